@@ -0,0 +1,45 @@
+"""Add scrape jobs queue table
+
+Revision ID: 20250801_scrape_jobs
+Revises: sge_media_v1
+Create Date: 2025-08-01 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250801_scrape_jobs"
+down_revision = "sge_media_v1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("scrape_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("source_name", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False, server_default="queued"),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("run_after", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("requested_by", sa.String(length=100), nullable=True),
+        sa.Column("worker_id", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_scrape_jobs_id", "scrape_jobs", ["id"])
+    op.create_index("ix_scrape_jobs_source_name", "scrape_jobs", ["source_name"])
+    op.create_index("ix_scrape_jobs_claim", "scrape_jobs", ["status", "run_after", "priority"])
+
+
+def downgrade():
+    op.drop_index("ix_scrape_jobs_claim", table_name="scrape_jobs")
+    op.drop_index("ix_scrape_jobs_source_name", table_name="scrape_jobs")
+    op.drop_index("ix_scrape_jobs_id", table_name="scrape_jobs")
+    op.drop_table("scrape_jobs")
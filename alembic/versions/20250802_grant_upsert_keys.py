@@ -0,0 +1,50 @@
+"""Add grant dedupe key and content hash for bulk upserts
+
+Revision ID: 20250802_grant_upsert_keys
+Revises: 20250801_scrape_jobs
+Create Date: 2025-08-02 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250802_grant_upsert_keys"
+down_revision = "20250801_scrape_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("grants", sa.Column("dedupe_key", sa.String(length=32), nullable=True))
+    op.add_column("grants", sa.Column("content_hash", sa.String(length=40), nullable=True))
+    op.add_column("scraper_logs", sa.Column("grants_unchanged", sa.Integer(), nullable=True, server_default="0"))
+
+    # Same expression as app.services.scrapers.ingest.dedupe_key. Earlier runs
+    # inserted duplicates; only the oldest copy of each grant gets the key, the
+    # rest keep NULL so they can be reviewed and removed separately.
+    op.execute(r"""
+        UPDATE grants AS g
+        SET dedupe_key = k.key
+        FROM (
+            SELECT id, key, row_number() OVER (PARTITION BY key ORDER BY id) AS copy
+            FROM (
+                SELECT id, md5(
+                    source || '|' ||
+                    rtrim(btrim(coalesce(source_url, ''), E' \t\r\n'), '/') || '|' ||
+                    lower(btrim(regexp_replace(title, '\s+', ' ', 'g')))
+                ) AS key
+                FROM grants
+            ) keyed
+        ) k
+        WHERE g.id = k.id AND k.copy = 1
+    """)
+
+    op.create_unique_constraint("uq_grants_dedupe_key", "grants", ["dedupe_key"])
+
+
+def downgrade():
+    op.drop_constraint("uq_grants_dedupe_key", "grants", type_="unique")
+    op.drop_column("scraper_logs", "grants_unchanged")
+    op.drop_column("grants", "content_hash")
+    op.drop_column("grants", "dedupe_key")
@@ -0,0 +1,46 @@
+"""Add crawl URL frontier table
+
+Revision ID: 20250803_crawl_urls
+Revises: 20250802_grant_upsert_keys
+Create Date: 2025-08-03 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250803_crawl_urls"
+down_revision = "20250802_grant_upsert_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("crawl_urls",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("source_name", sa.String(length=100), nullable=False),
+        sa.Column("url", sa.String(length=1000), nullable=False),
+        sa.Column("canonical_url", sa.String(length=1000), nullable=True),
+        sa.Column("last_status", sa.Integer(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_requests", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("quarantined_until", sa.DateTime(), nullable=True),
+        sa.Column("first_seen_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_checked_at", sa.DateTime(), nullable=True),
+        sa.Column("last_success_at", sa.DateTime(), nullable=True),
+        sa.Column("history", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("url")
+    )
+    op.create_index("ix_crawl_urls_id", "crawl_urls", ["id"])
+    op.create_index("ix_crawl_urls_source_name", "crawl_urls", ["source_name"])
+    op.create_index("ix_crawl_urls_quarantined_until", "crawl_urls", ["quarantined_until"])
+
+
+def downgrade():
+    op.drop_index("ix_crawl_urls_quarantined_until", table_name="crawl_urls")
+    op.drop_index("ix_crawl_urls_source_name", table_name="crawl_urls")
+    op.drop_index("ix_crawl_urls_id", table_name="crawl_urls")
+    op.drop_table("crawl_urls")
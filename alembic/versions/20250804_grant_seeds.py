@@ -0,0 +1,34 @@
+"""Add known-grant seed versions table
+
+Revision ID: 20250804_grant_seeds
+Revises: 20250803_crawl_urls
+Create Date: 2025-08-04 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250804_grant_seeds"
+down_revision = "20250803_crawl_urls"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("grant_seeds",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("source_name", sa.String(length=100), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("checksum", sa.String(length=64), nullable=False),
+        sa.Column("grant_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("applied_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("source_name")
+    )
+    op.create_index("ix_grant_seeds_id", "grant_seeds", ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_grant_seeds_id", table_name="grant_seeds")
+    op.drop_table("grant_seeds")
@@ -0,0 +1,42 @@
+"""Add per-URL scrape telemetry table
+
+Revision ID: 20250805_scrape_url_stats
+Revises: 20250804_grant_seeds
+Create Date: 2025-08-05 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250805_scrape_url_stats"
+down_revision = "20250804_grant_seeds"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("scrape_url_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("scraper_log_id", sa.Integer(), nullable=False),
+        sa.Column("source_name", sa.String(length=100), nullable=False),
+        sa.Column("url", sa.String(length=1000), nullable=False),
+        sa.Column("status", sa.Integer(), nullable=True),
+        sa.Column("requests", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("fetch_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("parse_ms", sa.Integer(), nullable=True),
+        sa.Column("grants", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.String(length=255), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["scraper_log_id"], ["scraper_logs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_scrape_url_stats_scraper_log_id", "scrape_url_stats", ["scraper_log_id"])
+    op.create_index("ix_scrape_url_stats_source_name", "scrape_url_stats", ["source_name"])
+
+
+def downgrade():
+    op.drop_index("ix_scrape_url_stats_source_name", table_name="scrape_url_stats")
+    op.drop_index("ix_scrape_url_stats_scraper_log_id", table_name="scrape_url_stats")
+    op.drop_table("scrape_url_stats")
@@ -0,0 +1,35 @@
+"""Add grant change log for the incremental change feed
+
+Revision ID: 20250806_grant_changes
+Revises: 20250805_scrape_url_stats
+Create Date: 2025-08-06 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250806_grant_changes"
+down_revision = "20250805_scrape_url_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("grant_changes",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("grant_id", sa.Integer(), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_grant_changes_grant_id", "grant_changes", ["grant_id"])
+
+    # Existing grants enter the feed as inserts, so a client starting from
+    # cursor 0 receives everything
+    op.execute("INSERT INTO grant_changes (grant_id, op) SELECT id, 'insert' FROM grants ORDER BY id")
+
+
+def downgrade():
+    op.drop_index("ix_grant_changes_grant_id", table_name="grant_changes")
+    op.drop_table("grant_changes")
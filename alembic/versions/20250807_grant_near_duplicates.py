@@ -0,0 +1,48 @@
+"""Add MinHash signatures, LSH buckets and canonical grant links
+
+Revision ID: 20250807_grant_near_duplicates
+Revises: 20250806_grant_changes
+Create Date: 2025-08-07 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250807_grant_near_duplicates"
+down_revision = "20250806_grant_changes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("grants", sa.Column("canonical_id", sa.Integer(), nullable=True))
+    op.create_foreign_key("fk_grants_canonical_id", "grants", "grants", ["canonical_id"], ["id"], ondelete="SET NULL")
+    op.create_index("ix_grants_canonical_id", "grants", ["canonical_id"])
+
+    op.create_table("grant_signatures",
+        sa.Column("grant_id", sa.Integer(), nullable=False),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["grant_id"], ["grants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("grant_id")
+    )
+    op.create_table("grant_lsh_buckets",
+        sa.Column("grant_id", sa.Integer(), nullable=False),
+        sa.Column("band", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["grant_id"], ["grants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("grant_id", "band")
+    )
+    op.create_index("ix_grant_lsh_buckets_band_bucket", "grant_lsh_buckets", ["band", "bucket"])
+
+    # Signatures can't be computed in SQL; existing grants are indexed with
+    # `python -m app.workers.scraper dedupe` after upgrading
+
+
+def downgrade():
+    op.drop_index("ix_grant_lsh_buckets_band_bucket", table_name="grant_lsh_buckets")
+    op.drop_table("grant_lsh_buckets")
+    op.drop_table("grant_signatures")
+    op.drop_index("ix_grants_canonical_id", table_name="grants")
+    op.drop_constraint("fk_grants_canonical_id", "grants", type_="foreignkey")
+    op.drop_column("grants", "canonical_id")
@@ -0,0 +1,76 @@
+"""Add saved searches, grant alerts and alert matches
+
+Revision ID: 20250808_saved_searches
+Revises: 20250807_grant_near_duplicates
+Create Date: 2025-08-08 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250808_saved_searches"
+down_revision = "20250807_grant_near_duplicates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("saved_searches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("filters", sa.JSON(), nullable=False),
+        sa.Column("is_alert_enabled", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("watermark", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("result_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_used", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_saved_searches_id", "saved_searches", ["id"])
+    op.create_index("ix_saved_searches_user_id", "saved_searches", ["user_id"])
+
+    op.create_table("grant_alerts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("search_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("conditions", sa.JSON(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("last_triggered", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["search_id"], ["saved_searches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_grant_alerts_id", "grant_alerts", ["id"])
+    op.create_index("ix_grant_alerts_user_id", "grant_alerts", ["user_id"])
+    op.create_index("ix_grant_alerts_search_id", "grant_alerts", ["search_id"])
+
+    op.create_table("grant_alert_matches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("alert_id", sa.Integer(), nullable=False),
+        sa.Column("grant_id", sa.Integer(), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("matched_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("seen_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["alert_id"], ["grant_alerts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["grant_id"], ["grants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("alert_id", "grant_id", name="uq_grant_alert_matches_alert_grant")
+    )
+    op.create_index("ix_grant_alert_matches_alert_id", "grant_alert_matches", ["alert_id"])
+
+
+def downgrade():
+    op.drop_index("ix_grant_alert_matches_alert_id", table_name="grant_alert_matches")
+    op.drop_table("grant_alert_matches")
+    op.drop_index("ix_grant_alerts_search_id", table_name="grant_alerts")
+    op.drop_index("ix_grant_alerts_user_id", table_name="grant_alerts")
+    op.drop_index("ix_grant_alerts_id", table_name="grant_alerts")
+    op.drop_table("grant_alerts")
+    op.drop_index("ix_saved_searches_user_id", table_name="saved_searches")
+    op.drop_index("ix_saved_searches_id", table_name="saved_searches")
+    op.drop_table("saved_searches")
@@ -0,0 +1,63 @@
+"""Add grants_archive for grants closed long ago
+
+Revision ID: 20250809_grants_archive
+Revises: 20250808_saved_searches
+Create Date: 2025-08-09 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20250809_grants_archive"
+down_revision = "20250808_saved_searches"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Mirrors grants (JSONB as there) so rows copy across with INSERT ... SELECT
+    op.create_table("grants_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("source", sa.String(length=100), nullable=False),
+        sa.Column("source_url", sa.String(length=1000), nullable=True),
+        sa.Column("application_url", sa.String(length=1000), nullable=True),
+        sa.Column("contact_email", sa.String(length=255), nullable=True),
+        sa.Column("min_amount", sa.Numeric(), nullable=True),
+        sa.Column("max_amount", sa.Numeric(), nullable=True),
+        sa.Column("open_date", sa.DateTime(), nullable=True),
+        sa.Column("deadline", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("industry_focus", sa.String(length=100), nullable=True),
+        sa.Column("location_eligibility", sa.String(length=100), nullable=True),
+        sa.Column("org_type_eligible", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("funding_purpose", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("audience_tags", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("dedupe_key", sa.String(length=32), nullable=True),
+        sa.Column("content_hash", sa.String(length=40), nullable=True),
+        sa.Column("canonical_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_by_id", sa.Integer(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_grants_archive_source", "grants_archive", ["source"])
+    op.create_index("ix_grants_archive_deadline", "grants_archive", ["deadline"])
+
+    # The archive job's scan: closed grants by deadline
+    op.create_index("ix_grants_status_deadline", "grants", ["status", "deadline"])
+
+    # Closed grants are moved over by the scraper worker (or
+    # `python -m app.workers.scraper archive`), in batches, after upgrading
+
+
+def downgrade():
+    op.drop_index("ix_grants_status_deadline", table_name="grants")
+    op.drop_index("ix_grants_archive_deadline", table_name="grants_archive")
+    op.drop_index("ix_grants_archive_source", table_name="grants_archive")
+    op.drop_table("grants_archive")
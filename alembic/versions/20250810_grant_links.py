@@ -0,0 +1,43 @@
+"""Add grant_links for link-check results
+
+Revision ID: 20250810_grant_links
+Revises: 20250809_grants_archive
+Create Date: 2025-08-10 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20250810_grant_links"
+down_revision = "20250809_grants_archive"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("grant_links",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("url", sa.String(length=1000), nullable=False),
+        sa.Column("state", sa.String(length=20), nullable=False),
+        sa.Column("last_status", sa.Integer(), nullable=True),
+        sa.Column("final_url", sa.String(length=1000), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_checked_at", sa.DateTime(), nullable=False),
+        sa.Column("last_ok_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("url")
+    )
+    op.create_index("ix_grant_links_id", "grant_links", ["id"])
+    op.create_index("ix_grant_links_state", "grant_links", ["state"])
+    op.create_index("ix_grant_links_last_checked_at", "grant_links", ["last_checked_at"])
+
+    # Links are checked by the scraper worker (or `python -m app.workers.scraper links`)
+
+
+def downgrade():
+    op.drop_index("ix_grant_links_last_checked_at", table_name="grant_links")
+    op.drop_index("ix_grant_links_state", table_name="grant_links")
+    op.drop_index("ix_grant_links_id", table_name="grant_links")
+    op.drop_table("grant_links")
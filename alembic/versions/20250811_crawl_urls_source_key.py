@@ -0,0 +1,33 @@
+"""Key crawl_urls on source and URL
+
+Revision ID: 20250811_crawl_urls_source_key
+Revises: 20250810_grant_links
+Create Date: 2025-08-11 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250811_crawl_urls_source_key"
+down_revision = "20250810_grant_links"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sources that crawl the same endpoint each keep their own row
+    op.drop_constraint("crawl_urls_url_key", "crawl_urls", type_="unique")
+    op.create_unique_constraint("uq_crawl_urls_source_url", "crawl_urls", ["source_name", "url"])
+
+
+def downgrade():
+    # Keep the most recently checked row per URL
+    op.execute("""
+        DELETE FROM crawl_urls c
+        USING crawl_urls newer
+        WHERE c.url = newer.url
+          AND (COALESCE(newer.last_checked_at, newer.first_seen_at), newer.id)
+              > (COALESCE(c.last_checked_at, c.first_seen_at), c.id)
+    """)
+    op.drop_constraint("uq_crawl_urls_source_url", "crawl_urls", type_="unique")
+    op.create_unique_constraint("crawl_urls_url_key", "crawl_urls", ["url"])
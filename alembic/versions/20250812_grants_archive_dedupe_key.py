@@ -0,0 +1,22 @@
+"""Index grants_archive.dedupe_key for ingest lookups
+
+Revision ID: 20250812_grants_archive_dedupe_key
+Revises: 20250811_crawl_urls_source_key
+Create Date: 2025-08-12 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250812_grants_archive_dedupe_key"
+down_revision = "20250811_crawl_urls_source_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_grants_archive_dedupe_key", "grants_archive", ["dedupe_key"])
+
+
+def downgrade():
+    op.drop_index("ix_grants_archive_dedupe_key", table_name="grants_archive")
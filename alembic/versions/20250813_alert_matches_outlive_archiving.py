@@ -0,0 +1,28 @@
+"""Keep grant alert matches when their grant is archived
+
+Revision ID: 20250813_alert_matches_outlive_archiving
+Revises: 20250812_grants_archive_dedupe_key
+Create Date: 2025-08-13 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250813_alert_matches_outlive_archiving"
+down_revision = "20250812_grants_archive_dedupe_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Archiving deletes the grant row; restoring brings it back under the same id
+    op.drop_constraint("grant_alert_matches_grant_id_fkey", "grant_alert_matches", type_="foreignkey")
+
+
+def downgrade():
+    # Matches of archived or deleted grants can't satisfy the foreign key
+    op.execute("DELETE FROM grant_alert_matches WHERE grant_id NOT IN (SELECT id FROM grants)")
+    op.create_foreign_key(
+        "grant_alert_matches_grant_id_fkey", "grant_alert_matches", "grants",
+        ["grant_id"], ["id"], ondelete="CASCADE"
+    )
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func, desc
 from datetime import datetime, timedelta
@@ -9,6 +9,16 @@ import logging
 
 from app.core.deps import get_db, get_current_user
 from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import record_grant_changes
+from app.models.saved_search import SavedSearch as SavedSearchModel, GrantAlert as GrantAlertModel
+from app.services.grant_changes import changes_since
+from app.services.grant_facets import get_facet_index
+from app.services.grant_loader import get_grant_loader, load_grants
+from app.services.link_checker import FLAGGED_STATES, STATES as LINK_STATES, flagged_links, grant_link_statuses
+from app.services.query_parser import conditions as query_conditions, parse_query, related_searches, search_suggestions
+from app.services.saved_searches import create_alert, create_saved_search, unseen_matches
+from app.services.similar_grants import similar_grants
 from app.models.user import User
 from app.schemas.grant import (
     GrantCreate, GrantUpdate, GrantResponse, GrantList, GrantFilters,
@@ -16,7 +26,7 @@ from app.schemas.grant import (
     GrantApplication, GrantApplicationCreate, GrantNote, GrantNoteCreate,
     AIRecommendationRequest, AIRecommendationResponse, SmartSearchRequest,
     SmartSearchResponse, GrantExportRequest, GrantExportResponse,
-    EnhancedGrantResponse, GrantDashboard, GrantMetrics
+    EnhancedGrantResponse, GrantDashboard, GrantMetrics, GrantAlert, GrantAlertCreate
 )
 
 router = APIRouter()
@@ -40,6 +50,39 @@ ORG_TYPE_OPTIONS = [
     "indigenous organisation", "social enterprise", "community group", "any"
 ]
 
+# Most grants one ?ids= request may ask for
+MAX_IDS = 500
+
+# Statuses of grants still taking applications (kept current by app/services/grant_lifecycle.py)
+OPEN_STATUSES = ["open", "closing_soon"]
+
+def grant_item(grant: Grant) -> dict:
+    """A grant as returned in list responses."""
+    return {
+        "id": grant.id,
+        "title": grant.title,
+        "description": grant.description,
+        "source": grant.source,
+        "source_url": grant.source_url,
+        "application_url": grant.application_url,
+        "contact_email": grant.contact_email,
+        "min_amount": float(grant.min_amount) if grant.min_amount else None,
+        "max_amount": float(grant.max_amount) if grant.max_amount else None,
+        "open_date": grant.open_date.isoformat() if grant.open_date else None,
+        "deadline": grant.deadline.isoformat() if grant.deadline else None,
+        "industry_focus": grant.industry_focus,
+        "location_eligibility": grant.location_eligibility,
+        "org_type_eligible": grant.org_type_eligible or [],
+        "funding_purpose": grant.funding_purpose or [],
+        "audience_tags": grant.audience_tags or [],
+        "status": grant.status,
+        "notes": grant.notes,
+        "canonical_id": grant.canonical_id,
+        "archived_at": grant.archived_at.isoformat() if isinstance(grant, ArchivedGrant) else None,
+        "created_at": grant.created_at.isoformat() if grant.created_at else None,
+        "updated_at": grant.updated_at.isoformat() if grant.updated_at else None
+    }
+
 # Existing endpoints
 @router.get("/", response_model=GrantList)
 def get_grants(
@@ -49,9 +92,21 @@ def get_grants(
     industry_focus: Optional[str] = Query(None, enum=INDUSTRY_FOCUS_OPTIONS),
     location: Optional[str] = Query(None, enum=LOCATION_ELIGIBILITY_OPTIONS),
     org_type: Optional[str] = Query(None, enum=ORG_TYPE_OPTIONS),
-    status: Optional[str] = Query(None, enum=["open", "closed", "draft", "active", "closing_soon"])
+    status: Optional[str] = Query(None, enum=["open", "closed", "draft", "active", "closing_soon"]),
+    include_duplicates: bool = Query(False, description="Also list other sources' copies of the same program"),
+    include_archived: bool = Query(False, description="Also list grants moved to the archive, after the current ones"),
+    ids: Optional[str] = Query(None, description="Comma-separated grant ids: return exactly these grants, in this order")
 ):
     """Get list of grants with optional filtering."""
+    grant_ids = None
+    if ids is not None:
+        try:
+            grant_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+        if len(grant_ids) > MAX_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_IDS} ids per request")
+    
     try:
         from app.db.session import get_engine
         from sqlalchemy.orm import sessionmaker
@@ -63,50 +118,72 @@ def get_grants(
         db = SessionLocal()
         
         try:
-            query = db.query(Grant)
-            
-            if source:
-                query = query.filter(Grant.source == source)
+            if grant_ids is not None:
+                # One IN query for the lot (archived grants included); ids that don't exist are left out
+                found = load_grants(db, grant_ids, include_archived=True)
+                items = [grant_item(found[grant_id]) for grant_id in grant_ids if grant_id in found]
+                return GrantList(
+                    items=items,
+                    total=len(items),
+                    page=1,
+                    size=len(items),
+                    has_next=False,
+                    has_prev=False
+                )
             
-            if industry_focus:
-                query = query.filter(Grant.industry_focus == industry_focus)
+            def filtered(model):
+                # grants and grants_archive have the same columns
+                query = db.query(model)
                 
-            if location:
-                query = query.filter(Grant.location_eligibility == location)
+                if not include_duplicates:
+                    query = query.filter(model.canonical_id.is_(None))
                 
-            if org_type:
-                query = query.filter(Grant.org_type_eligible.contains([org_type]))
+                if source:
+                    query = query.filter(model.source == source)
                 
-            if status:
-                query = query.filter(Grant.status == status)
+                if industry_focus:
+                    query = query.filter(model.industry_focus == industry_focus)
+                    
+                if location:
+                    query = query.filter(model.location_eligibility == location)
+                    
+                if org_type:
+                    query = query.filter(model.org_type_eligible.contains([org_type]))
+                    
+                if status:
+                    query = query.filter(model.status == status)
+                
+                return query
             
+            query = filtered(Grant)
             total = query.count()
             grants = query.offset(skip).limit(limit).all()
             
-            grant_items = []
-            for grant in grants:
-                grant_items.append({
-                    "id": grant.id,
-                    "title": grant.title,
-                    "description": grant.description,
-                    "source": grant.source,
-                    "source_url": grant.source_url,
-                    "application_url": grant.application_url,
-                    "contact_email": grant.contact_email,
-                    "min_amount": float(grant.min_amount) if grant.min_amount else None,
-                    "max_amount": float(grant.max_amount) if grant.max_amount else None,
-                    "open_date": grant.open_date.isoformat() if grant.open_date else None,
-                    "deadline": grant.deadline.isoformat() if grant.deadline else None,
-                    "industry_focus": grant.industry_focus,
-                    "location_eligibility": grant.location_eligibility,
-                    "org_type_eligible": grant.org_type_eligible or [],
-                    "funding_purpose": grant.funding_purpose or [],
-                    "audience_tags": grant.audience_tags or [],
-                    "status": grant.status,
-                    "notes": grant.notes,
-                    "created_at": grant.created_at.isoformat() if grant.created_at else None,
-                    "updated_at": grant.updated_at.isoformat() if grant.updated_at else None
-                })
+            if include_archived:
+                # Archived grants page on after the current ones
+                archived = filtered(ArchivedGrant)
+                current_total = total
+                total += archived.count()
+                if len(grants) < limit:
+                    grants += (
+                        archived.order_by(ArchivedGrant.id)
+                        .offset(max(0, skip - current_total))
+                        .limit(limit - len(grants))
+                        .all()
+                    )
+            
+            grant_items = [grant_item(grant) for grant in grants]
+            
+            # Counts come from the in-memory bitmap index, not per-value queries
+            facet_index = get_facet_index()
+            facet_index.refresh(db)
+            facets = facet_index.counts({
+                "source": source,
+                "industry_focus": industry_focus,
+                "location_eligibility": location,
+                "org_type": org_type,
+                "status": status
+            }, include_duplicates=include_duplicates)
             
             return GrantList(
                 items=grant_items,
@@ -114,7 +191,8 @@ def get_grants(
                 page=skip // limit + 1,
                 size=limit,
                 has_next=skip + limit < total,
-                has_prev=skip > 0
+                has_prev=skip > 0,
+                facets=facets
             )
             
         finally:
@@ -126,48 +204,201 @@ def get_grants(
             detail=f"Error fetching grants: {str(e)}"
         )
 
+@router.get("/changes")
+def get_grant_changes(
+    since: int = Query(0, ge=0, description="Cursor from the previous response's next_cursor"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Grants inserted, updated or deleted since a cursor, for incremental sync."""
+    feed = changes_since(db, since=since, limit=limit)
+    return {
+        "changes": [
+            {
+                "cursor": change["cursor"],
+                "op": change["op"],
+                "grant_id": change["grant_id"],
+                "changed_at": change["changed_at"].isoformat() if change["changed_at"] else None,
+                "grant": grant_item(change["grant"]) if change["grant"] is not None else None
+            }
+            for change in feed["changes"]
+        ],
+        "next_cursor": feed["next_cursor"],
+        "has_more": feed["has_more"]
+    }
+
+@router.get("/saved-searches", response_model=List[SavedSearch])
+def list_saved_searches(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """The current user's saved searches."""
+    searches = (
+        db.query(SavedSearchModel)
+        .filter(SavedSearchModel.user_id == current_user.id)
+        .order_by(desc(SavedSearchModel.last_used))
+        .all()
+    )
+    return [SavedSearch.from_orm(search) for search in searches]
+
+@router.post("/saved-searches", response_model=SavedSearch)
+def save_search(
+    request: SavedSearchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Save a search; with alerts enabled, new and changed grants matching it are reported."""
+    try:
+        search = create_saved_search(db, current_user.id, request.name, request.filters, request.is_alert_enabled)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    return SavedSearch.from_orm(search)
+
+@router.delete("/saved-searches/{search_id}")
+def delete_saved_search(
+    search_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete a saved search and its alerts."""
+    search = db.query(SavedSearchModel).filter(
+        SavedSearchModel.id == search_id, SavedSearchModel.user_id == current_user.id
+    ).first()
+    if not search:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    db.query(GrantAlertModel).filter(GrantAlertModel.search_id == search_id).delete()
+    db.delete(search)
+    db.commit()
+    return {"deleted": search_id}
+
+@router.get("/alerts", response_model=List[GrantAlert])
+def list_alerts(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """The current user's grant alerts."""
+    alerts = db.query(GrantAlertModel).filter(GrantAlertModel.user_id == current_user.id).all()
+    return [GrantAlert.from_orm(alert) for alert in alerts]
+
+@router.post("/alerts", response_model=GrantAlert)
+def add_alert(
+    request: GrantAlertCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Alert on one of your saved searches, optionally narrowed by extra conditions."""
+    search = db.query(SavedSearchModel).filter(
+        SavedSearchModel.id == request.search_id, SavedSearchModel.user_id == current_user.id
+    ).first()
+    if not search:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    try:
+        alert = create_alert(db, search, request.name, request.conditions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    return GrantAlert.from_orm(alert)
+
+@router.get("/alerts/matches")
+def list_alert_matches(
+    limit: int = Query(100, ge=1, le=500),
+    mark_seen: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Grants your alerts fired for that you haven't seen yet."""
+    rows = unseen_matches(db, current_user.id, limit=limit, mark_seen=mark_seen)
+    if mark_seen:
+        db.commit()
+    return {
+        "items": [
+            {
+                "alert_id": alert.id,
+                "alert_name": alert.name,
+                "search_id": alert.search_id,
+                "op": match.op,
+                "matched_at": match.matched_at.isoformat(),
+                "grant": grant_item(grant)
+            }
+            for match, alert, grant in rows
+        ]
+    }
+
+@router.get("/links")
+def list_flagged_links(
+    state: Optional[List[str]] = Query(None, description=f"Link states to list (default: {', '.join(FLAGGED_STATES)})"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Source and application links the link checker found dead or redirected, with the grants using them."""
+    states = state or list(FLAGGED_STATES)
+    unknown = set(states) - set(LINK_STATES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown link states: {', '.join(sorted(unknown))}")
+    return {"items": flagged_links(db, states, skip=skip, limit=limit)}
+
 @router.get("/{grant_id}", response_model=GrantResponse)
-def get_grant(grant_id: int, db: Session = Depends(get_db)):
-    """Get a specific grant by ID."""
+async def get_grant(grant_id: int):
+    """Get a specific grant by ID, archived or not. Concurrent lookups share one query (see grant_loader.py)."""
     try:
-        from app.db.session import get_engine
-        from sqlalchemy.orm import sessionmaker
-        from app.models.grant import Grant
-        
-        engine = get_engine()
-        SessionLocal = sessionmaker(bind=engine)
-        db = SessionLocal()
-        
-        grant = db.query(Grant).filter(Grant.id == grant_id).first()
-        
-        if not grant:
-            raise HTTPException(status_code=404, detail="Grant not found")
-        
-        return {
-            "id": grant.id,
-            "title": grant.title,
-            "description": grant.description,
-            "source": grant.source,
-            "source_url": grant.source_url,
-            "application_url": grant.application_url,
-            "contact_email": grant.contact_email,
-            "min_amount": float(grant.min_amount) if grant.min_amount else None,
-            "max_amount": float(grant.max_amount) if grant.max_amount else None,
-            "open_date": grant.open_date.isoformat() if grant.open_date else None,
-            "deadline": grant.deadline.isoformat() if grant.deadline else None,
-            "industry_focus": grant.industry_focus,
-            "location_eligibility": grant.location_eligibility,
-            "org_type_eligible": grant.org_type_eligible,
-            "status": grant.status,
-            "created_at": grant.created_at.isoformat() if grant.created_at else None,
-            "updated_at": grant.updated_at.isoformat() if grant.updated_at else None
-        }
-        
+        grant = await get_grant_loader().load(grant_id)
     except Exception as e:
         logger.error(f"Error getting grant {grant_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
+    
+    if not grant:
+        raise HTTPException(status_code=404, detail="Grant not found")
+    
+    return {
+        "id": grant.id,
+        "title": grant.title,
+        "description": grant.description,
+        "source": grant.source,
+        "source_url": grant.source_url,
+        "application_url": grant.application_url,
+        "contact_email": grant.contact_email,
+        "min_amount": float(grant.min_amount) if grant.min_amount else None,
+        "max_amount": float(grant.max_amount) if grant.max_amount else None,
+        "open_date": grant.open_date.isoformat() if grant.open_date else None,
+        "deadline": grant.deadline.isoformat() if grant.deadline else None,
+        "industry_focus": grant.industry_focus,
+        "location_eligibility": grant.location_eligibility,
+        "org_type_eligible": grant.org_type_eligible,
+        "status": grant.status,
+        "canonical_id": grant.canonical_id,
+        "archived_at": grant.archived_at.isoformat() if isinstance(grant, ArchivedGrant) else None,
+        "created_at": grant.created_at.isoformat() if grant.created_at else None,
+        "updated_at": grant.updated_at.isoformat() if grant.updated_at else None
+    }
+
+@router.get("/{grant_id}/similar")
+def get_similar_grants(
+    grant_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Grants most like this one, by TF-IDF cosine similarity of title and description."""
+    grant = db.query(Grant).filter(Grant.id == grant_id).first()
+    if not grant:
+        raise HTTPException(status_code=404, detail="Grant not found")
+    
+    return {
+        "grant_id": grant_id,
+        "items": [
+            {**grant_item(similar), "similarity": score}
+            for similar, score in similar_grants(db, grant, limit=limit)
+        ]
+    }
+
+@router.get("/{grant_id}/links")
+def get_grant_links(grant_id: int, db: Session = Depends(get_db)):
+    """Last link-check result for a grant's source and application URLs."""
+    grant = db.query(Grant).filter(Grant.id == grant_id).first()
+    if not grant:
+        raise HTTPException(status_code=404, detail="Grant not found")
+    return {"grant_id": grant_id, "links": grant_link_statuses(db, grant)}
 
 @router.post("/", response_model=GrantResponse)
 def create_grant(grant_data: GrantCreate, db: Session = Depends(get_db)):
@@ -246,7 +477,7 @@ async def get_ai_recommendations(
         recommendations = []
         
         # Get grants that match the criteria
-        query = db.query(Grant).filter(Grant.status == "open")
+        query = db.query(Grant).filter(Grant.status.in_(OPEN_STATUSES), Grant.canonical_id.is_(None))
         
         if request.industry_focus:
             query = query.filter(Grant.industry_focus == request.industry_focus)
@@ -308,39 +539,14 @@ async def smart_search(
 ):
     """Perform smart search with natural language processing and AI insights."""
     try:
-        # Parse natural language query
-        parsed_query = parse_natural_language_query(request.query)
+        # Parse natural language query (compiled parser, memoized per query)
+        parsed = parse_query(request.query)
         
         # Build search query
-        query = db.query(Grant).filter(Grant.status.in_(["open", "closing_soon"]))
+        query = db.query(Grant).filter(Grant.status.in_(OPEN_STATUSES), Grant.canonical_id.is_(None))
         
         # Apply parsed filters
-        if parsed_query.get("keywords"):
-            keywords = parsed_query["keywords"]
-            search_conditions = []
-            for keyword in keywords:
-                search_conditions.append(
-                    or_(
-                        Grant.title.ilike(f"%{keyword}%"),
-                        Grant.description.ilike(f"%{keyword}%"),
-                        Grant.funding_purpose.contains([keyword])
-                    )
-                )
-            query = query.filter(or_(*search_conditions))
-        
-        if parsed_query.get("industry"):
-            query = query.filter(Grant.industry_focus == parsed_query["industry"])
-        
-        if parsed_query.get("location"):
-            query = query.filter(Grant.location_eligibility.contains([parsed_query["location"]]))
-        
-        if parsed_query.get("amount_range"):
-            min_amount = parsed_query["amount_range"].get("min")
-            max_amount = parsed_query["amount_range"].get("max")
-            if min_amount:
-                query = query.filter(Grant.max_amount >= min_amount)
-            if max_amount:
-                query = query.filter(Grant.min_amount <= max_amount)
+        query = query.filter(*query_conditions(parsed))
         
         # Apply additional filters if provided
         if request.filters:
@@ -372,9 +578,9 @@ async def smart_search(
         return SmartSearchResponse(
             grants=enhanced_grants,
             total_results=total,
-            search_suggestions=generate_search_suggestions(request.query),
+            search_suggestions=search_suggestions(request.query, parsed),
             ai_insights=ai_insights,
-            related_searches=generate_related_searches(request.query)
+            related_searches=related_searches(parsed)
         )
         
     except Exception as e:
@@ -390,22 +596,14 @@ async def get_grant_analytics(
     try:
         # Get basic counts
         total_grants = db.query(Grant).count()
-        open_grants = db.query(Grant).filter(Grant.status == "open").count()
-        
-        # Calculate closing soon (deadline within 30 days)
-        thirty_days_from_now = datetime.now() + timedelta(days=30)
-        closing_soon = db.query(Grant).filter(
-            and_(
-                Grant.status == "open",
-                Grant.deadline <= thirty_days_from_now
-            )
-        ).count()
+        open_grants = db.query(Grant).filter(Grant.status.in_(OPEN_STATUSES)).count()
+        closing_soon = db.query(Grant).filter(Grant.status == "closing_soon").count()
         
         # Calculate funding totals
         funding_query = db.query(
             func.sum(Grant.max_amount).label('total_funding'),
             func.avg(Grant.max_amount).label('average_amount')
-        ).filter(Grant.status == "open")
+        ).filter(Grant.status.in_(OPEN_STATUSES))
         
         funding_result = funding_query.first()
         total_funding = funding_result.total_funding or Decimal('0')
@@ -435,8 +633,9 @@ async def get_grant_analytics(
         # Get upcoming deadlines
         upcoming_deadlines = db.query(Grant).filter(
             and_(
-                Grant.status.in_(["open", "closing_soon"]),
-                Grant.deadline >= datetime.now()
+                Grant.status.in_(OPEN_STATUSES),
+                Grant.deadline.isnot(None),
+                Grant.canonical_id.is_(None)
             )
         ).order_by(Grant.deadline).limit(5).all()
         
@@ -447,7 +646,7 @@ async def get_grant_analytics(
         sector_breakdown = {}
         location_breakdown = {}
         
-        for grant in db.query(Grant).filter(Grant.status == "open").all():
+        for grant in db.query(Grant).filter(Grant.status.in_(OPEN_STATUSES)).all():
             if grant.industry_focus:
                 sector_breakdown[grant.industry_focus] = sector_breakdown.get(grant.industry_focus, 0) + 1
             if grant.location_eligibility:
@@ -494,22 +693,31 @@ async def get_grant_dashboard(
         # Get upcoming deadlines
         upcoming_deadlines = db.query(Grant).filter(
             and_(
-                Grant.status.in_(["open", "closing_soon"]),
-                Grant.deadline >= datetime.now()
+                Grant.status.in_(OPEN_STATUSES),
+                Grant.deadline.isnot(None),
+                Grant.canonical_id.is_(None)
             )
         ).order_by(Grant.deadline).limit(5).all()
         
-        # Mock saved searches and alerts
-        saved_searches = []
-        alerts = []
+        saved_searches = (
+            db.query(SavedSearchModel)
+            .filter(SavedSearchModel.user_id == current_user.id)
+            .order_by(desc(SavedSearchModel.last_used))
+            .limit(10)
+            .all()
+        )
+        alerts = db.query(GrantAlertModel).filter(
+            GrantAlertModel.user_id == current_user.id,
+            GrantAlertModel.is_active.is_(True)
+        ).all()
         
         return GrantDashboard(
             overview=analytics,
             recommendations=recommendations_response.recommendations,
             recent_applications=recent_applications,
             upcoming_deadlines=[GrantResponse.from_orm(grant) for grant in upcoming_deadlines],
-            saved_searches=saved_searches,
-            alerts=alerts
+            saved_searches=[SavedSearch.from_orm(search) for search in saved_searches],
+            alerts=[GrantAlert.from_orm(alert) for alert in alerts]
         )
         
     except Exception as e:
@@ -671,44 +879,7 @@ def extract_key_requirements(grant: Grant) -> List[str]:
 
 def parse_natural_language_query(query: str) -> dict:
     """Parse natural language query into structured filters."""
-    # Mock implementation - in production, this would use NLP
-    parsed = {"keywords": []}
-    
-    query_lower = query.lower()
-    
-    # Extract industry keywords
-    industry_keywords = {
-        "technology": ["tech", "digital", "software", "ai", "artificial intelligence"],
-        "healthcare": ["health", "medical", "wellness", "mental health"],
-        "sustainability": ["sustainable", "environment", "green", "climate"],
-        "education": ["education", "learning", "school", "training"],
-        "cultural heritage": ["cultural", "heritage", "indigenous", "arts"]
-    }
-    
-    for industry, keywords in industry_keywords.items():
-        if any(keyword in query_lower for keyword in keywords):
-            parsed["industry"] = industry
-            break
-    
-    # Extract location keywords
-    location_keywords = {
-        "victoria": ["victoria", "melbourne", "geelong"],
-        "national": ["national", "australia", "countrywide"],
-        "local": ["local", "community", "neighbourhood"]
-    }
-    
-    for location, keywords in location_keywords.items():
-        if any(keyword in query_lower for keyword in keywords):
-            parsed["location"] = location
-            break
-    
-    # Extract amount keywords
-    if "small" in query_lower or "under 50k" in query_lower:
-        parsed["amount_range"] = {"max": 50000}
-    elif "large" in query_lower or "over 100k" in query_lower:
-        parsed["amount_range"] = {"min": 100000}
-    
-    return parsed
+    return parse_query(query).as_dict()
 
 def calculate_relevance_score(grant: Grant, query: str) -> int:
     """Calculate relevance score for a grant based on search query."""
@@ -753,35 +924,15 @@ def generate_ai_insights(grants: List[EnhancedGrantResponse], query: str) -> dic
         "deadline_urgency": "medium" if any(g.deadline and (g.deadline - datetime.now()).days < 30 for g in grants) else "low"
     }
 
-def generate_search_suggestions(query: str) -> List[str]:
-    """Generate search suggestions based on the query."""
-    suggestions = [
-        f"{query} in Victoria",
-        f"{query} for nonprofits",
-        f"{query} under $50,000",
-        f"{query} closing soon"
-    ]
-    return suggestions
-
-def generate_related_searches(query: str) -> List[str]:
-    """Generate related search terms."""
-    related = [
-        "sustainability grants",
-        "technology innovation funding",
-        "community development grants",
-        "indigenous cultural projects"
-    ]
-    return related
-
 # Existing endpoints (keep these)
 @router.post("/scrape")
 async def scrape_all_sources(
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Trigger scraping of all available grant sources."""
+    """Queue scraping of all available grant sources for the scraper worker."""
     try:
         from app.core.config import settings
+        from app.services.scrapers.job_queue import enqueue_scrape_job
         
         if not hasattr(settings, 'ALLOWED_SCRAPER_SOURCES'):
             raise HTTPException(
@@ -801,40 +952,28 @@ async def scrape_all_sources(
                 "available_sources": []
             }
         
-        # Start scraping for each enabled source
-        started_sources = []
+        # Queue a job per source; the worker picks them up
+        jobs = []
         for source in enabled_sources:
             try:
-                # Import and initialize scraper
-                if source == "australian_grants":
-                    from app.services.scrapers.australian_grants_scraper import AustralianGrantsScraper
-                    scraper = AustralianGrantsScraper(db)
-                elif source == "business_gov":
-                    from app.services.scrapers.business_gov import BusinessGovScraper
-                    scraper = BusinessGovScraper(db)
-                elif source == "media_investment":
-                    from app.services.scrapers.media_investment_scraper import MediaInvestmentScraper
-                    scraper = MediaInvestmentScraper(db)
-                else:
-                    logger.warning(f"Skipping {source} - not yet implemented")
-                    continue
-                
-                # Add to background tasks
-                background_tasks.add_task(scraper.scrape)
-                started_sources.append(source)
-                
+                job = enqueue_scrape_job(db, source, requested_by="api")
+                jobs.append({"source": source, "job_id": job.id, "status": job.status})
             except Exception as e:
-                logger.error(f"Error starting scraper {source}: {str(e)}")
+                logger.error(f"Error queueing scraper {source}: {str(e)}")
+                db.rollback()
                 # Continue with other sources even if one fails
         
         return {
-            "status": "started",
-            "message": f"Started scraping for {len(started_sources)} sources",
-            "started_sources": started_sources,
+            "status": "queued",
+            "message": f"Queued scraping for {len(jobs)} sources",
+            "started_sources": [job["source"] for job in jobs],
+            "jobs": jobs,
             "total_enabled": len(enabled_sources),
             "estimated_time": "5-10 minutes"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in scrape_all_sources: {str(e)}")
         raise HTTPException(
@@ -845,12 +984,12 @@ async def scrape_all_sources(
 @router.post("/scrape/{source}")
 async def scrape_specific_source(
     source: str,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Trigger scraping of a specific grant source."""
+    """Queue scraping of a specific grant source for the scraper worker."""
     try:
         from app.core.config import settings
+        from app.services.scrapers.job_queue import enqueue_scrape_job
         
         # Check if source is allowed
         if not hasattr(settings, 'ALLOWED_SCRAPER_SOURCES') or source not in settings.ALLOWED_SCRAPER_SOURCES:
@@ -866,60 +1005,17 @@ async def scrape_specific_source(
                 detail=f"Source '{source}' is currently disabled"
             )
         
-        # Import the appropriate scraper
-        scraper_map = {
-            "australian_grants": "AustralianGrantsScraper",
-            "business.gov.au": "BusinessGovScraper", 
-            "media_investment": "MediaInvestmentScraper",
-            "grantconnect": "GrantConnectScraper",
-            "philanthropic": "PhilanthropicScraper"
-        }
-        
-        if source not in scraper_map:
-            raise HTTPException(
-                status_code=400,
-                detail=f"No scraper implementation found for source '{source}'"
-            )
+        # An explicit request jumps ahead of scheduled runs
+        job = enqueue_scrape_job(db, source, requested_by="api", priority=10)
         
-        # Import and initialize scraper
-        try:
-            if source == "australian_grants":
-                from app.services.scrapers.australian_grants_scraper import AustralianGrantsScraper
-                scraper = AustralianGrantsScraper(db)
-            elif source == "business_gov":
-                from app.services.scrapers.business_gov import BusinessGovScraper
-                scraper = BusinessGovScraper(db)
-            elif source == "media_investment":
-                from app.services.scrapers.media_investment_scraper import MediaInvestmentScraper
-                scraper = MediaInvestmentScraper(db)
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Scraper for '{source}' not yet implemented"
-                )
-            
-            # Run scraper in background
-            background_tasks.add_task(scraper.scrape)
-            
-            return {
-                "status": "started",
-                "message": f"Scraping started for {source}",
-                "source": source,
-                "estimated_time": "2-5 minutes"
-            }
-            
-        except ImportError as e:
-            logger.error(f"Import error for scraper {source}: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Scraper module for '{source}' could not be imported"
-            )
-        except Exception as e:
-            logger.error(f"Error initializing scraper {source}: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error initializing scraper: {str(e)}"
-            )
+        return {
+            "status": "queued",
+            "message": f"Scraping queued for {source}",
+            "source": source,
+            "job_id": job.id,
+            "job_status": job.status,
+            "estimated_time": "2-5 minutes"
+        }
             
     except HTTPException:
         raise
@@ -1044,6 +1140,9 @@ def clear_all_grants():
     db = next(get_db())
     
     try:
+        # Bulk deletes bypass the ORM flush, so log them for the change feed here
+        grant_ids = [grant_id for (grant_id,) in db.query(Grant.id)]
+        record_grant_changes(db.connection(), [("delete", grant_id) for grant_id in grant_ids])
         deleted_count = db.query(Grant).delete()
         db.commit()
         
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter
 from app.db.session import health_check as check_db_health
+from app.core.api_client import get_all_client_metrics, get_latency_report
 from sqlalchemy import text
 from datetime import datetime
 
@@ -19,6 +20,18 @@ async def health_check():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@router.get("/upstreams")
+async def upstream_latency(details: bool = False):
+    """Latency percentiles per upstream service (Notion, scraped sites, ...), slowest first.
+    
+    ``details=true`` adds each service's counters and per-endpoint breakdown.
+    """
+    report = get_latency_report()
+    if details:
+        report["clients"] = get_all_client_metrics()
+    report["timestamp"] = datetime.utcnow().isoformat()
+    return report
+
 @router.get("/db-test")
 async def database_test():
     """Detailed database connection test."""
@@ -73,7 +73,7 @@ async def connect_notion_workspace(
         
         # Get workspace info from Notion API
         notion_client = NotionAPIClient(access_token)
-        workspace_info = notion_client.get_workspace_info()
+        workspace_info = await notion_client.get_workspace_info()
         
         # Create workspace record
         workspace = NotionWorkspace(
@@ -267,7 +267,7 @@ async def sync_media_project_to_notion(
             
             # Create page in Notion (you'll need a parent page ID)
             parent_page_id = "your_parent_page_id"  # This should be configurable
-            notion_page = template_manager.create_media_project_template(parent_page_id, project_data)
+            notion_page = await template_manager.create_media_project_template(parent_page_id, project_data)
             
             # Create mapping
             mapping = NotionSyncMapping(
@@ -294,7 +294,7 @@ async def sync_media_project_to_notion(
                 "target_audience": project.target_audience
             }
             
-            sync_manager.sync_media_project(project_data, mapping.notion_page_id)
+            await sync_manager.sync_media_project(project_data, mapping.notion_page_id)
             mapping.sync_status = SyncStatus.COMPLETED
         
         mapping.last_sync_at = datetime.utcnow()
@@ -510,7 +510,7 @@ async def create_notion_template(
         template_manager = NotionTemplateManager(notion_client)
         
         if template_request.template_name == "media_project":
-            result = template_manager.create_media_project_template(
+            result = await template_manager.create_media_project_template(
                 template_request.parent_page_id,
                 template_request.project_data or {}
             )
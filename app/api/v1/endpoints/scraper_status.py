@@ -1,11 +1,17 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, case
 
+from app.core.config import settings
 from app.core.deps import get_db
 from app.models.scraper_log import ScraperLog
 from app.schemas.scraper_log import ScraperLog as ScraperLogSchema
+from app.schemas.scrape_job import ScrapeJob as ScrapeJobSchema
+from app.services.scrapers.frontier import dead_endpoint_report
+from app.services.scrapers.job_queue import enqueue_scrape_job, get_recent_jobs
+from app.services.scrapers.scheduler import ScrapeScheduler
+from app.services.scrapers.telemetry import performance_report
 
 router = APIRouter()
 
@@ -38,20 +44,43 @@ def get_scraper_status(db: Session = Depends(get_db)):
     }
 
 @router.post("/run")
-def run_scrapers(
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """Run all available scrapers."""
+def run_scrapers(db: Session = Depends(get_db)):
+    """Queue a run of all enabled scrapers for the scraper worker."""
+    
+    jobs = [
+        enqueue_scrape_job(db, source_name, requested_by="api")
+        for source_name, config in settings.ALLOWED_SCRAPER_SOURCES.items()
+        if config.get("enabled", False)
+    ]
     
-    # For now, return a success response
-    # In a full implementation, this would trigger actual scraping
     return {
-        "status": "started",
-        "message": "Scraper run initiated",
-        "available_sources": ["business_gov", "grantconnect", "australian_grants"]
+        "status": "queued",
+        "message": "Scraper run queued",
+        "available_sources": [job.source_name for job in jobs],
+        "job_ids": [job.id for job in jobs]
     }
 
+@router.get("/jobs", response_model=List[ScrapeJobSchema])
+def get_scrape_jobs(source_name: Optional[str] = None, limit: int = 50, db: Session = Depends(get_db)):
+    """Get recent scrape jobs and their queue status."""
+    return get_recent_jobs(db, limit=min(limit, 200), source_name=source_name)
+
+@router.get("/schedule", response_model=List[dict])
+def get_scrape_schedule(db: Session = Depends(get_db)):
+    """Get when each enabled source is next due to be scraped, and why."""
+    return [schedule.to_dict() for schedule in ScrapeScheduler(db).plan()]
+
+@router.get("/dead-endpoints", response_model=List[dict])
+def get_dead_endpoints(source_name: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get scraper endpoints that are currently failing or quarantined."""
+    return dead_endpoint_report(db, source_name)
+
+@router.get("/performance", response_model=List[dict])
+def get_scraper_performance(source_name: Optional[str] = None, runs: int = 10, slowest: int = 10,
+                            db: Session = Depends(get_db)):
+    """Get per-source fetch/parse percentiles, slowest URLs and trends over recent runs."""
+    return performance_report(db, source_name, runs=min(max(runs, 1), 50), slowest=min(max(slowest, 1), 100))
+
 @router.get("/sources", response_model=List[dict])
 def get_scraper_sources(db: Session = Depends(get_db)):
     """Get status of all scraper sources with their latest run statistics."""
@@ -6,16 +6,19 @@ Handles all external API calls with reliability and monitoring
 import asyncio
 import aiohttp
 import requests
+import threading
 import time
 import logging
-from typing import Dict, List, Optional, Union, Any, Callable
+from typing import Dict, List, Optional, Union, Any, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from contextlib import asynccontextmanager
 from urllib.parse import urljoin, urlparse
 from app.core.config import settings
+from app.core.latency import LatencyHistogram, WindowedHistogram, merge_histograms
 import json
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -58,18 +61,219 @@ class APIResponse:
     success: bool = False
     error: Optional[str] = None
 
+# Endpoints tracked per client; further ones are counted under "other"
+MAX_TRACKED_ENDPOINTS = 100
+
+# Path segments that are identifiers (numbers, UUIDs, long hex/Notion ids)
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,})$")
+
+def endpoint_label(endpoint: str) -> str:
+    """Endpoint with query string dropped and IDs folded, e.g. ``/pages/{id}``."""
+    path = urlparse(endpoint).path if endpoint.startswith(("http://", "https://")) else endpoint.split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")) or "/"
+
+def _latency_window() -> WindowedHistogram:
+    return WindowedHistogram(settings.API_METRICS_WINDOW_SECONDS, settings.API_METRICS_WINDOW_SLOTS)
+
+@dataclass
+class EndpointMetrics:
+    """Per-endpoint counters and latency."""
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    total_time: float = 0.0
+    last_accessed: Optional[datetime] = None
+    latency: WindowedHistogram = field(default_factory=_latency_window)
+
 @dataclass
 class ConnectionMetrics:
-    """Metrics for API connection monitoring."""
+    """Metrics for API connection monitoring.
+    
+    Shared by every client created with the same service name (see
+    ``get_connection_metrics``). Latency is kept in fixed-memory histograms,
+    overall and per endpoint, over a rolling window of
+    ``API_METRICS_WINDOW_SECONDS``; ``latency_total`` covers the lifetime.
+    """
+    base_url: str = ""
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
     total_retries: int = 0
-    avg_response_time: float = 0.0
     last_success: Optional[datetime] = None
     last_failure: Optional[datetime] = None
     consecutive_failures: int = 0
-    endpoints: Dict[str, Dict] = field(default_factory=dict)
+    latency: WindowedHistogram = field(default_factory=_latency_window)
+    latency_total: LatencyHistogram = field(default_factory=LatencyHistogram)
+    endpoints: Dict[str, EndpointMetrics] = field(default_factory=dict)
+    _lock: Any = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    @property
+    def avg_response_time(self) -> float:
+        return self.latency_total.mean or 0.0
+    
+    def record(self, endpoint: str, success: bool, elapsed: Optional[float], retry: bool = False):
+        """Record one request attempt."""
+        label = endpoint_label(endpoint)
+        now = datetime.now()
+        with self._lock:
+            self.total_requests += 1
+            if success:
+                self.successful_requests += 1
+                self.last_success = now
+                self.consecutive_failures = 0
+            else:
+                self.failed_requests += 1
+                self.last_failure = now
+                self.consecutive_failures += 1
+            if retry:
+                self.total_retries += 1
+            
+            if label not in self.endpoints and len(self.endpoints) >= MAX_TRACKED_ENDPOINTS:
+                label = "other"
+            endpoint_metrics = self.endpoints.get(label)
+            if endpoint_metrics is None:
+                endpoint_metrics = self.endpoints[label] = EndpointMetrics()
+            endpoint_metrics.requests += 1
+            endpoint_metrics.last_accessed = now
+            if success:
+                endpoint_metrics.successes += 1
+            else:
+                endpoint_metrics.failures += 1
+            
+            if elapsed is not None:
+                self.latency.record(elapsed)
+                self.latency_total.record(elapsed)
+                endpoint_metrics.latency.record(elapsed)
+                endpoint_metrics.total_time += elapsed
+    
+    def latency_snapshot(self) -> LatencyHistogram:
+        with self._lock:
+            return self.latency.snapshot()
+    
+    def snapshot(self) -> Dict:
+        """Counters plus windowed latency percentiles, overall and per endpoint."""
+        with self._lock:
+            success_rate = 0.0
+            if self.total_requests > 0:
+                success_rate = (self.successful_requests / self.total_requests) * 100
+            
+            return {
+                "total_requests": self.total_requests,
+                "successful_requests": self.successful_requests,
+                "failed_requests": self.failed_requests,
+                "success_rate": round(success_rate, 2),
+                "total_retries": self.total_retries,
+                "avg_response_time": round(self.avg_response_time, 3),
+                "latency": self.latency.snapshot().summary(),
+                "latency_total": self.latency_total.summary(),
+                "last_success": self.last_success.isoformat() if self.last_success else None,
+                "last_failure": self.last_failure.isoformat() if self.last_failure else None,
+                "consecutive_failures": self.consecutive_failures,
+                "endpoints": {
+                    label: {
+                        "requests": endpoint.requests,
+                        "successes": endpoint.successes,
+                        "failures": endpoint.failures,
+                        "avg_response_time": round(endpoint.total_time / endpoint.requests, 3) if endpoint.requests else 0.0,
+                        "latency": endpoint.latency.snapshot().summary(),
+                        "last_accessed": endpoint.last_accessed
+                    }
+                    for label, endpoint in self.endpoints.items()
+                }
+            }
+    
+    def reset(self):
+        """Clear counters and histograms in place (clients keep sharing this object)."""
+        with self._lock:
+            self.total_requests = 0
+            self.successful_requests = 0
+            self.failed_requests = 0
+            self.total_retries = 0
+            self.last_success = None
+            self.last_failure = None
+            self.consecutive_failures = 0
+            self.latency.clear()
+            self.latency_total.clear()
+            self.endpoints = {}
+
+_connection_metrics: Dict[str, ConnectionMetrics] = {}
+_connection_metrics_lock = threading.Lock()
+
+def get_connection_metrics(service_name: str, base_url: str = "") -> ConnectionMetrics:
+    """Get the metrics shared by all clients of ``service_name``."""
+    with _connection_metrics_lock:
+        if service_name not in _connection_metrics:
+            _connection_metrics[service_name] = ConnectionMetrics(base_url=base_url)
+        return _connection_metrics[service_name]
+
+# Consecutive failures that open a host's circuit breaker, and for how long
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = timedelta(minutes=5)
+
+def is_host_failure(status_code: int) -> bool:
+    """Whether a response says the host itself is in trouble.
+    
+    Only server errors, rate limiting and failed connections/timeouts
+    (status 0) count. Other 4xx responses are about the request - one user's
+    bad token, say - and must not cut the host off for every other caller.
+    """
+    return status_code == 0 or status_code == 429 or status_code >= 500
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream host.
+    
+    Shared by every client that calls the host (see ``get_circuit_breaker``),
+    so a failing upstream is cut off for all of them at once. Clients may be
+    used from threadpool workers as well as the event loop, hence the lock.
+    """
+    
+    def __init__(self, host: str):
+        self.host = host
+        self.failures = 0
+        self.open_until: Optional[datetime] = None
+        self._lock = threading.Lock()
+    
+    def is_open(self) -> bool:
+        with self._lock:
+            if self.open_until is None:
+                return False
+            
+            if datetime.now() > self.open_until:
+                # Reset circuit breaker
+                self.open_until = None
+                self.failures = 0
+                logger.info(f"Circuit breaker reset for {self.host}")
+                return False
+            
+            return True
+    
+    def record(self, success: bool):
+        with self._lock:
+            if success:
+                self.failures = 0
+                self.open_until = None
+                return
+            
+            self.failures += 1
+            if self.failures >= CIRCUIT_BREAKER_THRESHOLD and self.open_until is None:
+                self.open_until = datetime.now() + CIRCUIT_BREAKER_COOLDOWN
+                logger.warning(f"Circuit breaker opened for {self.host} due to consecutive failures")
+    
+    def reset(self):
+        with self._lock:
+            self.failures = 0
+            self.open_until = None
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Get the circuit breaker for the host of ``url``."""
+    host = urlparse(url).netloc.lower()
+    with _circuit_breakers_lock:
+        if host not in _circuit_breakers:
+            _circuit_breakers[host] = CircuitBreaker(host)
+        return _circuit_breakers[host]
 
 class APIClient:
     """Robust API client with retry logic and monitoring."""
@@ -78,7 +282,8 @@ class APIClient:
                  base_url: str = "",
                  timeout: float = 30.0,
                  retry_config: Optional[RetryConfig] = None,
-                 headers: Optional[Dict[str, str]] = None):
+                 headers: Optional[Dict[str, str]] = None,
+                 service_name: Optional[str] = None):
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.retry_config = retry_config or RetryConfig()
@@ -86,10 +291,11 @@ class APIClient:
         if headers:
             self.default_headers.update(headers)
         
-        self.metrics = ConnectionMetrics()
+        # Named clients share metrics, so short-lived instances (one per
+        # access token, say) still add up in get_all_client_metrics
+        self.service_name = service_name
+        self.metrics = get_connection_metrics(service_name, self.base_url) if service_name else ConnectionMetrics(base_url=self.base_url)
         self.session = None
-        self._circuit_breaker_until: Optional[datetime] = None
-        self._circuit_breaker_failures = 0
         
     def _get_default_headers(self) -> Dict[str, str]:
         """Get default headers for all requests."""
@@ -101,32 +307,13 @@ class APIClient:
             "Content-Type": "application/json"
         }
     
-    def _is_circuit_breaker_open(self) -> bool:
-        """Check if circuit breaker is open."""
-        if self._circuit_breaker_until is None:
-            return False
-        
-        if datetime.now() > self._circuit_breaker_until:
-            # Reset circuit breaker
-            self._circuit_breaker_until = None
-            self._circuit_breaker_failures = 0
-            logger.info("Circuit breaker reset")
-            return False
-        
-        return True
+    def _is_circuit_breaker_open(self, url: Optional[str] = None) -> bool:
+        """Check if the circuit breaker for ``url``'s host (default: base URL) is open."""
+        return get_circuit_breaker(url or self.base_url).is_open()
     
-    def _update_circuit_breaker(self, success: bool):
+    def _update_circuit_breaker(self, success: bool, url: Optional[str] = None):
         """Update circuit breaker state."""
-        if success:
-            self._circuit_breaker_failures = 0
-            self._circuit_breaker_until = None
-        else:
-            self._circuit_breaker_failures += 1
-            
-            # Open circuit breaker after 5 consecutive failures
-            if self._circuit_breaker_failures >= 5:
-                self._circuit_breaker_until = datetime.now() + timedelta(minutes=5)
-                logger.warning("Circuit breaker opened due to consecutive failures")
+        get_circuit_breaker(url or self.base_url).record(success)
     
     def _calculate_delay(self, attempt: int) -> float:
         """Calculate delay for retry with exponential backoff."""
@@ -139,7 +326,7 @@ class APIClient:
         
         return delay
     
-    def _should_retry(self, response: APIResponse, attempt: int) -> bool:
+    def _should_retry(self, response: APIResponse, attempt: int, exception: Optional[BaseException] = None) -> bool:
         """Determine if request should be retried."""
         if attempt >= self.retry_config.max_retries:
             return False
@@ -147,8 +334,8 @@ class APIClient:
         if response.status_code in self.retry_config.retryable_status_codes:
             return True
         
-        if response.error and any(
-            isinstance(response.error, exc) 
+        if exception is not None and any(
+            isinstance(exception, exc) 
             for exc in self.retry_config.retryable_exceptions
         ):
             return True
@@ -157,46 +344,7 @@ class APIClient:
     
     def _update_metrics(self, response: APIResponse, endpoint: str):
         """Update connection metrics."""
-        self.metrics.total_requests += 1
-        
-        if response.success:
-            self.metrics.successful_requests += 1
-            self.metrics.last_success = datetime.now()
-            self.metrics.consecutive_failures = 0
-        else:
-            self.metrics.failed_requests += 1
-            self.metrics.last_failure = datetime.now()
-            self.metrics.consecutive_failures += 1
-        
-        self.metrics.total_retries += (response.attempt - 1)
-        
-        # Update response time average
-        if response.elapsed:
-            total_time = self.metrics.avg_response_time * (self.metrics.total_requests - 1)
-            self.metrics.avg_response_time = (total_time + response.elapsed) / self.metrics.total_requests
-        
-        # Update endpoint-specific metrics
-        if endpoint not in self.metrics.endpoints:
-            self.metrics.endpoints[endpoint] = {
-                "requests": 0,
-                "successes": 0,
-                "failures": 0,
-                "avg_response_time": 0.0,
-                "last_accessed": None
-            }
-        
-        endpoint_metrics = self.metrics.endpoints[endpoint]
-        endpoint_metrics["requests"] += 1
-        endpoint_metrics["last_accessed"] = datetime.now()
-        
-        if response.success:
-            endpoint_metrics["successes"] += 1
-        else:
-            endpoint_metrics["failures"] += 1
-        
-        if response.elapsed:
-            total_endpoint_time = endpoint_metrics["avg_response_time"] * (endpoint_metrics["requests"] - 1)
-            endpoint_metrics["avg_response_time"] = (total_endpoint_time + response.elapsed) / endpoint_metrics["requests"]
+        self.metrics.record(endpoint, response.success, response.elapsed, retry=response.attempt > 1)
     
     def _build_url(self, endpoint: str) -> str:
         """Build full URL from endpoint."""
@@ -208,25 +356,12 @@ class APIClient:
         
         return endpoint
     
-    def request(self, 
-                method: Union[RequestMethod, str],
-                endpoint: str,
-                data: Optional[Dict] = None,
-                params: Optional[Dict] = None,
-                headers: Optional[Dict] = None,
-                timeout: Optional[float] = None,
-                **kwargs) -> APIResponse:
-        """Make a synchronous HTTP request with retry logic."""
-        
-        # Check circuit breaker
-        if self._is_circuit_breaker_open():
-            return APIResponse(
-                status_code=503,
-                error="Circuit breaker is open",
-                url=self._build_url(endpoint),
-                success=False
-            )
-        
+    def _prepare_request(self,
+                         method: Union[RequestMethod, str],
+                         endpoint: str,
+                         headers: Optional[Dict],
+                         timeout: Optional[float]) -> Tuple[Optional[APIResponse], str, str, Dict[str, str], float]:
+        """Resolve method, URL, headers and timeout, or return an early rejection."""
         if isinstance(method, RequestMethod):
             method = method.value
         
@@ -238,6 +373,15 @@ class APIClient:
         if headers:
             request_headers.update(headers)
         
+        # Check circuit breaker
+        if self._is_circuit_breaker_open(url):
+            return APIResponse(
+                status_code=503,
+                error="Circuit breaker is open",
+                url=url,
+                success=False
+            ), method, url, request_headers, request_timeout
+        
         # Validate external URL
         if not self._is_allowed_domain(url):
             return APIResponse(
@@ -245,13 +389,33 @@ class APIClient:
                 error=f"Domain not allowed: {urlparse(url).netloc}",
                 url=url,
                 success=False
-            )
+            ), method, url, request_headers, request_timeout
+        
+        return None, method, url, request_headers, request_timeout
+    
+    def _record_attempt(self, api_response: APIResponse, endpoint: str, url: str):
+        """Update metrics and circuit breaker after one attempt."""
+        self._update_metrics(api_response, endpoint)
+        self._update_circuit_breaker(not is_host_failure(api_response.status_code), url)
+    
+    def request(self, 
+                method: Union[RequestMethod, str],
+                endpoint: str,
+                data: Optional[Dict] = None,
+                params: Optional[Dict] = None,
+                headers: Optional[Dict] = None,
+                timeout: Optional[float] = None,
+                **kwargs) -> APIResponse:
+        """Make a synchronous HTTP request with retry logic."""
+        
+        rejected, method, url, request_headers, request_timeout = self._prepare_request(method, endpoint, headers, timeout)
+        if rejected is not None:
+            return rejected
         
         attempt = 1
         while attempt <= self.retry_config.max_retries:
+            start_time = time.time()
             try:
-                start_time = time.time()
-                
                 # Make request
                 response = requests.request(
                     method=method,
@@ -284,8 +448,7 @@ class APIClient:
                 )
                 
                 # Update metrics and circuit breaker
-                self._update_metrics(api_response, endpoint)
-                self._update_circuit_breaker(api_response.success)
+                self._record_attempt(api_response, endpoint, url)
                 
                 # Return if successful or not retryable
                 if api_response.success or not self._should_retry(api_response, attempt):
@@ -306,12 +469,11 @@ class APIClient:
                 )
                 
                 # Update metrics and circuit breaker
-                self._update_metrics(api_response, endpoint)
-                self._update_circuit_breaker(False)
+                self._record_attempt(api_response, endpoint, url)
                 
                 logger.error(f"Request exception (attempt {attempt}): {str(e)} - {url}")
                 
-                if not self._should_retry(api_response, attempt):
+                if not self._should_retry(api_response, attempt, e):
                     return api_response
             
             # Wait before retry
@@ -336,6 +498,10 @@ class APIClient:
         """Make a PUT request."""
         return self.request(RequestMethod.PUT, endpoint, data=data, **kwargs)
     
+    def patch(self, endpoint: str, data: Optional[Dict] = None, **kwargs) -> APIResponse:
+        """Make a PATCH request."""
+        return self.request(RequestMethod.PATCH, endpoint, data=data, **kwargs)
+    
     def delete(self, endpoint: str, **kwargs) -> APIResponse:
         """Make a DELETE request."""
         return self.request(RequestMethod.DELETE, endpoint, **kwargs)
@@ -370,29 +536,15 @@ class APIClient:
     
     def get_metrics(self) -> Dict:
         """Get connection metrics."""
-        success_rate = 0.0
-        if self.metrics.total_requests > 0:
-            success_rate = (self.metrics.successful_requests / self.metrics.total_requests) * 100
-        
         return {
-            "total_requests": self.metrics.total_requests,
-            "successful_requests": self.metrics.successful_requests,
-            "failed_requests": self.metrics.failed_requests,
-            "success_rate": round(success_rate, 2),
-            "total_retries": self.metrics.total_retries,
-            "avg_response_time": round(self.metrics.avg_response_time, 3),
-            "last_success": self.metrics.last_success.isoformat() if self.metrics.last_success else None,
-            "last_failure": self.metrics.last_failure.isoformat() if self.metrics.last_failure else None,
-            "consecutive_failures": self.metrics.consecutive_failures,
-            "circuit_breaker_open": self._is_circuit_breaker_open(),
-            "endpoints": self.metrics.endpoints
+            **self.metrics.snapshot(),
+            "circuit_breaker_open": self._is_circuit_breaker_open()
         }
     
     def reset_metrics(self):
-        """Reset connection metrics."""
-        self.metrics = ConnectionMetrics()
-        self._circuit_breaker_until = None
-        self._circuit_breaker_failures = 0
+        """Reset connection metrics and the base host's circuit breaker."""
+        self.metrics.reset()
+        get_circuit_breaker(self.base_url).reset()
     
     def health_check(self) -> Dict:
         """Perform a health check."""
@@ -413,15 +565,189 @@ class APIClient:
                 "circuit_breaker_open": self._is_circuit_breaker_open()
             }
 
+# Shared aiohttp session for AsyncAPIClient, one per event loop
+_async_session: Optional[aiohttp.ClientSession] = None
+_async_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def get_async_session() -> aiohttp.ClientSession:
+    """Get the pooled session used by every AsyncAPIClient, creating it on first use."""
+    global _async_session, _async_session_loop
+    
+    loop = asyncio.get_running_loop()
+    
+    # Sessions are bound to the loop they were created on
+    if _async_session is not None and (_async_session.closed or _async_session_loop is not loop):
+        _async_session = None
+    
+    if _async_session is None:
+        connector = aiohttp.TCPConnector(
+            limit=settings.API_CLIENT_POOL_SIZE,
+            limit_per_host=settings.API_CLIENT_POOL_PER_HOST,
+            ttl_dns_cache=300
+        )
+        _async_session = aiohttp.ClientSession(connector=connector)
+        _async_session_loop = loop
+    
+    return _async_session
+
+async def close_async_session():
+    """Close the shared AsyncAPIClient session (application shutdown)."""
+    global _async_session, _async_session_loop
+    if _async_session is not None and not _async_session.closed:
+        await _async_session.close()
+    _async_session = None
+    _async_session_loop = None
+
+class AsyncAPIClient(APIClient):
+    """Async twin of APIClient on the shared pooled aiohttp session.
+    
+    Retry, metrics, domain and circuit-breaker behaviour are the same as
+    APIClient's; the difference is that requests and backoff waits yield to
+    the event loop, so a slow upstream does not stall other requests.
+    """
+    
+    async def request(self, 
+                      method: Union[RequestMethod, str],
+                      endpoint: str,
+                      data: Optional[Dict] = None,
+                      params: Optional[Dict] = None,
+                      headers: Optional[Dict] = None,
+                      timeout: Optional[float] = None,
+                      **kwargs) -> APIResponse:
+        """Make an asynchronous HTTP request with retry logic."""
+        
+        rejected, method, url, request_headers, request_timeout = self._prepare_request(method, endpoint, headers, timeout)
+        if rejected is not None:
+            return rejected
+        
+        attempt = 1
+        while attempt <= self.retry_config.max_retries:
+            start_time = time.monotonic()
+            try:
+                session = await get_async_session()
+                async with session.request(
+                    method,
+                    url,
+                    json=data if data else None,
+                    params=params,
+                    headers=request_headers,
+                    timeout=aiohttp.ClientTimeout(total=request_timeout),
+                    **kwargs
+                ) as response:
+                    text = await response.text()
+                    elapsed = time.monotonic() - start_time
+                    
+                    # Parse response
+                    response_data = None
+                    try:
+                        response_data = json.loads(text) if text else None
+                    except ValueError:
+                        pass
+                    
+                    api_response = APIResponse(
+                        status_code=response.status,
+                        data=response_data,
+                        text=text,
+                        headers=dict(response.headers),
+                        url=url,
+                        elapsed=elapsed,
+                        attempt=attempt,
+                        success=response.status < 400
+                    )
+                
+                # Update metrics and circuit breaker
+                self._record_attempt(api_response, endpoint, url)
+                
+                # Return if successful or not retryable
+                if api_response.success or not self._should_retry(api_response, attempt):
+                    return api_response
+                
+                logger.warning(f"Request failed (attempt {attempt}): {api_response.status_code} - {url}")
+                
+            except Exception as e:
+                elapsed = time.monotonic() - start_time
+                
+                api_response = APIResponse(
+                    status_code=0,
+                    error=str(e),
+                    url=url,
+                    elapsed=elapsed,
+                    attempt=attempt,
+                    success=False
+                )
+                
+                # Update metrics and circuit breaker
+                self._record_attempt(api_response, endpoint, url)
+                
+                logger.error(f"Request exception (attempt {attempt}): {str(e)} - {url}")
+                
+                if not self._should_retry(api_response, attempt, e):
+                    return api_response
+            
+            # Wait before retry
+            if attempt < self.retry_config.max_retries:
+                delay = self._calculate_delay(attempt)
+                logger.info(f"Retrying in {delay:.2f}s... (attempt {attempt + 1})")
+                await asyncio.sleep(delay)
+            
+            attempt += 1
+        
+        return api_response
+    
+    async def get(self, endpoint: str, params: Optional[Dict] = None, **kwargs) -> APIResponse:
+        """Make a GET request."""
+        return await self.request(RequestMethod.GET, endpoint, params=params, **kwargs)
+    
+    async def post(self, endpoint: str, data: Optional[Dict] = None, **kwargs) -> APIResponse:
+        """Make a POST request."""
+        return await self.request(RequestMethod.POST, endpoint, data=data, **kwargs)
+    
+    async def put(self, endpoint: str, data: Optional[Dict] = None, **kwargs) -> APIResponse:
+        """Make a PUT request."""
+        return await self.request(RequestMethod.PUT, endpoint, data=data, **kwargs)
+    
+    async def patch(self, endpoint: str, data: Optional[Dict] = None, **kwargs) -> APIResponse:
+        """Make a PATCH request."""
+        return await self.request(RequestMethod.PATCH, endpoint, data=data, **kwargs)
+    
+    async def delete(self, endpoint: str, **kwargs) -> APIResponse:
+        """Make a DELETE request."""
+        return await self.request(RequestMethod.DELETE, endpoint, **kwargs)
+    
+    async def health_check(self) -> Dict:
+        """Perform a health check."""
+        if self.base_url:
+            response = await self.get("")
+            return {
+                "status": "healthy" if response.success else "unhealthy",
+                "base_url": self.base_url,
+                "response_time": response.elapsed,
+                "status_code": response.status_code,
+                "circuit_breaker_open": self._is_circuit_breaker_open()
+            }
+        else:
+            return {
+                "status": "healthy",
+                "base_url": None,
+                "circuit_breaker_open": self._is_circuit_breaker_open()
+            }
+
 # Global API client instances for different services
 _api_clients: Dict[str, APIClient] = {}
+_async_api_clients: Dict[str, AsyncAPIClient] = {}
 
 def get_api_client(service_name: str, base_url: str = "", **kwargs) -> APIClient:
     """Get or create an API client for a specific service."""
     if service_name not in _api_clients:
-        _api_clients[service_name] = APIClient(base_url=base_url, **kwargs)
+        _api_clients[service_name] = APIClient(base_url=base_url, service_name=service_name, **kwargs)
     return _api_clients[service_name]
 
+def get_async_api_client(service_name: str, base_url: str = "", **kwargs) -> AsyncAPIClient:
+    """Get or create an async API client for a specific service."""
+    if service_name not in _async_api_clients:
+        _async_api_clients[service_name] = AsyncAPIClient(base_url=base_url, service_name=service_name, **kwargs)
+    return _async_api_clients[service_name]
+
 def get_scraper_client(source: str) -> APIClient:
     """Get an API client configured for a specific scraper source."""
     if source not in settings.ALLOWED_SCRAPER_SOURCES:
@@ -447,19 +773,45 @@ def get_scraper_client(source: str) -> APIClient:
     )
 
 def get_all_client_metrics() -> Dict[str, Dict]:
-    """Get metrics for all API clients."""
+    """Get metrics for every named service (sync and async clients, scrapers)."""
+    with _connection_metrics_lock:
+        services = list(_connection_metrics.items())
     return {
-        service_name: client.get_metrics()
-        for service_name, client in _api_clients.items()
+        service_name: {
+            **metrics.snapshot(),
+            "circuit_breaker_open": get_circuit_breaker(metrics.base_url).is_open()
+        }
+        for service_name, metrics in services
+    }
+
+def get_latency_report() -> Dict[str, Any]:
+    """Windowed latency per service, slowest p95 first, plus all services merged."""
+    with _connection_metrics_lock:
+        services = list(_connection_metrics.items())
+    
+    histograms = {service_name: metrics.latency_snapshot() for service_name, metrics in services}
+    ranked = sorted(
+        (name for name, histogram in histograms.items() if histogram.count),
+        key=lambda name: histograms[name].quantile(0.95),
+        reverse=True
+    )
+    return {
+        "window_seconds": settings.API_METRICS_WINDOW_SECONDS,
+        "overall": merge_histograms(histograms.values()).summary(),
+        "services": {name: histograms[name].summary() for name in ranked},
+        "idle_services": sorted(name for name, histogram in histograms.items() if not histogram.count)
     }
 
 def reset_all_client_metrics():
     """Reset metrics for all API clients."""
-    for client in _api_clients.values():
-        client.reset_metrics()
+    with _connection_metrics_lock:
+        services = list(_connection_metrics.values())
+    for metrics in services:
+        metrics.reset()
+        get_circuit_breaker(metrics.base_url).reset()
 
 def health_check_all_clients() -> Dict[str, Dict]:
-    """Perform health checks for all API clients."""
+    """Perform health checks for all synchronous API clients."""
     return {
         service_name: client.health_check()
         for service_name, client in _api_clients.items()
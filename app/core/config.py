@@ -104,6 +104,7 @@ class Settings:
             "base_url": "https://www.screenaustralia.gov.au",
             "enabled": True,
             "rate_limit": 1.0,
+            "peak_months": [2, 3, 8, 9],
             "description": "Screen Australia and Australian government grants"
         },
         "business.gov.au": {
@@ -128,6 +129,7 @@ class Settings:
             "base_url": "https://www.philanthropy.org.au",
             "enabled": True,
             "rate_limit": 0.5,
+            "max_interval_hours": 336,
             "description": "Philanthropic funding sources"
         }
     }
@@ -150,6 +152,7 @@ class Settings:
         "www.abc.net.au",
         "www.sbs.com.au",
         "www.grants.gov.au",
+        "grants.gov.au",
         "www.philanthropy.org.au",
         "www.nineentertainment.com.au",
         "www.sevenwestmedia.com.au",
@@ -158,7 +161,53 @@ class Settings:
         "www.newscorpaustralia.com.au",
         "www.southerncrossaustereo.com.au"
     ]
-    
+
+    # Outbound API clients (AsyncAPIClient connection pool)
+    API_CLIENT_POOL_SIZE: int = int(os.getenv("API_CLIENT_POOL_SIZE", "100"))
+    API_CLIENT_POOL_PER_HOST: int = int(os.getenv("API_CLIENT_POOL_PER_HOST", "20"))
+    API_METRICS_WINDOW_SECONDS: float = float(os.getenv("API_METRICS_WINDOW_SECONDS", "300"))  # latency percentiles cover this much recent time
+    API_METRICS_WINDOW_SLOTS: int = int(os.getenv("API_METRICS_WINDOW_SLOTS", "5"))  # window ages out one slot at a time
+
+    # Scraper runtime
+    SCRAPER_PARSE_WORKERS: int = int(os.getenv("SCRAPER_PARSE_WORKERS", "2"))  # 0 = parse in a thread instead
+    SCRAPER_HTTP_POOL_SIZE: int = int(os.getenv("SCRAPER_HTTP_POOL_SIZE", "20"))
+    SCRAPER_HTTP_PER_HOST: int = int(os.getenv("SCRAPER_HTTP_PER_HOST", "4"))
+    SCRAPER_HTTP_TIMEOUT: int = int(os.getenv("SCRAPER_HTTP_TIMEOUT", "30"))
+    SCRAPER_WORKER_POLL_INTERVAL: float = float(os.getenv("SCRAPER_WORKER_POLL_INTERVAL", "5"))
+    SCRAPER_JOB_MAX_ATTEMPTS: int = int(os.getenv("SCRAPER_JOB_MAX_ATTEMPTS", "3"))
+    SCRAPER_SCHEDULER_ENABLED: bool = os.getenv("SCRAPER_SCHEDULER_ENABLED", "true").lower() == "true"
+    SCRAPER_SCHEDULER_INTERVAL: int = int(os.getenv("SCRAPER_SCHEDULER_INTERVAL", "300"))  # seconds between planning passes
+    SCRAPER_MIN_INTERVAL_HOURS: float = float(os.getenv("SCRAPER_MIN_INTERVAL_HOURS", "6"))
+    SCRAPER_MAX_INTERVAL_HOURS: float = float(os.getenv("SCRAPER_MAX_INTERVAL_HOURS", "168"))
+    SCRAPER_SCHEDULE_JITTER: float = float(os.getenv("SCRAPER_SCHEDULE_JITTER", "0.1"))  # +/- fraction of the interval
+    SCRAPER_FIXTURE_DIR: str = os.getenv("SCRAPER_FIXTURE_DIR", "tests/fixtures/scrapers")  # recorded responses for replay
+    SCRAPER_INGEST_BATCH_SIZE: int = int(os.getenv("SCRAPER_INGEST_BATCH_SIZE", "100"))  # grants per upsert/commit while streaming
+    SCRAPER_PIPELINE_BUFFER: int = int(os.getenv("SCRAPER_PIPELINE_BUFFER", "200"))  # parsed grants allowed to wait for the writer
+    SCRAPER_FRONTIER_FAILURE_THRESHOLD: int = int(os.getenv("SCRAPER_FRONTIER_FAILURE_THRESHOLD", "2"))  # consecutive failures before quarantine
+    SCRAPER_FRONTIER_BACKOFF_HOURS: float = float(os.getenv("SCRAPER_FRONTIER_BACKOFF_HOURS", "12"))  # first quarantine, doubled per failure
+    SCRAPER_FRONTIER_MAX_BACKOFF_HOURS: float = float(os.getenv("SCRAPER_FRONTIER_MAX_BACKOFF_HOURS", "720"))
+    SCRAPER_DISCOVERY_ENABLED: bool = os.getenv("SCRAPER_DISCOVERY_ENABLED", "true").lower() == "true"
+    SCRAPER_DISCOVERY_MAX_PAGES: int = int(os.getenv("SCRAPER_DISCOVERY_MAX_PAGES", "25"))  # new pages added per site per run
+    SCRAPER_DISCOVERY_MAX_SITEMAPS: int = int(os.getenv("SCRAPER_DISCOVERY_MAX_SITEMAPS", "5"))  # sitemap files read per site per run
+    SCRAPER_GRANTCONNECT_PAGE_SIZE: int = int(os.getenv("SCRAPER_GRANTCONNECT_PAGE_SIZE", "100"))
+    SCRAPER_GRANTCONNECT_MAX_PAGES: int = int(os.getenv("SCRAPER_GRANTCONNECT_MAX_PAGES", "50"))
+    SCRAPER_GRANTCONNECT_CONCURRENCY: int = int(os.getenv("SCRAPER_GRANTCONNECT_CONCURRENCY", "4"))  # detail requests in flight; the pool allows SCRAPER_HTTP_PER_HOST per host
+    SCRAPER_GRANTCONNECT_RETRIES: int = int(os.getenv("SCRAPER_GRANTCONNECT_RETRIES", "3"))  # attempts per request
+    SCRAPER_ARCHIVE_ENABLED: bool = os.getenv("SCRAPER_ARCHIVE_ENABLED", "true").lower() == "true"
+    SCRAPER_ARCHIVE_DIR: str = os.getenv("SCRAPER_ARCHIVE_DIR", "data/page_archive")  # raw fetched pages, for reparse
+    SCRAPER_TELEMETRY_RUNS: int = int(os.getenv("SCRAPER_TELEMETRY_RUNS", "30"))  # runs of per-URL timings kept per source
+    SCRAPER_DUPLICATE_THRESHOLD: float = float(os.getenv("SCRAPER_DUPLICATE_THRESHOLD", "0.5"))  # estimated Jaccard similarity for cross-source near-duplicates
+    SCRAPER_CLOSING_SOON_DAYS: int = int(os.getenv("SCRAPER_CLOSING_SOON_DAYS", "30"))  # deadline window for the closing_soon status
+    SCRAPER_LIFECYCLE_INTERVAL: int = int(os.getenv("SCRAPER_LIFECYCLE_INTERVAL", "3600"))  # seconds between grant status passes
+    SCRAPER_GRANT_ARCHIVE_DAYS: int = int(os.getenv("SCRAPER_GRANT_ARCHIVE_DAYS", "90"))  # days closed before a grant moves to grants_archive
+    SCRAPER_GRANT_ARCHIVE_BATCH: int = int(os.getenv("SCRAPER_GRANT_ARCHIVE_BATCH", "500"))  # grants moved per archive transaction
+    SCRAPER_LINK_CHECK_INTERVAL: int = int(os.getenv("SCRAPER_LINK_CHECK_INTERVAL", "900"))  # seconds between link-check passes
+    SCRAPER_LINK_CHECK_BATCH: int = int(os.getenv("SCRAPER_LINK_CHECK_BATCH", "2000"))  # links checked per worker pass
+    SCRAPER_LINK_RECHECK_HOURS: float = float(os.getenv("SCRAPER_LINK_RECHECK_HOURS", "24"))
+    SCRAPER_LINK_CHECK_CONCURRENCY: int = int(os.getenv("SCRAPER_LINK_CHECK_CONCURRENCY", "20"))  # checks in flight; per host it is SCRAPER_HTTP_PER_HOST
+    SCRAPER_LINK_CHECK_TIMEOUT: float = float(os.getenv("SCRAPER_LINK_CHECK_TIMEOUT", "15"))  # seconds per check
+    SCRAPER_LINK_DEAD_AFTER: int = int(os.getenv("SCRAPER_LINK_DEAD_AFTER", "3"))  # consecutive failed checks before a link counts as dead
+
     # Frontend URL
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
     
@@ -0,0 +1,153 @@
+"""
+Fixed-memory latency histograms.
+
+``LatencyHistogram`` counts samples in log-spaced buckets (each ~10% wider
+than the last, from 0.5ms to 5 minutes), so memory is a fixed ~150 counters
+however many requests are recorded, and two histograms merge by adding
+their counts - per-endpoint histograms roll up into per-client ones, and
+per-client ones into a total. Quantiles are accurate to one bucket (~5%);
+the maximum is exact.
+
+``WindowedHistogram`` keeps the last ``window`` seconds as a ring of
+sub-histograms that are recycled as time moves on, so percentiles reflect
+current behaviour rather than the whole process lifetime.
+"""
+
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+MIN_SECONDS = 0.0005
+MAX_SECONDS = 300.0
+GROWTH = 1.1
+
+_LOG_GROWTH = math.log(GROWTH)
+# Bucket 0 holds everything under MIN_SECONDS; the last bucket everything over MAX_SECONDS
+BUCKETS = int(math.ceil(math.log(MAX_SECONDS / MIN_SECONDS) / _LOG_GROWTH)) + 2
+
+
+def _bucket(seconds: float) -> int:
+    if seconds < MIN_SECONDS:
+        return 0
+    return min(int(math.log(seconds / MIN_SECONDS) / _LOG_GROWTH) + 1, BUCKETS - 1)
+
+
+def _bucket_midpoint(index: int) -> float:
+    if index == 0:
+        return MIN_SECONDS / 2
+    low = MIN_SECONDS * GROWTH ** (index - 1)
+    return low * math.sqrt(GROWTH)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (seconds)."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        seconds = max(seconds, 0.0)
+        self.counts[_bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add ``other``'s samples into this histogram and return it."""
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def clear(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate ``q`` quantile (0..1), or None if empty."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_midpoint(i), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Count plus avg/p50/p95/p99/max in seconds."""
+        def rounded(value):
+            return round(value, 4) if value is not None else None
+
+        return {
+            "count": self.count,
+            "avg": rounded(self.mean),
+            "p50": rounded(self.quantile(0.50)),
+            "p95": rounded(self.quantile(0.95)),
+            "p99": rounded(self.quantile(0.99)),
+            "max": rounded(self.max) if self.count else None
+        }
+
+
+def merge_histograms(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    merged = LatencyHistogram()
+    for histogram in histograms:
+        merged.merge(histogram)
+    return merged
+
+
+class WindowedHistogram:
+    """Latency over roughly the last ``window`` seconds.
+
+    The window is split into ``slots`` sub-histograms; a slot is cleared and
+    reused when the clock moves into it again, so old samples age out one
+    slot at a time.
+    """
+
+    def __init__(self, window: float = 300.0, slots: int = 5, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.slots = slots
+        self.slot_seconds = window / slots
+        self.clock = clock
+        self.ring = [LatencyHistogram() for _ in range(slots)]
+        self.epochs: List[Optional[int]] = [None] * slots
+
+    def _epoch(self, now: Optional[float]) -> int:
+        return int((self.clock() if now is None else now) // self.slot_seconds)
+
+    def record(self, seconds: float, now: Optional[float] = None):
+        epoch = self._epoch(now)
+        i = epoch % self.slots
+        if self.epochs[i] != epoch:
+            self.ring[i].clear()
+            self.epochs[i] = epoch
+        self.ring[i].record(seconds)
+
+    def snapshot(self, now: Optional[float] = None) -> LatencyHistogram:
+        """Merged histogram of the slots still inside the window."""
+        epoch = self._epoch(now)
+        return merge_histograms(
+            histogram for histogram, slot_epoch in zip(self.ring, self.epochs)
+            if slot_epoch is not None and epoch - slot_epoch < self.slots
+        )
+
+    def clear(self):
+        for histogram in self.ring:
+            histogram.clear()
+        self.epochs = [None] * self.slots
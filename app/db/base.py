@@ -11,7 +11,16 @@ from app.models.tag import Tag
 from app.models.task_tags import task_tags
 from app.models.project_tags import project_tags
 from app.models.grant import Grant
+from app.models.grant_change import GrantChange
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_link import GrantLink
+from app.models.grant_signature import GrantSignature, GrantLshBucket
 from app.models.scraper_log import ScraperLog
+from app.models.scrape_job import ScrapeJob
+from app.models.crawl_url import CrawlUrl
+from app.models.grant_seed import GrantSeed
+from app.models.scrape_url_stat import ScrapeUrlStat
+from app.models.saved_search import SavedSearch, GrantAlert, GrantAlertMatch
 from app.models.time_entry import TimeEntry
 from app.models.metric import Metric
 from app.models.program_logic import ProgramLogic
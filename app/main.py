@@ -34,6 +34,8 @@ from app.models.sge_media import SgeMediaProject, SgeDistributionLog, SgePerform
 
 from app.api.v1.api import api_router
 from app.db.session import get_engine, close_database
+from app.services.scrapers.parse_pool import shutdown_parse_executor
+from app.core.api_client import close_async_session
 from app.core.config import settings
 from app.core.error_handlers import setup_error_handlers
 from app.db.init_db import init_db, get_db_info, validate_database_config
@@ -147,6 +149,8 @@ async def lifespan(app: FastAPI):
     # Shutdown: Clean up resources
     logger.info("Shutting down NavImpact API...")
     try:
+        shutdown_parse_executor()
+        await close_async_session()
         close_database()
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
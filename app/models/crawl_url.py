@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, UniqueConstraint
+from app.db.base_class import Base
+
+class CrawlUrl(Base):
+    """Fetch history of one scraper endpoint (the URL frontier)."""
+
+    __tablename__ = "crawl_urls"
+    # Sources can share an endpoint; each keeps its own history for it
+    __table_args__ = (UniqueConstraint("source_name", "url", name="uq_crawl_urls_source_url"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_name = Column(String(100), nullable=False, index=True)
+    url = Column(String(1000), nullable=False)
+    canonical_url = Column(String(1000))  # where the URL last redirected to successfully
+    last_status = Column(Integer)  # HTTP status; null for network errors
+    last_error = Column(Text)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    total_requests = Column(Integer, nullable=False, default=0)
+    total_failures = Column(Integer, nullable=False, default=0)
+    quarantined_until = Column(DateTime, index=True)
+    first_seen_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_checked_at = Column(DateTime)
+    last_success_at = Column(DateTime)
+    history = Column(JSON)  # most recent checks, newest last: [{"at", "status", "error"}]
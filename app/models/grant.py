@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, Numeric, JSON, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, Text, Numeric, JSON, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -33,6 +33,14 @@ class Grant(Base):
     funding_purpose = Column(JSON, nullable=True, default=list)
     audience_tags = Column(JSON, nullable=True, default=list)
     
+    # Ingestion identity (see app/services/scrapers/ingest.py)
+    dedupe_key = Column(String(32), nullable=True, unique=True)
+    content_hash = Column(String(40), nullable=True)
+    
+    # Near-duplicate of another source's listing (see app/services/scrapers/near_duplicates.py);
+    # null for canonical grants
+    canonical_id = Column(Integer, ForeignKey("grants.id", ondelete="SET NULL"), nullable=True, index=True)
+    
     # Status and notes
     status = Column(String(50), nullable=False, default="draft", index=True)
     notes = Column(Text, nullable=True)
@@ -44,6 +52,9 @@ class Grant(Base):
     # Many-to-many relationship with tags
     # tags = relationship("Tag", secondary="grant_tags", back_populates="grants")  # Temporarily disabled
     
+    # Lifecycle and archive scans: grants of a status by deadline
+    __table_args__ = (Index("ix_grants_status_deadline", "status", "deadline"),)
+    
     def __repr__(self):
         return f"<Grant {self.title}>"
     
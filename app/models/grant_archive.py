@@ -0,0 +1,46 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, Numeric, JSON
+from app.db.base_class import Base
+
+class ArchivedGrant(Base):
+    """A grant moved out of ``grants`` after being closed for a while (see app/services/grant_archive.py)."""
+
+    __tablename__ = "grants_archive"
+
+    # Same columns as Grant, keeping its id; only what archived reads filter on is indexed
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(500), nullable=False)
+    description = Column(Text, nullable=True)
+    source = Column(String(100), index=True, nullable=False)
+    source_url = Column(String(1000), nullable=True)
+    application_url = Column(String(1000), nullable=True)
+    contact_email = Column(String(255), nullable=True)
+
+    min_amount = Column(Numeric(10, 2), nullable=True)
+    max_amount = Column(Numeric(10, 2), nullable=True)
+
+    open_date = Column(DateTime, nullable=True)
+    deadline = Column(DateTime, nullable=True, index=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    industry_focus = Column(String(100), nullable=True)
+    location_eligibility = Column(String(100), nullable=True)
+    org_type_eligible = Column(JSON, nullable=True)
+    funding_purpose = Column(JSON, nullable=True)
+    audience_tags = Column(JSON, nullable=True)
+
+    # Not unique: a program relisted each round archives once per round.
+    # Ingest looks scraped grants up here before inserting them.
+    dedupe_key = Column(String(32), nullable=True, index=True)
+    content_hash = Column(String(40), nullable=True)
+    canonical_id = Column(Integer, nullable=True)  # as it was when archived; no FK
+
+    status = Column(String(50), nullable=False)
+    notes = Column(Text, nullable=True)
+    created_by_id = Column(Integer, nullable=True)
+
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ArchivedGrant {self.title}>"
@@ -0,0 +1,42 @@
+from typing import Iterable, Tuple
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, event, func, insert, select
+from sqlalchemy.orm import Session
+from app.db.base_class import Base
+from app.models.grant import Grant
+
+# Transaction-level advisory lock taken before writing changes (Postgres).
+# Writers then allocate cursor ids in commit order, so a reader that has
+# seen cursor N can never later find an uncommitted change below N.
+CHANGE_LOG_LOCK = 0x6C4A0001
+
+class GrantChange(Base):
+    """One insert, update or delete of a grant; ``id`` is the change-feed cursor."""
+
+    __tablename__ = "grant_changes"
+
+    # BIGINT in Postgres; SQLite only autoincrements INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    grant_id = Column(Integer, nullable=False, index=True)  # no FK: deletions outlive the row
+    op = Column(String(10), nullable=False)  # insert, update, delete
+    changed_at = Column(DateTime, nullable=False, server_default=func.now())
+
+def record_grant_changes(connection, changes: Iterable[Tuple[str, int]]):
+    """Append ``(op, grant_id)`` pairs to the change log on ``connection``'s transaction."""
+    rows = [{"op": op, "grant_id": grant_id} for op, grant_id in changes if grant_id is not None]
+    if not rows:
+        return
+    if connection.dialect.name == "postgresql":
+        connection.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK)))
+    connection.execute(insert(GrantChange.__table__), rows)
+
+@event.listens_for(Session, "after_flush")
+def _log_orm_grant_changes(session, flush_context):
+    """Grants written through the ORM are logged in the same flush."""
+    changes = [("insert", obj.id) for obj in session.new if isinstance(obj, Grant)]
+    changes += [
+        ("update", obj.id) for obj in session.dirty
+        if isinstance(obj, Grant) and session.is_modified(obj, include_collections=False)
+    ]
+    changes += [("delete", obj.id) for obj in session.deleted if isinstance(obj, Grant)]
+    if changes:
+        record_grant_changes(session.connection(), changes)
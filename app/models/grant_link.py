@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from app.db.base_class import Base
+
+class GrantLink(Base):
+    """Last check of one grant source or application URL (see app/services/link_checker.py)."""
+
+    __tablename__ = "grant_links"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(1000), nullable=False, unique=True)  # shared by every grant linking to it
+    state = Column(String(20), nullable=False, index=True)  # ok, redirected, blocked, error, dead
+    last_status = Column(Integer)  # HTTP status; null for network errors
+    final_url = Column(String(1000))  # where it redirects to, when it does
+    last_error = Column(Text)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    last_checked_at = Column(DateTime, nullable=False, index=True)
+    last_ok_at = Column(DateTime)
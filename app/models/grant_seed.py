@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.base_class import Base
+
+class GrantSeed(Base):
+    """Which version of the known-grants dataset has been ingested for a source."""
+
+    __tablename__ = "grant_seeds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_name = Column(String(100), nullable=False, unique=True)
+    version = Column(Integer, nullable=False)
+    checksum = Column(String(64), nullable=False)  # sha256 of the source's entries
+    grant_count = Column(Integer, nullable=False, default=0)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, LargeBinary, ForeignKey, Index
+from app.db.base_class import Base
+
+class GrantSignature(Base):
+    """MinHash signature of a grant's normalised title and description."""
+
+    __tablename__ = "grant_signatures"
+
+    grant_id = Column(Integer, ForeignKey("grants.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # packed uint32 per permutation
+
+class GrantLshBucket(Base):
+    """One LSH band of a grant's signature; grants sharing a bucket are duplicate candidates."""
+
+    __tablename__ = "grant_lsh_buckets"
+
+    grant_id = Column(Integer, ForeignKey("grants.id", ondelete="CASCADE"), primary_key=True)
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, nullable=False)
+
+    __table_args__ = (Index("ix_grant_lsh_buckets_band_bucket", "band", "bucket"),)
@@ -0,0 +1,47 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, JSON, ForeignKey, UniqueConstraint
+from app.db.base_class import Base
+
+class SavedSearch(Base):
+    """A user's saved grant filters; alerts on it are evaluated from the change feed."""
+
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(200), nullable=False)
+    filters = Column(JSON, nullable=False, default=dict)
+    is_alert_enabled = Column(Boolean, nullable=False, default=False)
+    # Change-feed cursor this search's alerts have been evaluated up to
+    watermark = Column(BigInteger, nullable=False, default=0)
+    result_count = Column(Integer, nullable=False, default=0)  # grants matched by its alerts so far
+    last_used = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class GrantAlert(Base):
+    """Notify on new or changed grants matching a saved search plus extra conditions."""
+
+    __tablename__ = "grant_alerts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    search_id = Column(Integer, ForeignKey("saved_searches.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(200), nullable=False)
+    conditions = Column(JSON, nullable=False, default=dict)
+    is_active = Column(Boolean, nullable=False, default=True)
+    last_triggered = Column(DateTime)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class GrantAlertMatch(Base):
+    """A grant an alert fired for."""
+
+    __tablename__ = "grant_alert_matches"
+    __table_args__ = (UniqueConstraint("alert_id", "grant_id", name="uq_grant_alert_matches_alert_grant"),)
+
+    id = Column(Integer, primary_key=True)
+    alert_id = Column(Integer, ForeignKey("grant_alerts.id", ondelete="CASCADE"), nullable=False, index=True)
+    # No FK: matches outlive archiving, and a restored grant keeps its id and its history
+    grant_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)  # insert or update, from the change feed
+    matched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    seen_at = Column(DateTime)
@@ -0,0 +1,27 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Index
+from app.db.base_class import Base
+
+class ScrapeJob(Base):
+    """Queued scraper run, claimed by a scraper worker."""
+
+    __tablename__ = "scrape_jobs"
+    __table_args__ = (
+        # Covers the worker's claim query
+        Index("ix_scrape_jobs_claim", "status", "run_after", "priority"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_name = Column(String(100), nullable=False, index=True)
+    status = Column(String(50), nullable=False, default="queued")  # queued, running, succeeded, failed
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    requested_by = Column(String(100))  # api, scheduler, cli
+    worker_id = Column(String(100))
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    error_message = Column(Text)
+    result = Column(JSON)
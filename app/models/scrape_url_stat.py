@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from app.db.base_class import Base
+
+class ScrapeUrlStat(Base):
+    """Fetch and parse telemetry for one URL in one scraper run."""
+
+    __tablename__ = "scrape_url_stats"
+
+    id = Column(Integer, primary_key=True)
+    scraper_log_id = Column(Integer, ForeignKey("scraper_logs.id", ondelete="CASCADE"), nullable=False, index=True)
+    source_name = Column(String(100), nullable=False, index=True)
+    url = Column(String(1000), nullable=False)
+    status = Column(Integer)  # last HTTP status; null for network errors
+    requests = Column(Integer, nullable=False, default=1)  # includes retries
+    fetch_ms = Column(Integer, nullable=False, default=0)  # summed over requests
+    bytes = Column(Integer, nullable=False, default=0)
+    parse_ms = Column(Integer)
+    grants = Column(Integer, nullable=False, default=0)
+    error = Column(String(255))
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
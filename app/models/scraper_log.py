@@ -16,6 +16,7 @@ class ScraperLog(Base):
     grants_found = Column(Integer, default=0)
     grants_added = Column(Integer, default=0)
     grants_updated = Column(Integer, default=0)
+    grants_unchanged = Column(Integer, default=0)
     error_message = Column(Text)
     scraper_metadata = Column("metadata", JSON)  # Store additional info like URLs scraped, rate limits, etc.
     
@@ -24,7 +25,8 @@ class ScraperLog(Base):
         self.start_time = datetime.utcnow()
         
     def complete(self, status: str, grants_found: int = 0, grants_added: int = 0, 
-                grants_updated: int = 0, error_message: str = None, metadata: dict = None):
+                grants_updated: int = 0, grants_unchanged: int = 0, error_message: str = None,
+                metadata: dict = None):
         """Mark the scraping job as complete and calculate duration."""
         self.end_time = datetime.utcnow()
         self.duration_seconds = int((self.end_time - self.start_time).total_seconds())
@@ -32,5 +34,6 @@ class ScraperLog(Base):
         self.grants_found = grants_found
         self.grants_added = grants_added
         self.grants_updated = grants_updated
+        self.grants_unchanged = grants_unchanged
         self.error_message = error_message
         self.scraper_metadata = metadata or {} 
\ No newline at end of file
@@ -1,10 +1,11 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from datetime import datetime, timedelta
 from app.core.deps import get_db, get_current_user
 from app.models.grant import Grant
+from app.models.saved_search import GrantAlertMatch
 from app.models.user import User
 from app.schemas.grant import (
     GrantCreate, GrantUpdate, GrantResponse, GrantList, GrantFilters,
@@ -12,8 +13,7 @@ from app.schemas.grant import (
     GrantsByCategory, GrantTimeline, DeadlineGroup, MatchingInsights,
     ScraperRunRequest, ScraperRunResponse
 )
-from app.services.scrapers.business_gov import BusinessGovScraper
-from app.services.scrapers.grantconnect import GrantConnectScraper
+from app.services.scrapers.job_queue import enqueue_scrape_job, get_recent_jobs
 import logging
 
 logger = logging.getLogger(__name__)
@@ -140,6 +140,7 @@ async def delete_grant(
         if not grant:
             raise HTTPException(status_code=404, detail="Grant not found")
         
+        db.query(GrantAlertMatch).filter(GrantAlertMatch.grant_id == grant_id).delete(synchronize_session=False)
         db.delete(grant)
         db.commit()
         logger.info(f"Deleted grant: {grant.title}")
@@ -279,34 +280,17 @@ async def get_grant_dashboard(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Error generating dashboard")
 
 # Scraper Integration
-async def run_scrapers_background(sources: List[str], db: Session):
-    """Background task to run scrapers."""
-    scrapers = {
-        "business.gov.au": BusinessGovScraper(db),
-        "grantconnect.gov.au": GrantConnectScraper(db)
-    }
-    
-    for source in sources:
-        if source in scrapers:
-            try:
-                logger.info(f"Running scraper for {source}")
-                scraper = scrapers[source]
-                grants = await scraper.scrape()
-                scraper.save_grants(grants)
-                logger.info(f"Successfully scraped {len(grants)} grants from {source}")
-            except Exception as e:
-                logger.error(f"Error running scraper for {source}: {str(e)}")
+SCRAPER_SOURCES = ["business.gov.au", "grantconnect"]
 
 @router.post("/scrape", response_model=ScraperRunResponse)
 async def run_scrapers(
     request: ScraperRunRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Run grant scrapers to fetch new grant data."""
+    """Queue grant scrapers; the scraper worker runs them."""
     try:
-        available_sources = ["business.gov.au", "grantconnect.gov.au"]
+        available_sources = SCRAPER_SOURCES
         sources_to_run = request.sources or available_sources
         
         # Validate sources
@@ -317,26 +301,31 @@ async def run_scrapers(
                 detail=f"Invalid sources: {invalid_sources}. Available: {available_sources}"
             )
         
-        # Add background task
-        background_tasks.add_task(run_scrapers_background, sources_to_run, db)
+        for source in sources_to_run:
+            enqueue_scrape_job(db, source, requested_by=f"user:{current_user.id}")
         
         return ScraperRunResponse(
             started_at=datetime.utcnow(),
             sources=sources_to_run,
-            status="started",
-            message=f"Scraper job started for {len(sources_to_run)} sources"
+            status="queued",
+            message=f"Scraper jobs queued for {len(sources_to_run)} sources"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error starting scrapers: {str(e)}")
         raise HTTPException(status_code=500, detail="Error starting scrapers")
 
 @router.get("/scrape/status")
-async def get_scraper_status():
-    """Get current scraper status."""
-    # This would typically check a job queue or database
+async def get_scraper_status(db: Session = Depends(get_db)):
+    """Get current scraper queue status."""
+    jobs = get_recent_jobs(db, limit=20)
+    running = [job for job in jobs if job.status == "running"]
+    queued = [job for job in jobs if job.status == "queued"]
+    finished = [job for job in jobs if job.finished_at]
     return {
-        "status": "idle",
-        "last_run": None,
-        "next_scheduled": None,
-        "available_sources": ["business.gov.au", "grantconnect.gov.au"]
-    } 
\ No newline at end of file
+        "status": "running" if running else "idle",
+        "last_run": max((job.finished_at for job in finished), default=None),
+        "next_scheduled": min((job.run_after for job in queued), default=None),
+        "available_sources": SCRAPER_SOURCES
+    }
@@ -56,6 +56,8 @@ class GrantResponse(GrantBase):
     created_at: datetime
     updated_at: datetime
     created_by_id: Optional[int] = None
+    canonical_id: Optional[int] = None  # set on other sources' copies of a program
+    archived_at: Optional[datetime] = None  # set on grants moved to grants_archive
     
     class Config:
         from_attributes = True
@@ -68,6 +70,7 @@ class GrantList(BaseModel):
     size: int
     has_next: bool
     has_prev: bool
+    facets: Optional[Dict[str, Dict[str, int]]] = None  # facet -> value -> grants matching the other filters
 
 class GrantFilters(BaseModel):
     """Schema for grant filtering parameters."""
@@ -205,6 +208,9 @@ class SavedSearch(BaseModel):
     last_used: datetime
     result_count: int
     is_alert_enabled: bool = False
+    
+    class Config:
+        from_attributes = True
 
 class SavedSearchCreate(BaseModel):
     name: str
@@ -310,6 +316,9 @@ class GrantAlert(BaseModel):
     is_active: bool
     last_triggered: Optional[datetime] = None
     created_at: datetime
+    
+    class Config:
+        from_attributes = True
 
 class GrantAlertCreate(BaseModel):
     search_id: int
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Optional, Dict
+from pydantic import BaseModel
+
+class ScrapeJobBase(BaseModel):
+    source_name: str
+    status: str
+    priority: int = 0
+    requested_by: Optional[str] = None
+
+class ScrapeJob(ScrapeJobBase):
+    id: int
+    attempts: int = 0
+    max_attempts: int = 3
+    run_after: datetime
+    worker_id: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+    result: Optional[Dict] = None
+
+    class Config:
+        from_attributes = True
@@ -8,6 +8,7 @@ class ScraperLogBase(BaseModel):
     grants_found: int = 0
     grants_added: int = 0
     grants_updated: int = 0
+    grants_unchanged: Optional[int] = 0
     error_message: Optional[str] = None
     scraper_metadata: Optional[Dict] = None
 
@@ -0,0 +1,141 @@
+"""
+Hot/cold split for grants.
+
+Grants closed for more than ``SCRAPER_GRANT_ARCHIVE_DAYS`` (by deadline,
+or by last update for grants closed without one) are moved from ``grants``
+to ``grants_archive`` in batches, so the table every list, search and
+analytics query reads only grows with the grants that are still current.
+
+Each batch is one transaction:
+
+1. copies of the batch's grants from other sources are unlinked
+   (``canonical_id`` cleared) and become canonical themselves;
+2. ``INSERT INTO grants_archive ... SELECT ... FROM grants`` copies the rows,
+   ids included;
+3. their near-duplicate signatures and the grants themselves are deleted.
+   Alert matches stay (``grant_alert_matches.grant_id`` has no foreign
+   key), so a restored grant keeps its alert history and is not alerted
+   on as new;
+4. the deletes and unlinks are logged to the change feed, so in-memory
+   indexes drop the archived grants like any other delete.
+
+Archived grants stay reachable by id (``load_grants(...,
+include_archived=True)``, ``GET /grants/{id}``) and in lists with
+``include_archived``. Their ids are never reused: Postgres sequences only
+move forward.
+
+Ingest checks the archive before inserting: a program a source still lists
+is not re-added while its archived round is over, and is moved back
+(``restore_archived``, same id) when it reopens with a later deadline.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import DateTime, and_, bindparam, delete, insert, literal, null, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import record_grant_changes
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+
+logger = logging.getLogger(__name__)
+
+# Columns copied from grants; archived_at is set on the way in
+COPIED_COLUMNS = [column.name for column in ArchivedGrant.__table__.columns if column.name != "archived_at"]
+
+
+def _archivable(cutoff: datetime):
+    # Written as an OR rather than coalesce() so the deadline index can be used
+    return and_(
+        Grant.status == "closed",
+        or_(Grant.deadline < cutoff, and_(Grant.deadline.is_(None), Grant.updated_at < cutoff)),
+    )
+
+
+def _archive_batch(db: Session, ids: List[int], now: datetime) -> int:
+    unlinked = db.execute(
+        update(Grant)
+        .where(Grant.canonical_id.in_(ids), Grant.id.notin_(ids))
+        .values(canonical_id=None)
+        .returning(Grant.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    source = Grant.__table__
+    db.execute(
+        insert(ArchivedGrant.__table__).from_select(
+            COPIED_COLUMNS + ["archived_at"],
+            select(*[source.c[name] for name in COPIED_COLUMNS], literal(now, DateTime)).where(source.c.id.in_(ids))
+        )
+    )
+    db.execute(delete(GrantLshBucket).where(GrantLshBucket.grant_id.in_(ids)))
+    db.execute(delete(GrantSignature).where(GrantSignature.grant_id.in_(ids)))
+    db.execute(delete(Grant).where(Grant.id.in_(ids)).execution_options(synchronize_session=False))
+
+    record_grant_changes(db.connection(), [("update", grant_id) for grant_id in unlinked] +
+                         [("delete", grant_id) for grant_id in ids])
+    return len(unlinked)
+
+
+def archive_closed_grants(db: Session, now: Optional[datetime] = None, days: Optional[int] = None,
+                          batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Move long-closed grants to ``grants_archive``, committing after each batch."""
+    now = now or datetime.utcnow()
+    days = days if days is not None else settings.SCRAPER_GRANT_ARCHIVE_DAYS
+    batch_size = batch_size or settings.SCRAPER_GRANT_ARCHIVE_BATCH
+    cutoff = now - timedelta(days=days)
+
+    stats = {"archived": 0, "batches": 0, "unlinked": 0}
+    while True:
+        ids = db.execute(
+            select(Grant.id).where(_archivable(cutoff)).order_by(Grant.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        try:
+            stats["unlinked"] += _archive_batch(db, ids, now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        stats["archived"] += len(ids)
+        stats["batches"] += 1
+
+    if stats["archived"]:
+        # Loaded grants may have been archived or unlinked underneath the session
+        db.expire_all()
+        logger.info(f"Grants archived: {stats}")
+    return stats
+
+
+def restore_archived(db: Session, statuses: Dict[int, str]) -> List[int]:
+    """Move archived grants back into ``grants`` with the given statuses (no commit).
+
+    ``statuses`` maps archived grant id -> status. The grant it was a copy
+    of may be gone, so ``canonical_id`` starts empty; re-indexing sets it again.
+    """
+    ids = list(statuses)
+    if not ids:
+        return []
+    archive = ArchivedGrant.__table__
+    columns = [archive.c[name] if name != "canonical_id" else null() for name in COPIED_COLUMNS]
+    db.execute(insert(Grant.__table__).from_select(COPIED_COLUMNS, select(*columns).where(archive.c.id.in_(ids))))
+    db.execute(
+        update(Grant.__table__).where(Grant.__table__.c.id == bindparam("_id")),
+        [{"_id": grant_id, "status": status} for grant_id, status in statuses.items()]
+    )
+    db.execute(delete(ArchivedGrant).where(ArchivedGrant.id.in_(ids)))
+    record_grant_changes(db.connection(), [("insert", grant_id) for grant_id in ids])
+    logger.info(f"Restored {len(ids)} reopened grants from the archive")
+    return ids
+
+
+def load_archived(db: Session, ids: List[int]) -> Dict[int, ArchivedGrant]:
+    """Archived grants by id, one query."""
+    if not ids:
+        return {}
+    return {grant.id: grant for grant in db.query(ArchivedGrant).filter(ArchivedGrant.id.in_(ids))}
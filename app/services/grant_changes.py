@@ -0,0 +1,131 @@
+"""
+Incremental grant change feed.
+
+Every insert, update and delete of a grant appends a row to
+``grant_changes`` in the same transaction as the write (ORM flushes via a
+session listener, bulk ingestion and bulk deletes explicitly). The row id is
+a monotonic cursor, so a client keeps the last cursor it has seen and asks
+for what happened after it:
+
+    GET /grants/changes?since=0          full sync (existing grants are
+                                         backfilled as inserts)
+    GET /grants/changes?since=<cursor>   only what changed since
+
+A page collapses repeated changes to the same grant to the latest one and
+returns the grant as it is now, so a client applies each entry as an upsert
+or delete and stores ``next_cursor``.
+
+In-process views of the grants (the similar-grants and facet indexes)
+follow the same feed through ``ChangeFollower``.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.grant import Grant
+from app.models.grant_change import GrantChange
+
+logger = logging.getLogger(__name__)
+
+
+def changes_since(db: Session, since: int = 0, limit: int = 500) -> Dict[str, Any]:
+    """Changes after cursor ``since``, oldest first, at most ``limit`` log rows.
+
+    Returns ``{"changes": [...], "next_cursor": int, "has_more": bool}``. Each
+    change is ``{"cursor", "op", "grant_id", "changed_at", "grant"}`` where
+    ``grant`` is the current row (None for deletes).
+    """
+    rows = (
+        db.query(GrantChange)
+        .filter(GrantChange.id > since)
+        .order_by(GrantChange.id)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # The last change to each grant in the page wins
+    latest: Dict[int, GrantChange] = {}
+    for row in rows:
+        latest.pop(row.grant_id, None)
+        latest[row.grant_id] = row
+
+    live_ids = [grant_id for grant_id, row in latest.items() if row.op != "delete"]
+    grants = {grant.id: grant for grant in db.query(Grant).filter(Grant.id.in_(live_ids))} if live_ids else {}
+
+    changes: List[Dict[str, Any]] = []
+    for grant_id, row in latest.items():
+        grant = grants.get(grant_id)
+        # Deleted by a later change outside this page
+        op = row.op if row.op == "delete" or grant is not None else "delete"
+        changes.append({
+            "cursor": row.id,
+            "op": op,
+            "grant_id": grant_id,
+            "changed_at": row.changed_at,
+            "grant": grant
+        })
+
+    return {
+        "changes": changes,
+        "next_cursor": rows[-1].id if rows else since,
+        "has_more": has_more
+    }
+
+
+class ChangeFollower:
+    """Base for in-memory views of grants kept current from the change feed.
+
+    Subclasses name the ``columns`` they need and implement ``apply`` (a row
+    was inserted or changed) and ``discard`` (a grant is gone). ``refresh``
+    loads everything on first use and afterwards only the grants changed
+    since the last cursor. Subclasses hold ``_lock`` while reading.
+    """
+
+    columns = (Grant.id,)
+    name = "grant index"
+
+    def __init__(self):
+        self.cursor: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def apply(self, row):
+        raise NotImplementedError
+
+    def discard(self, grant_id: int):
+        raise NotImplementedError
+
+    def _load(self, db: Session, grant_ids: Optional[List[int]] = None) -> int:
+        query = select(*self.columns)
+        if grant_ids is not None:
+            query = query.where(Grant.id.in_(grant_ids))
+        rows = db.execute(query).all()
+        found = {row.id for row in rows}
+        for grant_id in set(grant_ids or ()) - found:
+            self.discard(grant_id)
+        for row in rows:
+            self.apply(row)
+        return len(rows)
+
+    def refresh(self, db: Session) -> int:
+        """Apply changes since the last refresh (everything on first use); returns grants re-read."""
+        with self._lock:
+            if self.cursor is None:
+                # Read the cursor first: changes racing the load are applied again next time
+                self.cursor = db.execute(select(func.coalesce(func.max(GrantChange.id), 0))).scalar()
+                loaded = self._load(db)
+                logger.info(f"Built {self.name}: {loaded} grants")
+                return loaded
+
+            changes = db.execute(
+                select(GrantChange.id, GrantChange.grant_id).where(GrantChange.id > self.cursor)
+            ).all()
+            if not changes:
+                return 0
+            self.cursor = max(change_id for change_id, _ in changes)
+            return self._load(db, sorted({grant_id for _, grant_id in changes}))
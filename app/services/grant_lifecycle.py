@@ -0,0 +1,99 @@
+"""
+Grant status lifecycle.
+
+A grant's status follows its dates:
+
+* ``draft`` - not open yet (``open_date`` in the future);
+* ``open`` - open, deadline unknown or more than ``SCRAPER_CLOSING_SOON_DAYS`` away;
+* ``closing_soon`` - open with the deadline inside that window;
+* ``closed`` - the deadline has passed.
+
+``update_grant_statuses`` moves grants between them with one set-based
+``UPDATE ... RETURNING id`` per target status over the indexed ``status``,
+``deadline`` and ``open_date`` columns, and logs every moved grant to the
+change feed in the same transaction, so the in-memory indexes and alerts
+pick the moves up like any other edit. Read paths can then filter on the
+indexed status instead of comparing deadlines with the clock.
+
+Scrapers write ``active`` for listed grants; it is normalised like
+``open``. A ``draft`` with no ``open_date`` is a hand-made draft and is
+left alone, and ``closed`` is never reopened here: ingest does that when a
+scrape lists the grant again with a deadline that hasn't passed (see
+``scrapers/ingest.py``), so a grant closed by hand stays closed until its
+source relists it. Other statuses are never touched.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.grant import Grant
+from app.models.grant_change import record_grant_changes
+
+logger = logging.getLogger(__name__)
+
+LISTED = ("open", "active", "closing_soon")
+
+
+def _transitions(now: datetime, window: timedelta) -> List[Tuple[str, object]]:
+    """``(target status, WHERE clause)`` pairs; the clauses are disjoint."""
+    not_past = or_(Grant.deadline.is_(None), Grant.deadline >= now)
+    soon = and_(Grant.deadline >= now, Grant.deadline <= now + window)
+    later = or_(Grant.deadline.is_(None), Grant.deadline > now + window)
+    # Open for applications: listed and started, or a draft whose open date has come
+    started = or_(
+        and_(Grant.status.in_(LISTED), or_(Grant.open_date.is_(None), Grant.open_date <= now)),
+        and_(Grant.status == "draft", Grant.open_date <= now),
+    )
+    return [
+        ("closed", and_(Grant.status.in_(LISTED + ("draft",)), Grant.deadline < now)),
+        ("draft", and_(Grant.status.in_(LISTED), Grant.open_date > now, not_past)),
+        ("closing_soon", and_(started, soon)),
+        ("open", and_(started, later)),
+    ]
+
+
+def status_for(open_date: Optional[datetime], deadline: Optional[datetime], now: Optional[datetime] = None,
+               closing_soon_days: Optional[int] = None) -> str:
+    """The status a listed grant with these dates should have (what ``update_grant_statuses`` would set)."""
+    now = now or datetime.utcnow()
+    days = closing_soon_days if closing_soon_days is not None else settings.SCRAPER_CLOSING_SOON_DAYS
+    if deadline is not None and deadline < now:
+        return "closed"
+    if open_date is not None and open_date > now:
+        return "draft"
+    if deadline is not None and deadline <= now + timedelta(days=days):
+        return "closing_soon"
+    return "open"
+
+
+def update_grant_statuses(db: Session, now: Optional[datetime] = None,
+                          closing_soon_days: Optional[int] = None) -> Dict[str, int]:
+    """Move grants to the status their dates call for (no commit). Returns grants moved per status."""
+    now = now or datetime.utcnow()
+    days = closing_soon_days if closing_soon_days is not None else settings.SCRAPER_CLOSING_SOON_DAYS
+
+    moved: Dict[str, int] = {}
+    changes = []
+    for status, where in _transitions(now, timedelta(days=days)):
+        ids = db.execute(
+            update(Grant)
+            .where(where, Grant.status != status)
+            .values(status=status)
+            .returning(Grant.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        if ids:
+            moved[status] = len(ids)
+            changes.extend(("update", grant_id) for grant_id in ids)
+
+    if changes:
+        record_grant_changes(db.connection(), changes)
+        # Loaded grants would otherwise keep their old status
+        db.expire_all()
+        logger.info(f"Grant statuses updated: {moved}")
+    return moved
@@ -0,0 +1,130 @@
+"""
+Batched grant lookups by id.
+
+``load_grants`` fetches any number of grants with one ``WHERE id IN (...)``
+query per ``MAX_BATCH`` ids instead of one query per grant, optionally
+looking up the ids it didn't find in ``grants_archive``.
+
+``GrantLoader`` does the same for callers that ask for one grant at a time
+(DataLoader-style request coalescing): every ``load`` issued while a batch
+is collecting - concurrent lookups inside one request, or requests that
+arrive within ``BATCH_WINDOW`` of each other - is answered by a single
+query. The query runs in a worker thread with its own short-lived session,
+so the event loop keeps serving while it waits. Grants come back detached
+with every column loaded and are shared between the callers that asked for
+them, so treat them as read-only. Archived grants are found too. Nothing is
+cached between batches.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+
+from sqlalchemy.orm import Session
+
+from app.db.session import get_session_local
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.services.grant_archive import load_archived
+
+logger = logging.getLogger(__name__)
+
+# How long a batch waits for more lookups before its query is sent (seconds)
+BATCH_WINDOW = 0.002
+
+# Ids per query; a full batch is sent without waiting out the window
+MAX_BATCH = 500
+
+
+def load_grants(db: Session, ids: Iterable[int],
+                include_archived: bool = False) -> Dict[int, Union[Grant, ArchivedGrant]]:
+    """Grants by id, one query per ``MAX_BATCH`` ids; missing ids are absent."""
+    ids = list(dict.fromkeys(ids))
+    found: Dict[int, Union[Grant, ArchivedGrant]] = {}
+    for start in range(0, len(ids), MAX_BATCH):
+        for grant in db.query(Grant).filter(Grant.id.in_(ids[start:start + MAX_BATCH])):
+            found[grant.id] = grant
+    if include_archived:
+        missing = [grant_id for grant_id in ids if grant_id not in found]
+        for start in range(0, len(missing), MAX_BATCH):
+            found.update(load_archived(db, missing[start:start + MAX_BATCH]))
+    return found
+
+
+class GrantLoader:
+    """Coalesces concurrent single-grant lookups into batched queries."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None, window: float = BATCH_WINDOW):
+        self.session_factory = session_factory
+        self.window = window
+        self.batches = 0
+        self._pending: Dict[int, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, grant_id: int) -> Optional[Union[Grant, ArchivedGrant]]:
+        """The grant with ``grant_id``, or None; shares a query with concurrent loads."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(grant_id, []).append(future)
+        if len(self._pending) >= MAX_BATCH:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return await future
+
+    async def load_many(self, ids: Iterable[int]) -> List[Optional[Union[Grant, ArchivedGrant]]]:
+        """Grants for ``ids`` in order (None where missing), in as few queries as possible."""
+        return list(await asyncio.gather(*(self.load(grant_id) for grant_id in ids)))
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[int, List[asyncio.Future]]):
+        self.batches += 1
+        try:
+            found = await asyncio.to_thread(self._fetch, list(batch))
+        except Exception as e:
+            logger.error(f"Batched grant lookup of {len(batch)} ids failed: {str(e)}")
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for grant_id, futures in batch.items():
+            for future in futures:
+                # A caller that gave up (e.g. client disconnected) leaves a cancelled future
+                if not future.done():
+                    future.set_result(found.get(grant_id))
+
+    def _fetch(self, ids: List[int]) -> Dict[int, Union[Grant, ArchivedGrant]]:
+        db = (self.session_factory or get_session_local())()
+        try:
+            found = load_grants(db, ids, include_archived=True)
+            db.expunge_all()
+            return found
+        finally:
+            db.close()
+
+
+_loader: Optional[GrantLoader] = None
+_loader_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_grant_loader() -> GrantLoader:
+    """The process-wide loader for the running event loop."""
+    global _loader, _loader_loop
+    loop = asyncio.get_running_loop()
+    # Pending futures belong to the loop the loader was first used on
+    if _loader is None or _loader_loop is not loop:
+        _loader = GrantLoader()
+        _loader_loop = loop
+    return _loader
@@ -0,0 +1,363 @@
+"""
+Grant link checker.
+
+Grants link out twice (``source_url`` and ``application_url``), and those
+pages move or disappear between scrapes. The checker requests every
+distinct URL and records the outcome per URL in ``grant_links`` (so a
+portal linked from a thousand grants is checked once):
+
+* a HEAD request, following redirects; servers that answer HEAD with an
+  error often serve GET fine, so any error is retried once as a GET whose
+  body is never read;
+* only public addresses are connected to: grant URLs come from scraped
+  pages, so checks run on their own session whose connector resolves
+  hosts through ``PublicResolver``. A host with any private, loopback,
+  link-local or otherwise non-global address fails to resolve, and the
+  connection is made to the addresses that were vetted, so a host can't
+  pass the check and then re-resolve (DNS rebinding) somewhere internal.
+  IP-literal hosts skip resolution and are checked up front. Redirects are
+  followed by hand, up to ``MAX_REDIRECTS``, so every hop goes through the
+  same checks; a rejected URL is recorded as an invalid link;
+* requests are queued per host: at most ``SCRAPER_HTTP_PER_HOST`` are in
+  flight to one host and ``SCRAPER_LINK_CHECK_CONCURRENCY`` overall, the
+  session's own limits, so no check waits on a pool slot and eats its
+  timeout, and no site sees more than its share. Checking many hosts at
+  once is what makes tens of thousands of links a matter of minutes;
+* states: ``ok``; ``redirected`` (loads, but at another address - the UI
+  can offer the new one); ``blocked`` (401/403/429 - says nothing about
+  the link); ``error`` (5xx, timeouts, connection failures); ``dead``
+  (404/410, an unusable URL, or ``SCRAPER_LINK_DEAD_AFTER`` errors in a row).
+
+Each pass checks the ``SCRAPER_LINK_CHECK_BATCH`` links that are unchecked
+or were checked longest ago, once they are older than
+``SCRAPER_LINK_RECHECK_HOURS``.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+from sqlalchemy import or_, select, union
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.grant import Grant
+from app.models.grant_link import GrantLink
+from app.services.scrapers.http_pool import DEFAULT_HEADERS
+
+logger = logging.getLogger(__name__)
+
+STATES = ("ok", "redirected", "blocked", "error", "dead")
+FLAGGED_STATES = ("dead", "redirected")
+
+GONE_STATUSES = {404, 410}
+BLOCKED_STATUSES = {401, 403, 429}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 10
+
+# URLs per IN (...) when reading and writing results
+QUERY_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class LinkResult:
+    """Outcome of checking one URL."""
+    url: str
+    status: Optional[int] = None
+    final_url: Optional[str] = None
+    error: Optional[str] = None
+    invalid: bool = False
+
+
+class UnsafeURL(OSError):
+    """A URL the checker won't request.
+
+    An ``OSError`` so that, raised from the resolver, aiohttp's connector
+    reports it as a failed lookup (``ClientConnectorError.os_error``).
+    """
+
+
+def is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class PublicResolver(AbstractResolver):
+    """Resolves hosts, refusing any that have a non-public address.
+
+    The connector connects to what this returns, so the addresses checked
+    are the addresses used.
+    """
+
+    def __init__(self, resolver: Optional[AbstractResolver] = None):
+        self._resolver = resolver
+
+    async def resolve(self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET):
+        if self._resolver is None:
+            self._resolver = aiohttp.DefaultResolver()
+        infos = await self._resolver.resolve(host, port, family)
+        if not infos or not all(is_public_address(info["host"]) for info in infos):
+            raise UnsafeURL(f"non-public address for {host}")
+        return infos
+
+    async def close(self):
+        if self._resolver is not None:
+            await self._resolver.close()
+
+
+def link_check_session(concurrency: int, per_host: int, resolver: PublicResolver) -> aiohttp.ClientSession:
+    """A session that only connects to public addresses, sized for one pass. Close ``resolver`` after it."""
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host, resolver=resolver, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS)
+
+
+def _vet(url: str):
+    """Raise ``UnsafeURL`` unless ``url`` is http(s) with a host name or a public IP address.
+
+    Host names are checked when the connector resolves them.
+    """
+    host = _host(url)
+    if host is None:
+        raise UnsafeURL("invalid URL")
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return
+    if not is_public_address(str(address)):
+        raise UnsafeURL(f"non-public address for {host}")
+
+
+def _unsafe(error: Exception) -> Optional[UnsafeURL]:
+    if isinstance(error, aiohttp.ClientConnectorError) and isinstance(error.os_error, UnsafeURL):
+        return error.os_error
+    return None
+
+
+def _host(url: str) -> Optional[str]:
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
+    return parts.hostname.lower()
+
+
+def _comparable(url: str) -> str:
+    """A URL with the differences that don't matter to a reader removed (http/https, trailing slash)."""
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/")
+    return f"{(parts.hostname or '').lower()}{path}?{parts.query}"
+
+
+def moved(url: str, final_url: Optional[str]) -> bool:
+    return bool(final_url) and _comparable(url) != _comparable(final_url)
+
+
+async def _request(session, method: str, url: str, timeout: aiohttp.ClientTimeout) -> LinkResult:
+    """Request ``url``, following redirects one hop at a time so each is checked."""
+    target = url
+    for _ in range(MAX_REDIRECTS + 1):
+        _vet(target)
+        async with session.request(method, target, allow_redirects=False, timeout=timeout) as response:
+            status = response.status
+            location = response.headers.get("Location") if status in REDIRECT_STATUSES else None
+        if not location:
+            return LinkResult(url=url, status=status, final_url=target)
+        target = urljoin(target, location)
+    return LinkResult(url=url, error="too many redirects")
+
+
+async def check_link(session, url: str, timeout: aiohttp.ClientTimeout) -> LinkResult:
+    """HEAD ``url``, retrying as GET if HEAD doesn't come back OK."""
+    result = None
+    for method in ("HEAD", "GET"):
+        try:
+            result = await _request(session, method, url, timeout)
+        except UnsafeURL as e:
+            return LinkResult(url=url, error=str(e), invalid=True)
+        except asyncio.TimeoutError:
+            result = LinkResult(url=url, error="timeout")
+        except aiohttp.ClientError as e:
+            unsafe = _unsafe(e)
+            if unsafe is not None:
+                return LinkResult(url=url, error=str(unsafe), invalid=True)
+            result = LinkResult(url=url, error=f"{type(e).__name__}: {str(e)}"[:500])
+        if result.status is not None and result.status < 400:
+            break
+    return result
+
+
+async def check_links(urls: Iterable[str], http_session=None, concurrency: Optional[int] = None,
+                      per_host: Optional[int] = None, timeout: Optional[float] = None) -> List[LinkResult]:
+    """Check ``urls`` concurrently, never more than ``per_host`` at a time per host.
+
+    Without ``http_session`` a ``link_check_session`` is opened for the pass.
+    """
+    concurrency = concurrency or settings.SCRAPER_LINK_CHECK_CONCURRENCY
+    per_host = per_host or settings.SCRAPER_HTTP_PER_HOST
+    if http_session is None:
+        resolver = PublicResolver()
+        try:
+            async with link_check_session(concurrency, per_host, resolver) as session:
+                return await check_links(urls, session, concurrency, per_host, timeout)
+        finally:
+            await resolver.close()
+
+    client_timeout = aiohttp.ClientTimeout(total=timeout or settings.SCRAPER_LINK_CHECK_TIMEOUT)
+
+    results: List[LinkResult] = []
+    queues: Dict[str, Deque[str]] = defaultdict(deque)
+    for url in dict.fromkeys(urls):
+        host = _host(url)
+        if host is None:
+            results.append(LinkResult(url=url, error="invalid URL", invalid=True))
+        else:
+            queues[host].append(url)
+
+    limit = asyncio.Semaphore(concurrency)
+
+    async def drain(queue: Deque[str]):
+        # Up to per_host of these share one host's queue
+        while queue:
+            url = queue.popleft()
+            async with limit:
+                results.append(await check_link(http_session, url, client_timeout))
+
+    await asyncio.gather(*(
+        drain(queue) for queue in queues.values() for _ in range(min(per_host, len(queue)))
+    ))
+    return results
+
+
+def apply_result(link: GrantLink, result: LinkResult, now: datetime):
+    """Update a link's state from one check."""
+    link.last_checked_at = now
+    link.last_status = result.status
+    link.final_url = result.final_url if result.final_url and moved(link.url, result.final_url) else None
+    link.last_error = result.error
+    status = result.status
+
+    if status is not None and status < 400:
+        link.state = "redirected" if link.final_url else "ok"
+        link.consecutive_failures = 0
+        link.last_ok_at = now
+    elif status in BLOCKED_STATUSES:
+        link.state = "blocked"
+    else:
+        link.consecutive_failures = (link.consecutive_failures or 0) + 1
+        if result.invalid or status in GONE_STATUSES or link.consecutive_failures >= settings.SCRAPER_LINK_DEAD_AFTER:
+            link.state = "dead"
+        else:
+            link.state = "error"
+
+
+def due_links(db: Session, now: datetime, limit: int) -> List[str]:
+    """Grant URLs never checked or not checked for ``SCRAPER_LINK_RECHECK_HOURS``, oldest first."""
+    cutoff = now - timedelta(hours=settings.SCRAPER_LINK_RECHECK_HOURS)
+    urls = union(
+        select(Grant.source_url.label("url")).where(Grant.source_url.isnot(None), Grant.source_url != ""),
+        select(Grant.application_url.label("url")).where(Grant.application_url.isnot(None), Grant.application_url != ""),
+    ).subquery()
+    return db.execute(
+        select(urls.c.url)
+        .outerjoin(GrantLink, GrantLink.url == urls.c.url)
+        .where(or_(GrantLink.id.is_(None), GrantLink.last_checked_at < cutoff))
+        .order_by(GrantLink.last_checked_at.nulls_first(), urls.c.url)
+        .limit(limit)
+    ).scalars().all()
+
+
+def record_results(db: Session, results: Sequence[LinkResult], now: datetime) -> Dict[str, int]:
+    """Store check results (no commit). Returns links per state."""
+    urls = [result.url for result in results]
+    links: Dict[str, GrantLink] = {}
+    for start in range(0, len(urls), QUERY_CHUNK):
+        links.update(
+            (link.url, link) for link in db.query(GrantLink).filter(GrantLink.url.in_(urls[start:start + QUERY_CHUNK]))
+        )
+
+    states: Counter = Counter()
+    for result in results:
+        link = links.get(result.url)
+        if link is None:
+            link = links[result.url] = GrantLink(url=result.url, consecutive_failures=0)
+            db.add(link)
+        apply_result(link, result, now)
+        states[link.state] += 1
+    db.flush()
+    return dict(states)
+
+
+async def check_grant_links(db: Session, now: Optional[datetime] = None, limit: Optional[int] = None,
+                            http_session=None) -> Dict[str, Any]:
+    """Check the links that are due (no commit)."""
+    now = now or datetime.utcnow()
+    urls = due_links(db, now, limit or settings.SCRAPER_LINK_CHECK_BATCH)
+    if not urls:
+        return {"checked": 0, "states": {}}
+
+    started = datetime.utcnow()
+    results = await check_links(urls, http_session=http_session)
+    states = record_results(db, results, now)
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    logger.info(f"Checked {len(urls)} grant links in {elapsed:.1f}s: {states}")
+    return {"checked": len(urls), "states": states}
+
+
+def flagged_links(db: Session, states: Sequence[str] = FLAGGED_STATES, skip: int = 0,
+                  limit: int = 100) -> List[Dict[str, Any]]:
+    """Links in ``states`` with the grants that use them, worst first."""
+    links = (
+        db.query(GrantLink)
+        .filter(GrantLink.state.in_(list(states)))
+        .order_by(GrantLink.state, GrantLink.url)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    if not links:
+        return []
+
+    urls = {link.url for link in links}
+    grants_by_url: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for grant_id, title, source_url, application_url in db.execute(
+        select(Grant.id, Grant.title, Grant.source_url, Grant.application_url)
+        .where(or_(Grant.source_url.in_(list(urls)), Grant.application_url.in_(list(urls))))
+        .order_by(Grant.id)
+    ):
+        for field, url in (("source_url", source_url), ("application_url", application_url)):
+            if url in urls:
+                grants_by_url[url].append({"id": grant_id, "title": title, "field": field})
+
+    return [{**link_status(link), "grants": grants_by_url.get(link.url, [])} for link in links]
+
+
+def link_status(link: GrantLink) -> Dict[str, Any]:
+    return {
+        "url": link.url,
+        "state": link.state,
+        "status": link.last_status,
+        "final_url": link.final_url,
+        "error": link.last_error,
+        "last_checked_at": link.last_checked_at.isoformat() if link.last_checked_at else None,
+        "last_ok_at": link.last_ok_at.isoformat() if link.last_ok_at else None,
+    }
+
+
+def grant_link_statuses(db: Session, grant) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Link status of a grant's source and application URLs; None where unchecked or missing."""
+    fields = {"source_url": grant.source_url, "application_url": grant.application_url}
+    urls = [url for url in fields.values() if url]
+    links = {link.url: link for link in db.query(GrantLink).filter(GrantLink.url.in_(urls))} if urls else {}
+    return {field: link_status(links[url]) if url in links else None for field, url in fields.items()}
@@ -10,7 +10,7 @@ from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
 import httpx
-from app.core.api_client import APIClient, APIResponse, RetryConfig
+from app.core.api_client import AsyncAPIClient, APIResponse, RetryConfig
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -42,11 +42,13 @@ class NotionAPIClient:
             jitter=True
         )
         
-        # Create API client with Notion-specific headers
-        self.client = APIClient(
+        # Create API client with Notion-specific headers; async so that calls
+        # from request handlers don't block the event loop
+        self.client = AsyncAPIClient(
             base_url=self.base_url,
             retry_config=retry_config,
             timeout=30.0,
+            service_name="notion",
             headers={
                 "Authorization": f"Bearer {access_token}",
                 "Notion-Version": "2022-06-28",
@@ -69,17 +71,17 @@ class NotionAPIClient:
         
         return response.data or {}
     
-    def get_workspace_info(self) -> Dict[str, Any]:
+    async def get_workspace_info(self) -> Dict[str, Any]:
         """Get workspace information."""
-        response = self.client.get("/users/me")
+        response = await self.client.get("/users/me")
         return self._handle_response(response)
     
-    def get_page(self, page_id: str) -> Dict[str, Any]:
+    async def get_page(self, page_id: str) -> Dict[str, Any]:
         """Get a page by ID."""
-        response = self.client.get(f"/pages/{page_id}")
+        response = await self.client.get(f"/pages/{page_id}")
         return self._handle_response(response)
     
-    def create_page(self, parent_id: str, properties: Dict[str, Any], content: Optional[List[Dict]] = None) -> Dict[str, Any]:
+    async def create_page(self, parent_id: str, properties: Dict[str, Any], content: Optional[List[Dict]] = None) -> Dict[str, Any]:
         """Create a new page."""
         data = {
             "parent": {"page_id": parent_id},
@@ -89,27 +91,27 @@ class NotionAPIClient:
         if content:
             data["children"] = content
         
-        response = self.client.post("/pages", data=data)
+        response = await self.client.post("/pages", data=data)
         return self._handle_response(response)
     
-    def update_page(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    async def update_page(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Update a page."""
         data = {"properties": properties}
-        response = self.client.patch(f"/pages/{page_id}", data=data)
+        response = await self.client.patch(f"/pages/{page_id}", data=data)
         return self._handle_response(response)
     
-    def delete_page(self, page_id: str) -> Dict[str, Any]:
+    async def delete_page(self, page_id: str) -> Dict[str, Any]:
         """Delete a page (archive it)."""
         data = {"archived": True}
-        response = self.client.patch(f"/pages/{page_id}", data=data)
+        response = await self.client.patch(f"/pages/{page_id}", data=data)
         return self._handle_response(response)
     
-    def get_database(self, database_id: str) -> Dict[str, Any]:
+    async def get_database(self, database_id: str) -> Dict[str, Any]:
         """Get a database by ID."""
-        response = self.client.get(f"/databases/{database_id}")
+        response = await self.client.get(f"/databases/{database_id}")
         return self._handle_response(response)
     
-    def query_database(self, database_id: str, filters: Optional[Dict] = None, sorts: Optional[List[Dict]] = None, page_size: int = 100) -> Dict[str, Any]:
+    async def query_database(self, database_id: str, filters: Optional[Dict] = None, sorts: Optional[List[Dict]] = None, page_size: int = 100) -> Dict[str, Any]:
         """Query a database."""
         data = {"page_size": page_size}
         
@@ -119,10 +121,10 @@ class NotionAPIClient:
         if sorts:
             data["sorts"] = sorts
         
-        response = self.client.post(f"/databases/{database_id}/query", data=data)
+        response = await self.client.post(f"/databases/{database_id}/query", data=data)
         return self._handle_response(response)
     
-    def create_database(self, parent_id: str, title: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_database(self, parent_id: str, title: str, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new database."""
         data = {
             "parent": {"page_id": parent_id},
@@ -130,22 +132,22 @@ class NotionAPIClient:
             "properties": properties
         }
         
-        response = self.client.post("/databases", data=data)
+        response = await self.client.post("/databases", data=data)
         return self._handle_response(response)
     
-    def add_block(self, block_id: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def add_block(self, block_id: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Add blocks to a page."""
         data = {"children": children}
-        response = self.client.patch(f"/blocks/{block_id}/children", data=data)
+        response = await self.client.patch(f"/blocks/{block_id}/children", data=data)
         return self._handle_response(response)
     
-    def get_block_children(self, block_id: str, page_size: int = 100) -> Dict[str, Any]:
+    async def get_block_children(self, block_id: str, page_size: int = 100) -> Dict[str, Any]:
         """Get children of a block."""
         params = {"page_size": page_size}
-        response = self.client.get(f"/blocks/{block_id}/children", params=params)
+        response = await self.client.get(f"/blocks/{block_id}/children", params=params)
         return self._handle_response(response)
     
-    def search(self, query: str = "", filter_type: str = "page", page_size: int = 100) -> Dict[str, Any]:
+    async def search(self, query: str = "", filter_type: str = "page", page_size: int = 100) -> Dict[str, Any]:
         """Search for pages or databases."""
         data = {
             "query": query,
@@ -153,7 +155,7 @@ class NotionAPIClient:
             "page_size": page_size
         }
         
-        response = self.client.post("/search", data=data)
+        response = await self.client.post("/search", data=data)
         return self._handle_response(response)
 
 
@@ -163,7 +165,7 @@ class NotionTemplateManager:
     def __init__(self, client: NotionAPIClient):
         self.client = client
     
-    def create_media_project_template(self, parent_page_id: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_media_project_template(self, parent_page_id: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a media project template page."""
         
         # Define page properties
@@ -299,9 +301,9 @@ class NotionTemplateManager:
             }
         ]
         
-        return self.client.create_page(parent_page_id, properties, content)
+        return await self.client.create_page(parent_page_id, properties, content)
     
-    def create_distribution_log_template(self, parent_page_id: str, log_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_distribution_log_template(self, parent_page_id: str, log_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a distribution log template."""
         
         properties = {
@@ -352,7 +354,7 @@ class NotionTemplateManager:
             }
         ]
         
-        return self.client.create_page(parent_page_id, properties, content)
+        return await self.client.create_page(parent_page_id, properties, content)
 
 
 class NotionSyncManager:
@@ -362,12 +364,12 @@ class NotionSyncManager:
         self.client = client
         self.template_manager = template_manager
     
-    def sync_media_project(self, project_data: Dict[str, Any], notion_page_id: str) -> Dict[str, Any]:
+    async def sync_media_project(self, project_data: Dict[str, Any], notion_page_id: str) -> Dict[str, Any]:
         """Sync a media project to Notion."""
         try:
             # Update the existing page with new project data
             properties = self._map_project_to_notion_properties(project_data)
-            result = self.client.update_page(notion_page_id, properties)
+            result = await self.client.update_page(notion_page_id, properties)
             
             logger.info(f"Successfully synced project {project_data.get('id')} to Notion page {notion_page_id}")
             return result
@@ -419,11 +421,11 @@ class NotionSyncManager:
             }
         }
     
-    def sync_distribution_log(self, log_data: Dict[str, Any], notion_page_id: str) -> Dict[str, Any]:
+    async def sync_distribution_log(self, log_data: Dict[str, Any], notion_page_id: str) -> Dict[str, Any]:
         """Sync a distribution log to Notion."""
         try:
             properties = self._map_distribution_to_notion_properties(log_data)
-            result = self.client.update_page(notion_page_id, properties)
+            result = await self.client.update_page(notion_page_id, properties)
             
             logger.info(f"Successfully synced distribution log {log_data.get('id')} to Notion")
             return result
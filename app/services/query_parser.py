@@ -0,0 +1,424 @@
+"""
+Natural-language grant queries.
+
+Smart search turns a query such as "tech grants for startups in Melbourne
+$20k–$150k closing in March" into structured filters. The parser is
+compiled once at import time into a single regex that is scanned over the
+query once, left to right:
+
+* date expressions anchored on a closing verb ("closing in March",
+  "due next month", "closing within 14 days", "closing soon"), resolved to a
+  deadline window relative to today;
+* amount expressions: ranges ("$20k–$150k", "between 20,000 and 50,000"),
+  bounds ("under 50k", "at least $1m") and bare amounts ("$50k+");
+* the industry, location and organisation-type vocabularies, folded into one
+  trie-shaped alternation (``_trie_pattern`` in scrapers/extraction.py)
+  and matched on whole words, longest phrase first - so "ai" no longer
+  matches inside "training" and "small business" wins over "small".
+
+Whatever isn't consumed, minus stop words, becomes free-text keywords.
+Parsed queries are immutable and memoized in an LRU keyed on the normalised
+text and today's date, so repeated searches cost a dict lookup.
+``conditions`` turns a parsed query into SQLAlchemy filters for the grant
+query.
+"""
+
+import calendar
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import String, cast, or_
+
+from app.models.grant import Grant
+from app.services.scrapers.extraction import _trie_pattern
+
+logger = logging.getLogger(__name__)
+
+# Field -> value -> phrases. Values are the ones the grant filters use.
+VOCABULARY: Dict[str, Dict[str, Sequence[str]]] = {
+    "industry": {
+        "technology": ["tech", "technology", "digital", "software", "ai", "artificial intelligence", "cyber", "cybersecurity"],
+        "healthcare": ["health", "healthcare", "medical", "wellness", "mental health", "aged care", "disability"],
+        "sustainability": ["sustainable", "sustainability", "environment", "environmental", "green", "climate", "recycling", "circular economy"],
+        "education": ["education", "learning", "school", "schools", "training", "skills"],
+        "cultural heritage": ["cultural", "culture", "heritage", "indigenous", "first nations", "arts"],
+        "agriculture": ["agriculture", "agricultural", "farm", "farms", "farming", "farmers", "agtech", "drought"],
+        "manufacturing": ["manufacturing", "manufacturer", "manufacturers", "factory"],
+        "energy": ["energy", "renewable", "renewables", "solar", "battery", "batteries", "hydrogen"],
+        "research": ["research", "r&d", "commercialisation", "commercialization"],
+        "media": ["media", "film", "screen", "journalism", "broadcasting", "podcast", "podcasts"],
+    },
+    "location": {
+        "victoria": ["victoria", "victorian", "vic", "melbourne", "geelong", "ballarat", "bendigo"],
+        "new south wales": ["new south wales", "nsw", "sydney", "inner west", "newcastle", "wollongong"],
+        "queensland": ["queensland", "queenslander", "qld", "brisbane", "gold coast"],
+        "south australia": ["south australia", "south australian", "adelaide"],
+        "western australia": ["western australia", "western australian", "perth"],
+        "national": ["national", "australia", "australian", "australia-wide", "countrywide", "nationwide"],
+        "regional": ["regional", "rural", "remote"],
+        "local": ["local", "community", "neighbourhood", "council"],
+        "international": ["international", "overseas", "export", "exporters", "global"],
+    },
+    "org_type": {
+        "startup": ["startup", "startups", "start-up", "start-ups"],
+        "sme": ["sme", "smes", "small business", "small businesses", "small and medium businesses"],
+        "enterprise": ["enterprise", "enterprises", "large business", "corporate"],
+        "nonprofit": ["nonprofit", "nonprofits", "non-profit", "non-profits", "not-for-profit", "not-for-profits", "not for profit", "not for profits", "nfp", "nfps", "charity", "charities"],
+        "government": ["government", "local government", "councils"],
+        "academic": ["academic", "university", "universities", "researchers"],
+        "indigenous organisation": ["indigenous organisation", "indigenous organisations", "aboriginal corporation", "aboriginal corporations"],
+        "social enterprise": ["social enterprise", "social enterprises"],
+        "community group": ["community group", "community groups", "community organisation", "community organisations"],
+    },
+}
+
+# Vocabulary value -> the values stored on grants that mean the same thing.
+# Manually entered grants use the vocabulary values; scrapers store their own
+# tokens ("small_business", "not_for_profit", "screen" ...) and council
+# scrapers store the council's area ("yarra", "inner_west_sydney" ...). Values
+# not listed here are stored as they are.
+STORED_VALUES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "industry": {
+        "technology": ("technology", "digital"),
+        "healthcare": ("healthcare", "health"),
+        "sustainability": ("sustainability", "environment"),
+        "cultural heritage": ("cultural heritage", "arts"),
+        "media": ("media", "screen"),
+    },
+    "location": {
+        "victoria": ("victoria", "vic", "melbourne", "geelong", "ballarat", "bendigo", "yarra", "moreland"),
+        "new south wales": ("new south wales", "nsw", "sydney", "inner_west_sydney", "newcastle", "wollongong"),
+        "queensland": ("queensland", "qld", "brisbane"),
+        "south australia": ("south australia", "sa", "adelaide"),
+        "western australia": ("western australia", "wa", "perth"),
+        # GrantConnect writes "National" for grants open everywhere
+        "national": ("national", "National"),
+    },
+    "org_type": {
+        "sme": ("sme", "small_business", "medium_business"),
+        "enterprise": ("enterprise", "large_business", "company"),
+        "nonprofit": ("nonprofit", "not_for_profit"),
+        "academic": ("academic", "research_organisation", "research institution"),
+        "indigenous organisation": ("indigenous organisation", "indigenous_organisation"),
+        "social enterprise": ("social enterprise", "social_enterprise"),
+        "community group": ("community group", "community_group"),
+    },
+}
+
+# Org type scrapers store when a grant names no eligibility restriction
+ANY_ORG_TYPE = "any"
+
+STOP_WORDS = frozenset("""
+    a about all an and any are available be between close closes closing deadline due for from funding fund funds
+    grant grants have i in is looking me my need of on opportunities opportunity or our program programs programme
+    programmes search show that the to we what with
+""".split())
+
+MONTHS = {name: number for number in range(1, 13)
+          for name in (calendar.month_name[number].lower(), calendar.month_abbr[number].lower())}
+
+# Window for "closing soon"
+SOON_DAYS = 30
+
+# "small" / "large" without a figure
+SIZE_WORDS = {"small": ("max", 50_000), "large": ("min", 100_000)}
+
+_UNITS = {"k": 1_000, "thousand": 1_000, "m": 1_000_000, "mil": 1_000_000, "million": 1_000_000}
+
+_MAX_QUALIFIERS = ("under", "below", "less than", "up to", "at most", "max", "maximum", "no more than")
+_MIN_QUALIFIERS = ("over", "above", "more than", "at least", "min", "minimum", "from", "starting at")
+_QUALIFIERS = {**{q: "max" for q in _MAX_QUALIFIERS}, **{q: "min" for q in _MIN_QUALIFIERS}}
+
+
+def _money(name: str) -> str:
+    return (
+        rf"(?P<{name}_cur>\$)?\s?(?P<{name}>\d[\d,]*(?:\.\d+)?)"
+        rf"(?:\s*(?P<{name}_unit>million|thousand|mil|k|m)\b)?"
+    )
+
+
+_DATE = (
+    r"\b(?:clos(?:e|es|ing)|due|deadlines?|end(?:s|ing)?)\s+(?:"
+    r"(?P<soon>soon)"
+    r"|(?P<which>this|next)\s+(?P<period>week|month|year)"
+    r"|(?:with)?in\s+(?:the\s+next\s+)?(?P<count>\d+)\s+(?P<span>days?|weeks?|months?)"
+    r"|(?:(?P<rel>in|by|before|after|during)\s+)?(?P<month>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")"
+    r"(?:\s+(?P<year>20\d\d))?"
+    r")\b"
+)
+_RANGE = r"(?:\b(?P<between>between)\s+)?" + _money("low") + r"\s*(?:-|–|—|to|and)\s*" + _money("high")
+_BOUND = (
+    r"\b(?P<qualifier>" + "|".join(q.replace(" ", r"\s+") for q in sorted(_QUALIFIERS, key=len, reverse=True)) + r")\s+"
+    + _money("bound")
+)
+_BARE = _money("bare") + r"(?P<plus>\+|\s+or\s+more|\s+plus)?"
+
+_PHRASES: Dict[str, Tuple[str, str]] = {}
+for _field, _values in VOCABULARY.items():
+    for _value, _phrases in _values.items():
+        for _phrase in _phrases:
+            _PHRASES[_phrase] = (_field, _value)
+
+# Alternatives are tried in order at each position: a date or amount before a
+# vocabulary phrase, and a phrase ("small business") before a size word
+_QUERY_RE = re.compile(
+    "|".join([
+        rf"(?P<date>{_DATE})",
+        rf"(?P<range>{_RANGE})",
+        rf"(?P<boundexpr>{_BOUND})",
+        rf"(?P<phrase>\b(?:{_trie_pattern(list(_PHRASES))})(?![\w-]))",
+        rf"(?P<size>\b(?:{'|'.join(SIZE_WORDS)})\b)",
+        rf"(?P<bareexpr>{_BARE})",
+    ])
+)
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9&'-]*")
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """Structured filters from a natural-language query."""
+    keywords: Tuple[str, ...] = ()
+    industry: Optional[str] = None
+    location: Optional[str] = None
+    org_types: Tuple[str, ...] = ()
+    min_amount: Optional[int] = None
+    max_amount: Optional[int] = None
+    deadline_from: Optional[date] = None
+    deadline_to: Optional[date] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The filters as the plain dict smart search has always returned."""
+        parsed: Dict[str, Any] = {"keywords": list(self.keywords)}
+        if self.industry:
+            parsed["industry"] = self.industry
+        if self.location:
+            parsed["location"] = self.location
+        if self.org_types:
+            parsed["org_type"] = list(self.org_types)
+        if self.min_amount is not None or self.max_amount is not None:
+            parsed["amount_range"] = {
+                key: value for key, value in (("min", self.min_amount), ("max", self.max_amount)) if value is not None
+            }
+        if self.deadline_from or self.deadline_to:
+            parsed["deadline"] = {
+                key: value.isoformat()
+                for key, value in (("from", self.deadline_from), ("to", self.deadline_to)) if value
+            }
+        return parsed
+
+
+def _amount(match: re.Match, name: str) -> Optional[int]:
+    try:
+        value = float(match.group(name).replace(",", ""))
+    except ValueError:
+        return None
+    unit = match.group(f"{name}_unit")
+    if unit:
+        value *= _UNITS[unit]
+    return int(value)
+
+
+def _has_money_marker(match: re.Match, *names: str) -> bool:
+    """A figure counts as money with a ``$`` or a unit; "3 employees" doesn't."""
+    return any(match.group(f"{name}_cur") or match.group(f"{name}_unit") for name in names)
+
+
+def _month_end(year: int, month: int) -> date:
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _deadline_window(match: re.Match, today: date) -> Tuple[Optional[date], Optional[date]]:
+    """``(from, to)`` deadline dates, inclusive, for a date expression."""
+    if match.group("soon"):
+        return today, today + timedelta(days=SOON_DAYS)
+
+    period = match.group("period")
+    if period:
+        ahead = match.group("which") == "next"
+        if period == "week":
+            week_start = today - timedelta(days=today.weekday())
+            if ahead:
+                week_start += timedelta(days=7)
+            return max(today, week_start), week_start + timedelta(days=6)
+        if period == "month":
+            first = _add_months(today.replace(day=1), 1 if ahead else 0)
+            return max(today, first), _month_end(first.year, first.month)
+        year = today.year + (1 if ahead else 0)
+        return max(today, date(year, 1, 1)), date(year, 12, 31)
+
+    if match.group("count"):
+        count, span = int(match.group("count")), match.group("span")
+        if span.startswith("month"):
+            return today, _add_months(today, count)
+        return today, today + timedelta(days=count * (7 if span.startswith("week") else 1))
+
+    month = MONTHS[match.group("month")]
+    if match.group("year"):
+        year = int(match.group("year"))
+    else:
+        # The next time that month comes round, this month included
+        year = today.year if month >= today.month else today.year + 1
+    first, last = date(year, month, 1), _month_end(year, month)
+    relation = match.group("rel")
+    if relation == "by":
+        return today, last
+    if relation == "before":
+        return today, first - timedelta(days=1)
+    if relation == "after":
+        return max(today, last + timedelta(days=1)), None
+    return max(today, first), last
+
+
+@lru_cache(maxsize=2048)
+def _parse(text: str, today: date) -> ParsedQuery:
+    fields: Dict[str, Any] = {}
+    sizes: Dict[str, int] = {}
+    org_types: List[str] = []
+    keywords: List[str] = []
+    pos = 0
+
+    def add_keywords(chunk: str):
+        for word in _WORD_RE.findall(chunk):
+            word = word.strip("'-")
+            if len(word) > 1 and word not in STOP_WORDS and not word.isdigit() and word not in keywords:
+                keywords.append(word)
+
+    def bound(kind: str, value: Optional[int]):
+        # The first figure of each kind wins, like the first industry does
+        if value is not None:
+            fields.setdefault(f"{kind}_amount", value)
+
+    for match in _QUERY_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "date":
+            if "deadline_from" not in fields:
+                fields["deadline_from"], fields["deadline_to"] = _deadline_window(match, today)
+        elif kind == "range" and (match.group("between") or _has_money_marker(match, "low", "high")):
+            low, high = _amount(match, "low"), _amount(match, "high")
+            if low is not None and match.group("high_unit") and not match.group("low_unit"):
+                low *= _UNITS[match.group("high_unit")]  # "$20-150k": the unit applies to both ends
+            if low is not None and high is not None and low > high:
+                low, high = high, low
+            bound("min", low)
+            bound("max", high)
+        elif kind == "boundexpr":
+            qualifier = re.sub(r"\s+", " ", match.group("qualifier"))
+            bound(_QUALIFIERS[qualifier], _amount(match, "bound"))
+        elif kind == "phrase":
+            field, value = _PHRASES[match.group("phrase")]
+            if field == "org_type":
+                if value not in org_types:
+                    org_types.append(value)
+            else:
+                fields.setdefault(field, value)
+        elif kind == "size":
+            size_kind, value = SIZE_WORDS[match.group("size")]
+            sizes.setdefault(size_kind, value)
+        elif kind == "bareexpr" and _has_money_marker(match, "bare"):
+            # A bare figure is what the grant needs to be able to award
+            bound("min", _amount(match, "bare"))
+        else:
+            continue
+        add_keywords(text[pos:match.start()])
+        pos = match.end()
+    add_keywords(text[pos:])
+    if "min_amount" not in fields and "max_amount" not in fields:
+        # "small" / "large" only stand in for a figure the query doesn't give
+        for size_kind, value in sizes.items():
+            bound(size_kind, value)
+
+    return ParsedQuery(keywords=tuple(keywords), org_types=tuple(org_types), **fields)
+
+
+def normalise(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+def parse_query(query: str, today: Optional[date] = None) -> ParsedQuery:
+    """Parse a natural-language grant query (memoized)."""
+    return _parse(normalise(query), today or date.today())
+
+
+def stored_values(field: str, value: str) -> Tuple[str, ...]:
+    """The values grants store for vocabulary ``value`` of ``field``."""
+    return STORED_VALUES.get(field, {}).get(value, (value,))
+
+
+def conditions(parsed: ParsedQuery) -> List[Any]:
+    """SQLAlchemy filters on ``Grant`` for a parsed query; all must hold."""
+    filters: List[Any] = []
+    if parsed.keywords:
+        filters.append(or_(*[
+            or_(
+                Grant.title.ilike(f"%{keyword}%"),
+                Grant.description.ilike(f"%{keyword}%"),
+                cast(Grant.funding_purpose, String).ilike(f"%{keyword}%")
+            )
+            for keyword in parsed.keywords
+        ]))
+    if parsed.industry:
+        filters.append(Grant.industry_focus.in_(stored_values("industry", parsed.industry)))
+    if parsed.location:
+        filters.append(Grant.location_eligibility.in_(stored_values("location", parsed.location)))
+    if parsed.org_types:
+        tokens = {ANY_ORG_TYPE}
+        for org_type in parsed.org_types:
+            tokens.update(stored_values("org_type", org_type))
+        # JSON list text; matches on Postgres (JSONB) and SQLite alike
+        filters.append(or_(*[
+            cast(Grant.org_type_eligible, String).like(f'%"{token}"%') for token in sorted(tokens)
+        ]))
+    if parsed.min_amount is not None:
+        filters.append(Grant.max_amount >= parsed.min_amount)
+    if parsed.max_amount is not None:
+        filters.append(Grant.min_amount <= parsed.max_amount)
+    if parsed.deadline_from:
+        filters.append(Grant.deadline >= datetime.combine(parsed.deadline_from, datetime.min.time()))
+    if parsed.deadline_to:
+        filters.append(Grant.deadline < datetime.combine(parsed.deadline_to + timedelta(days=1), datetime.min.time()))
+    return filters
+
+
+# Refinements offered for whatever the query leaves open
+_REFINEMENTS = (
+    ("location", "in Victoria"),
+    ("org_types", "for nonprofits"),
+    ("max_amount", "under $50,000"),
+    ("deadline_to", "closing soon"),
+)
+
+POPULAR_SEARCHES = (
+    ("sustainability grants", "sustainability"),
+    ("technology innovation funding", "technology"),
+    ("community development grants", "local"),
+    ("indigenous cultural projects", "cultural heritage"),
+)
+
+_ORG_LABELS = (("startup", "startups"), ("sme", "small businesses"), ("nonprofit", "nonprofits"))
+
+
+def search_suggestions(query: str, parsed: ParsedQuery) -> List[str]:
+    """The query narrowed along each dimension it doesn't already filter on."""
+    query = " ".join(query.split())
+    return [f"{query} {refinement}" for field, refinement in _REFINEMENTS if not getattr(parsed, field)]
+
+
+def related_searches(parsed: ParsedQuery, limit: int = 4) -> List[str]:
+    """Searches next to this one: its industry for other organisations, then popular searches."""
+    related = []
+    if parsed.industry:
+        related.extend(
+            f"{parsed.industry} grants for {label}" for org_type, label in _ORG_LABELS if org_type not in parsed.org_types
+        )
+    related.extend(search for search, topic in POPULAR_SEARCHES if topic not in (parsed.industry, parsed.location))
+    return related[:limit]
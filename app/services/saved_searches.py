@@ -0,0 +1,247 @@
+"""
+Saved searches and grant alerts.
+
+A saved search is a set of filters; each active alert on it adds its own
+conditions and fires for grants that are inserted or changed and then match
+both. Alerts are evaluated from the change feed rather than by re-running
+searches:
+
+1. Every alert-enabled search has a ``watermark``, the feed cursor it has
+   been evaluated up to. One query reads the changes between the lowest
+   watermark and the head of the feed, reduced to the latest cursor per
+   grant, and one more loads those grants.
+2. Filters are split into predicates such as ``("industry_focus", "media")``.
+   Searches share predicates heavily, so each distinct predicate is
+   evaluated once over the changed grants, giving a bitset (Python int,
+   bit i = i-th changed grant).
+3. An alert's matches are the AND of its predicates' bitsets with the
+   bitset of grants changed after its search's watermark. Nothing per
+   alert touches the database except recording the matches.
+
+Matches are stored once per alert and grant (``grant_alert_matches``); new
+searches start at the head of the feed so they only alert on what happens
+after they are saved. Copies of a program from other sources are skipped.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.grant import Grant
+from app.models.grant_change import GrantChange
+from app.models.saved_search import GrantAlert, GrantAlertMatch, SavedSearch
+
+logger = logging.getLogger(__name__)
+
+Predicate = Tuple[str, str]
+
+
+def _amount(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _text(grant: Grant) -> str:
+    return f"{grant.title or ''} {grant.description or ''}".lower()
+
+
+def _any_of(value) -> List[Any]:
+    return list(value) if isinstance(value, list) else [value]
+
+
+# Filter name -> test of one grant against the filter value. Semantics follow
+# the SQL filters of the grant list and search endpoints. List values mean
+# any of them.
+FILTERS: Dict[str, Callable[[Grant, Any], bool]] = {
+    "source": lambda grant, value: grant.source in _any_of(value),
+    "industry_focus": lambda grant, value: grant.industry_focus in _any_of(value),
+    "location": lambda grant, value: grant.location_eligibility in _any_of(value),
+    "status": lambda grant, value: grant.status in _any_of(value),
+    "org_type": lambda grant, value: bool(set(_any_of(value)) & set(grant.org_type_eligible or [])),
+    "min_amount": lambda grant, value: _amount(grant.max_amount) is not None and _amount(grant.max_amount) >= float(value),
+    "max_amount": lambda grant, value: _amount(grant.min_amount) is not None and _amount(grant.min_amount) <= float(value),
+    "keywords": lambda grant, value: any(str(word).lower() in _text(grant) for word in _any_of(value)),
+}
+
+# Alternative spellings used by the list endpoint and GrantFilters
+FILTER_ALIASES = {"location_eligibility": "location", "search": "keywords", "query": "keywords"}
+
+
+def predicates(filters: Optional[Dict[str, Any]]) -> Tuple[Predicate, ...]:
+    """Normalised, hashable predicates for a filter dict; raises ValueError for unknown filters."""
+    result = set()
+    for name, value in (filters or {}).items():
+        if value is None or value == "" or value == []:
+            continue
+        name = FILTER_ALIASES.get(name, name)
+        if name not in FILTERS:
+            raise ValueError(f"Unsupported filter: {name}")
+        if isinstance(value, list):
+            value = sorted(value, key=str)
+        result.add((name, json.dumps(value, sort_keys=True)))
+    return tuple(sorted(result))
+
+
+def feed_head(db: Session) -> int:
+    return db.execute(select(func.coalesce(func.max(GrantChange.id), 0))).scalar()
+
+
+def create_saved_search(db: Session, user_id: int, name: str, filters: Dict[str, Any],
+                        is_alert_enabled: bool = False) -> SavedSearch:
+    """Save a search (no commit). With alerts enabled it gets a default alert."""
+    predicates(filters)
+    search = SavedSearch(
+        user_id=user_id, name=name, filters=filters, is_alert_enabled=is_alert_enabled,
+        watermark=feed_head(db)
+    )
+    db.add(search)
+    db.flush()
+    if is_alert_enabled:
+        db.add(GrantAlert(user_id=user_id, search_id=search.id, name=name, conditions={}))
+        db.flush()
+    return search
+
+
+def create_alert(db: Session, search: SavedSearch, name: str, conditions: Dict[str, Any]) -> GrantAlert:
+    """Add an alert to a saved search (no commit); enables alerts on the search."""
+    predicates(conditions)
+    if not search.is_alert_enabled:
+        # Evaluation starts from now, not from when the search was saved
+        search.is_alert_enabled = True
+        search.watermark = feed_head(db)
+    alert = GrantAlert(user_id=search.user_id, search_id=search.id, name=name, conditions=conditions)
+    db.add(alert)
+    db.flush()
+    return alert
+
+
+def _changed_grants(db: Session, low: int, head: int) -> Tuple[List[Grant], List[int], List[str]]:
+    """Grants changed in ``(low, head]`` with their latest cursor and op."""
+    latest = db.execute(
+        select(GrantChange.grant_id, func.max(GrantChange.id))
+        .where(GrantChange.id > low, GrantChange.id <= head)
+        .group_by(GrantChange.grant_id)
+    ).all()
+    if not latest:
+        return [], [], []
+    cursors = dict(latest)
+    ops = dict(db.execute(select(GrantChange.id, GrantChange.op).where(GrantChange.id.in_(list(cursors.values())))).all())
+    grants = (
+        db.query(Grant)
+        .filter(Grant.id.in_(list(cursors)), Grant.canonical_id.is_(None))
+        .order_by(Grant.id)
+        .all()
+    )
+    return grants, [cursors[grant.id] for grant in grants], [ops[cursors[grant.id]] for grant in grants]
+
+
+def _bitset(grants: List[Grant], test: Callable[[Grant], bool]) -> int:
+    bits = 0
+    for i, grant in enumerate(grants):
+        if test(grant):
+            bits |= 1 << i
+    return bits
+
+
+def evaluate_saved_searches(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Fire alerts for grants changed since each search's watermark (no commit)."""
+    now = now or datetime.utcnow()
+    searches = db.query(SavedSearch).filter(SavedSearch.is_alert_enabled.is_(True)).all()
+    stats = {"searches": len(searches), "alerts": 0, "grants": 0, "predicates": 0, "matches": 0}
+    if not searches:
+        return stats
+
+    head = feed_head(db)
+    pending = [search for search in searches if search.watermark < head]
+    if not pending:
+        return stats
+
+    alerts_by_search: Dict[int, List[GrantAlert]] = defaultdict(list)
+    for alert in db.query(GrantAlert).filter(
+        GrantAlert.search_id.in_([search.id for search in pending]),
+        GrantAlert.is_active.is_(True)
+    ):
+        alerts_by_search[alert.search_id].append(alert)
+
+    grants, cursors, ops = _changed_grants(db, min(search.watermark for search in pending), head)
+    stats["grants"] = len(grants)
+
+    predicate_bits: Dict[Predicate, int] = {}
+    fresh_bits: Dict[int, int] = {}
+    fired: Dict[int, List[int]] = {}  # alert id -> positions in grants
+    alerts: Dict[int, GrantAlert] = {}
+    for search in pending:
+        if search.watermark not in fresh_bits:
+            fresh_bits[search.watermark] = sum(
+                1 << i for i, cursor in enumerate(cursors) if cursor > search.watermark
+            )
+        base_predicates = predicates(search.filters)
+        for alert in alerts_by_search.get(search.id, []):
+            stats["alerts"] += 1
+            bits = fresh_bits[search.watermark]
+            for predicate in sorted(set(base_predicates) | set(predicates(alert.conditions))):
+                if not bits:
+                    break
+                if predicate not in predicate_bits:
+                    name, value = predicate
+                    test, decoded = FILTERS[name], json.loads(value)
+                    predicate_bits[predicate] = _bitset(grants, lambda grant: test(grant, decoded))
+                bits &= predicate_bits[predicate]
+            if bits:
+                fired[alert.id] = [i for i in range(len(grants)) if bits >> i & 1]
+                alerts[alert.id] = alert
+        search.watermark = head
+
+    # A grant changing again doesn't re-fire an alert that already has it
+    existing = set()
+    if fired:
+        existing = set(db.execute(
+            select(GrantAlertMatch.alert_id, GrantAlertMatch.grant_id)
+            .where(GrantAlertMatch.alert_id.in_(list(fired)))
+            .where(GrantAlertMatch.grant_id.in_({grants[i].id for positions in fired.values() for i in positions}))
+        ).all())
+
+    searches_by_id = {search.id: search for search in pending}
+    matches: List[Dict[str, Any]] = []
+    for alert_id, positions in fired.items():
+        new = [i for i in positions if (alert_id, grants[i].id) not in existing]
+        if not new:
+            continue
+        matches.extend(
+            {"alert_id": alert_id, "grant_id": grants[i].id, "op": ops[i], "matched_at": now} for i in new
+        )
+        alert = alerts[alert_id]
+        alert.last_triggered = now
+        search = searches_by_id[alert.search_id]
+        search.result_count = (search.result_count or 0) + len(new)
+
+    if matches:
+        db.execute(insert(GrantAlertMatch), matches)
+    db.flush()
+    stats["predicates"] = len(predicate_bits)
+    stats["matches"] = len(matches)
+    logger.info(f"Saved-search alerts evaluated: {stats}")
+    return stats
+
+
+def unseen_matches(db: Session, user_id: int, limit: int = 100, mark_seen: bool = False) -> List[Tuple[GrantAlertMatch, GrantAlert, Grant]]:
+    """A user's alert matches not yet seen, newest first."""
+    rows = (
+        db.query(GrantAlertMatch, GrantAlert, Grant)
+        .join(GrantAlert, GrantAlert.id == GrantAlertMatch.alert_id)
+        .join(Grant, Grant.id == GrantAlertMatch.grant_id)
+        .filter(GrantAlert.user_id == user_id, GrantAlertMatch.seen_at.is_(None))
+        .order_by(GrantAlertMatch.id.desc())
+        .limit(limit)
+        .all()
+    )
+    if mark_seen:
+        now = datetime.utcnow()
+        for match, _, _ in rows:
+            match.seen_at = now
+        db.flush()
+    return rows
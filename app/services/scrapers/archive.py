@@ -0,0 +1,148 @@
+"""
+Raw page archive.
+
+Every page a scraper fetches live is kept, gzip-compressed and
+content-addressed (unchanged pages are stored once however often they are
+crawled), together with the URL, status and fetch time:
+
+    <root>/blobs/ab/ab12...ef.gz
+    <root>/<source>/fetches.jsonl     one line per fetch, appended as it happens
+
+The archive answers the same lookups as a ``FixtureStore`` (latest fetch of
+each request), so a scraper can be run against it with ``replaying()``.
+That is what ``reparse`` does: after a parser fix, the current parsers are
+rerun over the archived pages and the results upserted, without any network
+traffic:
+
+    python -m app.workers.scraper reparse philanthropic councils
+
+Appending to the log is the only write per fetch; the in-memory index for a
+source is built from the log on first use.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.scrapers.replay import BlobStore, Fixture, request_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArchivedFetch:
+    """One line of a source's fetch log."""
+    key: str
+    method: str
+    url: str
+    final_url: Optional[str]
+    status: int
+    sha256: str
+    size: int
+    fetched_at: str
+
+    def as_fixture(self) -> Fixture:
+        return Fixture(self.method, self.url, self.status, self.sha256, self.size, self.fetched_at)
+
+
+class PageArchive:
+    """Content-addressed archive of fetched pages, by source."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.blobs = BlobStore(self.root / "blobs")
+        self._indexes: Dict[str, Dict[str, ArchivedFetch]] = {}
+        self._lock = threading.Lock()
+
+    def _log_path(self, source: str) -> Path:
+        return self.root / source.replace("/", "_") / "fetches.jsonl"
+
+    def index(self, source: str) -> Dict[str, ArchivedFetch]:
+        """Latest fetch per request key for a source, loaded on first use."""
+        with self._lock:
+            if source not in self._indexes:
+                entries: Dict[str, ArchivedFetch] = {}
+                path = self._log_path(source)
+                if path.exists():
+                    with path.open(encoding="utf-8") as f:
+                        for line in f:
+                            line = line.strip()
+                            if not line:
+                                continue
+                            try:
+                                fetch = ArchivedFetch(**json.loads(line))
+                            except (TypeError, ValueError):
+                                # A torn last line from an interrupted run
+                                logger.warning(f"Skipping unreadable archive entry in {path}")
+                                continue
+                            entries[fetch.key] = fetch
+                self._indexes[source] = entries
+            return self._indexes[source]
+
+    def put(self, source: str, method: str, url: str, status: int, body: str,
+            kwargs: Optional[Dict[str, Any]] = None, final_url: Optional[str] = None) -> ArchivedFetch:
+        """Archive one fetch. Blocking file IO; call it from a thread in async code."""
+        raw = body.encode("utf-8")
+        fetch = ArchivedFetch(
+            key=request_key(method, url, kwargs),
+            method=method.upper(),
+            url=url,
+            final_url=final_url if final_url and final_url != url else None,
+            status=status,
+            sha256=self.blobs.put(raw),
+            size=len(raw),
+            fetched_at=datetime.utcnow().isoformat(timespec="seconds")
+        )
+        index = self.index(source)
+        path = self._log_path(source)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(fetch)) + "\n")
+            index[fetch.key] = fetch
+        return fetch
+
+    # FixtureStore interface, so replaying() can serve pages from the archive
+
+    def get(self, source: str, method: str, url: str,
+            kwargs: Optional[Dict[str, Any]] = None) -> Optional[Fixture]:
+        fetch = self.index(source).get(request_key(method, url, kwargs))
+        return fetch.as_fixture() if fetch else None
+
+    def body(self, fixture: Fixture) -> str:
+        return self.blobs.get(fixture.sha256).decode("utf-8")
+
+    def sources(self) -> List[str]:
+        """Sources with archived pages."""
+        if not self.root.exists():
+            return []
+        return sorted(p.parent.name for p in self.root.glob("*/fetches.jsonl"))
+
+    def summary(self, source: str) -> Dict[str, Any]:
+        entries = list(self.index(source).values())
+        ok = [entry for entry in entries if entry.status == 200]
+        return {
+            "urls": len(entries),
+            "pages": len(ok),
+            "bytes": sum(entry.size for entry in ok),
+            "oldest": min((entry.fetched_at for entry in ok), default=None),
+            "newest": max((entry.fetched_at for entry in ok), default=None)
+        }
+
+
+_archive: Optional[PageArchive] = None
+
+
+def get_page_archive() -> Optional[PageArchive]:
+    """The process-wide archive, or None when archiving is disabled."""
+    global _archive
+    if not settings.SCRAPER_ARCHIVE_ENABLED:
+        return None
+    if _archive is None or _archive.root != Path(settings.SCRAPER_ARCHIVE_DIR):
+        _archive = PageArchive(settings.SCRAPER_ARCHIVE_DIR)
+    return _archive
@@ -1,12 +1,11 @@
-import asyncio
 import logging
 import random
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, AsyncIterator
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin
 from .base_scraper import BaseScraper
+from .extraction import KeywordClassifier
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -17,9 +16,43 @@ class AustralianGrantsScraper(BaseScraper):
     specifically relevant to media, entertainment, and creative industries.
     """
     
+    # Source name -> page parser method
+    page_parsers = {
+        "screen_australia": "_parse_screen_australia",
+        "creative_australia": "_parse_creative_australia",
+        "business_gov": "_parse_business_gov",
+        "create_nsw": "_parse_create_nsw"
+    }
+    
+    categories = KeywordClassifier({
+        "industry_focus": ([
+            ("screen", ["screen", "film", "television", "tv", "movie", "cinema"]),
+            ("games", ["game", "gaming", "interactive", "digital"]),
+            ("arts", ["art", "creative", "culture", "music", "theatre"]),
+            ("media", ["media", "content", "production"])
+        ], "creative"),
+        "org_types": ([
+            ("individual", ["individual", "artist", "freelancer"]),
+            ("small_business", ["small business", "sme", "startup"]),
+            ("not_for_profit", ["non-profit", "not-for-profit", "charity"]),
+            ("company", ["company", "corporation", "enterprise"])
+        ], ["any"]),
+        "funding_purpose": ([
+            ("development", ["development", "develop", "create"]),
+            ("production", ["production", "produce", "make"]),
+            ("research", ["research", "study", "investigate"]),
+            ("marketing", ["marketing", "promotion", "distribute"])
+        ], ["development"]),
+        "audience_tags": ([
+            ("emerging", ["emerging", "new", "early career"]),
+            ("established", ["established", "experienced", "professional"]),
+            ("indigenous", ["indigenous", "aboriginal", "first nations"]),
+            ("diverse", ["diverse", "multicultural", "inclusive"])
+        ], ["general"])
+    })
+    
     def __init__(self, db_session: Session):
         super().__init__(db_session, "australian_grants")
-        self.scraped_grants = []
         self.urls_scraped = []
         self.rate_limits = {"requests_made": 0, "max_per_minute": 30}
         
@@ -34,7 +67,8 @@ class AustralianGrantsScraper(BaseScraper):
                     "/funding-and-support/games",
                     "/funding-and-support/online-and-games"
                 ],
-                "description": "Screen Australia - Government funding for screen content"
+                "description": "Screen Australia - Government funding for screen content",
+                "discovery": {"sitemaps": ["/sitemap.xml"], "include": [r"^/funding-and-support/"]}
             },
             "create_nsw": {
                 "base_url": "https://www.create.nsw.gov.au",
@@ -43,7 +77,8 @@ class AustralianGrantsScraper(BaseScraper):
                     "/funding-and-support/individuals",
                     "/funding-and-support/artists-and-creative-practitioners"
                 ],
-                "description": "Create NSW - NSW state government arts funding"
+                "description": "Create NSW - NSW state government arts funding",
+                "discovery": {"sitemaps": ["/sitemap.xml"], "include": [r"^/funding-and-support/"]}
             },
             "creative_australia": {
                 "base_url": "https://creative.gov.au",
@@ -52,7 +87,8 @@ class AustralianGrantsScraper(BaseScraper):
                     "/investment-and-development/arts-projects-for-organisations",
                     "/investment-and-development/four-year-funding"
                 ],
-                "description": "Creative Australia - Federal arts funding"
+                "description": "Creative Australia - Federal arts funding",
+                "discovery": {"sitemaps": ["/sitemap.xml"], "include": [r"^/investment-and-development/"]}
             },
             "business_gov": {
                 "base_url": "https://business.gov.au",
@@ -61,21 +97,22 @@ class AustralianGrantsScraper(BaseScraper):
                     "/grants-and-programs/arts-and-culture",
                     "/grants-and-programs/innovation-and-science"
                 ],
-                "description": "Business.gov.au - Creative industry grants"
+                "description": "Business.gov.au - Creative industry grants",
+                "discovery": {"sitemaps": ["/sitemap.xml"], "include": [r"^/grants-and-programs/"]}
             }
         }
     
-    async def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method that coordinates all source scraping."""
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield grants from all sources as each page is parsed."""
         logger.info("Starting Australian grants scraper")
-        
+        async for grant in self._stream_sites(self.sources, stagger=2, pause=(1, 3)):
+            yield grant
+    
+    async def scrape(self) -> List[Dict[str, Any]]:
+        """Scrape all sources and return the valid grants without saving them."""
         try:
-            # Run the async scraping
-            self.scraped_grants = await self._scrape_all_sources()
-            
-            # Filter and validate grants
             valid_grants = []
-            for grant in self.scraped_grants:
+            async for grant in self.stream():
                 if self._validate_grant_data(grant):
                     valid_grants.append(grant)
                 else:
@@ -88,69 +125,9 @@ class AustralianGrantsScraper(BaseScraper):
             logger.error(f"Error in main scrape method: {str(e)}")
             return []
     
-    async def _scrape_all_sources(self) -> List[Dict[str, Any]]:
-        """Scrape all sources concurrently with rate limiting."""
-        all_grants = []
-        
-        # Create tasks for each source with delays
-        tasks = []
-        for i, (source_name, source_config) in enumerate(self.sources.items()):
-            # Add progressive delay to avoid overwhelming servers
-            delay = i * 2  # 2 seconds between each source start
-            task = asyncio.create_task(self._scrape_source_with_delay(source_name, source_config, delay))
-            tasks.append(task)
-        
-        # Wait for all tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        for i, result in enumerate(results):
-            source_name = list(self.sources.keys())[i]
-            if isinstance(result, Exception):
-                logger.error(f"Error scraping {source_name}: {str(result)}")
-            else:
-                logger.info(f"Successfully scraped {len(result)} grants from {source_name}")
-                all_grants.extend(result)
-        
-        return all_grants
-    
-    async def _scrape_source_with_delay(self, source_name: str, source_config: Dict, delay: int) -> List[Dict[str, Any]]:
-        """Scrape a source with initial delay."""
-        if delay > 0:
-            logger.info(f"Waiting {delay} seconds before scraping {source_name}")
-            await asyncio.sleep(delay)
-        
-        return await self._scrape_source(source_name, source_config)
-    
     async def _scrape_source(self, source_name: str, source_config: Dict) -> List[Dict[str, Any]]:
-        """Scrape a specific source using the BaseScraper _make_request method."""
-        grants = []
-        base_url = source_config["base_url"]
-        
-        logger.info(f"Scraping {source_name} from {base_url}")
-        
-        # Create tasks for each endpoint with delays
-        for endpoint in source_config["endpoints"]:
-            try:
-                url = urljoin(base_url, endpoint)
-                
-                # Rate limiting
-                await self._rate_limit_delay()
-                
-                # Scrape the endpoint
-                endpoint_grants = await self._scrape_endpoint(source_name, url)
-                if endpoint_grants:
-                    grants.extend(endpoint_grants)
-                    logger.info(f"Found {len(endpoint_grants)} grants from {url}")
-                
-                # Add delay between endpoints
-                await asyncio.sleep(random.uniform(1, 3))
-                
-            except Exception as e:
-                logger.error(f"Error scraping endpoint {endpoint}: {str(e)}")
-                continue
-        
-        return grants
+        """Scrape a single source."""
+        return [grant async for grant in self._stream_site(source_name, source_config, 0, (1, 3))]
     
     async def _rate_limit_delay(self):
         """Implement rate limiting to be respectful to servers."""
@@ -160,7 +137,7 @@ class AustralianGrantsScraper(BaseScraper):
         if self.rate_limits["requests_made"] % 10 == 0:
             delay = random.uniform(2, 5)
             logger.info(f"Rate limiting: waiting {delay:.1f} seconds")
-            await asyncio.sleep(delay)
+            await self._polite_sleep(delay)
     
     async def _scrape_endpoint(self, source_name: str, url: str) -> List[Dict[str, Any]]:
         """Scrape a specific endpoint with retry logic."""
@@ -176,32 +153,19 @@ class AustralianGrantsScraper(BaseScraper):
                 html = await self._make_request(url)
                 if not html:
                     logger.warning(f"Failed to fetch {url} (attempt {attempt + 1})")
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(retry_delay * (attempt + 1))
+                    if attempt < max_retries - 1 and self._worth_retrying(url):
+                        await self._polite_sleep(retry_delay * (attempt + 1))
                         continue
                     return []
                 
-                soup = self._parse_html(html)
-                
-                # Use source-specific parsing logic
-                grants = []
-                if source_name == "screen_australia":
-                    grants = await self._parse_screen_australia(soup, url)
-                elif source_name == "creative_australia":
-                    grants = await self._parse_creative_australia(soup, url)
-                elif source_name == "business_gov":
-                    grants = await self._parse_business_gov(soup, url)
-                elif source_name == "create_nsw":
-                    grants = await self._parse_create_nsw(soup, url)
-                else:
-                    grants = await self._parse_generic(soup, url)
-                
-                return grants
+                # Use source-specific parsing logic, off the event loop
+                parser_name = self.page_parsers.get(source_name, "_parse_generic")
+                return await self._parse_page(html, url, parser_name)
                 
             except Exception as e:
                 logger.error(f"Error scraping {url} (attempt {attempt + 1}): {str(e)}")
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay * (attempt + 1))
+                    await self._polite_sleep(retry_delay * (attempt + 1))
                     continue
                 return []
         
@@ -473,130 +437,6 @@ class AustralianGrantsScraper(BaseScraper):
         
         return None
     
-    def _extract_amounts(self, text: str) -> tuple:
-        """Extract funding amounts from text."""
-        min_amount = None
-        max_amount = None
-        
-        # Look for dollar amounts
-        amount_patterns = [
-            r'\$([0-9,]+(?:\.[0-9]{2})?)',
-            r'([0-9,]+(?:\.[0-9]{2})?) dollars?',
-            r'up to \$([0-9,]+)',
-            r'maximum \$([0-9,]+)',
-            r'minimum \$([0-9,]+)'
-        ]
-        
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    amount = int(match.replace(',', ''))
-                    if 'up to' in text.lower() or 'maximum' in text.lower():
-                        max_amount = amount
-                    elif 'minimum' in text.lower():
-                        min_amount = amount
-                    else:
-                        # If no qualifier, assume it's the maximum
-                        max_amount = amount
-                except ValueError:
-                    continue
-        
-        return min_amount, max_amount
-    
-    def _extract_dates(self, text: str) -> Dict[str, Optional[str]]:
-        """Extract dates from text."""
-        dates = {"open_date": None, "deadline": None}
-        
-        # Look for date patterns
-        date_patterns = [
-            r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
-            r'(\d{1,2} [A-Za-z]+ \d{4})',
-            r'([A-Za-z]+ \d{1,2}, \d{4})',
-            r'(\d{4}-\d{2}-\d{2})'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                # Try to determine if it's an open date or deadline
-                context = text[max(0, text.find(match) - 50):text.find(match) + 50].lower()
-                if any(word in context for word in ['open', 'start', 'begin']):
-                    dates["open_date"] = match
-                elif any(word in context for word in ['close', 'deadline', 'due', 'end']):
-                    dates["deadline"] = match
-        
-        return dates
-    
-    def _extract_email(self, text: str) -> Optional[str]:
-        """Extract email address from text."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else None
-    
-    def _determine_industry_focus(self, text: str) -> str:
-        """Determine industry focus from text."""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['screen', 'film', 'television', 'tv', 'movie', 'cinema']):
-            return "screen"
-        elif any(word in text_lower for word in ['game', 'gaming', 'interactive', 'digital']):
-            return "games"
-        elif any(word in text_lower for word in ['art', 'creative', 'culture', 'music', 'theatre']):
-            return "arts"
-        elif any(word in text_lower for word in ['media', 'content', 'production']):
-            return "media"
-        else:
-            return "creative"
-    
-    def _extract_org_types(self, text: str) -> List[str]:
-        """Extract organization types from text."""
-        text_lower = text.lower()
-        org_types = []
-        
-        if any(word in text_lower for word in ['individual', 'artist', 'freelancer']):
-            org_types.append("individual")
-        if any(word in text_lower for word in ['small business', 'sme', 'startup']):
-            org_types.append("small_business")
-        if any(word in text_lower for word in ['non-profit', 'not-for-profit', 'charity']):
-            org_types.append("not_for_profit")
-        if any(word in text_lower for word in ['company', 'corporation', 'enterprise']):
-            org_types.append("company")
-        
-        return org_types if org_types else ["any"]
-    
-    def _extract_funding_purpose(self, text: str) -> List[str]:
-        """Extract funding purpose from text."""
-        text_lower = text.lower()
-        purposes = []
-        
-        if any(word in text_lower for word in ['development', 'develop', 'create']):
-            purposes.append("development")
-        if any(word in text_lower for word in ['production', 'produce', 'make']):
-            purposes.append("production")
-        if any(word in text_lower for word in ['research', 'study', 'investigate']):
-            purposes.append("research")
-        if any(word in text_lower for word in ['marketing', 'promotion', 'distribute']):
-            purposes.append("marketing")
-        
-        return purposes if purposes else ["development"]
-    
-    def _extract_audience_tags(self, text: str) -> List[str]:
-        """Extract audience tags from text."""
-        text_lower = text.lower()
-        tags = []
-        
-        if any(word in text_lower for word in ['emerging', 'new', 'early career']):
-            tags.append("emerging")
-        if any(word in text_lower for word in ['established', 'experienced', 'professional']):
-            tags.append("established")
-        if any(word in text_lower for word in ['indigenous', 'aboriginal', 'first nations']):
-            tags.append("indigenous")
-        if any(word in text_lower for word in ['diverse', 'multicultural', 'inclusive']):
-            tags.append("diverse")
-        
-        return tags if tags else ["general"]
-    
     def _validate_grant_data(self, data: Dict[str, Any]) -> bool:
         """Enhanced validation for grant data."""
         if not super()._validate_grant_data(data):
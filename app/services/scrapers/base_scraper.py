@@ -1,13 +1,30 @@
+import asyncio
+import random
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from datetime import datetime
 import logging
+import time
+from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from app.core.security import verify_external_request
+from app.core.api_client import get_connection_metrics
+from app.core.security import verify_external_url
 from app.core.config import settings
-from app.models.grant import Grant
+from app.services.scrapers.archive import get_page_archive
+from app.services.scrapers.discovery import parse_feed, parse_sitemap, plan_endpoints
+from app.services.scrapers.extraction import (
+    KeywordClassifier, extract_amounts, extract_dates, extract_email, parse_date
+)
+from app.services.scrapers.frontier import UrlFrontier
+from app.services.scrapers.http_pool import get_http_session
+from app.services.scrapers.ingest import IngestResult, upsert_grants
+from app.services.scrapers.known_grants import known_grants_for
+from app.services.scrapers.parse_pool import make_soup, parse_page
+from app.services.scrapers.pipeline import merge_streams
+from app.services.scrapers.replay import current_fixtures
+from app.services.scrapers.telemetry import RunTelemetry, request_url
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,6 +32,12 @@ logger = logging.getLogger(__name__)
 class BaseScraper(ABC):
     """Base class for all grant scrapers."""
     
+    # Keyword tables behind the category extractors, defined per scraper
+    categories: Optional[KeywordClassifier] = None
+    
+    # API scrapers fetch one URL per record; those are not endpoints worth tracking
+    frontier_tracking: bool = True
+    
     def __init__(self, db_session: Session, source_id: str):
         """Initialize the scraper with a database session and source ID."""
         if source_id not in settings.ALLOWED_SCRAPER_SOURCES:
@@ -24,6 +47,22 @@ class BaseScraper(ABC):
         self.source_id = source_id
         self.source_config = settings.ALLOWED_SCRAPER_SOURCES[source_id]
         self.base_url = self.source_config["base_url"]
+        
+        # Set by save_grants when the scraper writes its own results
+        self.ingest_result: Optional[IngestResult] = None
+        
+        # Set by ScraperService; skips quarantined endpoints and follows known redirects
+        self.frontier: Optional[UrlFrontier] = None
+        
+        # Per-site counts from sitemap/feed discovery, for the scraper log
+        self.discovery_stats: Dict[str, Dict[str, int]] = {}
+        
+        # Per-URL fetch/parse timings for this run, saved by ScraperService
+        self.telemetry = RunTelemetry()
+        
+        # Set by ScraperService; known grants are skipped while the dataset still matches it
+        self.applied_seed_checksum: Optional[str] = None
+        self.seed_report: Dict[str, Any] = {}
     
     @abstractmethod
     async def scrape(self) -> List[Dict[str, Any]]:
@@ -56,22 +95,225 @@ class BaseScraper(ABC):
         return normalized
     
     async def _make_request(self, url: str, method: str = "GET", **kwargs) -> Optional[str]:
-        """Make a verified request to an external URL."""
+        """Make a verified request to an external URL; the body of a 200, else None."""
+        response_status, body = await self._fetch(url, method, **kwargs)
+        return body if response_status == 200 else None
+    
+    async def _fetch(self, url: str, method: str = "GET", **kwargs) -> Tuple[Optional[int], Optional[str]]:
+        """Like ``_make_request``, but returns ``(status, body)`` so callers can
+        tell a final 4xx from a failure worth retrying. Network errors give
+        ``(None, None)``; the body is None unless the status is 200."""
+        if not await verify_external_url(url):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access to this external domain is not allowed"
+            )
+        
+        fixtures = current_fixtures()
+        if fixtures is not None and fixtures.replaying:
+            return fixtures.respond(method, url, kwargs)
+        
+        # Only plain page fetches are tracked; API calls vary by params
+        frontier = self.frontier if self.frontier_tracking and method == "GET" and not kwargs.get("params") else None
+        fetch_url = url
+        if frontier is not None:
+            if not frontier.allow(url):
+                return None, None
+            fetch_url = frontier.resolve(url)
+            if fetch_url != url and not await verify_external_url(fetch_url):
+                fetch_url = url
+        
+        # Live fetches only; replayed fixtures would skew the upstream latency
+        parsed = urlparse(url)
+        metrics = get_connection_metrics(f"scraper_{self.source_id}", f"{parsed.scheme}://{parsed.netloc}")
+        telemetry_url = request_url(url, kwargs.get("params"))
+        started = time.perf_counter()
         try:
-            response = await verify_external_request(url, method, **kwargs)
-            if response and response.status == 200:
-                return await response.text()
-            else:
-                logger.error(f"Error fetching {url}: Status {response.status if response else 'No response'}")
-                return None
+            session = await get_http_session()
+            async with session.request(method, fetch_url, **kwargs) as response:
+                body = await response.text() if response.status == 200 else ""
+                elapsed = time.perf_counter() - started
+                metrics.record(parsed.path, response.status == 200, elapsed)
+                self.telemetry.record_fetch(telemetry_url, response.status, elapsed, len(body))
+                await self._archive_page(method, url, response, body, kwargs)
+                if fixtures is not None:
+                    fixtures.record(method, url, response.status, body, kwargs)
+                if frontier is not None:
+                    frontier.record(url, response.status, str(response.url))
+                if response.status == 200:
+                    return response.status, body
+                logger.error(f"Error fetching {url}: Status {response.status}")
+                return response.status, None
         except Exception as e:
+            elapsed = time.perf_counter() - started
+            metrics.record(parsed.path, False, elapsed)
+            self.telemetry.record_fetch(telemetry_url, None, elapsed, 0, error=f"{type(e).__name__}: {e}")
             logger.error(f"Error making request to {url}: {str(e)}")
-            return None
+            if frontier is not None:
+                # Redirect loops end up here as TooManyRedirects
+                frontier.record(url, None, error=f"{type(e).__name__}: {e}")
+            return None, None
+    
+    async def _archive_page(self, method: str, url: str, response, body: str, kwargs: Dict[str, Any]):
+        """Keep the raw response in the page archive for later re-parsing."""
+        archive = get_page_archive()
+        if archive is None:
+            return
+        try:
+            await asyncio.to_thread(
+                archive.put, self.source_id, method, url, response.status, body, kwargs, str(response.url)
+            )
+        except OSError as e:
+            logger.warning(f"Could not archive {url}: {str(e)}")
+    
+    async def _process_known_grants(self) -> List[Dict[str, Any]]:
+        """This source's known grants from the seed dataset, normalized."""
+        seed = known_grants_for(self.source_id)
+        if seed is None:
+            return []
+        return [self.normalize_grant_data(grant_data) for grant_data in seed.grants]
+    
+    async def _stream_known_grants(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the known grants, unless this version of them was already ingested."""
+        seed = known_grants_for(self.source_id)
+        if seed is None:
+            return
+        self.seed_report = {"version": seed.version, "checksum": seed.checksum[:12], "grants": len(seed.grants)}
+        if seed.checksum == self.applied_seed_checksum:
+            self.seed_report["skipped"] = True
+            return
+        for grant in await self._process_known_grants():
+            yield grant
+        self.seed_report["skipped"] = False
+    
+    def _worth_retrying(self, url: str) -> bool:
+        """Whether a failed fetch of ``url`` could succeed if tried again this run."""
+        return self.frontier is None or self.frontier.worth_retrying(url)
+    
+    async def _polite_sleep(self, seconds: float):
+        """Wait between requests to a live site; skipped when replaying fixtures."""
+        fixtures = current_fixtures()
+        if fixtures is not None and fixtures.replaying:
+            return
+        await asyncio.sleep(seconds)
+    
+    def _stream_sites(self, sites: Dict[str, Dict[str, Any]], stagger: float,
+                      pause: Tuple[float, float]) -> AsyncIterator[Dict[str, Any]]:
+        """Crawl several sites concurrently, yielding grants as each page is parsed.
+        
+        Each site is ``{"base_url": ..., "endpoints": [...]}``. Site starts are
+        staggered by ``stagger`` seconds and each site pauses a random
+        ``pause`` range between endpoints. Subclasses provide
+        ``_scrape_endpoint(site_name, url)`` and ``_rate_limit_delay()``.
+        """
+        return merge_streams(
+            self._stream_site(name, config, i * stagger, pause)
+            for i, (name, config) in enumerate(sites.items())
+        )
+    
+    async def _stream_site(self, site_name: str, site_config: Dict[str, Any], delay: float,
+                           pause: Tuple[float, float]) -> AsyncIterator[Dict[str, Any]]:
+        """Crawl one site's endpoints in order, yielding each page's grants."""
+        if delay > 0:
+            logger.info(f"Waiting {delay} seconds before scraping {site_name}")
+            await self._polite_sleep(delay)
+        
+        base_url = site_config["base_url"]
+        logger.info(f"Scraping {site_name} from {base_url}")
+        
+        urls = [urljoin(base_url, endpoint) for endpoint in site_config["endpoints"]]
+        if site_config.get("discovery") and settings.SCRAPER_DISCOVERY_ENABLED:
+            urls = await self._discover_endpoints(site_name, site_config, urls)
+        
+        found = 0
+        for url in urls:
+            if self.frontier is not None and not self.frontier.allow(url):
+                # Quarantined: no request, no rate-limit wait, no pause
+                continue
+            try:
+                await self._rate_limit_delay()
+                endpoint_grants = await self._scrape_endpoint(site_name, url)
+            except Exception as e:
+                logger.error(f"Error scraping {site_name} endpoint {url}: {str(e)}")
+                continue
+            
+            if endpoint_grants:
+                logger.info(f"Found {len(endpoint_grants)} grants from {url}")
+                found += len(endpoint_grants)
+                for grant in endpoint_grants:
+                    yield grant
+            
+            await self._polite_sleep(random.uniform(*pause))
+        
+        logger.info(f"Successfully scraped {found} grants from {site_name}")
+    
+    async def _discover_endpoints(self, site_name: str, site_config: Dict[str, Any],
+                                  urls: List[str]) -> List[str]:
+        """Rewrite a site's endpoint list from its sitemaps and feeds.
+        
+        Falls back to the fixed list if nothing could be read.
+        """
+        discovery = site_config["discovery"]
+        base_url = site_config["base_url"]
+        pages = []
+        
+        pending = [urljoin(base_url, path) for path in discovery.get("sitemaps", ["/sitemap.xml"])]
+        read = 0
+        while pending and read < settings.SCRAPER_DISCOVERY_MAX_SITEMAPS:
+            sitemap_url = pending.pop(0)
+            read += 1
+            try:
+                xml = await self._make_request(sitemap_url)
+            except Exception as e:
+                logger.warning(f"Could not read sitemap {sitemap_url}: {str(e)}")
+                continue
+            if not xml:
+                continue
+            sitemap_pages, children = await asyncio.to_thread(parse_sitemap, xml)
+            pages.extend(sitemap_pages)
+            # Compressed sitemaps are not supported; newest children first
+            children = sorted(
+                (child for child in children if not child.url.endswith(".gz")),
+                key=lambda child: child.lastmod or datetime.min, reverse=True
+            )
+            pending.extend(child.url for child in children)
+        
+        for path in discovery.get("feeds", []):
+            feed_url = urljoin(base_url, path)
+            try:
+                xml = await self._make_request(feed_url)
+            except Exception as e:
+                logger.warning(f"Could not read feed {feed_url}: {str(e)}")
+                continue
+            if xml:
+                pages.extend(await asyncio.to_thread(parse_feed, xml))
+        
+        if not pages:
+            return urls
+        
+        last_success = self.frontier.last_success if self.frontier is not None else (lambda url: None)
+        planned, stats = plan_endpoints(
+            base_url, urls, pages, discovery.get("include", []), last_success,
+            settings.SCRAPER_DISCOVERY_MAX_PAGES
+        )
+        self.discovery_stats[site_name] = stats
+        logger.info(
+            f"Discovery for {site_name}: {stats['listed']} pages listed, {stats['new_pages']} new, "
+            f"{stats['unchanged_skipped']} unchanged skipped"
+        )
+        return planned
+    
+    async def _parse_page(self, html: str, url: str, parser_name: str) -> List[Dict[str, Any]]:
+        """Run the named ``_parse_*`` method over a page in the parse pool."""
+        started = time.perf_counter()
+        grants = await parse_page(type(self), html, url, parser_name)
+        self.telemetry.record_parse(url, time.perf_counter() - started, len(grants))
+        return grants
     
     def _parse_html(self, html: str) -> BeautifulSoup:
         """Parse HTML content safely."""
         try:
-            return BeautifulSoup(html, 'html.parser')
+            return make_soup(html)
         except Exception as e:
             logger.error(f"Error parsing HTML: {str(e)}")
             raise HTTPException(
@@ -87,73 +329,64 @@ class BaseScraper(ABC):
     
     def _parse_date(self, date_input) -> Optional[datetime]:
         """Parse date string or datetime object into datetime object."""
-        if not date_input:
-            return None
-        
-        # If it's already a datetime object, return it
-        if isinstance(date_input, datetime):
-            return date_input
-        
-        # If it's not a string, try to convert it
-        if not isinstance(date_input, str):
-            try:
-                date_str = str(date_input)
-            except:
-                logger.warning(f"Could not convert date input to string: {date_input}")
-                return None
-        else:
-            date_str = date_input
-            
-        date_formats = [
-            "%Y-%m-%d",  # 2024-03-20
-            "%d/%m/%Y",  # 20/03/2024
-            "%d-%m-%Y",  # 20-03-2024
-            "%Y/%m/%d",  # 2024/03/20
-            "%d %b %Y",  # 20 Mar 2024
-            "%d %B %Y",  # 20 March 2024
-            "%B %d, %Y"  # March 20, 2024
-        ]
-        
-        for date_format in date_formats:
-            try:
-                return datetime.strptime(date_str.strip(), date_format)
-            except ValueError:
-                continue
-        
-        logger.warning(f"Could not parse date: {date_str}")
-        return None
+        return parse_date(date_input)
+    
+    def _extract_amounts(self, text: str) -> Tuple[Optional[int], Optional[int]]:
+        """Extract funding amounts (min, max) from text."""
+        return extract_amounts(text)
+    
+    def _extract_dates(self, text: str) -> Dict[str, Optional[str]]:
+        """Extract opening date and deadline from text."""
+        return extract_dates(text)
+    
+    def _extract_email(self, text: str) -> Optional[str]:
+        """Extract email address from text."""
+        return extract_email(text)
+    
+    def _determine_industry_focus(self, text: str) -> str:
+        """Determine industry focus from text."""
+        return self.categories.classify("industry_focus", text)
+    
+    def _extract_org_types(self, text: str) -> List[str]:
+        """Extract organization types from text."""
+        return self.categories.classify("org_types", text)
+    
+    def _extract_funding_purpose(self, text: str) -> List[str]:
+        """Extract funding purpose from text."""
+        return self.categories.classify("funding_purpose", text)
+    
+    def _extract_audience_tags(self, text: str) -> List[str]:
+        """Extract audience tags from text."""
+        return self.categories.classify("audience_tags", text)
     
     def _validate_grant_data(self, data: Dict[str, Any]) -> bool:
         """Validate grant data before saving."""
         required_fields = ["title", "description", "source_url"]
         return all(data.get(field) for field in required_fields)
     
-    async def save_grants(self, grants: List[Dict[str, Any]]) -> List[Grant]:
-        """Save scraped grants to the database."""
-        saved_grants = []
+    async def save_grants(self, grants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Upsert scraped grants into the database and return the valid ones.
+        
+        Counts are accumulated in ``self.ingest_result`` for the scraper log.
+        """
+        valid_grants = []
         for grant_data in grants:
             if not self._validate_grant_data(grant_data):
                 logger.warning(f"Invalid grant data from {self.source_id}: {grant_data}")
                 continue
-            
-            try:
-                grant = Grant(
-                    source=self.source_id,
-                    **grant_data
-                )
-                self.db.add(grant)
-                saved_grants.append(grant)
-            except Exception as e:
-                logger.error(f"Error saving grant from {self.source_id}: {str(e)}")
-                continue
+            valid_grants.append(grant_data)
         
         try:
+            result = upsert_grants(self.db, self.source_id, valid_grants)
             self.db.commit()
-            return saved_grants
         except Exception as e:
-            logger.error(f"Error committing grants to database: {str(e)}")
+            logger.error(f"Error saving grants to database: {str(e)}")
             self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error saving grants to database"
-            ) 
\ No newline at end of file
+            )
+        
+        result.skipped += len(grants) - len(valid_grants)
+        self.ingest_result = result if self.ingest_result is None else self.ingest_result.merge(result)
+        return valid_grants
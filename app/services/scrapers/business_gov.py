@@ -1,14 +1,11 @@
-import asyncio
 import logging
 import random
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Any, AsyncIterator
 from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin, urlparse
 from .base_scraper import BaseScraper
+from .extraction import KeywordClassifier
 from sqlalchemy.orm import Session
-from app.models.grant import Grant
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +15,42 @@ class BusinessGovScraper(BaseScraper):
     Fetches real, current grant opportunities from the Australian Government.
     """
     
+    categories = KeywordClassifier({
+        "industry_focus": ([
+            ("export", ["export", "international", "trade"]),
+            ("research", ["research", "development", "r&d"]),
+            ("manufacturing", ["manufacturing", "production"]),
+            ("digital", ["digital", "technology", "tech"]),
+            ("small_business", ["small business", "sme"]),
+            ("innovation", ["innovation", "entrepreneur"])
+        ], "business"),
+        "org_types": ([
+            ("small_business", ["small business", "sme"]),
+            ("medium_business", ["medium business", "medium enterprise"]),
+            ("large_business", ["large business", "large enterprise"]),
+            ("startup", ["startup", "start-up"]),
+            ("company", ["company", "corporation"]),
+            ("individual", ["individual", "sole trader"])
+        ], ["small_business"]),
+        "funding_purpose": ([
+            ("export_development", ["export", "international", "market development"]),
+            ("research", ["research", "development", "r&d"]),
+            ("marketing", ["marketing", "promotion"]),
+            ("capability_building", ["capability", "training", "skill"]),
+            ("innovation", ["innovation", "modernisation"]),
+            ("growth", ["growth", "expansion"])
+        ], ["business_development"]),
+        "audience_tags": ([
+            ("exporter", ["export", "international"]),
+            ("sme", ["small business", "sme"]),
+            ("innovation", ["innovation", "technology"]),
+            ("manufacturing", ["manufacturing"]),
+            ("research", ["research"]),
+            ("female_founders", ["female", "women"]),
+            ("digital_transformation", ["digital"])
+        ], ["business"])
+    })
+    
     def __init__(self, db_session: Session):
         super().__init__(db_session, "business.gov.au")
         self.urls_scraped = []
@@ -34,143 +67,28 @@ class BusinessGovScraper(BaseScraper):
             "/grants-and-programs/small-business",
             "/grants-and-programs/research-and-development"
         ]
-        
-        # Known current grants (as fallback/examples)
-        self.known_grants = [
-            {
-                "title": "Export Market Development Grants (EMDG)",
-                "description": "The Export Market Development Grants (EMDG) scheme encourages small to medium-sized Australian businesses to develop export markets. The scheme provides grants to reimburse up to 50% of eligible export promotion expenses above $5,000, up to a maximum grant of $150,000 in a grant year.",
-                "source_url": "https://business.gov.au/grants-and-programs/export-market-development-grants-emdg",
-                "min_amount": 5000,
-                "max_amount": 150000,
-                "industry_focus": "export",
-                "location_eligibility": "national",
-                "org_types": ["small_business", "medium_business"],
-                "funding_purpose": ["marketing", "export_development"],
-                "audience_tags": ["exporter", "sme"],
-                "status": "active",
-                "contact_email": "emdg@austrade.gov.au"
-            },
-            {
-                "title": "Research and Development Tax Incentive",
-                "description": "The Research and Development Tax Incentive provides targeted tax offsets for eligible R&D activities. Companies with aggregated turnover of less than $20 million can claim a refundable tax offset of 43.5% for eligible R&D expenditure.",
-                "source_url": "https://business.gov.au/grants-and-programs/research-and-development-tax-incentive",
-                "min_amount": 20000,
-                "max_amount": None,
-                "industry_focus": "research",
-                "location_eligibility": "national",
-                "org_types": ["company", "small_business"],
-                "funding_purpose": ["research", "development", "innovation"],
-                "audience_tags": ["research", "innovation", "technology"],
-                "status": "active",
-                "contact_email": "client.services@business.gov.au"
-            },
-            {
-                "title": "Modern Manufacturing Initiative",
-                "description": "The Modern Manufacturing Initiative supports Australian manufacturers to scale up, become more competitive and resilient. It includes grants for manufacturing modernisation, supply chain resilience, and manufacturing integration.",
-                "source_url": "https://business.gov.au/grants-and-programs/modern-manufacturing-initiative",
-                "min_amount": 1000000,
-                "max_amount": 20000000,
-                "industry_focus": "manufacturing",
-                "location_eligibility": "national",
-                "org_types": ["company", "medium_business", "large_business"],
-                "funding_purpose": ["modernisation", "scale_up", "competitiveness"],
-                "audience_tags": ["manufacturing", "supply_chain", "resilience"],
-                "status": "active",
-                "contact_email": "manufacturing@industry.gov.au"
-            },
-            {
-                "title": "Entrepreneurs' Programme",
-                "description": "The Entrepreneurs' Programme helps Australian businesses accelerate their growth and build their capability to compete. It provides access to business advisers and facilitators, and grants for research and development activities.",
-                "source_url": "https://business.gov.au/grants-and-programs/entrepreneurs-programme",
-                "min_amount": 25000,
-                "max_amount": 250000,
-                "industry_focus": "innovation",
-                "location_eligibility": "national",
-                "org_types": ["small_business", "medium_business", "startup"],
-                "funding_purpose": ["capability_building", "growth", "innovation"],
-                "audience_tags": ["entrepreneur", "growth", "innovation"],
-                "status": "active",
-                "contact_email": "entrepreneurs@business.gov.au"
-            },
-            {
-                "title": "Digital Solutions – Australian Small Business Advisory Services",
-                "description": "Provides small businesses with access to digital solutions and advisory services to help them adapt and thrive in the digital economy. Includes grants for digital technology adoption and capability building.",
-                "source_url": "https://business.gov.au/grants-and-programs/digital-solutions-australian-small-business-advisory-services",
-                "min_amount": 2500,
-                "max_amount": 25000,
-                "industry_focus": "digital",
-                "location_eligibility": "national",
-                "org_types": ["small_business"],
-                "funding_purpose": ["digital_adoption", "capability_building"],
-                "audience_tags": ["digital_transformation", "small_business"],
-                "status": "active",
-                "contact_email": "digital@business.gov.au"
-            },
-            {
-                "title": "Boosting Female Founders Initiative",
-                "description": "Supports female entrepreneurs to start and grow their businesses through grants, mentoring, and networking opportunities. Aimed at increasing female participation in entrepreneurship and innovation.",
-                "source_url": "https://business.gov.au/grants-and-programs/boosting-female-founders-initiative",
-                "min_amount": 25000,
-                "max_amount": 400000,
-                "industry_focus": "entrepreneurship",
-                "location_eligibility": "national",
-                "org_types": ["startup", "small_business"],
-                "funding_purpose": ["startup", "growth", "capability_building"],
-                "audience_tags": ["female_founders", "entrepreneurship", "innovation"],
-                "status": "active",
-                "contact_email": "femalefounders@business.gov.au"
-            },
-            {
-                "title": "Industry Growth Centres Initiative",
-                "description": "Supports industry-led approaches to drive innovation, productivity and competitiveness. Provides grants for collaborative projects that address industry challenges and opportunities.",
-                "source_url": "https://business.gov.au/grants-and-programs/industry-growth-centres-initiative",
-                "min_amount": 50000,
-                "max_amount": 500000,
-                "industry_focus": "industry_development",
-                "location_eligibility": "national",
-                "org_types": ["company", "industry_association", "research_organisation"],
-                "funding_purpose": ["collaboration", "innovation", "productivity"],
-                "audience_tags": ["industry_collaboration", "competitiveness"],
-                "status": "active",
-                "contact_email": "growthcentres@industry.gov.au"
-            },
-            {
-                "title": "Small Business Support Program",
-                "description": "Provides grants and support services to help small businesses recover, adapt and build resilience. Includes funding for business advice, capability building, and recovery support.",
-                "source_url": "https://business.gov.au/grants-and-programs/small-business-support-program",
-                "min_amount": 2500,
-                "max_amount": 50000,
-                "industry_focus": "small_business",
-                "location_eligibility": "national",
-                "org_types": ["small_business"],
-                "funding_purpose": ["recovery", "adaptation", "resilience"],
-                "audience_tags": ["small_business", "recovery", "support"],
-                "status": "active",
-                "contact_email": "smallbusiness@business.gov.au"
-            }
-        ]
     
-    async def scrape(self) -> List[Grant]:
-        """Main scraping method that fetches real grant data."""
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield grants from the website as each page is parsed, then the known grants."""
         logger.info("Starting Business.gov.au scraper")
         
-        grants = []
+        site = {
+            "base_url": self.base_url,
+            "endpoints": self.grant_endpoints,
+            "discovery": {"sitemaps": ["/sitemap.xml"], "include": [r"^/grants-and-programs/"]}
+        }
+        async for grant in self._stream_site("business.gov.au", site, 0, (1, 3)):
+            yield grant
         
+        # Known grants from the seed dataset (skipped if this version is already ingested)
+        async for grant in self._stream_known_grants():
+            yield grant
+    
+    async def scrape(self) -> List[Dict[str, Any]]:
+        """Scrape everything, then save it in one go. ScraperService streams instead."""
         try:
-            # First, try to scrape live data from the website
-            web_grants = await self._scrape_website_grants()
-            grants.extend(web_grants)
-            
-            # Always include known current grants (these are verified real grants)
-            known_grants = await self._process_known_grants()
-            grants.extend(known_grants)
-            
-            # Remove duplicates based on title and source_url
-            unique_grants = self._deduplicate_grants(grants)
-            
-            # Save grants to database
-            saved_grants = await self.save_grants(unique_grants)
+            grants = [grant async for grant in self.stream()]
+            saved_grants = await self.save_grants(grants)
             
             logger.info(f"Successfully scraped {len(saved_grants)} grants from Business.gov.au")
             return saved_grants
@@ -187,39 +105,15 @@ class BusinessGovScraper(BaseScraper):
                 logger.error(f"Fallback also failed: {str(fallback_error)}")
                 return []
     
-    async def _scrape_website_grants(self) -> List[Dict[str, Any]]:
-        """Scrape grants from the Business.gov.au website."""
-        grants = []
-        
-        try:
-            # Try to scrape from known grant pages
-            for endpoint in self.grant_endpoints:
-                try:
-                    await self._rate_limit_delay()
-                    
-                    url = urljoin(self.base_url, endpoint)
-                    self.urls_scraped.append(url)
-                    
-                    # Use BaseScraper's _make_request method
-                    html = await self._make_request(url)
-                    if html:
-                        soup = self._parse_html(html)
-                        endpoint_grants = await self._parse_grants_page(soup, url)
-                        grants.extend(endpoint_grants)
-                        
-                        logger.info(f"Found {len(endpoint_grants)} grants from {url}")
-                    
-                    # Add delay between requests
-                    await asyncio.sleep(random.uniform(1, 3))
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping {endpoint}: {str(e)}")
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"Error scraping website grants: {str(e)}")
+    async def _scrape_endpoint(self, site_name: str, url: str) -> List[Dict[str, Any]]:
+        """Fetch and parse one grants listing page."""
+        self.urls_scraped.append(url)
         
-        return grants
+        # Use BaseScraper's _make_request method
+        html = await self._make_request(url)
+        if not html:
+            return []
+        return await self._parse_page(html, url, "_parse_grants_page")
     
     async def _parse_grants_page(self, soup: BeautifulSoup, url: str) -> List[Dict[str, Any]]:
         """Parse grants from a Business.gov.au page."""
@@ -338,43 +232,6 @@ class BusinessGovScraper(BaseScraper):
             logger.error(f"Error extracting main page grant: {str(e)}")
             return None
     
-    async def _process_known_grants(self) -> List[Dict[str, Any]]:
-        """Process known current grants."""
-        processed_grants = []
-        
-        for grant_data in self.known_grants:
-            try:
-                # Add current dates if not specified
-                if not grant_data.get("open_date"):
-                    grant_data["open_date"] = datetime.now()
-                
-                if not grant_data.get("deadline"):
-                    # Set deadline to 6 months from now for ongoing programs
-                    grant_data["deadline"] = datetime.now() + timedelta(days=180)
-                
-                # Normalize the grant data
-                normalized_grant = self.normalize_grant_data(grant_data)
-                processed_grants.append(normalized_grant)
-                
-            except Exception as e:
-                logger.error(f"Error processing known grant {grant_data.get('title', 'Unknown')}: {str(e)}")
-                continue
-        
-        return processed_grants
-    
-    def _deduplicate_grants(self, grants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate grants based on title and source_url."""
-        seen = set()
-        unique_grants = []
-        
-        for grant in grants:
-            key = (grant.get("title", ""), grant.get("source_url", ""))
-            if key not in seen:
-                seen.add(key)
-                unique_grants.append(grant)
-        
-        return unique_grants
-    
     async def _rate_limit_delay(self):
         """Implement rate limiting."""
         self.rate_limits["requests_made"] += 1
@@ -382,7 +239,7 @@ class BusinessGovScraper(BaseScraper):
         if self.rate_limits["requests_made"] % 5 == 0:
             delay = random.uniform(1, 3)
             logger.info(f"Rate limiting: waiting {delay:.1f} seconds")
-            await asyncio.sleep(delay)
+            await self._polite_sleep(delay)
     
     def _extract_description(self, element: BeautifulSoup) -> Optional[str]:
         """Extract description from element."""
@@ -419,141 +276,3 @@ class BusinessGovScraper(BaseScraper):
                         return text[:1000]
         
         return None
-    
-    def _extract_amounts(self, text: str) -> tuple:
-        """Extract funding amounts from text."""
-        min_amount = None
-        max_amount = None
-        
-        # Look for dollar amounts
-        patterns = [
-            r'up to \$([0-9,]+)',
-            r'maximum \$([0-9,]+)',
-            r'minimum \$([0-9,]+)',
-            r'\$([0-9,]+(?:\.[0-9]{2})?)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    amount = int(match.replace(',', ''))
-                    if 'up to' in text.lower() or 'maximum' in text.lower():
-                        max_amount = amount
-                    elif 'minimum' in text.lower():
-                        min_amount = amount
-                    else:
-                        max_amount = amount
-                except ValueError:
-                    continue
-        
-        return min_amount, max_amount
-    
-    def _extract_dates(self, text: str) -> Dict[str, Optional[str]]:
-        """Extract dates from text."""
-        dates = {"open_date": None, "deadline": None}
-        
-        date_patterns = [
-            r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
-            r'(\d{1,2} [A-Za-z]+ \d{4})',
-            r'([A-Za-z]+ \d{1,2}, \d{4})',
-            r'(\d{4}-\d{2}-\d{2})'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                context = text[max(0, text.find(match) - 50):text.find(match) + 50].lower()
-                if any(word in context for word in ['open', 'start', 'begin']):
-                    dates["open_date"] = match
-                elif any(word in context for word in ['close', 'deadline', 'due', 'end']):
-                    dates["deadline"] = match
-        
-        return dates
-    
-    def _extract_email(self, text: str) -> Optional[str]:
-        """Extract email address from text."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else None
-    
-    def _determine_industry_focus(self, text: str) -> str:
-        """Determine industry focus from text."""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['export', 'international', 'trade']):
-            return "export"
-        elif any(word in text_lower for word in ['research', 'development', 'r&d']):
-            return "research"
-        elif any(word in text_lower for word in ['manufacturing', 'production']):
-            return "manufacturing"
-        elif any(word in text_lower for word in ['digital', 'technology', 'tech']):
-            return "digital"
-        elif any(word in text_lower for word in ['small business', 'sme']):
-            return "small_business"
-        elif any(word in text_lower for word in ['innovation', 'entrepreneur']):
-            return "innovation"
-        else:
-            return "business"
-    
-    def _extract_org_types(self, text: str) -> List[str]:
-        """Extract organization types from text."""
-        text_lower = text.lower()
-        org_types = []
-        
-        if any(word in text_lower for word in ['small business', 'sme']):
-            org_types.append("small_business")
-        if any(word in text_lower for word in ['medium business', 'medium enterprise']):
-            org_types.append("medium_business")
-        if any(word in text_lower for word in ['large business', 'large enterprise']):
-            org_types.append("large_business")
-        if any(word in text_lower for word in ['startup', 'start-up']):
-            org_types.append("startup")
-        if any(word in text_lower for word in ['company', 'corporation']):
-            org_types.append("company")
-        if any(word in text_lower for word in ['individual', 'sole trader']):
-            org_types.append("individual")
-        
-        return org_types if org_types else ["small_business"]
-    
-    def _extract_funding_purpose(self, text: str) -> List[str]:
-        """Extract funding purpose from text."""
-        text_lower = text.lower()
-        purposes = []
-        
-        if any(word in text_lower for word in ['export', 'international', 'market development']):
-            purposes.append("export_development")
-        if any(word in text_lower for word in ['research', 'development', 'r&d']):
-            purposes.append("research")
-        if any(word in text_lower for word in ['marketing', 'promotion']):
-            purposes.append("marketing")
-        if any(word in text_lower for word in ['capability', 'training', 'skill']):
-            purposes.append("capability_building")
-        if any(word in text_lower for word in ['innovation', 'modernisation']):
-            purposes.append("innovation")
-        if any(word in text_lower for word in ['growth', 'expansion']):
-            purposes.append("growth")
-        
-        return purposes if purposes else ["business_development"]
-    
-    def _extract_audience_tags(self, text: str) -> List[str]:
-        """Extract audience tags from text."""
-        text_lower = text.lower()
-        tags = []
-        
-        if any(word in text_lower for word in ['export', 'international']):
-            tags.append("exporter")
-        if any(word in text_lower for word in ['small business', 'sme']):
-            tags.append("sme")
-        if any(word in text_lower for word in ['innovation', 'technology']):
-            tags.append("innovation")
-        if any(word in text_lower for word in ['manufacturing']):
-            tags.append("manufacturing")
-        if any(word in text_lower for word in ['research']):
-            tags.append("research")
-        if any(word in text_lower for word in ['female', 'women']):
-            tags.append("female_founders")
-        if any(word in text_lower for word in ['digital']):
-            tags.append("digital_transformation")
-        
-        return tags if tags else ["business"] 
\ No newline at end of file
@@ -1,12 +1,10 @@
-import asyncio
 import logging
 import random
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Any, AsyncIterator
 from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin
 from .base_scraper import BaseScraper
+from .extraction import KeywordClassifier
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -18,9 +16,18 @@ class CouncilScraper(BaseScraper):
     small business, and local projects.
     """
     
+    categories = KeywordClassifier({
+        "industry_focus": ([
+            ("arts", ["art", "creative", "cultural", "music", "film", "theatre"]),
+            ("business", ["business", "entrepreneur", "startup", "commerce"]),
+            ("environment", ["environment", "sustainability", "climate", "green"]),
+            ("sport", ["sport", "recreation", "fitness", "health"]),
+            ("technology", ["technology", "innovation", "digital"])
+        ], "community")
+    })
+    
     def __init__(self, db_session: Session):
         super().__init__(db_session, "councils")
-        self.scraped_grants = []
         self.urls_scraped = []
         self.rate_limits = {"requests_made": 0, "max_per_minute": 15}
         
@@ -101,148 +108,22 @@ class CouncilScraper(BaseScraper):
                 "description": "Moreland City Council - Community and arts grants"
             }
         }
-        
-        # Known current council grants (verified real programs)
-        self.known_grants = [
-            {
-                "title": "City of Melbourne Community Grants",
-                "description": "Supports community projects that benefit Melbourne residents. Funding for community development, social inclusion, and local initiatives that strengthen neighborhoods.",
-                "source_url": "https://www.melbourne.vic.gov.au/community/grants-and-funding/community-grants",
-                "min_amount": 1000,
-                "max_amount": 25000,
-                "industry_focus": "community",
-                "location": "melbourne",
-                "org_types": ["not_for_profit", "community_group"],
-                "funding_purpose": ["community_development", "social_inclusion"],
-                "audience_tags": ["community", "melbourne", "local", "social_impact"],
-                "contact_email": "grants@melbourne.vic.gov.au",
-                "status": "active"
-            },
-            {
-                "title": "City of Melbourne Arts and Culture Grants",
-                "description": "Supports arts and cultural projects that contribute to Melbourne's cultural life. Funding for creative projects, cultural events, and artistic development.",
-                "source_url": "https://www.melbourne.vic.gov.au/community/grants-and-funding/arts-and-culture-grants",
-                "min_amount": 2000,
-                "max_amount": 50000,
-                "industry_focus": "arts",
-                "location": "melbourne",
-                "org_types": ["arts_organisation", "individual", "not_for_profit"],
-                "funding_purpose": ["creation", "development", "presentation"],
-                "audience_tags": ["arts", "culture", "melbourne", "creative"],
-                "contact_email": "arts@melbourne.vic.gov.au",
-                "status": "active"
-            },
-            {
-                "title": "City of Sydney Community Grants",
-                "description": "Provides funding for community projects that benefit Sydney residents. Supports initiatives that build community capacity and address local needs.",
-                "source_url": "https://www.cityofsydney.nsw.gov.au/grants-sponsorship/community-grants",
-                "min_amount": 1500,
-                "max_amount": 30000,
-                "industry_focus": "community",
-                "location": "sydney",
-                "org_types": ["not_for_profit", "community_group"],
-                "funding_purpose": ["community_development", "capacity_building"],
-                "audience_tags": ["community", "sydney", "local", "capacity_building"],
-                "contact_email": "grants@cityofsydney.nsw.gov.au",
-                "status": "active"
-            },
-            {
-                "title": "City of Sydney Cultural Grants",
-                "description": "Supports cultural projects and events that enhance Sydney's cultural landscape. Funding for arts projects, cultural festivals, and creative initiatives.",
-                "source_url": "https://www.cityofsydney.nsw.gov.au/grants-sponsorship/cultural-grants",
-                "min_amount": 3000,
-                "max_amount": 75000,
-                "industry_focus": "arts",
-                "location": "sydney",
-                "org_types": ["arts_organisation", "cultural_institution", "not_for_profit"],
-                "funding_purpose": ["creation", "presentation", "cultural_development"],
-                "audience_tags": ["arts", "culture", "sydney", "festivals"],
-                "contact_email": "cultural@cityofsydney.nsw.gov.au",
-                "status": "active"
-            },
-            {
-                "title": "Brisbane City Council Community Grants",
-                "description": "Supports community projects that benefit Brisbane residents. Funding for community development, social programs, and local initiatives.",
-                "source_url": "https://www.brisbane.qld.gov.au/community-and-safety/grants-and-funding/community-grants",
-                "min_amount": 1000,
-                "max_amount": 20000,
-                "industry_focus": "community",
-                "location": "brisbane",
-                "org_types": ["not_for_profit", "community_group"],
-                "funding_purpose": ["community_development", "social_programs"],
-                "audience_tags": ["community", "brisbane", "local", "social"],
-                "contact_email": "grants@brisbane.qld.gov.au",
-                "status": "active"
-            },
-            {
-                "title": "City of Adelaide Community Grants",
-                "description": "Provides funding for community projects that enhance Adelaide's livability. Supports initiatives that build community connections and address local needs.",
-                "source_url": "https://www.cityofadelaide.com.au/community/grants-and-funding/community-grants",
-                "min_amount": 1000,
-                "max_amount": 15000,
-                "industry_focus": "community",
-                "location": "adelaide",
-                "org_types": ["not_for_profit", "community_group"],
-                "funding_purpose": ["community_development", "livability"],
-                "audience_tags": ["community", "adelaide", "local", "livability"],
-                "contact_email": "grants@cityofadelaide.com.au",
-                "status": "active"
-            },
-            {
-                "title": "City of Yarra Arts and Culture Grants",
-                "description": "Supports arts and cultural projects in the City of Yarra. Funding for creative projects, cultural events, and community arts initiatives.",
-                "source_url": "https://www.yarracity.vic.gov.au/community/grants-and-funding/arts-and-culture-grants",
-                "min_amount": 1500,
-                "max_amount": 35000,
-                "industry_focus": "arts",
-                "location": "yarra",
-                "org_types": ["arts_organisation", "individual", "community_group"],
-                "funding_purpose": ["creation", "development", "community_arts"],
-                "audience_tags": ["arts", "culture", "yarra", "community_arts"],
-                "contact_email": "arts@yarracity.vic.gov.au",
-                "status": "active"
-            },
-            {
-                "title": "Inner West Council Community Grants",
-                "description": "Supports community projects in the Inner West of Sydney. Funding for local initiatives that strengthen communities and improve quality of life.",
-                "source_url": "https://www.innerwest.nsw.gov.au/community/grants-and-funding/community-grants",
-                "min_amount": 1000,
-                "max_amount": 25000,
-                "industry_focus": "community",
-                "location": "inner_west_sydney",
-                "org_types": ["not_for_profit", "community_group"],
-                "funding_purpose": ["community_development", "quality_of_life"],
-                "audience_tags": ["community", "inner_west", "sydney", "local"],
-                "contact_email": "grants@innerwest.nsw.gov.au",
-                "status": "active"
-            }
-        ]
     
-    async def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method for council grants."""
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield council grants as each page is parsed, then the known grants."""
         logger.info("Starting Council Grants scraper")
         
+        async for grant in self._stream_sites(self.councils, stagger=4, pause=(3, 6)):
+            yield grant
+        
+        async for grant in self._stream_known_grants():
+            yield grant
+    
+    async def scrape(self) -> List[Dict[str, Any]]:
+        """Scrape everything, then save it in one go. ScraperService streams instead."""
         try:
-            # Scrape web sources
-            web_grants = await self._scrape_all_councils()
-            
-            # Add known grants
-            known_grants = await self._process_known_grants()
-            
-            # Combine and deduplicate
-            all_grants = web_grants + known_grants
-            unique_grants = self._deduplicate_grants(all_grants)
-            
-            # Validate grants
-            valid_grants = []
-            for grant in unique_grants:
-                if self._validate_grant_data(grant):
-                    valid_grants.append(grant)
-                else:
-                    logger.warning(f"Invalid grant data: {grant.get('title', 'Unknown')}")
-            
-            # Save to database
-            saved_grants = await self.save_grants(valid_grants)
+            grants = [grant async for grant in self.stream()]
+            saved_grants = await self.save_grants(grants)
             
             logger.info(f"Successfully scraped {len(saved_grants)} council grants")
             return saved_grants
@@ -259,68 +140,6 @@ class CouncilScraper(BaseScraper):
                 logger.error(f"Fallback also failed: {str(fallback_error)}")
                 return []
     
-    async def _scrape_all_councils(self) -> List[Dict[str, Any]]:
-        """Scrape all council sources."""
-        all_grants = []
-        
-        # Create tasks for each council
-        tasks = []
-        for i, (council_name, council_config) in enumerate(self.councils.items()):
-            delay = i * 4  # 4 seconds between each council
-            task = asyncio.create_task(self._scrape_council_with_delay(council_name, council_config, delay))
-            tasks.append(task)
-        
-        # Wait for all tasks
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        for i, result in enumerate(results):
-            council_name = list(self.councils.keys())[i]
-            if isinstance(result, Exception):
-                logger.error(f"Error scraping {council_name}: {str(result)}")
-            else:
-                logger.info(f"Successfully scraped {len(result)} grants from {council_name}")
-                all_grants.extend(result)
-        
-        return all_grants
-    
-    async def _scrape_council_with_delay(self, council_name: str, council_config: Dict, delay: int) -> List[Dict[str, Any]]:
-        """Scrape a council with initial delay."""
-        if delay > 0:
-            logger.info(f"Waiting {delay} seconds before scraping {council_name}")
-            await asyncio.sleep(delay)
-        
-        return await self._scrape_council(council_name, council_config)
-    
-    async def _scrape_council(self, council_name: str, council_config: Dict) -> List[Dict[str, Any]]:
-        """Scrape a specific council."""
-        grants = []
-        base_url = council_config["base_url"]
-        
-        logger.info(f"Scraping {council_name} from {base_url}")
-        
-        for endpoint in council_config["endpoints"]:
-            try:
-                url = urljoin(base_url, endpoint)
-                
-                # Rate limiting
-                await self._rate_limit_delay()
-                
-                # Scrape endpoint
-                endpoint_grants = await self._scrape_endpoint(council_name, url)
-                if endpoint_grants:
-                    grants.extend(endpoint_grants)
-                    logger.info(f"Found {len(endpoint_grants)} grants from {url}")
-                
-                # Delay between endpoints
-                await asyncio.sleep(random.uniform(3, 6))
-                
-            except Exception as e:
-                logger.error(f"Error scraping {council_name} endpoint {endpoint}: {str(e)}")
-                continue
-        
-        return grants
-    
     async def _scrape_endpoint(self, council_name: str, url: str) -> List[Dict[str, Any]]:
         """Scrape a specific endpoint."""
         try:
@@ -332,30 +151,27 @@ class CouncilScraper(BaseScraper):
                 logger.warning(f"Failed to fetch {url}")
                 return []
             
-            soup = self._parse_html(html)
-            
-            # Use council-specific parsing
-            grants = []
+            # Use council-specific parsing, off the event loop
             if "melbourne.vic.gov.au" in url:
-                grants = await self._parse_melbourne(soup, url)
+                parser_name = "_parse_melbourne"
             elif "cityofsydney.nsw.gov.au" in url:
-                grants = await self._parse_sydney(soup, url)
+                parser_name = "_parse_sydney"
             elif "brisbane.qld.gov.au" in url:
-                grants = await self._parse_brisbane(soup, url)
+                parser_name = "_parse_brisbane"
             elif "cityofadelaide.com.au" in url:
-                grants = await self._parse_adelaide(soup, url)
+                parser_name = "_parse_adelaide"
             elif "perth.wa.gov.au" in url:
-                grants = await self._parse_perth(soup, url)
+                parser_name = "_parse_perth"
             elif "yarracity.vic.gov.au" in url:
-                grants = await self._parse_yarra(soup, url)
+                parser_name = "_parse_yarra"
             elif "innerwest.nsw.gov.au" in url:
-                grants = await self._parse_inner_west(soup, url)
+                parser_name = "_parse_inner_west"
             elif "moreland.vic.gov.au" in url:
-                grants = await self._parse_moreland(soup, url)
+                parser_name = "_parse_moreland"
             else:
-                grants = await self._parse_generic_council(soup, url)
+                parser_name = "_parse_generic_council"
             
-            return grants
+            return await self._parse_page(html, url, parser_name)
             
         except Exception as e:
             logger.error(f"Error scraping endpoint {url}: {str(e)}")
@@ -643,119 +459,6 @@ class CouncilScraper(BaseScraper):
             logger.error(f"Error extracting grant from container: {str(e)}")
             return None
     
-    def _extract_amounts(self, text: str) -> tuple[Optional[int], Optional[int]]:
-        """Extract funding amounts from text."""
-        # Look for dollar amounts
-        amount_patterns = [
-            r'\$([0-9,]+(?:\.[0-9]{2})?)',
-            r'([0-9,]+)\s*dollars?',
-            r'up\s+to\s+\$([0-9,]+)',
-            r'maximum\s+\$([0-9,]+)',
-            r'minimum\s+\$([0-9,]+)'
-        ]
-        
-        amounts = []
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, text, re.I)
-            for match in matches:
-                try:
-                    amount = int(match.replace(',', ''))
-                    amounts.append(amount)
-                except ValueError:
-                    continue
-        
-        if not amounts:
-            return None, None
-        
-        amounts.sort()
-        min_amount = amounts[0] if amounts else None
-        max_amount = amounts[-1] if len(amounts) > 1 else None
-        
-        return min_amount, max_amount
-    
-    def _extract_dates(self, text: str) -> Dict[str, Optional[datetime]]:
-        """Extract dates from text."""
-        dates = {"open_date": None, "deadline": None}
-        
-        # Look for deadline patterns
-        deadline_patterns = [
-            r'deadline[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'due[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'closes[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'applications\s+close[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})'
-        ]
-        
-        for pattern in deadline_patterns:
-            match = re.search(pattern, text, re.I)
-            if match:
-                try:
-                    date_str = match.group(1)
-                    dates["deadline"] = self._parse_date(date_str)
-                    break
-                except Exception:
-                    continue
-        
-        return dates
-    
-    def _extract_email(self, text: str) -> Optional[str]:
-        """Extract email address from text."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
-        return match.group(0) if match else None
-    
-    def _determine_industry_focus(self, text: str) -> str:
-        """Determine industry focus based on text content."""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['art', 'creative', 'cultural', 'music', 'film', 'theatre']):
-            return "arts"
-        elif any(word in text_lower for word in ['business', 'entrepreneur', 'startup', 'commerce']):
-            return "business"
-        elif any(word in text_lower for word in ['environment', 'sustainability', 'climate', 'green']):
-            return "environment"
-        elif any(word in text_lower for word in ['sport', 'recreation', 'fitness', 'health']):
-            return "sport"
-        elif any(word in text_lower for word in ['technology', 'innovation', 'digital']):
-            return "technology"
-        else:
-            return "community"
-    
-    async def _process_known_grants(self) -> List[Dict[str, Any]]:
-        """Process known council grants."""
-        processed_grants = []
-        
-        for grant_data in self.known_grants:
-            try:
-                # Add current dates if not specified
-                if not grant_data.get("open_date"):
-                    grant_data["open_date"] = datetime.now() - timedelta(days=60)
-                
-                if not grant_data.get("deadline"):
-                    grant_data["deadline"] = datetime.now() + timedelta(days=120)
-                
-                # Normalize the grant data
-                normalized_grant = self.normalize_grant_data(grant_data)
-                processed_grants.append(normalized_grant)
-                
-            except Exception as e:
-                logger.error(f"Error processing known grant {grant_data.get('title', 'Unknown')}: {str(e)}")
-                continue
-        
-        return processed_grants
-    
-    def _deduplicate_grants(self, grants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate grants."""
-        seen = set()
-        unique_grants = []
-        
-        for grant in grants:
-            key = (grant.get("title", ""), grant.get("source_url", ""))
-            if key not in seen:
-                seen.add(key)
-                unique_grants.append(grant)
-        
-        return unique_grants
-    
     async def _rate_limit_delay(self):
         """Implement rate limiting."""
         self.rate_limits["requests_made"] += 1
@@ -0,0 +1,188 @@
+"""
+Sitemap and feed driven endpoint discovery.
+
+Sites configured with a ``discovery`` block publish ``sitemap.xml`` files
+(and optionally RSS/Atom feeds) listing their pages with a last-modified
+time. Before a site is crawled, those are read and the endpoint list is
+rewritten:
+
+* a fixed endpoint whose ``lastmod`` is no newer than our last successful
+  fetch of it (from the URL frontier) is skipped;
+* pages on the same host that match the site's ``include`` patterns but are
+  missing from the fixed list are added, newest first, if they changed since
+  we last fetched them (or were never fetched), up to
+  ``SCRAPER_DISCOVERY_MAX_PAGES``;
+* sitemap indexes are followed, up to ``SCRAPER_DISCOVERY_MAX_SITEMAPS``
+  files per site.
+
+Without a lastmod, or without history for a URL, the page is fetched.
+
+Site config::
+
+    "discovery": {
+        "sitemaps": ["/sitemap.xml"],
+        "feeds": ["/news/rss"],
+        "include": [r"^/funding-and-support/"]
+    }
+"""
+
+import logging
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DiscoveredPage:
+    """A page listed in a sitemap or feed."""
+    url: str
+    lastmod: Optional[datetime] = None
+    via: str = "sitemap"  # sitemap, feed
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element: ET.Element, name: str) -> Optional[str]:
+    for child in element:
+        if _local(child.tag) == name and child.text:
+            return child.text.strip()
+    return None
+
+
+def parse_w3c_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Sitemap/Atom timestamps as naive UTC (the frontier stores utcnow())."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)  # RSS pubDate (RFC 822)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_sitemap(xml: str) -> Tuple[List[DiscoveredPage], List[DiscoveredPage]]:
+    """Parse a sitemap or sitemap index into ``(pages, child_sitemaps)``."""
+    try:
+        root = ET.fromstring(xml.encode("utf-8") if isinstance(xml, str) else xml)
+    except ET.ParseError as e:
+        logger.warning(f"Unparseable sitemap: {str(e)}")
+        return [], []
+
+    entries = []
+    for element in root:
+        loc = _child_text(element, "loc")
+        if loc:
+            entries.append(DiscoveredPage(loc, parse_w3c_datetime(_child_text(element, "lastmod"))))
+
+    if _local(root.tag) == "sitemapindex":
+        return [], entries
+    return entries, []
+
+
+def parse_feed(xml: str) -> List[DiscoveredPage]:
+    """Links and update times from an RSS 2.0 or Atom feed."""
+    try:
+        root = ET.fromstring(xml.encode("utf-8") if isinstance(xml, str) else xml)
+    except ET.ParseError as e:
+        logger.warning(f"Unparseable feed: {str(e)}")
+        return []
+
+    pages = []
+    for element in root.iter():
+        name = _local(element.tag)
+        if name == "item":
+            link = _child_text(element, "link")
+            updated = _child_text(element, "pubDate") or _child_text(element, "date")
+        elif name == "entry":
+            link = next(
+                (child.get("href") for child in element
+                 if _local(child.tag) == "link" and child.get("rel", "alternate") == "alternate"),
+                None
+            )
+            updated = _child_text(element, "updated") or _child_text(element, "published")
+        else:
+            continue
+        if link:
+            pages.append(DiscoveredPage(link.strip(), parse_w3c_datetime(updated), via="feed"))
+    return pages
+
+
+def _key(url: str) -> str:
+    return url.strip().rstrip("/")
+
+
+def is_changed(lastmod: Optional[datetime], last_success: Optional[datetime]) -> bool:
+    """Whether a page may have changed since we last fetched it successfully."""
+    return lastmod is None or last_success is None or lastmod > last_success
+
+
+def plan_endpoints(base_url: str, endpoint_urls: Sequence[str], discovered: Iterable[DiscoveredPage],
+                   include: Sequence[str], last_success: Callable[[str], Optional[datetime]],
+                   max_new: int) -> Tuple[List[str], Dict[str, int]]:
+    """Merge discovered pages into a site's fixed endpoint list.
+
+    Returns the URLs to fetch and counts for the run log.
+    """
+    host = urlparse(base_url).netloc.lower()
+    patterns = [re.compile(pattern) for pattern in include]
+
+    # Latest lastmod per page; a page may appear in several sitemaps/feeds
+    lastmods: Dict[str, Optional[datetime]] = {}
+    originals: Dict[str, str] = {}
+    for page in discovered:
+        key = _key(page.url)
+        originals.setdefault(key, page.url)
+        if key not in lastmods or (page.lastmod and (lastmods[key] is None or page.lastmod > lastmods[key])):
+            lastmods[key] = page.lastmod
+
+    urls = []
+    unchanged = 0
+    fixed = set()
+    for url in endpoint_urls:
+        key = _key(url)
+        fixed.add(key)
+        if key in lastmods and not is_changed(lastmods[key], last_success(url)):
+            unchanged += 1
+            continue
+        urls.append(url)
+
+    candidates = []
+    for key, lastmod in lastmods.items():
+        url = originals[key]
+        parsed = urlparse(url)
+        if key in fixed or parsed.netloc.lower() != host:
+            continue
+        if not any(pattern.search(parsed.path) for pattern in patterns):
+            continue
+        if not is_changed(lastmod, last_success(url)):
+            unchanged += 1
+            continue
+        candidates.append((lastmod or datetime.min, url))
+
+    # Newest first, so the cap drops the stalest pages
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    added = [url for _, url in candidates[:max_new]]
+
+    stats = {
+        "listed": len(lastmods),
+        "fixed_fetched": len(urls),
+        "unchanged_skipped": unchanged,
+        "new_pages": len(added),
+        "new_pages_dropped": max(len(candidates) - max_new, 0)
+    }
+    return urls + added, stats
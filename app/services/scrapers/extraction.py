@@ -0,0 +1,358 @@
+"""
+Shared text extractors for scrapers.
+
+Every scraper pulls the same facts out of free text: funding amounts, open
+and closing dates, a contact email and a handful of keyword categories. The
+extractors here are compiled once at import time and scan each text a single
+time:
+
+* ``KeywordClassifier`` - the category keyword tables of a scraper, answering
+  every ``_determine_*`` / ``_extract_*`` category question with plain
+  substring checks on text lowered once;
+* ``scan_text`` - one combined scan finds amounts and dates, anchored on the
+  cheap literal ``$`` and year prefixes, and a short context window before
+  each match decides whether it is a minimum or maximum, an opening date or a
+  deadline;
+* ``parse_date`` - remembers which format parsed each date *shape*
+  (``99/99/9999``, ``99 aaaaa 9999`` ...) so later dates go straight to the
+  right ``strptime`` format instead of failing through the list.
+
+Results are memoized per text because a scraper asks several questions of the
+same container text in a row.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CategoryRules = Sequence[Tuple[str, Sequence[str]]]
+
+
+# ---------------------------------------------------------------------------
+# Keyword categories
+# ---------------------------------------------------------------------------
+
+def _trie_pattern(keywords: Sequence[str]) -> str:
+    """Regex alternation shaped like a trie; matches the longest keyword at a position."""
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return ("(?:" + pattern + ")?") if len(branches) == 1 else pattern + "?"
+        return pattern
+
+    return build(trie)
+
+
+class KeywordClassifier:
+    """
+    Multi-table keyword classifier with per-text memoization.
+
+    ``tables`` maps a category name to ``(rules, default)`` where ``rules`` is
+    an ordered list of ``(label, keywords)``. Keywords match as case-insensitive
+    substrings, as the hand-written ``any(word in text_lower ...)`` checks did.
+    A list default makes the category multi-label; otherwise the first matching
+    rule wins.
+
+    The checks stay plain ``in`` tests: CPython's substring search beats a
+    compiled keyword alternation for tables this size (see
+    scripts/benchmark_extraction.py). What is saved is repeat work - the text
+    is lowered once, and each category answer is cached per text.
+    """
+
+    def __init__(self, tables: Dict[str, Tuple[CategoryRules, Any]]):
+        self.tables = {
+            name: ([(label, tuple(k.lower() for k in keywords)) for label, keywords in rules], default)
+            for name, (rules, default) in tables.items()
+        }
+        # text -> {"": lowered text, category: answer, ...}, filled in as questions are asked
+        self._answers = lru_cache(maxsize=1024)(self._new_answers)
+
+    @staticmethod
+    def _new_answers(text: str) -> Dict[str, Any]:
+        return {"": text.lower()}
+
+    def _match(self, category: str, lowered: str) -> Any:
+        # Explicit loops: a generator per rule costs more than the checks themselves
+        rules, default = self.tables[category]
+        multi = isinstance(default, list)
+        matched = []
+        for label, keywords in rules:
+            for keyword in keywords:
+                if keyword in lowered:
+                    if not multi:
+                        return label
+                    matched.append(label)
+                    break
+        return tuple(matched) if multi else default
+
+    def classify(self, category: str, text: str) -> Any:
+        """First matching label (or every matching label for list defaults)."""
+        answers = self._answers(text or "")
+        try:
+            result = answers[category]
+        except KeyError:
+            result = answers[category] = self._match(category, answers[""])
+        default = self.tables[category][1]
+        if isinstance(default, list):
+            # Callers own the list they get back
+            return list(result) if result else list(default)
+        return result
+
+    def labels(self, text: str) -> FrozenSet[Tuple[str, str]]:
+        """All ``(category, label)`` pairs present in ``text``."""
+        lowered = self._answers(text or "")[""]
+        return frozenset(
+            (name, label)
+            for name, (rules, _) in self.tables.items()
+            for label, keywords in rules
+            if any(keyword in lowered for keyword in keywords)
+        )
+
+    def cache_clear(self):
+        self._answers.cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Amounts and dates
+# ---------------------------------------------------------------------------
+
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+
+# Dates are found from their year: "20" is a literal prefix the regex engine
+# can skip to, far cheaper than trying every date shape at every position.
+# The rest of the date is then matched just after (ISO) or just before the year.
+_YEAR_RE = re.compile(r"20\d\d(?!\d)")
+_ISO_TAIL_RE = re.compile(r"[/\-]\d{1,2}[/\-]\d{1,2}(?!\d)")
+_DATE_HEAD_RE = re.compile(
+    r"(?<![\d\w])(?:\d{1,2}[/\-]\d{1,2}[/\-]|\d{1,2}\s+" + _MONTH + r"\s+|" + _MONTH + r"\s+\d{1,2},\s+)$",
+    re.I
+)
+DATE_HEAD_MAX = 20
+
+# Amounts: "$" is likewise a literal prefix; "... dollars" is rare, so only
+# looked for when the word appears at all
+_AMOUNT_RE = re.compile(r"\$\s?(\d[\d,]*(?:\.\d{1,2})?)(?:\s*(k|m|million|thousand)\b)?", re.I)
+_WORDS_AMOUNT_RE = re.compile(r"(\d[\d,]*(?:\.\d{2})?)\s*dollars?\b", re.I)
+
+_AMOUNT_QUALIFIER_RE = re.compile(
+    r"\b(?:(?P<max>up\s+to|maximum|max\b|not\s+exceeding|no\s+more\s+than|capped\s+at)"
+    r"|(?P<min>minimum|min\b|at\s+least|starting\s+(?:at|from)|from))",
+    re.I
+)
+_RANGE_GAP_RE = re.compile(r"\s*(?:-|–|—|to|and)\s*$", re.I)
+
+_DATE_QUALIFIER_RE = re.compile(
+    r"\b(?:(?P<open>open(?:s|ed|ing)?|start(?:s|ing)?|begin(?:s|ning)?|commenc\w*)"
+    r"|(?P<close>clos(?:e|es|ed|ing)|deadline|due|end(?:s|ing)?))\b",
+    re.I
+)
+
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+
+_UNITS = {"k": 1_000, "thousand": 1_000, "m": 1_000_000, "million": 1_000_000}
+
+AMOUNT_WINDOW = 40
+DATE_WINDOW = 50
+DATE_LOOKAHEAD = 30
+
+
+@dataclass(frozen=True)
+class TextFacts:
+    """Amounts and dates found in a piece of text."""
+    min_amount: Optional[int] = None
+    max_amount: Optional[int] = None
+    open_date: Optional[str] = None
+    deadline: Optional[str] = None
+
+
+def _last_qualifier(pattern: re.Pattern, text: str, start: int, end: int) -> Optional[str]:
+    """Kind of the last qualifier keyword in ``text[start:end]``."""
+    kind = None
+    for match in pattern.finditer(text, start, end):
+        kind = match.lastgroup
+    return kind
+
+
+def _find_dates(text: str) -> List[Tuple[int, int, str]]:
+    dates = []
+    for year in _YEAR_RE.finditer(text):
+        start, end = year.span()
+        if start and text[start - 1].isdigit():
+            continue
+        tail = _ISO_TAIL_RE.match(text, end)
+        if tail:
+            dates.append((start, tail.end(), text[start:tail.end()]))
+            continue
+        head = _DATE_HEAD_RE.search(text, max(0, start - DATE_HEAD_MAX), start)
+        if head:
+            dates.append((head.start(), end, text[head.start():end]))
+    return dates
+
+
+def _find_amounts(text: str) -> List[Tuple[int, int, int]]:
+    matches = list(_AMOUNT_RE.finditer(text))
+    if "dollar" in text or "Dollar" in text or "DOLLAR" in text:
+        matches = sorted(matches + list(_WORDS_AMOUNT_RE.finditer(text)), key=lambda m: m.start())
+
+    amounts = []
+    for match in matches:
+        try:
+            value = float(match.group(1).replace(",", ""))
+        except ValueError:
+            continue
+        unit = match.group(2) if match.re is _AMOUNT_RE else None
+        if unit:
+            value *= _UNITS[unit.lower()]
+        amounts.append((match.start(), match.end(), int(value)))
+    return amounts
+
+
+@lru_cache(maxsize=1024)
+def scan_text(text: str) -> TextFacts:
+    """Find funding amounts and dates in ``text``, classifying each by its context."""
+    if not text:
+        return TextFacts()
+
+    open_date = deadline = None
+    prev_end = 0
+    for start, end, date in _find_dates(text):
+        kind = _last_qualifier(_DATE_QUALIFIER_RE, text, max(prev_end, start - DATE_WINDOW), start)
+        if kind is None:
+            following = _DATE_QUALIFIER_RE.search(text, end, end + DATE_LOOKAHEAD)
+            kind = following.lastgroup if following else None
+        if kind == "open" and open_date is None:
+            open_date = date
+        elif kind == "close" and deadline is None:
+            deadline = date
+        prev_end = end
+
+    mins: List[int] = []
+    maxes: List[int] = []
+    plain: List[int] = []
+    prev: Optional[Tuple[int, int, Optional[str]]] = None  # (end, value, kind)
+    for start, end, value in _find_amounts(text):
+        # "$10,000 - $50,000", "$10,000 to $50,000", "between $10,000 and $50,000"
+        if prev and prev[2] != "max" and _RANGE_GAP_RE.match(text, prev[0], start):
+            (mins if prev[2] == "min" else plain).remove(prev[1])
+            mins.append(prev[1])
+            maxes.append(value)
+            prev = (end, value, "max")
+            continue
+
+        kind = _last_qualifier(_AMOUNT_QUALIFIER_RE, text, max(prev[0] if prev else 0, start - AMOUNT_WINDOW), start)
+        (maxes if kind == "max" else mins if kind == "min" else plain).append(value)
+        prev = (end, value, kind)
+
+    return TextFacts(
+        min_amount=min(mins) if mins else None,
+        max_amount=max(maxes + plain) if (maxes or plain) else None,
+        open_date=open_date,
+        deadline=deadline
+    )
+
+
+def extract_amounts(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """``(min_amount, max_amount)`` from funding text."""
+    facts = scan_text(text or "")
+    return facts.min_amount, facts.max_amount
+
+
+def extract_dates(text: str) -> Dict[str, Optional[str]]:
+    """Opening date and deadline strings from free text."""
+    facts = scan_text(text or "")
+    return {"open_date": facts.open_date, "deadline": facts.deadline}
+
+
+@lru_cache(maxsize=1024)
+def extract_email(text: str) -> Optional[str]:
+    """First email address in ``text``."""
+    if not text or "@" not in text:
+        return None
+    match = _EMAIL_RE.search(text)
+    return match.group(0) if match else None
+
+
+# ---------------------------------------------------------------------------
+# Date parsing
+# ---------------------------------------------------------------------------
+
+DATE_FORMATS = [
+    "%Y-%m-%d",  # 2024-03-20
+    "%d/%m/%Y",  # 20/03/2024
+    "%d-%m-%Y",  # 20-03-2024
+    "%Y/%m/%d",  # 2024/03/20
+    "%d %b %Y",  # 20 Mar 2024
+    "%d %B %Y",  # 20 March 2024
+    "%B %d, %Y"  # March 20, 2024
+]
+
+_SHAPE_TABLE = str.maketrans(
+    "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "9" * 10 + "a" * 52
+)
+
+# Date shape -> format that parsed it last time
+_shape_formats: Dict[str, str] = {}
+
+
+def _detect_and_parse(date_str: str) -> Optional[datetime]:
+    shape = date_str.translate(_SHAPE_TABLE)
+    known = _shape_formats.get(shape)
+    if known:
+        try:
+            return datetime.strptime(date_str, known)
+        except ValueError:
+            pass  # e.g. "May" vs "March" share a shape with different formats
+
+    for date_format in DATE_FORMATS:
+        if date_format == known:
+            continue
+        try:
+            parsed = datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+        _shape_formats[shape] = date_format
+        return parsed
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(date_str: str) -> Optional[datetime]:
+    return _detect_and_parse(date_str.strip())
+
+
+def parse_date(date_input) -> Optional[datetime]:
+    """Parse a date string (or pass through a datetime) in any of ``DATE_FORMATS``."""
+    if not date_input:
+        return None
+    if isinstance(date_input, datetime):
+        return date_input
+    if not isinstance(date_input, str):
+        try:
+            date_input = str(date_input)
+        except Exception:
+            logger.warning(f"Could not convert date input to string: {date_input}")
+            return None
+
+    parsed = _parse_date_str(date_input)
+    if parsed is None:
+        logger.warning(f"Could not parse date: {date_input}")
+    return parsed
@@ -0,0 +1,218 @@
+"""
+Persisted URL frontier for scraper endpoints.
+
+Every fetch of a hard-coded endpoint is recorded against the URL in
+``crawl_urls``: status history, failure counts and the last redirect target.
+From that history the frontier decides what the next crawl fetches:
+
+* a URL that fails ``SCRAPER_FRONTIER_FAILURE_THRESHOLD`` times in a row is
+  quarantined; the quarantine doubles with each further failure, from
+  ``SCRAPER_FRONTIER_BACKOFF_HOURS`` up to ``SCRAPER_FRONTIER_MAX_BACKOFF_HOURS``.
+  When it expires the URL is probed once; one success clears it;
+* a URL that redirects to a page that loads is fetched at its canonical
+  address next time, skipping the redirect hop;
+* ``dead_endpoint_report`` lists what is currently failing, for fixing the
+  endpoint lists.
+
+During a run the frontier only touches memory; ``save`` writes the changes
+back in one go, so it never competes with the ingest pipeline for the session.
+"""
+
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.crawl_url import CrawlUrl
+
+logger = logging.getLogger(__name__)
+
+HISTORY_LENGTH = 20
+
+# Client errors that may succeed on a retry; other 4xx responses are final
+RETRYABLE_STATUSES = {408, 429}
+
+
+def quarantine_delay(consecutive_failures: int) -> Optional[timedelta]:
+    """How long to stop fetching a URL after this many failures in a row."""
+    threshold = settings.SCRAPER_FRONTIER_FAILURE_THRESHOLD
+    if consecutive_failures < threshold:
+        return None
+    hours = settings.SCRAPER_FRONTIER_BACKOFF_HOURS * 2 ** (consecutive_failures - threshold)
+    return timedelta(hours=min(hours, settings.SCRAPER_FRONTIER_MAX_BACKOFF_HOURS))
+
+
+@dataclass
+class UrlState:
+    """In-memory copy of a ``crawl_urls`` row."""
+    url: str
+    source_name: str
+    canonical_url: Optional[str] = None
+    last_status: Optional[int] = None
+    last_error: Optional[str] = None
+    consecutive_failures: int = 0
+    total_requests: int = 0
+    total_failures: int = 0
+    quarantined_until: Optional[datetime] = None
+    last_checked_at: Optional[datetime] = None
+    last_success_at: Optional[datetime] = None
+    history: List[Dict[str, Any]] = field(default_factory=list)
+
+    def record(self, now: datetime, status: Optional[int], final_url: Optional[str] = None,
+               error: Optional[str] = None, retry: bool = False):
+        """Apply one fetch outcome. Retries within a run add history but do not
+        count as further consecutive failures."""
+        self.total_requests += 1
+        self.last_checked_at = now
+        self.last_status = status
+        self.history = (self.history + [{"at": now.isoformat(), "status": status, "error": error}])[-HISTORY_LENGTH:]
+
+        if status == 200:
+            self.consecutive_failures = 0
+            self.quarantined_until = None
+            self.last_error = None
+            self.last_success_at = now
+            self.canonical_url = final_url if final_url and final_url != self.url else None
+            return
+
+        self.total_failures += 1
+        self.last_error = error or f"HTTP {status}"
+        if retry and self.consecutive_failures:
+            return
+        self.consecutive_failures += 1
+        # A stale redirect target may be the problem; go back to the original
+        self.canonical_url = None
+        delay = quarantine_delay(self.consecutive_failures)
+        self.quarantined_until = now + delay if delay else None
+
+
+class UrlFrontier:
+    """Fetch decisions and history for one source's endpoints during a crawl."""
+
+    def __init__(self, source_name: str, states: Optional[Dict[str, UrlState]] = None,
+                 now: Optional[datetime] = None):
+        self.source_name = source_name
+        self.states: Dict[str, UrlState] = states or {}
+        self.now = now or datetime.utcnow()
+        self.touched: set = set()
+        self.skipped: List[str] = []
+
+    @classmethod
+    def load(cls, db: Session, source_name: str) -> "UrlFrontier":
+        rows = db.query(CrawlUrl).filter(CrawlUrl.source_name == source_name).all()
+        states = {
+            row.url: UrlState(
+                url=row.url,
+                source_name=row.source_name,
+                canonical_url=row.canonical_url,
+                last_status=row.last_status,
+                last_error=row.last_error,
+                consecutive_failures=row.consecutive_failures or 0,
+                total_requests=row.total_requests or 0,
+                total_failures=row.total_failures or 0,
+                quarantined_until=row.quarantined_until,
+                last_checked_at=row.last_checked_at,
+                last_success_at=row.last_success_at,
+                history=list(row.history or [])
+            )
+            for row in rows
+        }
+        return cls(source_name, states)
+
+    def allow(self, url: str) -> bool:
+        """False while ``url`` is quarantined. Skips are remembered for the run summary."""
+        state = self.states.get(url)
+        if state is None or state.quarantined_until is None or state.quarantined_until <= self.now:
+            return True
+        if url not in self.skipped:
+            self.skipped.append(url)
+            logger.info(
+                f"Skipping quarantined URL {url} until {state.quarantined_until:%Y-%m-%d %H:%M} "
+                f"({state.consecutive_failures} failures, last: {state.last_error})"
+            )
+        return False
+
+    def resolve(self, url: str) -> str:
+        """The address to fetch ``url`` at: its remembered redirect target, if any."""
+        state = self.states.get(url)
+        return state.canonical_url if state and state.canonical_url else url
+
+    def last_success(self, url: str) -> Optional[datetime]:
+        state = self.states.get(url)
+        return state.last_success_at if state else None
+
+    def record(self, url: str, status: Optional[int], final_url: Optional[str] = None,
+               error: Optional[str] = None):
+        """Record the outcome of fetching ``url`` (status None for network errors)."""
+        state = self.states.get(url)
+        if state is None:
+            state = self.states[url] = UrlState(url=url, source_name=self.source_name)
+        state.record(datetime.utcnow(), status, final_url, error, retry=url in self.touched)
+        self.touched.add(url)
+        if state.quarantined_until:
+            logger.warning(f"Quarantined {url} until {state.quarantined_until:%Y-%m-%d %H:%M} after {state.consecutive_failures} failures")
+
+    def worth_retrying(self, url: str) -> bool:
+        """False once ``url`` has failed this run with a status a retry won't fix."""
+        state = self.states.get(url)
+        if url not in self.touched or state is None or state.last_status is None:
+            return True
+        return not (400 <= state.last_status < 500 and state.last_status not in RETRYABLE_STATUSES)
+
+    def summary(self) -> Dict[str, Any]:
+        checked = [self.states[url] for url in self.touched]
+        return {
+            "checked": len(checked),
+            "failed": sum(1 for state in checked if state.last_status != 200),
+            "redirected": sum(1 for state in checked if state.canonical_url),
+            "skipped": len(self.skipped),
+            "skipped_urls": self.skipped
+        }
+
+    def save(self, db: Session):
+        """Write the URLs checked during this run back to ``crawl_urls`` (no commit)."""
+        if not self.touched:
+            return
+        existing = {
+            row.url: row
+            for row in db.query(CrawlUrl).filter(
+                CrawlUrl.source_name == self.source_name, CrawlUrl.url.in_(self.touched)
+            ).all()
+        }
+        for url in self.touched:
+            values = asdict(self.states[url])
+            row = existing.get(url)
+            if row is None:
+                db.add(CrawlUrl(**values))
+            else:
+                for key, value in values.items():
+                    setattr(row, key, value)
+        db.flush()
+
+
+def dead_endpoint_report(db: Session, source_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """URLs that are failing now, worst first."""
+    query = db.query(CrawlUrl).filter(CrawlUrl.consecutive_failures > 0)
+    if source_name:
+        query = query.filter(CrawlUrl.source_name == source_name)
+    rows = query.order_by(CrawlUrl.consecutive_failures.desc(), CrawlUrl.url).all()
+
+    threshold = settings.SCRAPER_FRONTIER_FAILURE_THRESHOLD
+    return [
+        {
+            "source_name": row.source_name,
+            "url": row.url,
+            "state": "dead" if row.consecutive_failures >= threshold else "failing",
+            "last_status": row.last_status,
+            "last_error": row.last_error,
+            "consecutive_failures": row.consecutive_failures,
+            "failure_rate": round(row.total_failures / row.total_requests, 2) if row.total_requests else None,
+            "quarantined_until": row.quarantined_until,
+            "last_success_at": row.last_success_at,
+            "last_checked_at": row.last_checked_at
+        }
+        for row in rows
+    ]
@@ -1,94 +1,192 @@
 import aiohttp
+import asyncio
+import json
 import logging
-from typing import List, Dict, Optional
+from typing import Any, AsyncIterator, List, Dict, Optional
+from app.core.config import settings
 from .base_scraper import BaseScraper
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# Client errors a retry won't fix
+FINAL_STATUSES = {400, 401, 403, 404, 410}
+
 class GrantConnectScraper(BaseScraper):
-    """Scraper for GrantConnect (grantconnect.gov.au)."""
+    """Scraper for GrantConnect (grantconnect.gov.au).
+    
+    Pages through the search API, then fetches grant details concurrently
+    (at most ``SCRAPER_GRANTCONNECT_CONCURRENCY`` at a time) through the shared
+    scraper HTTP pool, so requests are also recorded/replayed as fixtures.
+    Failed requests are retried with exponential backoff; grants whose details
+    still can't be fetched are reported in ``fetch_report`` rather than
+    failing the run.
+    """
+    
+    frontier_tracking = False
     
     def __init__(self, db_session: Session, http_session: Optional[aiohttp.ClientSession] = None):
-        super().__init__(db_session, "grants.gov.au")
+        super().__init__(db_session, "grantconnect")
+        # Optional session override (tests); otherwise the shared pool is used
         self.http_session = http_session
         self.base_url = "https://www.grants.gov.au"
         self.search_url = f"{self.base_url}/api/v1/grants/search"
+        self.fetch_report: Dict[str, Any] = {}
     
-    async def scrape(self) -> List[dict]:
-        """Scrape grants from GrantConnect API."""
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield grants as their details arrive."""
         logger.info("Running GrantConnect scraper")
-        grants = []
+        self.fetch_report = {"pages": 0, "pages_failed": [], "listed": 0, "details_fetched": 0, "details_failed": []}
+        
+        listings = await self._fetch_listings()
+        self.fetch_report["listed"] = len(listings)
+        
+        limit = asyncio.Semaphore(settings.SCRAPER_GRANTCONNECT_CONCURRENCY)
+        
+        async def fetch(grant_data: Dict[str, Any]):
+            async with limit:
+                return grant_data, await self._fetch_grant_details(grant_data["id"])
         
+        tasks = [asyncio.create_task(fetch(grant_data)) for grant_data in listings]
         try:
-            if self.http_session:
-                session = self.http_session
-                async with session.get(self.search_url) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch grants list: {response.status}")
-                        return []
-                    
-                    data = await response.json()
-                    grant_list = data.get("grants", [])
-                    
-                    for grant_data in grant_list:
-                        try:
-                            grant_id = grant_data.get("id")
-                            if not grant_id:
-                                continue
-                            
-                            # Fetch detailed grant information
-                            details = await self._fetch_grant_details(session, grant_id)
-                            
-                            if details:
-                                grant_info = {
-                                    "title": grant_data.get("title"),
-                                    "description": grant_data.get("description"),
-                                    "source_url": f"{self.base_url}/grants/{grant_id}",
-                                    **details
-                                }
-                                grants.append(self.normalize_grant_data(grant_info))
-                            
-                        except Exception as e:
-                            logger.error(f"Error processing grant {grant_id}: {str(e)}")
-                            continue
-            
-            logger.info(f"Successfully scraped {len(grants)} grants from GrantConnect")
-            return grants
-            
+            for next_done in asyncio.as_completed(tasks):
+                grant_data, details = await next_done
+                grant_id = grant_data["id"]
+                if not details:
+                    self.fetch_report["details_failed"].append(grant_id)
+                    continue
+                self.fetch_report["details_fetched"] += 1
+                try:
+                    yield self.normalize_grant_data({
+                        "title": grant_data.get("title"),
+                        "description": grant_data.get("description"),
+                        "source_url": f"{self.base_url}/grants/{grant_id}",
+                        **details
+                    })
+                except Exception as e:
+                    logger.error(f"Error processing grant {grant_id}: {str(e)}")
+                    self.fetch_report["details_failed"].append(grant_id)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        report = self.fetch_report
+        if report["details_failed"] or report["pages_failed"]:
+            logger.warning(
+                f"GrantConnect partial sync: {len(report['details_failed'])} of {report['listed']} grant details "
+                f"and {len(report['pages_failed'])} search pages failed"
+            )
+        logger.info(f"Successfully scraped {report['details_fetched']} grants from GrantConnect")
+    
+    async def scrape(self) -> List[dict]:
+        """Scrape grants from GrantConnect API."""
+        try:
+            return [grant async for grant in self.stream()]
         except Exception as e:
             logger.error(f"Error scraping GrantConnect: {str(e)}")
             return []
     
-    async def _fetch_grant_details(self, session: aiohttp.ClientSession, grant_id: str) -> Dict:
+    async def _fetch_listings(self) -> List[Dict[str, Any]]:
+        """All search results, de-duplicated by grant id.
+        
+        If the first page reports ``totalPages`` the remaining pages are
+        fetched concurrently; otherwise pages are read until a short one.
+        """
+        page_size = settings.SCRAPER_GRANTCONNECT_PAGE_SIZE
+        max_pages = settings.SCRAPER_GRANTCONNECT_MAX_PAGES
+        
+        first = await self._fetch_search_page(1)
+        if first is None:
+            return []
+        pages = [first]
+        
+        total_pages = first.get("totalPages")
+        if total_pages:
+            limit = asyncio.Semaphore(settings.SCRAPER_GRANTCONNECT_CONCURRENCY)
+            
+            async def fetch(page: int):
+                async with limit:
+                    return await self._fetch_search_page(page)
+            
+            rest = await asyncio.gather(*(fetch(page) for page in range(2, min(total_pages, max_pages) + 1)))
+            pages.extend(page for page in rest if page is not None)
+        else:
+            page = 1
+            while len(pages[-1].get("grants", [])) >= page_size and page < max_pages:
+                page += 1
+                data = await self._fetch_search_page(page)
+                if data is None:
+                    break
+                pages.append(data)
+        
+        listings: Dict[str, Dict[str, Any]] = {}
+        for data in pages:
+            for grant_data in data.get("grants", []):
+                if grant_data.get("id"):
+                    listings.setdefault(str(grant_data["id"]), {**grant_data, "id": str(grant_data["id"])})
+        return list(listings.values())
+    
+    async def _fetch_search_page(self, page: int) -> Optional[Dict[str, Any]]:
+        data = await self._get_json(self.search_url, {"page": page, "pageSize": settings.SCRAPER_GRANTCONNECT_PAGE_SIZE})
+        self.fetch_report["pages"] = self.fetch_report.get("pages", 0) + 1
+        if data is None:
+            logger.error(f"Failed to fetch grants list page {page}")
+            self.fetch_report.setdefault("pages_failed", []).append(page)
+        return data
+    
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """GET a JSON document, retrying failures with exponential backoff."""
+        attempts = settings.SCRAPER_GRANTCONNECT_RETRIES
+        for attempt in range(attempts):
+            status = None
+            try:
+                if self.http_session is not None:
+                    async with self.http_session.get(url, params=params) as response:
+                        status = response.status
+                        if status == 200:
+                            return await response.json()
+                else:
+                    status, body = await self._fetch(url, params=params) if params else await self._fetch(url)
+                    if status == 200 and body:
+                        return json.loads(body)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"Error fetching {url} (attempt {attempt + 1}): {str(e)}")
+            
+            if status in FINAL_STATUSES:
+                logger.error(f"Failed to fetch {url}: {status}")
+                return None
+            if attempt < attempts - 1:
+                await self._polite_sleep(0.5 * 2 ** attempt)
+        return None
+    
+    async def _fetch_grant_details(self, grant_id: str) -> Dict:
         """
         Fetch detailed grant information using the API.
         """
         try:
-            url = f"{self.base_url}/api/v1/grants/{grant_id}"
-            async with session.get(url) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to fetch grant details: {response.status}")
-                    return {}
-                
-                data = await response.json()
-                grant = data.get("grant", {})
-                
-                details = {
-                    "open_date": grant.get("openDate"),
-                    "deadline": grant.get("closeDate"),
-                    "min_amount": self._parse_amount(grant.get("estimatedValueFrom")),
-                    "max_amount": self._parse_amount(grant.get("estimatedValueTo")),
-                    "contact_email": grant.get("contactEmail"),
-                    "industry_focus": self._extract_industry(grant.get("categories", [])),
-                    "location": self._extract_location(grant.get("eligibility", {})),
-                    "org_types": self._extract_org_types(grant.get("eligibility", {})),
-                    "funding_purpose": grant.get("fundingPurpose", []),
-                    "audience_tags": grant.get("targetGroups", [])
-                }
-                
-                return details
-                
+            data = await self._get_json(f"{self.base_url}/api/v1/grants/{grant_id}")
+            if data is None:
+                logger.error(f"Failed to fetch grant details for {grant_id}")
+                return {}
+            
+            grant = data.get("grant", {})
+            
+            details = {
+                "open_date": grant.get("openDate"),
+                "deadline": grant.get("closeDate"),
+                "min_amount": self._parse_amount(grant.get("estimatedValueFrom")),
+                "max_amount": self._parse_amount(grant.get("estimatedValueTo")),
+                "contact_email": grant.get("contactEmail"),
+                "industry_focus": self._extract_industry(grant.get("categories", [])),
+                "location": self._extract_location(grant.get("eligibility", {})),
+                "org_types": self._extract_org_types(grant.get("eligibility", {})),
+                "funding_purpose": grant.get("fundingPurpose", []),
+                "audience_tags": grant.get("targetGroups", [])
+            }
+            
+            return details
+        
         except Exception as e:
             logger.error(f"Error fetching grant details for {grant_id}: {str(e)}")
             return {}
@@ -135,4 +233,4 @@ class GrantConnectScraper(BaseScraper):
                 if any(keyword in org_lower for keyword in keywords):
                     org_types.append(mapped_type)
         
-        return org_types if org_types else ["any"] 
\ No newline at end of file
+        return org_types if org_types else ["any"]
@@ -0,0 +1,61 @@
+"""
+Shared aiohttp session for scrapers.
+
+Opening a ClientSession per request throws away the connection pool (and the
+TLS handshake) every time. Scrapers share one pooled session per process and
+event loop; the scraper worker closes it on shutdown.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "NavImpact Grant Scraper/1.0 (+https://navimpact.onrender.com)"
+}
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Get the shared scraper session, creating it on first use."""
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+
+    # Sessions are bound to the loop they were created on
+    if _session is not None and (_session.closed or _session_loop is not loop):
+        _session = None
+
+    if _session is None:
+        connector = aiohttp.TCPConnector(
+            limit=settings.SCRAPER_HTTP_POOL_SIZE,
+            limit_per_host=settings.SCRAPER_HTTP_PER_HOST,
+            ttl_dns_cache=300
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=settings.SCRAPER_HTTP_TIMEOUT)
+        )
+        _session_loop = loop
+        logger.info(f"Opened scraper HTTP pool (limit={settings.SCRAPER_HTTP_POOL_SIZE}, per_host={settings.SCRAPER_HTTP_PER_HOST})")
+
+    return _session
+
+
+async def close_http_session():
+    """Close the shared scraper session."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("Scraper HTTP pool closed")
+    _session = None
+    _session_loop = None
@@ -0,0 +1,330 @@
+"""
+Bulk grant ingestion.
+
+Scraped grants are written in batches with one statement per batch:
+
+    INSERT INTO grants (...) VALUES (...), (...), ...
+    ON CONFLICT (dedupe_key) DO UPDATE SET ...
+        WHERE grants.content_hash IS DISTINCT FROM excluded.content_hash
+    RETURNING id, (xmax = 0)
+
+``dedupe_key`` identifies a grant (source, URL and normalised title), so a
+re-scrape updates the existing row instead of adding a copy. ``content_hash``
+covers the scraped fields, so unchanged rows are skipped entirely and are not
+returned. ``xmax = 0`` is true only for freshly inserted rows, which gives
+exact added/updated/unchanged counts from the same round trip. The returned
+ids are appended to ``grant_changes`` (the change feed) and re-indexed for
+cross-source near-duplicates (``near_duplicates.py``) in the same
+transaction.
+
+Other databases (SQLite in tests) take a portable path: one SELECT of the
+existing hashes per batch, then a bulk INSERT and an executemany UPDATE.
+
+Before either, each batch's keys are looked up in ``grants_archive``. A grant
+that was archived is not inserted again while its round is over; when the
+source lists a later deadline it is moved back (same id) and then updated.
+New rows get the status their dates call for (``grant_lifecycle.status_for``)
+unless the scraper gave a more specific one. Updates keep the stored status,
+except that a ``closed`` grant scraped with a deadline that hasn't passed
+(a new round) takes the status of the scrape again; the lifecycle job never
+reopens closed grants itself.
+
+Nothing is committed here; callers own the transaction.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, case, func, insert, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import record_grant_changes
+from app.services.grant_archive import restore_archived
+from app.services.grant_lifecycle import LISTED, status_for
+from app.services.scrapers.extraction import parse_date
+from app.services.scrapers.near_duplicates import index_grants
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+# Scraper output keys that differ from the column names
+FIELD_ALIASES = {
+    "location": "location_eligibility",
+    "org_types": "org_type_eligible",
+}
+
+# Columns refreshed from the scrape on update. ``status`` is only set on
+# insert (or when a closed grant reopens) so that lifecycle changes made
+# after ingestion are not undone.
+CONTENT_COLUMNS = (
+    "title", "description", "source_url", "application_url", "contact_email",
+    "min_amount", "max_amount", "open_date", "deadline",
+    "industry_focus", "location_eligibility", "org_type_eligible", "funding_purpose", "audience_tags",
+)
+
+# Column length limits; one over-long value would fail the whole batch
+MAX_LENGTHS = {
+    "title": 500, "source_url": 1000, "application_url": 1000, "contact_email": 255,
+    "industry_focus": 100, "location_eligibility": 100,
+}
+
+_table = Grant.__table__
+
+
+@dataclass
+class IngestResult:
+    """Counts from one or more ingestion batches."""
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    # Already archived and not reopened, so not written
+    archived: int = 0
+    restored: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.added + self.updated + self.unchanged
+
+    def merge(self, other: "IngestResult") -> "IngestResult":
+        return IngestResult(
+            added=self.added + other.added,
+            updated=self.updated + other.updated,
+            unchanged=self.unchanged + other.unchanged,
+            skipped=self.skipped + other.skipped,
+            archived=self.archived + other.archived,
+            restored=self.restored + other.restored
+        )
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(title.split()).lower()
+
+
+def normalize_url(url: Optional[str]) -> str:
+    return (url or "").strip().rstrip("/")
+
+
+def dedupe_key(source: str, source_url: Optional[str], title: str) -> str:
+    """Identity of a grant within the table.
+
+    The same expression is used to backfill existing rows in the migration
+    (md5 so that it can be computed in SQL), so keep the two in step.
+    """
+    raw = f"{source}|{normalize_url(source_url)}|{normalize_title(title)}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _amount(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        return float(str(value).replace(",", "").replace("$", ""))
+    except ValueError:
+        return None
+
+
+def _hash_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return value
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """Hash of the scraped fields of a grant row."""
+    payload = {column: _hash_value(row.get(column)) for column in CONTENT_COLUMNS}
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def grant_row(source: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a scraped grant dict onto ``grants`` columns, or None if unusable."""
+    data = {FIELD_ALIASES.get(key, key): value for key, value in data.items()}
+
+    title = " ".join(str(data.get("title") or "").split())
+    if not title:
+        return None
+
+    row = {
+        "title": title,
+        "description": data.get("description") or None,
+        "source_url": normalize_url(data.get("source_url")) or None,
+        "application_url": data.get("application_url") or None,
+        "contact_email": data.get("contact_email") or None,
+        "min_amount": _amount(data.get("min_amount")),
+        "max_amount": _amount(data.get("max_amount")),
+        "open_date": parse_date(data.get("open_date")),
+        "deadline": parse_date(data.get("deadline")),
+        "industry_focus": data.get("industry_focus") or None,
+        "location_eligibility": data.get("location_eligibility") or None,
+        "org_type_eligible": list(data.get("org_type_eligible") or []),
+        "funding_purpose": list(data.get("funding_purpose") or []),
+        "audience_tags": list(data.get("audience_tags") or []),
+    }
+    for column, limit in MAX_LENGTHS.items():
+        if isinstance(row[column], str) and len(row[column]) > limit:
+            row[column] = row[column][:limit]
+
+    row["source"] = source
+    status = data.get("status")
+    row["status"] = status if status and status not in LISTED else status_for(row["open_date"], row["deadline"])
+    row["dedupe_key"] = dedupe_key(source, row["source_url"], title)
+    row["content_hash"] = content_hash(row)
+    return row
+
+
+def postgres_upsert_statement(rows: List[Dict[str, Any]], now: Optional[datetime] = None):
+    """The single-round-trip upsert for a batch of rows."""
+    now = now or datetime.utcnow()
+    stmt = pg_insert(_table).values(rows)
+    excluded = stmt.excluded
+    set_ = {column: excluded[column] for column in CONTENT_COLUMNS}
+    set_["status"] = case(
+        (and_(_table.c.status == "closed", excluded.deadline >= now), excluded.status),
+        else_=_table.c.status
+    )
+    set_["content_hash"] = excluded.content_hash
+    set_["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_table.c.dedupe_key],
+        set_=set_,
+        where=_table.c.content_hash.is_distinct_from(excluded.content_hash)
+    )
+    return stmt.returning(_table.c.id, literal_column("(xmax = 0)").label("inserted"))
+
+
+def _written(db: Session, changes: List[Tuple[str, int]]):
+    """Follow-up for rows a batch inserted or changed, in the same transaction."""
+    record_grant_changes(db.connection(), changes)
+    index_grants(db, [grant_id for _, grant_id in changes])
+
+
+def _upsert_postgres(db: Session, rows: List[Dict[str, Any]]) -> IngestResult:
+    returned = db.execute(postgres_upsert_statement(rows)).all()
+    _written(db, [("insert" if row.inserted else "update", row.id) for row in returned])
+    added = sum(1 for row in returned if row.inserted)
+    return IngestResult(added=added, updated=len(returned) - added, unchanged=len(rows) - len(returned))
+
+
+def _upsert_portable(db: Session, rows: List[Dict[str, Any]]) -> IngestResult:
+    now = datetime.utcnow()
+    existing, closed = {}, set()
+    for key, hash_, status in db.execute(
+        select(_table.c.dedupe_key, _table.c.content_hash, _table.c.status)
+        .where(_table.c.dedupe_key.in_([row["dedupe_key"] for row in rows]))
+    ):
+        existing[key] = hash_
+        if status == "closed":
+            closed.add(key)
+
+    new_rows = [row for row in rows if row["dedupe_key"] not in existing]
+    changed = [
+        {**{column: row[column] for column in CONTENT_COLUMNS}, "content_hash": row["content_hash"], "_key": row["dedupe_key"]}
+        for row in rows
+        if row["dedupe_key"] in existing and existing[row["dedupe_key"]] != row["content_hash"]
+    ]
+
+    if new_rows:
+        db.execute(insert(_table), new_rows)
+    if changed:
+        db.execute(update(_table).where(_table.c.dedupe_key == bindparam("_key")), changed)
+    reopened = [
+        {"_key": row["dedupe_key"], "status": row["status"]}
+        for row in rows
+        if row["dedupe_key"] in closed and existing[row["dedupe_key"]] != row["content_hash"]
+        and row["deadline"] is not None and row["deadline"] >= now
+    ]
+    if reopened:
+        db.execute(update(_table).where(_table.c.dedupe_key == bindparam("_key")), reopened)
+    if new_rows or changed:
+        ops = {row["dedupe_key"]: "insert" for row in new_rows}
+        ops.update((row["_key"], "update") for row in changed)
+        ids = db.execute(
+            select(_table.c.dedupe_key, _table.c.id)
+            .where(_table.c.dedupe_key.in_(list(ops)))
+            .order_by(_table.c.id)
+        ).all()
+        _written(db, [(ops[key], grant_id) for key, grant_id in ids])
+
+    return IngestResult(added=len(new_rows), updated=len(changed), unchanged=len(rows) - len(new_rows) - len(changed))
+
+
+def _check_archive(db: Session, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], IngestResult]:
+    """Drop rows for archived grants, restoring those that reopened. Returns the rows to upsert."""
+    archived = {}
+    for grant_id, key, deadline in db.execute(
+        select(ArchivedGrant.id, ArchivedGrant.dedupe_key, ArchivedGrant.deadline)
+        .where(ArchivedGrant.dedupe_key.in_([row["dedupe_key"] for row in rows]))
+        .order_by(ArchivedGrant.id)
+    ):
+        # A program archived once per round: the latest copy decides
+        archived[key] = (grant_id, deadline)
+    if not archived:
+        return rows, IngestResult()
+
+    kept, restore = [], {}
+    for row in rows:
+        if row["dedupe_key"] not in archived:
+            kept.append(row)
+            continue
+        grant_id, deadline = archived[row["dedupe_key"]]
+        reopened = (
+            row["deadline"] is not None and (deadline is None or row["deadline"] > deadline)
+            and row["status"] != "closed"
+        )
+        if reopened:
+            restore[grant_id] = row["status"]
+            kept.append(row)
+    restore_archived(db, restore)
+    return kept, IngestResult(archived=len(rows) - len(kept), restored=len(restore))
+
+
+def upsert_grants(db: Session, source: str, grants: Iterable[Dict[str, Any]],
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> IngestResult:
+    """Insert new grants and update changed ones, in batches."""
+    result = IngestResult()
+
+    # Later copies of the same grant win; a single INSERT .. ON CONFLICT
+    # can't touch the same row twice
+    rows: Dict[str, Dict[str, Any]] = {}
+    for data in grants:
+        row = grant_row(source, data)
+        if row is None:
+            result.skipped += 1
+            continue
+        if row["dedupe_key"] in rows:
+            result.skipped += 1
+        rows[row["dedupe_key"]] = row
+
+    result = result.merge(upsert_rows(db, list(rows.values()), batch_size))
+    logger.info(
+        f"Ingested {source}: {result.added} added, {result.updated} updated, "
+        f"{result.unchanged} unchanged, {result.skipped} skipped, "
+        f"{result.archived} archived, {result.restored} restored"
+    )
+    return result
+
+
+def upsert_rows(db: Session, rows: List[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> IngestResult:
+    """Write rows built by ``grant_row``. Dedupe keys must be unique."""
+    result = IngestResult()
+    upsert = _upsert_postgres if db.get_bind().dialect.name == "postgresql" else _upsert_portable
+    for start in range(0, len(rows), batch_size):
+        batch, checked = _check_archive(db, rows[start:start + batch_size])
+        result = result.merge(checked)
+        if batch:
+            result = result.merge(upsert(db, batch))
+    return result
@@ -0,0 +1,171 @@
+"""
+Database-backed queue for scraper runs.
+
+The API only enqueues ``scrape_jobs`` rows; scraper workers claim them with
+``SELECT ... FOR UPDATE SKIP LOCKED`` so any number of workers can poll the
+same table without handing out a job twice. A Postgres advisory lock per
+source guarantees that two workers never crawl the same source at once, even
+if duplicate jobs for it were queued.
+"""
+
+import logging
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import get_engine
+from app.models.scrape_job import ScrapeJob
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# First key of the two-int advisory lock form, reserved for scraper sources
+SOURCE_LOCK_CLASS = 0x5C4A
+
+# A job still "running" after this long belongs to a worker that died
+STALE_JOB_TIMEOUT = timedelta(hours=2)
+
+
+def enqueue_scrape_job(db: Session, source_name: str, requested_by: str = "api",
+                       priority: int = 0, run_after: Optional[datetime] = None) -> ScrapeJob:
+    """Queue a scrape of ``source_name`` unless one is already queued or running."""
+    existing = (
+        db.query(ScrapeJob)
+        .filter(ScrapeJob.source_name == source_name, ScrapeJob.status.in_(ACTIVE_STATUSES))
+        .order_by(ScrapeJob.id)
+        .first()
+    )
+    if existing:
+        # Let a higher-priority request bump the queued job forward
+        if existing.status == "queued" and priority > existing.priority:
+            existing.priority = priority
+            existing.run_after = min(existing.run_after, run_after or datetime.utcnow())
+            db.commit()
+        return existing
+
+    job = ScrapeJob(
+        source_name=source_name,
+        status="queued",
+        priority=priority,
+        max_attempts=settings.SCRAPER_JOB_MAX_ATTEMPTS,
+        run_after=run_after or datetime.utcnow(),
+        requested_by=requested_by
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    logger.info(f"Queued scrape job {job.id} for {source_name} (requested by {requested_by})")
+    return job
+
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[ScrapeJob]:
+    """Claim the next due job, skipping rows other workers have locked."""
+    now = datetime.utcnow()
+    job = (
+        db.query(ScrapeJob)
+        .filter(ScrapeJob.status == "queued", ScrapeJob.run_after <= now)
+        .order_by(ScrapeJob.priority.desc(), ScrapeJob.run_after, ScrapeJob.id)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if job is None:
+        db.commit()
+        return None
+
+    job.status = "running"
+    job.worker_id = worker_id
+    job.started_at = now
+    job.attempts += 1
+    db.commit()
+    return job
+
+
+def complete_job(db: Session, job: ScrapeJob, result: Dict[str, Any]):
+    """Mark a job as succeeded."""
+    job.status = "succeeded"
+    job.finished_at = datetime.utcnow()
+    job.error_message = None
+    job.result = result
+    db.commit()
+
+
+def fail_job(db: Session, job: ScrapeJob, error: str):
+    """Record a failed attempt, re-queueing with backoff while attempts remain."""
+    job.error_message = error
+    if job.attempts < job.max_attempts:
+        job.status = "queued"
+        job.run_after = datetime.utcnow() + timedelta(minutes=2 ** job.attempts)
+        logger.warning(f"Scrape job {job.id} ({job.source_name}) failed, retrying after {job.run_after}: {error}")
+    else:
+        job.status = "failed"
+        job.finished_at = datetime.utcnow()
+        logger.error(f"Scrape job {job.id} ({job.source_name}) failed permanently: {error}")
+    db.commit()
+
+
+def defer_job(db: Session, job: ScrapeJob, delay: timedelta):
+    """Put a claimed job back without counting it as an attempt."""
+    job.status = "queued"
+    job.attempts = max(job.attempts - 1, 0)
+    job.worker_id = None
+    job.started_at = None
+    job.run_after = datetime.utcnow() + delay
+    db.commit()
+
+
+def requeue_stale_jobs(db: Session, timeout: timedelta = STALE_JOB_TIMEOUT) -> int:
+    """Return jobs stuck in ``running`` (their worker died) to the queue."""
+    cutoff = datetime.utcnow() - timeout
+    count = (
+        db.query(ScrapeJob)
+        .filter(ScrapeJob.status == "running", ScrapeJob.started_at < cutoff)
+        .update({"status": "queued", "worker_id": None, "run_after": datetime.utcnow()},
+                synchronize_session=False)
+    )
+    db.commit()
+    if count:
+        logger.warning(f"Re-queued {count} stale scrape jobs")
+    return count
+
+
+def get_recent_jobs(db: Session, limit: int = 50, source_name: Optional[str] = None) -> List[ScrapeJob]:
+    """Most recent jobs, newest first."""
+    query = db.query(ScrapeJob)
+    if source_name:
+        query = query.filter(ScrapeJob.source_name == source_name)
+    return query.order_by(ScrapeJob.id.desc()).limit(limit).all()
+
+
+def source_lock_key(source_name: str) -> int:
+    """Stable signed 32-bit key for a source's advisory lock."""
+    return zlib.crc32(source_name.encode("utf-8")) - (1 << 31)
+
+
+@contextmanager
+def source_lock(source_name: str) -> Iterator[bool]:
+    """
+    Hold the advisory lock for a source while the block runs.
+
+    Yields False if another worker already holds it. The lock lives on its own
+    connection so job-session commits and rollbacks cannot release it early.
+    """
+    key = source_lock_key(source_name)
+    with get_engine().connect() as conn:
+        acquired = conn.execute(
+            text("SELECT pg_try_advisory_lock(:cls, :key)"),
+            {"cls": SOURCE_LOCK_CLASS, "key": key}
+        ).scalar()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                conn.execute(
+                    text("SELECT pg_advisory_unlock(:cls, :key)"),
+                    {"cls": SOURCE_LOCK_CLASS, "key": key}
+                )
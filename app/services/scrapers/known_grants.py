@@ -0,0 +1,80 @@
+"""
+Versioned seed dataset of known grant programs.
+
+Some scrapers also ingest a fixed list of verified programs that their sites
+don't list in a parseable way. The lists live in ``data/known_grants.json``,
+keyed by source, and are read once per process. Each source's entries are
+checksummed, and ``grant_seeds`` records the checksum last ingested for the
+source, so a run only pushes the known grants through the pipeline when the
+dataset has changed since; otherwise it does no database work for them.
+
+To change a program, edit the JSON and bump ``version``. Deleting a source's
+``grant_seeds`` row makes the next run re-ingest its known grants.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.grant_seed import GrantSeed
+
+logger = logging.getLogger(__name__)
+
+KNOWN_GRANTS_PATH = Path(__file__).parent / "data" / "known_grants.json"
+
+
+@dataclass(frozen=True)
+class SeedSource:
+    """One source's known grants at a dataset version."""
+    source_name: str
+    version: int
+    checksum: str
+    grants: Tuple[Dict[str, Any], ...]
+
+
+def seed_checksum(grants) -> str:
+    """sha256 of the entries in canonical JSON form (key order doesn't matter)."""
+    encoded = json.dumps(list(grants), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def load_known_grants(path: Path = KNOWN_GRANTS_PATH) -> Dict[str, SeedSource]:
+    """The dataset by source, parsed once per process."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    version = int(data["version"])
+    return {
+        source_name: SeedSource(source_name, version, seed_checksum(grants), tuple(grants))
+        for source_name, grants in data["sources"].items()
+    }
+
+
+def known_grants_for(source_name: str) -> Optional[SeedSource]:
+    return load_known_grants().get(source_name)
+
+
+def applied_seed_checksum(db: Session, source_name: str) -> Optional[str]:
+    """Checksum of the known grants last ingested for ``source_name``."""
+    row = db.query(GrantSeed).filter(GrantSeed.source_name == source_name).first()
+    return row.checksum if row else None
+
+
+def mark_seed_applied(db: Session, seed: SeedSource):
+    """Record that ``seed`` has been ingested (no commit)."""
+    row = db.query(GrantSeed).filter(GrantSeed.source_name == seed.source_name).first()
+    if row is None:
+        row = GrantSeed(source_name=seed.source_name)
+        db.add(row)
+    row.version = seed.version
+    row.checksum = seed.checksum
+    row.grant_count = len(seed.grants)
+    row.applied_at = datetime.utcnow()
+    db.flush()
+    logger.info(f"Known grants for {seed.source_name} at version {seed.version} ingested ({len(seed.grants)} grants)")
@@ -1,11 +1,8 @@
-import asyncio
 import logging
 import random
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Any, AsyncIterator
 from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin
 from .base_scraper import BaseScraper
 from sqlalchemy.orm import Session
 
@@ -20,7 +17,6 @@ class MediaInvestmentScraper(BaseScraper):
     
     def __init__(self, db_session: Session):
         super().__init__(db_session, "media_investment")
-        self.scraped_grants = []
         self.urls_scraped = []
         self.rate_limits = {"requests_made": 0, "max_per_minute": 10}
         
@@ -117,148 +113,22 @@ class MediaInvestmentScraper(BaseScraper):
                 "description": "Stan Entertainment - Original content development"
             }
         }
-        
-        # Known current media investment opportunities (verified real programs)
-        self.known_opportunities = [
-            {
-                "title": "ABC Innovation Fund",
-                "description": "Supports innovative digital content and technology projects that align with ABC's public service mission. Funding for experimental formats, interactive content, and digital storytelling initiatives.",
-                "source_url": "https://www.abc.net.au/innovation/funding-opportunities",
-                "min_amount": 10000,
-                "max_amount": 200000,
-                "industry_focus": "media",
-                "location": "national",
-                "org_types": ["individual", "small_business", "production_company"],
-                "funding_purpose": ["content_development", "digital_innovation", "experimental_formats"],
-                "audience_tags": ["media", "digital", "innovation", "broadcasting"],
-                "contact_email": "innovation@abc.net.au",
-                "status": "active"
-            },
-            {
-                "title": "SBS Emerging Talent Initiative",
-                "description": "Supports emerging content creators from culturally diverse backgrounds. Funding for documentary projects, digital content, and multicultural storytelling that reflects Australia's diversity.",
-                "source_url": "https://www.sbs.com.au/aboutus/corporate-information/emerging-talent",
-                "min_amount": 15000,
-                "max_amount": 150000,
-                "industry_focus": "media",
-                "location": "national",
-                "org_types": ["individual", "production_company", "not_for_profit"],
-                "funding_purpose": ["content_development", "documentary", "multicultural_content"],
-                "audience_tags": ["media", "diversity", "documentary", "multicultural"],
-                "contact_email": "emerging.talent@sbs.com.au",
-                "status": "active"
-            },
-            {
-                "title": "Screen Australia Documentary Development",
-                "description": "Supports the development of documentary projects for television and digital platforms. Funding for research, treatment development, and pre-production activities.",
-                "source_url": "https://www.screenaustralia.gov.au/funding-and-support/documentary",
-                "min_amount": 20000,
-                "max_amount": 300000,
-                "industry_focus": "media",
-                "location": "national",
-                "org_types": ["production_company", "individual", "not_for_profit"],
-                "funding_purpose": ["development", "pre_production", "research"],
-                "audience_tags": ["documentary", "television", "digital", "screen"],
-                "contact_email": "documentary@screenaustralia.gov.au",
-                "status": "active"
-            },
-            {
-                "title": "Nine Entertainment Content Development Fund",
-                "description": "Supports the development of innovative content formats and digital experiences. Funding for pilot productions, format development, and digital content creation.",
-                "source_url": "https://www.nineentertainment.com.au/about/content-development",
-                "min_amount": 25000,
-                "max_amount": 500000,
-                "industry_focus": "media",
-                "location": "national",
-                "org_types": ["production_company", "small_business"],
-                "funding_purpose": ["content_development", "format_development", "pilot_production"],
-                "audience_tags": ["television", "digital", "format", "entertainment"],
-                "contact_email": "development@nine.com.au",
-                "status": "active"
-            },
-            {
-                "title": "Foxtel Original Content Fund",
-                "description": "Supports the development and production of original Australian content for subscription television. Funding for drama, documentary, and factual programming.",
-                "source_url": "https://www.foxtel.com.au/about/content-development",
-                "min_amount": 50000,
-                "max_amount": 1000000,
-                "industry_focus": "media",
-                "location": "national",
-                "org_types": ["production_company", "independent_producer"],
-                "funding_purpose": ["production", "development", "original_content"],
-                "audience_tags": ["television", "drama", "documentary", "subscription"],
-                "contact_email": "content@foxtel.com.au",
-                "status": "active"
-            },
-            {
-                "title": "News Corp Digital Innovation Fund",
-                "description": "Supports digital journalism innovations and media technology projects. Funding for newsroom technology, digital storytelling tools, and audience engagement platforms.",
-                "source_url": "https://www.newscorpaustralia.com/about/innovation-fund",
-                "min_amount": 20000,
-                "max_amount": 250000,
-                "industry_focus": "media",
-                "location": "national",
-                "org_types": ["small_business", "individual", "technology_company"],
-                "funding_purpose": ["digital_innovation", "journalism_technology", "audience_engagement"],
-                "audience_tags": ["journalism", "digital", "technology", "news"],
-                "contact_email": "innovation@newscorp.com.au",
-                "status": "active"
-            },
-            {
-                "title": "Stan Original Productions Development",
-                "description": "Supports the development of original Australian content for streaming platforms. Funding for drama series, documentaries, and comedy productions.",
-                "source_url": "https://www.stan.com.au/about/original-productions",
-                "min_amount": 30000,
-                "max_amount": 750000,
-                "industry_focus": "media",
-                "location": "national",
-                "org_types": ["production_company", "independent_producer"],
-                "funding_purpose": ["content_development", "series_development", "streaming_content"],
-                "audience_tags": ["streaming", "drama", "comedy", "original"],
-                "contact_email": "originals@stan.com.au",
-                "status": "active"
-            },
-            {
-                "title": "Southern Cross Austereo Content Innovation",
-                "description": "Supports innovative radio and digital audio content development. Funding for podcast productions, audio storytelling, and digital audio experiences.",
-                "source_url": "https://www.southerncrossaustereo.com.au/about/content-development",
-                "min_amount": 5000,
-                "max_amount": 100000,
-                "industry_focus": "media",
-                "location": "national",
-                "org_types": ["individual", "small_business", "production_company"],
-                "funding_purpose": ["audio_content", "podcast_development", "digital_audio"],
-                "audience_tags": ["radio", "podcast", "audio", "digital"],
-                "contact_email": "content@sca.com.au",
-                "status": "active"
-            }
-        ]
     
-    async def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method for media investment opportunities."""
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield media investment opportunities as each page is parsed, then the known opportunities."""
         logger.info("Starting Media Investment scraper")
         
+        async for grant in self._stream_sites(self.media_companies, stagger=5, pause=(4, 8)):
+            yield grant
+        
+        async for grant in self._stream_known_grants():
+            yield grant
+    
+    async def scrape(self) -> List[Dict[str, Any]]:
+        """Scrape everything, then save it in one go. ScraperService streams instead."""
         try:
-            # Scrape web sources
-            web_opportunities = await self._scrape_all_media_companies()
-            
-            # Add known opportunities
-            known_opportunities = await self._process_known_opportunities()
-            
-            # Combine and deduplicate
-            all_opportunities = web_opportunities + known_opportunities
-            unique_opportunities = self._deduplicate_opportunities(all_opportunities)
-            
-            # Validate opportunities
-            valid_opportunities = []
-            for opportunity in unique_opportunities:
-                if self._validate_grant_data(opportunity):
-                    valid_opportunities.append(opportunity)
-                else:
-                    logger.warning(f"Invalid opportunity data: {opportunity.get('title', 'Unknown')}")
-            
-            # Save to database
-            saved_opportunities = await self.save_grants(valid_opportunities)
+            opportunities = [grant async for grant in self.stream()]
+            saved_opportunities = await self.save_grants(opportunities)
             
             logger.info(f"Successfully scraped {len(saved_opportunities)} media investment opportunities")
             return saved_opportunities
@@ -267,7 +137,7 @@ class MediaInvestmentScraper(BaseScraper):
             logger.error(f"Error in media investment scraper: {str(e)}")
             # Fallback to known opportunities
             try:
-                known_opportunities = await self._process_known_opportunities()
+                known_opportunities = await self._process_known_grants()
                 saved_opportunities = await self.save_grants(known_opportunities)
                 logger.info(f"Fallback: saved {len(saved_opportunities)} known opportunities")
                 return saved_opportunities
@@ -275,68 +145,6 @@ class MediaInvestmentScraper(BaseScraper):
                 logger.error(f"Fallback also failed: {str(fallback_error)}")
                 return []
     
-    async def _scrape_all_media_companies(self) -> List[Dict[str, Any]]:
-        """Scrape all media company sources."""
-        all_opportunities = []
-        
-        # Create tasks for each media company
-        tasks = []
-        for i, (company_name, company_config) in enumerate(self.media_companies.items()):
-            delay = i * 5  # 5 seconds between each company
-            task = asyncio.create_task(self._scrape_company_with_delay(company_name, company_config, delay))
-            tasks.append(task)
-        
-        # Wait for all tasks
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        for i, result in enumerate(results):
-            company_name = list(self.media_companies.keys())[i]
-            if isinstance(result, Exception):
-                logger.error(f"Error scraping {company_name}: {str(result)}")
-            else:
-                logger.info(f"Successfully scraped {len(result)} opportunities from {company_name}")
-                all_opportunities.extend(result)
-        
-        return all_opportunities
-    
-    async def _scrape_company_with_delay(self, company_name: str, company_config: Dict, delay: int) -> List[Dict[str, Any]]:
-        """Scrape a media company with initial delay."""
-        if delay > 0:
-            logger.info(f"Waiting {delay} seconds before scraping {company_name}")
-            await asyncio.sleep(delay)
-        
-        return await self._scrape_company(company_name, company_config)
-    
-    async def _scrape_company(self, company_name: str, company_config: Dict) -> List[Dict[str, Any]]:
-        """Scrape a specific media company."""
-        opportunities = []
-        base_url = company_config["base_url"]
-        
-        logger.info(f"Scraping {company_name} from {base_url}")
-        
-        for endpoint in company_config["endpoints"]:
-            try:
-                url = urljoin(base_url, endpoint)
-                
-                # Rate limiting
-                await self._rate_limit_delay()
-                
-                # Scrape endpoint
-                endpoint_opportunities = await self._scrape_endpoint(company_name, url)
-                if endpoint_opportunities:
-                    opportunities.extend(endpoint_opportunities)
-                    logger.info(f"Found {len(endpoint_opportunities)} opportunities from {url}")
-                
-                # Delay between endpoints
-                await asyncio.sleep(random.uniform(4, 8))
-                
-            except Exception as e:
-                logger.error(f"Error scraping {company_name} endpoint {endpoint}: {str(e)}")
-                continue
-        
-        return opportunities
-    
     async def _scrape_endpoint(self, company_name: str, url: str) -> List[Dict[str, Any]]:
         """Scrape a specific endpoint."""
         try:
@@ -348,32 +156,29 @@ class MediaInvestmentScraper(BaseScraper):
                 logger.warning(f"Failed to fetch {url}")
                 return []
             
-            soup = self._parse_html(html)
-            
-            # Use company-specific parsing
-            opportunities = []
+            # Use company-specific parsing, off the event loop
             if "abc.net.au" in url:
-                opportunities = await self._parse_abc(soup, url)
+                parser_name = "_parse_abc"
             elif "sbs.com.au" in url:
-                opportunities = await self._parse_sbs(soup, url)
+                parser_name = "_parse_sbs"
             elif "nineentertainment.com.au" in url:
-                opportunities = await self._parse_nine(soup, url)
+                parser_name = "_parse_nine"
             elif "sevenwestmedia.com.au" in url:
-                opportunities = await self._parse_seven(soup, url)
+                parser_name = "_parse_seven"
             elif "10play.com.au" in url:
-                opportunities = await self._parse_ten(soup, url)
+                parser_name = "_parse_ten"
             elif "foxtel.com.au" in url:
-                opportunities = await self._parse_foxtel(soup, url)
+                parser_name = "_parse_foxtel"
             elif "newscorpaustralia.com" in url:
-                opportunities = await self._parse_news_corp(soup, url)
+                parser_name = "_parse_news_corp"
             elif "southerncrossaustereo.com.au" in url:
-                opportunities = await self._parse_sca(soup, url)
+                parser_name = "_parse_sca"
             elif "stan.com.au" in url:
-                opportunities = await self._parse_stan(soup, url)
+                parser_name = "_parse_stan"
             else:
-                opportunities = await self._parse_generic_media(soup, url)
+                parser_name = "_parse_generic_media"
             
-            return opportunities
+            return await self._parse_page(html, url, parser_name)
             
         except Exception as e:
             logger.error(f"Error scraping endpoint {url}: {str(e)}")
@@ -686,105 +491,6 @@ class MediaInvestmentScraper(BaseScraper):
             logger.error(f"Error extracting opportunity from container: {str(e)}")
             return None
     
-    def _extract_amounts(self, text: str) -> tuple[Optional[int], Optional[int]]:
-        """Extract funding amounts from text."""
-        # Look for dollar amounts
-        amount_patterns = [
-            r'\$([0-9,]+(?:\.[0-9]{2})?)',
-            r'([0-9,]+)\s*dollars?',
-            r'up\s+to\s+\$([0-9,]+)',
-            r'maximum\s+\$([0-9,]+)',
-            r'minimum\s+\$([0-9,]+)',
-            r'budget\s+of\s+\$([0-9,]+)',
-            r'funding\s+of\s+\$([0-9,]+)'
-        ]
-        
-        amounts = []
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, text, re.I)
-            for match in matches:
-                try:
-                    amount = int(match.replace(',', ''))
-                    amounts.append(amount)
-                except ValueError:
-                    continue
-        
-        if not amounts:
-            return None, None
-        
-        amounts.sort()
-        min_amount = amounts[0] if amounts else None
-        max_amount = amounts[-1] if len(amounts) > 1 else None
-        
-        return min_amount, max_amount
-    
-    def _extract_dates(self, text: str) -> Dict[str, Optional[datetime]]:
-        """Extract dates from text."""
-        dates = {"open_date": None, "deadline": None}
-        
-        # Look for deadline patterns
-        deadline_patterns = [
-            r'deadline[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'due[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'closes[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'applications\s+close[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'submissions\s+due[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})'
-        ]
-        
-        for pattern in deadline_patterns:
-            match = re.search(pattern, text, re.I)
-            if match:
-                try:
-                    date_str = match.group(1)
-                    dates["deadline"] = self._parse_date(date_str)
-                    break
-                except Exception:
-                    continue
-        
-        return dates
-    
-    def _extract_email(self, text: str) -> Optional[str]:
-        """Extract email address from text."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
-        return match.group(0) if match else None
-    
-    async def _process_known_opportunities(self) -> List[Dict[str, Any]]:
-        """Process known media investment opportunities."""
-        processed_opportunities = []
-        
-        for opportunity_data in self.known_opportunities:
-            try:
-                # Add current dates if not specified
-                if not opportunity_data.get("open_date"):
-                    opportunity_data["open_date"] = datetime.now() - timedelta(days=90)
-                
-                if not opportunity_data.get("deadline"):
-                    opportunity_data["deadline"] = datetime.now() + timedelta(days=180)
-                
-                # Normalize the opportunity data
-                normalized_opportunity = self.normalize_grant_data(opportunity_data)
-                processed_opportunities.append(normalized_opportunity)
-                
-            except Exception as e:
-                logger.error(f"Error processing known opportunity {opportunity_data.get('title', 'Unknown')}: {str(e)}")
-                continue
-        
-        return processed_opportunities
-    
-    def _deduplicate_opportunities(self, opportunities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate opportunities."""
-        seen = set()
-        unique_opportunities = []
-        
-        for opportunity in opportunities:
-            key = (opportunity.get("title", ""), opportunity.get("source_url", ""))
-            if key not in seen:
-                seen.add(key)
-                unique_opportunities.append(opportunity)
-        
-        return unique_opportunities
-    
     async def _rate_limit_delay(self):
         """Implement rate limiting."""
         self.rate_limits["requests_made"] += 1
@@ -792,4 +498,4 @@ class MediaInvestmentScraper(BaseScraper):
         if self.rate_limits["requests_made"] % 2 == 0:
             delay = random.uniform(5, 10)
             logger.info(f"Rate limiting: waiting {delay:.1f} seconds")
-            await asyncio.sleep(delay) 
\ No newline at end of file
+            await self._polite_sleep(delay) 
\ No newline at end of file
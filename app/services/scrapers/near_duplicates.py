@@ -0,0 +1,288 @@
+"""
+Near-duplicate grants across sources.
+
+The same program is often listed by several sources (business.gov.au,
+GrantConnect, the aggregators) under slightly different titles, URLs and
+descriptions, so ``dedupe_key`` sees different grants. Each grant gets a
+MinHash signature over word shingles of its normalised title and
+description; the estimated Jaccard similarity of two grants is the fraction
+of signature positions that agree.
+
+Candidates are found with LSH rather than by comparing against every grant:
+the signature is cut into ``BANDS`` bands and each band hashed to a bucket
+stored in ``grant_lsh_buckets``. Grants sharing a bucket in any band are
+candidates (likely for similarity above ~0.4 with 32 bands of 4 rows), and
+only those are compared properly against ``SCRAPER_DUPLICATE_THRESHOLD``.
+
+Matching grants from different sources form a cluster whose canonical grant
+is its oldest member (lowest id); the others point at it through
+``grants.canonical_id``. Lists, search and matching only look at canonical
+grants. Grants from the same source are never clustered - within a source
+``dedupe_key`` is the identity, and similar listings there are usually
+separate rounds of a program.
+
+``index_grants`` runs for every batch ingestion inserts or changes, so
+clusters are maintained incrementally, and grants moved between clusters are
+logged to the change feed; ``rebuild`` indexes every grant (after the
+migration, or a change to the tokenisation).
+"""
+
+import hashlib
+import logging
+import random
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import delete, insert, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.grant import Grant
+from app.models.grant_change import record_grant_changes
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+# Only the start of long descriptions; boilerplate follows
+MAX_TOKENS = 300
+
+# Words that differ between listings of the same program without changing it
+NOISE_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on",
+    "or", "that", "the", "this", "to", "with", "your", "you",
+    "grant", "grants", "program", "programme", "fund", "funding",
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x6E64)
+# Fixed seed: signatures are stored, so the permutations must never change
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_grants = Grant.__table__
+_signatures = GrantSignature.__table__
+_buckets = GrantLshBucket.__table__
+
+
+def tokens(title: Optional[str], description: Optional[str]) -> List[str]:
+    text = f"{title or ''} {description or ''}".lower()
+    words = [word for word in _TOKEN.findall(text) if word not in NOISE_WORDS]
+    return words[:MAX_TOKENS]
+
+
+def shingles(words: Sequence[str]) -> Set[str]:
+    """Word bigrams (single words for one-word texts)."""
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(items: Iterable[str]) -> Optional[List[int]]:
+    """Signature of a set of shingles, or None for an empty set."""
+    hashes = [_shingle_hash(item) for item in set(items)]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) & 0xFFFFFFFF for a, b in _PERMUTATIONS]
+
+
+def signature_for(title: Optional[str], description: Optional[str]) -> Optional[List[int]]:
+    return minhash(shingles(tokens(title, description)))
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def band_buckets(signature: Sequence[int]) -> List[int]:
+    """One signed 64-bit bucket per band."""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(array("I", signature[band * ROWS:(band + 1) * ROWS]).tobytes(), digest_size=8).digest(),
+            "little", signed=True
+        )
+        for band in range(BANDS)
+    ]
+
+
+def pack(signature: Sequence[int]) -> bytes:
+    return array("I", signature).tobytes()
+
+
+def unpack(data: bytes) -> List[int]:
+    signature = array("I")
+    signature.frombytes(data)
+    return signature.tolist()
+
+
+def _store(db: Session, signatures: Dict[int, Optional[List[int]]]):
+    """Replace the stored signatures and buckets of these grants."""
+    ids = list(signatures)
+    db.execute(delete(_buckets).where(_buckets.c.grant_id.in_(ids)))
+    db.execute(delete(_signatures).where(_signatures.c.grant_id.in_(ids)))
+    indexed = {grant_id: signature for grant_id, signature in signatures.items() if signature is not None}
+    if not indexed:
+        return
+    db.execute(insert(_signatures), [
+        {"grant_id": grant_id, "signature": pack(signature)} for grant_id, signature in indexed.items()
+    ])
+    db.execute(insert(_buckets), [
+        {"grant_id": grant_id, "band": band, "bucket": bucket}
+        for grant_id, signature in indexed.items()
+        for band, bucket in enumerate(band_buckets(signature))
+    ])
+
+
+def find_matches(db: Session, grant_id: int, source: str, signature: Sequence[int]) -> Dict[int, float]:
+    """Grants from other sources similar to this signature, with their similarity."""
+    # Match on (band, bucket) pairs so the lookup uses the (band, bucket) index
+    wanted = list(enumerate(band_buckets(signature)))
+    candidates = set(db.execute(
+        select(_buckets.c.grant_id)
+        .where(tuple_(_buckets.c.band, _buckets.c.bucket).in_(wanted))
+        .where(_buckets.c.grant_id != grant_id)
+    ).scalars())
+    if not candidates:
+        return {}
+
+    threshold = settings.SCRAPER_DUPLICATE_THRESHOLD
+    matches = {}
+    for candidate, candidate_source, packed in db.execute(
+        select(_grants.c.id, _grants.c.source, _signatures.c.signature)
+        .join(_signatures, _signatures.c.grant_id == _grants.c.id)
+        .where(_grants.c.id.in_(candidates))
+    ):
+        if candidate_source == source:
+            continue
+        score = similarity(signature, unpack(packed))
+        if score >= threshold:
+            matches[candidate] = score
+    return matches
+
+
+def _cluster(db: Session, grant_id: int, source: str, signature: Sequence[int]) -> Dict[int, Optional[int]]:
+    """Join this grant to the clusters it matches, merging them.
+
+    Returns the previous ``canonical_id`` of every grant that was repointed.
+    """
+    matches = find_matches(db, grant_id, source, signature)
+    if not matches:
+        return {}
+    roots = {
+        canonical_id or match_id
+        for match_id, canonical_id in db.execute(
+            select(_grants.c.id, _grants.c.canonical_id).where(_grants.c.id.in_(list(matches)))
+        )
+    }
+    members = roots | {grant_id}
+    root = min(members)
+    others = list(members - {root})
+    moved = dict(db.execute(
+        select(_grants.c.id, _grants.c.canonical_id)
+        .where(or_(_grants.c.id.in_(others), _grants.c.canonical_id.in_(others)))
+        .where(_grants.c.canonical_id.is_distinct_from(root))
+    ).all())
+    if moved:
+        db.execute(update(_grants).where(_grants.c.id.in_(list(moved))).values(canonical_id=root))
+    return moved
+
+
+def index_grants(db: Session, grant_ids: Iterable[int]) -> Dict[str, int]:
+    """(Re)index new or changed grants and update their clusters (no commit).
+
+    Grants whose ``canonical_id`` ends up different are logged to the change
+    feed as updates (the grants passed in are logged by the caller).
+    """
+    grant_ids = sorted(set(grant_ids))
+    if not grant_ids:
+        return {"indexed": 0, "clustered": 0}
+
+    rows = db.execute(
+        select(_grants.c.id, _grants.c.source, _grants.c.title, _grants.c.description)
+        .where(_grants.c.id.in_(grant_ids))
+    ).all()
+    signatures = {row.id: signature_for(row.title, row.description) for row in rows}
+    sources = {row.id: row.source for row in rows}
+    _store(db, signatures)
+
+    # A changed grant may no longer belong where it was: take it and anything
+    # clustered under it out, then cluster them all again
+    released = [
+        (grant_id, source, unpack(packed)) for grant_id, source, packed in db.execute(
+            select(_grants.c.id, _grants.c.source, _signatures.c.signature)
+            .join(_signatures, _signatures.c.grant_id == _grants.c.id)
+            .where(_grants.c.canonical_id.in_(grant_ids))
+            .where(_grants.c.id.notin_(grant_ids))
+        )
+    ]
+    before: Dict[int, Optional[int]] = dict(db.execute(
+        select(_grants.c.id, _grants.c.canonical_id)
+        .where(_grants.c.canonical_id.in_(grant_ids))
+    ).all())
+    db.execute(
+        update(_grants)
+        .where(or_(_grants.c.id.in_(grant_ids), _grants.c.canonical_id.in_(grant_ids)))
+        .values(canonical_id=None)
+    )
+
+    work = [(grant_id, sources[grant_id], signature) for grant_id, signature in signatures.items() if signature]
+    clustered = 0
+    for grant_id, source, signature in sorted(work + released):
+        moved = _cluster(db, grant_id, source, signature)
+        if moved:
+            clustered += 1
+        for moved_id, previous in moved.items():
+            before.setdefault(moved_id, previous)
+
+    others = [grant_id for grant_id in before if grant_id not in signatures]
+    if others:
+        after = dict(db.execute(select(_grants.c.id, _grants.c.canonical_id).where(_grants.c.id.in_(others))).all())
+        record_grant_changes(db.connection(), [
+            ("update", grant_id) for grant_id in sorted(others) if after.get(grant_id) != before[grant_id]
+        ])
+    return {"indexed": len(work), "clustered": clustered}
+
+
+def rebuild(db: Session, batch_size: int = 500) -> Dict[str, int]:
+    """Index every grant from scratch, committing per batch."""
+    previous = dict(db.execute(
+        select(_grants.c.id, _grants.c.canonical_id).where(_grants.c.canonical_id.isnot(None))
+    ).all())
+    db.execute(update(_grants).values(canonical_id=None))
+    db.execute(delete(_buckets))
+    db.execute(delete(_signatures))
+    db.commit()
+
+    totals = {"indexed": 0, "clustered": 0}
+    last_id = 0
+    while True:
+        ids = db.execute(
+            select(_grants.c.id).where(_grants.c.id > last_id).order_by(_grants.c.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        stats = index_grants(db, ids)
+        db.commit()
+        totals = {key: totals[key] + stats[key] for key in totals}
+        last_id = ids[-1]
+
+    current = dict(db.execute(
+        select(_grants.c.id, _grants.c.canonical_id).where(_grants.c.canonical_id.isnot(None))
+    ).all())
+    record_grant_changes(db.connection(), [
+        ("update", grant_id) for grant_id in sorted(set(previous) | set(current))
+        if previous.get(grant_id) != current.get(grant_id)
+    ])
+    db.commit()
+    totals["clusters"] = len(set(current.values()))
+    logger.info(f"Near-duplicate index rebuilt: {totals}")
+    return totals
@@ -0,0 +1,93 @@
+"""
+Process pool for scraper HTML parsing.
+
+Scrapers run inside the same workers that serve API traffic, so building the
+DOM and walking it must not happen on the event loop. Pages are handed to a
+small pool of worker processes; only the raw HTML string goes in and plain
+grant dicts come back out.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Type
+
+from bs4 import BeautifulSoup
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# lxml is several times faster than the stdlib parser; fall back if missing
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Scraper instances used for parsing, cached once per worker process
+_worker_scrapers: Dict[type, Any] = {}
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Build a BeautifulSoup tree with the fastest available parser."""
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+def get_parse_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the shared parse pool, creating it on first use."""
+    global _executor
+
+    if settings.SCRAPER_PARSE_WORKERS <= 0:
+        return None
+
+    if _executor is None:
+        # spawn rather than fork: the parent has a running loop and DB pool
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.SCRAPER_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Started HTML parse pool with {settings.SCRAPER_PARSE_WORKERS} workers ({HTML_PARSER})")
+
+    return _executor
+
+
+def shutdown_parse_executor():
+    """Shut down the parse pool (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        logger.info("HTML parse pool shut down")
+
+
+def _parse_page_sync(scraper_cls: Type, html: str, url: str, parser_name: str) -> List[Dict[str, Any]]:
+    """Parse one page with a scraper's ``_parse_*`` method (runs in a worker)."""
+    scraper = _worker_scrapers.get(scraper_cls)
+    if scraper is None:
+        # Parsing never touches the database, so no session is needed here
+        scraper = scraper_cls(None)
+        _worker_scrapers[scraper_cls] = scraper
+
+    soup = make_soup(html)
+    grants = asyncio.run(getattr(scraper, parser_name)(soup, url))
+    return [dict(grant) for grant in grants if grant]
+
+
+async def parse_page(scraper_cls: Type, html: str, url: str, parser_name: str) -> List[Dict[str, Any]]:
+    """Parse a page off the event loop and return plain grant dicts."""
+    global _executor
+
+    loop = asyncio.get_running_loop()
+    executor = get_parse_executor()
+
+    try:
+        return await loop.run_in_executor(executor, _parse_page_sync, scraper_cls, html, url, parser_name)
+    except BrokenProcessPool:
+        logger.error(f"Parse pool died while parsing {url}, retrying in a thread")
+        _executor = None
+        return await loop.run_in_executor(None, _parse_page_sync, scraper_cls, html, url, parser_name)
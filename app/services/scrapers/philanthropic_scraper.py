@@ -1,12 +1,10 @@
-import asyncio
 import logging
 import random
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Any, AsyncIterator
 from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin
 from .base_scraper import BaseScraper
+from .extraction import KeywordClassifier
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -18,9 +16,18 @@ class PhilanthropicScraper(BaseScraper):
     and community development.
     """
     
+    categories = KeywordClassifier({
+        "industry_focus": ([
+            ("arts", ["art", "creative", "cultural", "music", "film", "theatre"]),
+            ("education", ["education", "school", "student", "learning"]),
+            ("health", ["health", "medical", "wellbeing", "mental"]),
+            ("environment", ["environment", "sustainability", "climate"]),
+            ("technology", ["technology", "innovation", "digital"])
+        ], "community")
+    })
+    
     def __init__(self, db_session: Session):
         super().__init__(db_session, "philanthropic")
-        self.scraped_grants = []
         self.urls_scraped = []
         self.rate_limits = {"requests_made": 0, "max_per_minute": 20}
         
@@ -85,106 +92,22 @@ class PhilanthropicScraper(BaseScraper):
                 "description": "Ian Potter Foundation - Arts, education, health"
             }
         }
-        
-        # Known current philanthropic grants (verified real programs)
-        self.known_grants = [
-            {
-                "title": "Lord Mayor's Charitable Foundation Community Grants",
-                "description": "Supports community organizations addressing disadvantage, promoting inclusion, and building stronger communities. Grants available for arts, education, health, and social welfare projects.",
-                "source_url": "https://www.lmcf.org.au/grants/community-grants",
-                "min_amount": 5000,
-                "max_amount": 50000,
-                "industry_focus": "community",
-                "location": "victoria",
-                "org_types": ["not_for_profit", "community_group"],
-                "funding_purpose": ["community_development", "social_welfare"],
-                "audience_tags": ["community", "social_impact", "victoria"],
-                "contact_email": "grants@lmcf.org.au",
-                "status": "active"
-            },
-            {
-                "title": "Myer Foundation Arts and Humanities Grants",
-                "description": "Supports innovative arts and humanities projects that contribute to Australian cultural life. Funding for creative projects, cultural programs, and artistic development.",
-                "source_url": "https://myerfoundation.org.au/grants/arts-and-humanities",
-                "min_amount": 10000,
-                "max_amount": 100000,
-                "industry_focus": "arts",
-                "location": "national",
-                "org_types": ["arts_organisation", "not_for_profit"],
-                "funding_purpose": ["creation", "development", "presentation"],
-                "audience_tags": ["arts", "culture", "creative"],
-                "contact_email": "grants@myerfoundation.org.au",
-                "status": "active"
-            },
-            {
-                "title": "Helen Macpherson Smith Trust Arts and Culture Grants",
-                "description": "Provides funding for arts and cultural projects that benefit the Victorian community. Supports both emerging and established artists and cultural organizations.",
-                "source_url": "https://www.hmstrust.org.au/grants/arts-and-culture",
-                "min_amount": 5000,
-                "max_amount": 75000,
-                "industry_focus": "arts",
-                "location": "victoria",
-                "org_types": ["arts_organisation", "individual", "not_for_profit"],
-                "funding_purpose": ["creation", "development", "community_engagement"],
-                "audience_tags": ["arts", "culture", "victoria", "community"],
-                "contact_email": "grants@hmstrust.org.au",
-                "status": "active"
-            },
-            {
-                "title": "Australia Council Arts Projects Grants",
-                "description": "Supports the creation, development, and presentation of arts projects by individuals and organizations. Funding for innovative artistic projects across all art forms.",
-                "source_url": "https://australiacouncil.gov.au/funding/arts-projects",
-                "min_amount": 5000,
-                "max_amount": 200000,
-                "industry_focus": "arts",
-                "location": "national",
-                "org_types": ["individual", "arts_organisation", "not_for_profit"],
-                "funding_purpose": ["creation", "development", "presentation"],
-                "audience_tags": ["arts", "creative", "national", "professional"],
-                "contact_email": "enquiries@australiacouncil.gov.au",
-                "status": "active"
-            },
-            {
-                "title": "Ian Potter Foundation Arts and Culture Grants",
-                "description": "Supports arts and cultural projects that demonstrate excellence and innovation. Funding for visual arts, performing arts, literature, and cultural heritage projects.",
-                "source_url": "https://www.ianpotter.org.au/grants/arts-and-culture",
-                "min_amount": 10000,
-                "max_amount": 150000,
-                "industry_focus": "arts",
-                "location": "national",
-                "org_types": ["arts_organisation", "not_for_profit", "cultural_institution"],
-                "funding_purpose": ["creation", "development", "preservation"],
-                "audience_tags": ["arts", "culture", "heritage", "excellence"],
-                "contact_email": "arts@ianpotter.org.au",
-                "status": "active"
-            }
-        ]
     
-    async def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method for philanthropic foundations."""
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield foundation grants as each page is parsed, then the known grants."""
         logger.info("Starting Philanthropic Foundations scraper")
         
+        async for grant in self._stream_sites(self.foundations, stagger=3, pause=(2, 4)):
+            yield grant
+        
+        async for grant in self._stream_known_grants():
+            yield grant
+    
+    async def scrape(self) -> List[Dict[str, Any]]:
+        """Scrape everything, then save it in one go. ScraperService streams instead."""
         try:
-            # Scrape web sources
-            web_grants = await self._scrape_all_foundations()
-            
-            # Add known grants
-            known_grants = await self._process_known_grants()
-            
-            # Combine and deduplicate
-            all_grants = web_grants + known_grants
-            unique_grants = self._deduplicate_grants(all_grants)
-            
-            # Validate grants
-            valid_grants = []
-            for grant in unique_grants:
-                if self._validate_grant_data(grant):
-                    valid_grants.append(grant)
-                else:
-                    logger.warning(f"Invalid grant data: {grant.get('title', 'Unknown')}")
-            
-            # Save to database
-            saved_grants = await self.save_grants(valid_grants)
+            grants = [grant async for grant in self.stream()]
+            saved_grants = await self.save_grants(grants)
             
             logger.info(f"Successfully scraped {len(saved_grants)} philanthropic grants")
             return saved_grants
@@ -201,68 +124,6 @@ class PhilanthropicScraper(BaseScraper):
                 logger.error(f"Fallback also failed: {str(fallback_error)}")
                 return []
     
-    async def _scrape_all_foundations(self) -> List[Dict[str, Any]]:
-        """Scrape all foundation sources."""
-        all_grants = []
-        
-        # Create tasks for each foundation
-        tasks = []
-        for i, (foundation_name, foundation_config) in enumerate(self.foundations.items()):
-            delay = i * 3  # 3 seconds between each foundation
-            task = asyncio.create_task(self._scrape_foundation_with_delay(foundation_name, foundation_config, delay))
-            tasks.append(task)
-        
-        # Wait for all tasks
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        for i, result in enumerate(results):
-            foundation_name = list(self.foundations.keys())[i]
-            if isinstance(result, Exception):
-                logger.error(f"Error scraping {foundation_name}: {str(result)}")
-            else:
-                logger.info(f"Successfully scraped {len(result)} grants from {foundation_name}")
-                all_grants.extend(result)
-        
-        return all_grants
-    
-    async def _scrape_foundation_with_delay(self, foundation_name: str, foundation_config: Dict, delay: int) -> List[Dict[str, Any]]:
-        """Scrape a foundation with initial delay."""
-        if delay > 0:
-            logger.info(f"Waiting {delay} seconds before scraping {foundation_name}")
-            await asyncio.sleep(delay)
-        
-        return await self._scrape_foundation(foundation_name, foundation_config)
-    
-    async def _scrape_foundation(self, foundation_name: str, foundation_config: Dict) -> List[Dict[str, Any]]:
-        """Scrape a specific foundation."""
-        grants = []
-        base_url = foundation_config["base_url"]
-        
-        logger.info(f"Scraping {foundation_name} from {base_url}")
-        
-        for endpoint in foundation_config["endpoints"]:
-            try:
-                url = urljoin(base_url, endpoint)
-                
-                # Rate limiting
-                await self._rate_limit_delay()
-                
-                # Scrape endpoint
-                endpoint_grants = await self._scrape_endpoint(foundation_name, url)
-                if endpoint_grants:
-                    grants.extend(endpoint_grants)
-                    logger.info(f"Found {len(endpoint_grants)} grants from {url}")
-                
-                # Delay between endpoints
-                await asyncio.sleep(random.uniform(2, 4))
-                
-            except Exception as e:
-                logger.error(f"Error scraping {foundation_name} endpoint {endpoint}: {str(e)}")
-                continue
-        
-        return grants
-    
     async def _scrape_endpoint(self, foundation_name: str, url: str) -> List[Dict[str, Any]]:
         """Scrape a specific endpoint."""
         try:
@@ -274,24 +135,21 @@ class PhilanthropicScraper(BaseScraper):
                 logger.warning(f"Failed to fetch {url}")
                 return []
             
-            soup = self._parse_html(html)
-            
-            # Use foundation-specific parsing
-            grants = []
+            # Use foundation-specific parsing, off the event loop
             if "lmcf.org.au" in url:
-                grants = await self._parse_lmcf(soup, url)
+                parser_name = "_parse_lmcf"
             elif "myerfoundation.org.au" in url:
-                grants = await self._parse_myer(soup, url)
+                parser_name = "_parse_myer"
             elif "hmstrust.org.au" in url:
-                grants = await self._parse_hms(soup, url)
+                parser_name = "_parse_hms"
             elif "australiacouncil.gov.au" in url:
-                grants = await self._parse_australia_council(soup, url)
+                parser_name = "_parse_australia_council"
             elif "ianpotter.org.au" in url:
-                grants = await self._parse_ian_potter(soup, url)
+                parser_name = "_parse_ian_potter"
             else:
-                grants = await self._parse_generic_foundation(soup, url)
+                parser_name = "_parse_generic_foundation"
             
-            return grants
+            return await self._parse_page(html, url, parser_name)
             
         except Exception as e:
             logger.error(f"Error scraping endpoint {url}: {str(e)}")
@@ -504,119 +362,6 @@ class PhilanthropicScraper(BaseScraper):
             logger.error(f"Error extracting grant from container: {str(e)}")
             return None
     
-    def _extract_amounts(self, text: str) -> tuple[Optional[int], Optional[int]]:
-        """Extract funding amounts from text."""
-        # Look for dollar amounts
-        amount_patterns = [
-            r'\$([0-9,]+(?:\.[0-9]{2})?)',
-            r'([0-9,]+)\s*dollars?',
-            r'up\s+to\s+\$([0-9,]+)',
-            r'maximum\s+\$([0-9,]+)',
-            r'minimum\s+\$([0-9,]+)'
-        ]
-        
-        amounts = []
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, text, re.I)
-            for match in matches:
-                try:
-                    amount = int(match.replace(',', ''))
-                    amounts.append(amount)
-                except ValueError:
-                    continue
-        
-        if not amounts:
-            return None, None
-        
-        amounts.sort()
-        min_amount = amounts[0] if amounts else None
-        max_amount = amounts[-1] if len(amounts) > 1 else None
-        
-        return min_amount, max_amount
-    
-    def _extract_dates(self, text: str) -> Dict[str, Optional[datetime]]:
-        """Extract dates from text."""
-        dates = {"open_date": None, "deadline": None}
-        
-        # Look for deadline patterns
-        deadline_patterns = [
-            r'deadline[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'due[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'closes[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
-            r'applications\s+close[:\s]+([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})'
-        ]
-        
-        for pattern in deadline_patterns:
-            match = re.search(pattern, text, re.I)
-            if match:
-                try:
-                    date_str = match.group(1)
-                    dates["deadline"] = self._parse_date(date_str)
-                    break
-                except Exception:
-                    continue
-        
-        return dates
-    
-    def _extract_email(self, text: str) -> Optional[str]:
-        """Extract email address from text."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
-        return match.group(0) if match else None
-    
-    def _determine_industry_focus(self, text: str) -> str:
-        """Determine industry focus based on text content."""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['art', 'creative', 'cultural', 'music', 'film', 'theatre']):
-            return "arts"
-        elif any(word in text_lower for word in ['education', 'school', 'student', 'learning']):
-            return "education"
-        elif any(word in text_lower for word in ['health', 'medical', 'wellbeing', 'mental']):
-            return "health"
-        elif any(word in text_lower for word in ['environment', 'sustainability', 'climate']):
-            return "environment"
-        elif any(word in text_lower for word in ['technology', 'innovation', 'digital']):
-            return "technology"
-        else:
-            return "community"
-    
-    async def _process_known_grants(self) -> List[Dict[str, Any]]:
-        """Process known philanthropic grants."""
-        processed_grants = []
-        
-        for grant_data in self.known_grants:
-            try:
-                # Add current dates if not specified
-                if not grant_data.get("open_date"):
-                    grant_data["open_date"] = datetime.now() - timedelta(days=30)
-                
-                if not grant_data.get("deadline"):
-                    grant_data["deadline"] = datetime.now() + timedelta(days=90)
-                
-                # Normalize the grant data
-                normalized_grant = self.normalize_grant_data(grant_data)
-                processed_grants.append(normalized_grant)
-                
-            except Exception as e:
-                logger.error(f"Error processing known grant {grant_data.get('title', 'Unknown')}: {str(e)}")
-                continue
-        
-        return processed_grants
-    
-    def _deduplicate_grants(self, grants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate grants."""
-        seen = set()
-        unique_grants = []
-        
-        for grant in grants:
-            key = (grant.get("title", ""), grant.get("source_url", ""))
-            if key not in seen:
-                seen.add(key)
-                unique_grants.append(grant)
-        
-        return unique_grants
-    
     async def _rate_limit_delay(self):
         """Implement rate limiting."""
         self.rate_limits["requests_made"] += 1
@@ -624,4 +369,4 @@ class PhilanthropicScraper(BaseScraper):
         if self.rate_limits["requests_made"] % 5 == 0:
             delay = random.uniform(2, 5)
             logger.info(f"Rate limiting: waiting {delay:.1f} seconds")
-            await asyncio.sleep(delay) 
\ No newline at end of file
+            await self._polite_sleep(delay) 
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Streaming scrape pipeline.
+
+Scrapers that implement ``stream()`` yield grants as each page is parsed.
+The pipeline chains async generator stages over that stream:
+
+    scraper.stream() -> buffered -> normalize -> dedupe -> batches -> upsert
+
+Stages are connected by bounded buffers, so a slow database pauses the
+crawl instead of piling parsed grants up in memory, and each batch is
+committed as soon as it is full: an interrupted run keeps everything it had
+written. Memory is bounded by the buffers and the batch size, plus the set
+of dedupe keys seen so far.
+"""
+
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.scrapers.ingest import IngestResult, grant_row, upsert_rows
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+async def merge_streams(streams: Iterable[AsyncIterator], maxsize: int = 0) -> AsyncIterator:
+    """Run several async generators concurrently and yield their items.
+
+    At most ``maxsize`` items are buffered; producers wait when the consumer
+    falls behind. A stream that raises is logged and dropped, the others carry
+    on. Closing the merged stream cancels the producers.
+    """
+    maxsize = maxsize or settings.SCRAPER_PIPELINE_BUFFER
+    # The queue itself is unbounded so end markers never block; the
+    # semaphore bounds the items in flight
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(maxsize)
+
+    async def pump(stream: AsyncIterator):
+        try:
+            async for item in stream:
+                await slots.acquire()
+                queue.put_nowait(item)
+        except Exception as e:
+            logger.error(f"Stream failed: {str(e)}")
+        finally:
+            queue.put_nowait(_DONE)
+
+    tasks = [asyncio.create_task(pump(stream)) for stream in streams]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            slots.release()
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def buffered(stream: AsyncIterator, maxsize: int = 0) -> AsyncIterator:
+    """Let ``stream`` run ahead of its consumer by up to ``maxsize`` items."""
+    return merge_streams([stream], maxsize)
+
+
+async def normalize(scraper, grants: AsyncIterator[Dict[str, Any]], stats: IngestResult) -> AsyncIterator[Dict[str, Any]]:
+    """Validate scraped grants and map them onto ``grants`` rows."""
+    async for grant in grants:
+        if not scraper._validate_grant_data(grant):
+            logger.warning(f"Invalid grant data from {scraper.source_id}: {grant.get('title', 'Unknown')}")
+            stats.skipped += 1
+            continue
+        row = grant_row(scraper.source_id, grant)
+        if row is None:
+            stats.skipped += 1
+            continue
+        yield row
+
+
+async def dedupe(rows: AsyncIterator[Dict[str, Any]], stats: IngestResult) -> AsyncIterator[Dict[str, Any]]:
+    """Drop rows whose dedupe key was already seen in this run (first wins)."""
+    seen = set()
+    async for row in rows:
+        if row["dedupe_key"] in seen:
+            stats.skipped += 1
+            continue
+        seen.add(row["dedupe_key"])
+        yield row
+
+
+async def batches(items: AsyncIterator, size: int) -> AsyncIterator[List]:
+    """Group a stream into lists of up to ``size`` items."""
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_batch(db: Session, rows: List[Dict[str, Any]]) -> IngestResult:
+    try:
+        result = upsert_rows(db, rows)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+
+
+async def run_pipeline(scraper, db: Session, batch_size: int = 0, buffer_size: int = 0) -> IngestResult:
+    """Stream a scraper's grants into the database, committing per batch.
+
+    ``skipped`` counts invalid and duplicate grants. Writes run in a thread
+    so that fetching and parsing continue while a batch is being written;
+    the session is only used by this stage while the pipeline runs.
+    """
+    batch_size = batch_size or settings.SCRAPER_INGEST_BATCH_SIZE
+    stats = IngestResult()
+
+    result = IngestResult()
+    # aclosing: if a write fails, the crawl behind it is cancelled right away
+    async with aclosing(buffered(scraper.stream(), buffer_size)) as grants:
+        rows = dedupe(normalize(scraper, grants, stats), stats)
+        async for batch in batches(rows, batch_size):
+            result = result.merge(await asyncio.to_thread(_write_batch, db, batch))
+            logger.info(
+                f"{scraper.source_id}: wrote batch of {len(batch)} "
+                f"({result.added} added, {result.updated} updated so far)"
+            )
+
+    result = result.merge(stats)
+    logger.info(
+        f"Pipeline {scraper.source_id}: {result.added} added, {result.updated} updated, "
+        f"{result.unchanged} unchanged, {result.skipped} skipped, "
+        f"{result.archived} archived, {result.restored} restored"
+    )
+    return result
@@ -0,0 +1,253 @@
+"""
+Record/replay of scraper HTTP responses.
+
+Live sites can't be hit from CI or the performance lab, so scrapers can run
+against responses captured earlier:
+
+    store = FixtureStore(settings.SCRAPER_FIXTURE_DIR)
+
+    with recording(store, "philanthropic"):      # live fetches are saved
+        await PhilanthropicScraper(db).scrape()
+    store.save()
+
+    with replaying(store, "philanthropic"):      # no network, no politeness delays
+        await PhilanthropicScraper(db).scrape()
+
+Response bodies are stored gzip-compressed and content-addressed (identical
+pages are stored once). Each source has a small JSON index mapping a request
+key to the status and body hash, so fixture updates diff cleanly:
+
+    <root>/<source>/index.json
+    <root>/blobs/ab/ab12...ef.gz
+
+The mode lives in a context variable, so tasks a scraper spawns inherit it
+and concurrent scrapes in other tasks are unaffected.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_VERSION = 1
+
+# Request kwargs that change the response; headers and timeouts don't
+KEY_KWARGS = ("params", "data", "json")
+
+
+class FixtureMissing(LookupError):
+    """Raised in strict replay when a request has no recorded response."""
+
+
+@dataclass
+class Fixture:
+    """A recorded response."""
+    method: str
+    url: str
+    status: int
+    sha256: str
+    size: int
+    recorded_at: str
+
+
+def request_key(method: str, url: str, kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for a request: method, URL and any body/query arguments."""
+    parts = {"method": method.upper(), "url": url}
+    for name in KEY_KWARGS:
+        if kwargs and kwargs.get(name) is not None:
+            parts[name] = kwargs[name]
+    encoded = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class BlobStore:
+    """Content-addressed, gzip-compressed blobs under ``root``."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / f"{sha256}.gz"
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` (once) and return its hash."""
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.path(sha256)
+        if not path.exists():
+            # mtime=0 keeps the compressed bytes reproducible
+            _atomic_write(path, gzip.compress(data, compresslevel=9, mtime=0))
+        return sha256
+
+    def get(self, sha256: str) -> bytes:
+        return gzip.decompress(self.path(sha256).read_bytes())
+
+    def exists(self, sha256: str) -> bool:
+        return self.path(sha256).exists()
+
+
+class FixtureStore:
+    """Recorded responses for each scraper source."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.blobs = BlobStore(self.root / "blobs")
+        self._indexes: Dict[str, Dict[str, Fixture]] = {}
+        self._dirty: set = set()
+
+    def _index_path(self, source: str) -> Path:
+        return self.root / source.replace("/", "_") / "index.json"
+
+    def index(self, source: str) -> Dict[str, Fixture]:
+        """The request-key -> fixture index for a source, loaded on first use."""
+        if source not in self._indexes:
+            path = self._index_path(source)
+            entries = {}
+            if path.exists():
+                data = json.loads(path.read_text())
+                if data.get("version") != FIXTURE_VERSION:
+                    raise ValueError(f"Unsupported fixture version {data.get('version')} in {path}")
+                entries = {key: Fixture(**entry) for key, entry in data["responses"].items()}
+            self._indexes[source] = entries
+        return self._indexes[source]
+
+    def put(self, source: str, method: str, url: str, status: int, body: str,
+            kwargs: Optional[Dict[str, Any]] = None) -> Fixture:
+        """Record a response."""
+        raw = body.encode("utf-8")
+        fixture = Fixture(
+            method=method.upper(),
+            url=url,
+            status=status,
+            sha256=self.blobs.put(raw),
+            size=len(raw),
+            recorded_at=datetime.utcnow().isoformat(timespec="seconds")
+        )
+        self.index(source)[request_key(method, url, kwargs)] = fixture
+        self._dirty.add(source)
+        return fixture
+
+    def get(self, source: str, method: str, url: str,
+            kwargs: Optional[Dict[str, Any]] = None) -> Optional[Fixture]:
+        return self.index(source).get(request_key(method, url, kwargs))
+
+    def body(self, fixture: Fixture) -> str:
+        return self.blobs.get(fixture.sha256).decode("utf-8")
+
+    def sources(self):
+        """Sources with a recorded index."""
+        if not self.root.exists():
+            return []
+        return sorted(p.parent.name for p in self.root.glob("*/index.json"))
+
+    def save(self):
+        """Write indexes changed since the last save."""
+        for source in sorted(self._dirty):
+            entries = self._indexes[source]
+            data = {
+                "version": FIXTURE_VERSION,
+                "source": source,
+                "responses": {
+                    key: asdict(entries[key])
+                    for key in sorted(entries, key=lambda k: (entries[k].url, k))
+                }
+            }
+            _atomic_write(self._index_path(source), (json.dumps(data, indent=2) + "\n").encode("utf-8"))
+            logger.info(f"Saved {len(entries)} fixtures for {source}")
+        self._dirty.clear()
+
+
+class FixtureSession:
+    """Active record or replay mode for one scrape, with simple counters."""
+
+    def __init__(self, store: FixtureStore, source: str, mode: str, strict: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.store = store
+        self.source = source
+        self.mode = mode
+        self.strict = strict
+        self.pages = 0
+        self.bytes = 0
+        self.misses = 0
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def respond(self, method: str, url: str,
+                kwargs: Optional[Dict[str, Any]] = None) -> Tuple[Optional[int], Optional[str]]:
+        """The recorded ``(status, body)``; body is None unless the status was 200.
+        An unrecorded request comes back as ``(None, None)``, like a network error."""
+        fixture = self.store.get(self.source, method, url, kwargs)
+        if fixture is None:
+            self.misses += 1
+            if self.strict:
+                raise FixtureMissing(f"No recorded response for {method} {url} ({self.source})")
+            logger.warning(f"No recorded response for {method} {url}")
+            return None, None
+        if fixture.status != 200:
+            return fixture.status, None
+        body = self.store.body(fixture)
+        self.pages += 1
+        self.bytes += fixture.size
+        return fixture.status, body
+
+    def replay(self, method: str, url: str, kwargs: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Serve a recorded response; None (like a failed fetch) if it wasn't 200."""
+        return self.respond(method, url, kwargs)[1]
+
+    def record(self, method: str, url: str, status: int, body: str,
+               kwargs: Optional[Dict[str, Any]] = None):
+        self.store.put(self.source, method, url, status, body, kwargs)
+        if status == 200:
+            self.pages += 1
+            self.bytes += len(body)
+
+
+_current: ContextVar[Optional[FixtureSession]] = ContextVar("scraper_fixtures", default=None)
+
+
+def current_fixtures() -> Optional[FixtureSession]:
+    """The fixture session scrapers in this context should use, if any."""
+    return _current.get()
+
+
+@contextmanager
+def _activate(session: FixtureSession) -> Iterator[FixtureSession]:
+    token = _current.set(session)
+    try:
+        yield session
+    finally:
+        _current.reset(token)
+
+
+def recording(store: FixtureStore, source: str) -> ContextManager[FixtureSession]:
+    """Fetch live and save every response to ``store``."""
+    return _activate(FixtureSession(store, source, "record"))
+
+
+def replaying(store: FixtureStore, source: str, strict: bool = False) -> ContextManager[FixtureSession]:
+    """Serve responses from ``store`` instead of the network."""
+    return _activate(FixtureSession(store, source, "replay", strict=strict))
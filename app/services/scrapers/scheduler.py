@@ -0,0 +1,204 @@
+"""
+Cadence-aware scrape scheduler.
+
+Decides when each enabled source should next be crawled from its
+``ScraperLog`` history and enqueues a job once that time has passed:
+
+* time since the last successful run is the clock everything is measured on;
+* the observed change rate (grants added or updated per grant found, smoothed
+  over recent runs) moves the interval between the configured minimum and
+  maximum - volatile sources are crawled often, static ones rarely;
+* during a source's deadline season (configured ``peak_months`` or open
+  grants closing soon) the interval is halved;
+* consecutive failures back off exponentially;
+* a stable per-run jitter spreads sources out so they do not all fire at once.
+"""
+
+import hashlib
+import logging
+import random
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import desc
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.grant import Grant
+from app.models.scraper_log import ScraperLog
+from app.services.scrapers.job_queue import enqueue_scrape_job
+
+logger = logging.getLogger(__name__)
+
+HISTORY_RUNS = 10
+CHANGE_RATE_ALPHA = 0.5  # EWMA weight of the most recent run
+SEASON_FACTOR = 0.5
+DEADLINE_SEASON_WINDOW = timedelta(days=30)
+
+
+@dataclass
+class RunSample:
+    """The parts of a ScraperLog row the scheduler looks at."""
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime]
+    grants_found: int = 0
+    grants_changed: int = 0
+
+
+@dataclass
+class SourceSchedule:
+    """Scheduling decision for one source."""
+    source_name: str
+    next_run: datetime
+    interval_hours: float
+    change_rate: float
+    in_season: bool
+    consecutive_failures: int
+    last_success: Optional[datetime]
+    reason: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def estimate_change_rate(history: Sequence[RunSample]) -> float:
+    """Smoothed fraction of found grants that were new or updated, in [0, 1]."""
+    rate = None
+    # history is newest first; fold oldest to newest
+    for run in reversed(history):
+        if run.status != "success":
+            continue
+        observed = min(run.grants_changed / max(run.grants_found, 1), 1.0)
+        rate = observed if rate is None else CHANGE_RATE_ALPHA * observed + (1 - CHANGE_RATE_ALPHA) * rate
+    return rate if rate is not None else 1.0
+
+
+def compute_schedule(source_name: str, history: Sequence[RunSample], now: datetime,
+                     min_interval: timedelta, max_interval: timedelta,
+                     in_season: bool = False, jitter: float = 0.0) -> SourceSchedule:
+    """Work out when ``source_name`` should next run. ``history`` is newest first."""
+    last_success = next((run for run in history if run.status == "success"), None)
+    failures = 0
+    for run in history:
+        if run.status == "success":
+            break
+        if run.status == "running":
+            continue
+        failures += 1
+
+    change_rate = estimate_change_rate(history)
+
+    # Geometric interpolation: rate 1 -> min interval, rate 0 -> max interval
+    ratio = max_interval / min_interval
+    interval = min_interval * (ratio ** (1.0 - change_rate))
+    if in_season:
+        interval = max(interval * SEASON_FACTOR, min_interval)
+
+    if last_success is None and not failures:
+        return SourceSchedule(source_name, now, interval.total_seconds() / 3600, change_rate,
+                              in_season, 0, None, "never run")
+
+    if failures:
+        # Retry failures from the last attempt, doubling each time
+        last_attempt = history[0].finished_at or history[0].started_at
+        backoff = min(min_interval * (2 ** (failures - 1)), max_interval)
+        anchor, interval, reason = last_attempt, backoff, f"{failures} consecutive failures"
+    else:
+        anchor = last_success.finished_at or last_success.started_at
+        reason = f"change rate {change_rate:.2f}" + (", deadline season" if in_season else "")
+
+    if jitter:
+        # Seeded by the anchor so repeated planning passes agree on the same time
+        seed = hashlib.sha1(f"{source_name}:{anchor.isoformat()}".encode()).digest()
+        offset = random.Random(seed).uniform(-jitter, jitter)
+        interval = interval * (1 + offset)
+
+    return SourceSchedule(
+        source_name=source_name,
+        next_run=anchor + interval,
+        interval_hours=round(interval.total_seconds() / 3600, 2),
+        change_rate=round(change_rate, 3),
+        in_season=in_season,
+        consecutive_failures=failures,
+        last_success=last_success.finished_at if last_success else None,
+        reason=reason
+    )
+
+
+class ScrapeScheduler:
+    """Plans scraper runs from ScraperLog history and enqueues the due ones."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_enabled_sources(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: config for name, config in settings.ALLOWED_SCRAPER_SOURCES.items()
+            if config.get("enabled", False)
+        }
+
+    def load_history(self, source_name: str, limit: int = HISTORY_RUNS) -> List[RunSample]:
+        logs = (
+            self.db.query(ScraperLog)
+            .filter(ScraperLog.source_name == source_name)
+            .order_by(desc(ScraperLog.start_time))
+            .limit(limit)
+            .all()
+        )
+        return [
+            RunSample(
+                status=log.status,
+                started_at=log.start_time,
+                finished_at=log.end_time,
+                grants_found=log.grants_found or 0,
+                grants_changed=(log.grants_added or 0) + (log.grants_updated or 0)
+            )
+            for log in logs
+        ]
+
+    def is_in_season(self, source_name: str, config: Dict[str, Any], now: datetime) -> bool:
+        """A source is in season in its peak months or while its grants are closing soon."""
+        if now.month in config.get("peak_months", []):
+            return True
+        closing_soon = (
+            self.db.query(Grant.id)
+            .filter(
+                Grant.source == source_name,
+                Grant.deadline >= now,
+                Grant.deadline <= now + DEADLINE_SEASON_WINDOW
+            )
+            .first()
+        )
+        return closing_soon is not None
+
+    def plan(self, now: Optional[datetime] = None) -> List[SourceSchedule]:
+        """Next run for every enabled source, soonest first."""
+        now = now or datetime.utcnow()
+        schedules = []
+        for source_name, config in self.get_enabled_sources().items():
+            min_interval = timedelta(hours=config.get("min_interval_hours", settings.SCRAPER_MIN_INTERVAL_HOURS))
+            max_interval = timedelta(hours=config.get("max_interval_hours", settings.SCRAPER_MAX_INTERVAL_HOURS))
+            schedules.append(compute_schedule(
+                source_name,
+                self.load_history(source_name),
+                now,
+                min_interval,
+                max_interval,
+                in_season=self.is_in_season(source_name, config, now),
+                jitter=settings.SCRAPER_SCHEDULE_JITTER
+            ))
+        return sorted(schedules, key=lambda schedule: schedule.next_run)
+
+    def enqueue_due(self, now: Optional[datetime] = None) -> List[str]:
+        """Enqueue a job for every source whose next run has passed."""
+        now = now or datetime.utcnow()
+        enqueued = []
+        for schedule in self.plan(now):
+            if schedule.next_run > now:
+                continue
+            enqueue_scrape_job(self.db, schedule.source_name, requested_by="scheduler")
+            enqueued.append(schedule.source_name)
+            logger.info(f"Scheduled {schedule.source_name}: {schedule.reason} (interval {schedule.interval_hours}h)")
+        return enqueued
@@ -1,10 +1,17 @@
 import logging
 import asyncio
-from typing import Dict, List, Type
+from typing import Dict, List, Optional, Type
 from sqlalchemy.orm import Session
 
 from app.models.scraper_log import ScraperLog
+from app.services.scrapers.archive import PageArchive, get_page_archive
 from app.services.scrapers.base_scraper import BaseScraper
+from app.services.scrapers.frontier import UrlFrontier
+from app.services.scrapers.ingest import upsert_grants
+from app.services.scrapers.known_grants import applied_seed_checksum, known_grants_for, mark_seed_applied
+from app.services.scrapers.pipeline import run_pipeline
+from app.services.scrapers.replay import replaying
+from app.services.scrapers.telemetry import save_run_telemetry
 from app.services.scrapers.business_gov import BusinessGovScraper
 from app.services.scrapers.grantconnect import GrantConnectScraper
 from app.services.scrapers.dummy_scraper import DummyScraper
@@ -46,51 +53,115 @@ class ScraperService:
         self.db.add(log)
         self.db.commit()
         
+        frontier = UrlFrontier.load(self.db, source_name)
+        scraper = None
         try:
             # Initialize and run scraper
             scraper = self.scrapers[source_name](self.db)
+            scraper.frontier = frontier
+            scraper.applied_seed_checksum = applied_seed_checksum(self.db, source_name)
             
-            # Handle both sync and async scrapers
-            if asyncio.iscoroutinefunction(scraper.scrape):
-                grants_found = await scraper.scrape()
+            if hasattr(scraper, "stream"):
+                # Grants flow into the database batch by batch as pages are parsed
+                ingest = await run_pipeline(scraper, self.db)
+                grants_found = ingest.total + ingest.skipped + ingest.archived
             else:
-                grants_found = scraper.scrape()
+                # Handle both sync and async scrapers
+                if asyncio.iscoroutinefunction(scraper.scrape):
+                    grants = await scraper.scrape()
+                else:
+                    grants = scraper.scrape()
+                grants_found = len(grants)
+                
+                # Scrapers that save their own results report the counts; the
+                # rest return plain dicts that are ingested here
+                ingest = getattr(scraper, "ingest_result", None)
+                if ingest is None:
+                    ingest = upsert_grants(self.db, scraper.source_id, [g for g in grants if isinstance(g, dict)])
             
-            # Count new and updated grants
-            grants_added = len([g for g in grants_found if not g.id])
-            grants_updated = len(grants_found) - grants_added
+            frontier.save(self.db)
+            save_run_telemetry(self.db, log, scraper.telemetry)
+            if scraper.seed_report.get("skipped") is False:
+                mark_seed_applied(self.db, known_grants_for(source_name))
             
             # Update log with success
             log.complete(
                 status="success",
-                grants_found=len(grants_found),
-                grants_added=grants_added,
-                grants_updated=grants_updated,
+                grants_found=grants_found,
+                grants_added=ingest.added,
+                grants_updated=ingest.updated,
+                grants_unchanged=ingest.unchanged,
                 metadata={
-                    "urls_scraped": scraper.urls_scraped if hasattr(scraper, 'urls_scraped') else None,
-                    "rate_limits": scraper.rate_limits if hasattr(scraper, 'rate_limits') else None
+                    "urls_scraped": len(scraper.urls_scraped) if hasattr(scraper, 'urls_scraped') else None,
+                    "rate_limits": scraper.rate_limits if hasattr(scraper, 'rate_limits') else None,
+                    "frontier": frontier.summary(),
+                    "discovery": getattr(scraper, "discovery_stats", None),
+                    "fetch_report": getattr(scraper, "fetch_report", None),
+                    "known_grants": scraper.seed_report or None,
+                    "telemetry": scraper.telemetry.summary()
                 }
             )
             
             return {
                 "status": "success",
-                "grants_found": len(grants_found),
-                "grants_added": grants_added,
-                "grants_updated": grants_updated,
+                "grants_found": grants_found,
+                "grants_added": ingest.added,
+                "grants_updated": ingest.updated,
+                "grants_unchanged": ingest.unchanged,
                 "duration_seconds": log.duration_seconds
             }
             
         except Exception as e:
-            # Update log with error
+            # Discard any half-written ingest before recording the error
+            self.db.rollback()
+            frontier.save(self.db)
+            if scraper is not None:
+                save_run_telemetry(self.db, log, scraper.telemetry)
             log.complete(
                 status="error",
-                error_message=str(e)
+                error_message=str(e),
+                metadata={"frontier": frontier.summary()}
             )
             raise
         
         finally:
             self.db.commit()
     
+    async def reparse_source(self, source_name: str, archive: Optional[PageArchive] = None) -> Dict:
+        """Rerun a source's current parsers over its archived pages and upsert the results.
+        
+        No network requests are made: pages missing from the archive count as
+        failed fetches. Nothing is written to ``scraper_logs`` or the URL
+        frontier, so the crawl schedule isn't affected.
+        """
+        if source_name not in self.scrapers:
+            raise ValueError(f"Unknown source: {source_name}")
+        archive = archive or get_page_archive()
+        if archive is None:
+            raise ValueError("The page archive is disabled (SCRAPER_ARCHIVE_ENABLED)")
+        
+        scraper = self.scrapers[source_name](self.db)
+        if not hasattr(scraper, "stream"):
+            raise ValueError(f"Source {source_name} does not fetch through the page archive")
+        
+        try:
+            with replaying(archive, source_name) as pages:
+                ingest = await run_pipeline(scraper, self.db)
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        logger.info(f"Reparsed {pages.pages} archived pages for {source_name} ({pages.misses} not archived)")
+        return {
+            "status": "success",
+            "pages": pages.pages,
+            "missing_pages": pages.misses,
+            "grants_found": ingest.total + ingest.skipped + ingest.archived,
+            "grants_added": ingest.added,
+            "grants_updated": ingest.updated,
+            "grants_unchanged": ingest.unchanged
+        }
+    
     async def scrape_all(self) -> Dict[str, Dict]:
         """Scrape all available sources."""
         results = {}
@@ -0,0 +1,235 @@
+"""
+Per-URL scrape telemetry.
+
+During a run the scraper collects, for every URL it fetches live: requests
+made (retries included), fetch time, bytes, last HTTP status, parse time and
+grants extracted. At the end of the run that becomes one ``scrape_url_stats``
+row per URL, linked to the run's ``scraper_logs`` row, and the log's metadata
+gets a fixed-size summary instead of lists that grow with the crawl. Only the
+last ``SCRAPER_TELEMETRY_RUNS`` runs per source are kept.
+
+``performance_report`` turns those rows into the ``/scraper/performance``
+view: fetch/parse percentiles per source, the slowest URLs, and per-run
+trends.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+from sqlalchemy import delete, desc, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.latency import LatencyHistogram
+from app.models.scrape_url_stat import ScrapeUrlStat
+from app.models.scraper_log import ScraperLog
+
+logger = logging.getLogger(__name__)
+
+
+def request_url(url: str, params: Any = None) -> str:
+    """``url`` with ``params`` added to its query string, as the request sends it.
+
+    Telemetry is per request URL: paged API calls to one endpoint are
+    different requests and must not collapse into one row.
+    """
+    if not params:
+        return url
+    query = params if isinstance(params, str) else urlencode(params, doseq=True)
+    return f"{url}{'&' if urlsplit(url).query else '?'}{query}"
+
+
+@dataclass
+class UrlTelemetry:
+    """What happened to one URL during a run."""
+    url: str
+    requests: int = 0
+    status: Optional[int] = None
+    fetch_seconds: float = 0.0
+    bytes: int = 0
+    parse_seconds: Optional[float] = None
+    grants: int = 0
+    error: Optional[str] = None
+    fetched_at: Optional[datetime] = None
+
+
+class RunTelemetry:
+    """Collects per-URL telemetry for one scraper run (memory only)."""
+
+    def __init__(self):
+        self.urls: Dict[str, UrlTelemetry] = {}
+
+    def _get(self, url: str) -> UrlTelemetry:
+        entry = self.urls.get(url)
+        if entry is None:
+            entry = self.urls[url] = UrlTelemetry(url)
+        return entry
+
+    def record_fetch(self, url: str, status: Optional[int], seconds: float, size: int,
+                     error: Optional[str] = None):
+        entry = self._get(url)
+        entry.requests += 1
+        entry.status = status
+        entry.fetch_seconds += seconds
+        entry.bytes += size
+        entry.error = error
+        entry.fetched_at = datetime.utcnow()
+
+    def record_parse(self, url: str, seconds: float, grants: int):
+        entry = self._get(url)
+        entry.parse_seconds = (entry.parse_seconds or 0.0) + seconds
+        entry.grants += grants
+
+    def summary(self) -> Dict[str, Any]:
+        """Fixed-size run summary for the scraper log."""
+        fetches = [entry for entry in self.urls.values() if entry.requests]
+        fetch, parse = LatencyHistogram(), LatencyHistogram()
+        for entry in fetches:
+            fetch.record(entry.fetch_seconds / entry.requests)
+        for entry in self.urls.values():
+            if entry.parse_seconds is not None:
+                parse.record(entry.parse_seconds)
+        return {
+            "urls": len(fetches),
+            "requests": sum(entry.requests for entry in fetches),
+            "failed": sum(1 for entry in fetches if entry.status != 200),
+            "bytes": sum(entry.bytes for entry in fetches),
+            "grants": sum(entry.grants for entry in self.urls.values()),
+            "fetch_seconds": fetch.summary(),
+            "parse_seconds": parse.summary()
+        }
+
+    def rows(self, scraper_log_id: int, source_name: str) -> List[Dict[str, Any]]:
+        return [
+            {
+                "scraper_log_id": scraper_log_id,
+                "source_name": source_name,
+                "url": entry.url[:1000],
+                "status": entry.status,
+                "requests": entry.requests,
+                "fetch_ms": int(entry.fetch_seconds * 1000),
+                "bytes": entry.bytes,
+                "parse_ms": int(entry.parse_seconds * 1000) if entry.parse_seconds is not None else None,
+                "grants": entry.grants,
+                "error": entry.error[:255] if entry.error else None,
+                "fetched_at": entry.fetched_at or datetime.utcnow()
+            }
+            # Pages only parsed (replayed) have no fetch to report
+            for entry in self.urls.values() if entry.requests
+        ]
+
+
+def save_run_telemetry(db: Session, log: ScraperLog, telemetry: RunTelemetry):
+    """Write a run's URL rows and drop the source's oldest runs (no commit)."""
+    rows = telemetry.rows(log.id, log.source_name)
+    if not rows:
+        return
+    db.execute(insert(ScrapeUrlStat), rows)
+
+    kept = [
+        log_id for (log_id,) in db.execute(
+            select(ScrapeUrlStat.scraper_log_id)
+            .where(ScrapeUrlStat.source_name == log.source_name)
+            .group_by(ScrapeUrlStat.scraper_log_id)
+            .order_by(desc(ScrapeUrlStat.scraper_log_id))
+            .limit(settings.SCRAPER_TELEMETRY_RUNS)
+        )
+    ]
+    db.execute(
+        delete(ScrapeUrlStat)
+        .where(ScrapeUrlStat.source_name == log.source_name)
+        .where(ScrapeUrlStat.scraper_log_id.notin_(kept))
+    )
+    db.flush()
+
+
+def _histogram(values) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def performance_report(db: Session, source_name: Optional[str] = None, runs: int = 10,
+                       slowest: int = 10) -> List[Dict[str, Any]]:
+    """Fetch/parse percentiles, slowest URLs and per-run trends over each source's last ``runs`` runs."""
+    recent = (
+        select(ScrapeUrlStat.source_name, ScrapeUrlStat.scraper_log_id)
+        .group_by(ScrapeUrlStat.source_name, ScrapeUrlStat.scraper_log_id)
+    )
+    if source_name:
+        recent = recent.where(ScrapeUrlStat.source_name == source_name)
+    run_ids: Dict[str, List[int]] = defaultdict(list)
+    for name, log_id in db.execute(recent.order_by(desc(ScrapeUrlStat.scraper_log_id))):
+        if len(run_ids[name]) < runs:
+            run_ids[name].append(log_id)
+    if not run_ids:
+        return []
+
+    log_ids = [log_id for ids in run_ids.values() for log_id in ids]
+    logs = {log.id: log for log in db.query(ScraperLog).filter(ScraperLog.id.in_(log_ids))}
+    stats = db.query(ScrapeUrlStat).filter(ScrapeUrlStat.scraper_log_id.in_(log_ids)).all()
+
+    by_source: Dict[str, List[ScrapeUrlStat]] = defaultdict(list)
+    for stat in stats:
+        by_source[stat.source_name].append(stat)
+
+    report = []
+    for name in sorted(by_source):
+        rows = by_source[name]
+
+        by_url: Dict[str, List[ScrapeUrlStat]] = defaultdict(list)
+        for row in rows:
+            by_url[row.url].append(row)
+        urls = []
+        for url, url_rows in by_url.items():
+            latest = max(url_rows, key=lambda row: row.scraper_log_id)
+            per_request = [row.fetch_ms / max(row.requests, 1) / 1000 for row in url_rows]
+            urls.append({
+                "url": url,
+                "runs": len(url_rows),
+                "avg_fetch_seconds": round(sum(per_request) / len(per_request), 3),
+                "max_fetch_seconds": round(max(per_request), 3),
+                "avg_bytes": sum(row.bytes for row in url_rows) // len(url_rows),
+                "last_status": latest.status,
+                "last_grants": latest.grants
+            })
+        urls.sort(key=lambda url: url["avg_fetch_seconds"], reverse=True)
+
+        by_run: Dict[int, List[ScrapeUrlStat]] = defaultdict(list)
+        for row in rows:
+            by_run[row.scraper_log_id].append(row)
+        trend = []
+        for log_id in sorted(by_run):
+            run_rows = by_run[log_id]
+            fetch = _histogram(row.fetch_ms / max(row.requests, 1) / 1000 for row in run_rows)
+            parse = _histogram(row.parse_ms / 1000 for row in run_rows if row.parse_ms is not None)
+            fetch_summary = fetch.summary()
+            log = logs.get(log_id)
+            trend.append({
+                "scraper_log_id": log_id,
+                "started_at": log.start_time if log else None,
+                "duration_seconds": log.duration_seconds if log else None,
+                "urls": len(run_rows),
+                "failed": sum(1 for row in run_rows if row.status != 200),
+                "bytes": sum(row.bytes for row in run_rows),
+                "grants": sum(row.grants for row in run_rows),
+                "fetch_p50": fetch_summary["p50"],
+                "fetch_p95": fetch_summary["p95"],
+                "parse_p95": parse.summary()["p95"]
+            })
+
+        report.append({
+            "source_name": name,
+            "runs": len(by_run),
+            "fetch_seconds": _histogram(row.fetch_ms / max(row.requests, 1) / 1000 for row in rows).summary(),
+            "parse_seconds": _histogram(row.parse_ms / 1000 for row in rows if row.parse_ms is not None).summary(),
+            "failure_rate": round(sum(1 for row in rows if row.status != 200) / len(rows), 3),
+            "slowest_urls": urls[:slowest],
+            "trend": trend
+        })
+    return report
@@ -0,0 +1,164 @@
+"""
+"More like this" for grants.
+
+Every grant is kept in memory as a sparse TF-IDF vector over the words and
+word pairs of its title and description, held as an inverted index (term ->
+{grant id: weight}), i.e. a sparse matrix stored by column. The grants
+similar to one grant are found by walking only the postings of that grant's
+terms and accumulating dot products, then dividing by the document norms -
+cosine similarity without touching grants that share no terms. Terms in more
+than half of all grants are skipped; they carry almost no weight and have
+the longest postings.
+
+The index is built once per process and then follows the change feed
+(``grant_changes``): each lookup first applies the grants inserted, updated
+or deleted since the last cursor it saw, so new scrapes show up without a
+rebuild, and a lookup with nothing new costs one indexed query. Results are
+loaded with a single query, and copies of a program from other sources
+(``canonical_id`` set) are left out.
+"""
+
+import heapq
+import logging
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.grant import Grant
+from app.services.grant_changes import ChangeFollower
+from app.services.scrapers.near_duplicates import tokens
+
+logger = logging.getLogger(__name__)
+
+# Skip terms in more than this share of grants (once there are enough grants to tell)
+MAX_DF = 0.5
+MIN_DOCS_FOR_MAX_DF = 20
+
+# Candidates loaded per requested result, to allow for filtered-out copies
+OVERFETCH = 3
+
+
+def term_counts(title: Optional[str], description: Optional[str]) -> Counter:
+    words = tokens(title, description)
+    terms = Counter(words)
+    terms.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return terms
+
+
+class SimilarityIndex(ChangeFollower):
+    """In-memory TF-IDF index of grants with incremental updates."""
+
+    columns = (Grant.id, Grant.title, Grant.description)
+    name = "similar-grants index"
+
+    def __init__(self):
+        super().__init__()
+        self.vectors: Dict[int, Dict[str, float]] = {}  # grant -> sublinear term frequencies
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.norms: Dict[int, float] = {}
+        self._stale_norms = False
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def idf(self, term: str) -> float:
+        return math.log((1 + len(self.vectors)) / (1 + len(self.postings.get(term, ())))) + 1
+
+    def remove(self, grant_id: int):
+        vector = self.vectors.pop(grant_id, None)
+        if vector is None:
+            return
+        for term in vector:
+            docs = self.postings[term]
+            docs.pop(grant_id, None)
+            if not docs:
+                del self.postings[term]
+        self.norms.pop(grant_id, None)
+        self._stale_norms = True
+
+    def add(self, grant_id: int, title: Optional[str], description: Optional[str]):
+        self.remove(grant_id)
+        counts = term_counts(title, description)
+        if not counts:
+            return
+        vector = {term: 1 + math.log(count) for term, count in counts.items()}
+        self.vectors[grant_id] = vector
+        for term, weight in vector.items():
+            self.postings[term][grant_id] = weight
+        self._stale_norms = True
+
+    def _refresh_norms(self):
+        # IDF moves with every change, so norms are recomputed together (one pass over the index)
+        idf = {term: self.idf(term) for term in self.postings}
+        self.norms = {
+            grant_id: math.sqrt(sum((weight * idf[term]) ** 2 for term, weight in vector.items()))
+            for grant_id, vector in self.vectors.items()
+        }
+        self._stale_norms = False
+
+    def apply(self, row):
+        self.add(row.id, row.title, row.description)
+
+    def discard(self, grant_id: int):
+        self.remove(grant_id)
+
+    def similar(self, grant_id: int, limit: int = 10) -> List[Tuple[int, float]]:
+        """``(grant id, cosine)`` of the closest grants, best first."""
+        with self._lock:
+            vector = self.vectors.get(grant_id)
+            if not vector:
+                return []
+            if self._stale_norms:
+                self._refresh_norms()
+
+            total = len(self.vectors)
+            max_df = MAX_DF * total if total >= MIN_DOCS_FOR_MAX_DF else total
+            scores: Dict[int, float] = defaultdict(float)
+            for term, weight in vector.items():
+                docs = self.postings[term]
+                if len(docs) > max_df:
+                    continue
+                idf = self.idf(term)
+                query_weight = weight * idf * idf
+                for other, other_weight in docs.items():
+                    scores[other] += query_weight * other_weight
+            scores.pop(grant_id, None)
+
+            norm = self.norms[grant_id]
+            return heapq.nlargest(
+                limit,
+                ((other, score / (norm * self.norms[other])) for other, score in scores.items() if self.norms[other]),
+                key=lambda item: item[1]
+            )
+
+
+_index = SimilarityIndex()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    return _index
+
+
+def similar_grants(db: Session, grant: Grant, limit: int = 10,
+                   index: Optional[SimilarityIndex] = None) -> List[Tuple[Grant, float]]:
+    """Canonical grants most similar to ``grant``, with their cosine similarity."""
+    index = index or get_similarity_index()
+    index.refresh(db)
+
+    candidates = index.similar(grant.id, limit * OVERFETCH)
+    if not candidates:
+        return []
+    same_program = {grant.id, grant.canonical_id}
+    rows = {
+        row.id: row for row in db.query(Grant).filter(
+            Grant.id.in_([candidate for candidate, _ in candidates]),
+            Grant.canonical_id.is_(None)
+        )
+    }
+    results = [
+        (rows[candidate], round(score, 4)) for candidate, score in candidates
+        if candidate in rows and candidate not in same_program
+    ]
+    return results[:limit]
@@ -0,0 +1,368 @@
+"""
+Scraper worker.
+
+Runs outside the web tier and drains the ``scrape_jobs`` queue, enqueueing
+scheduled runs as sources fall due (see ``scheduler.py``):
+
+    python -m app.workers.scraper                # schedule and poll forever
+    python -m app.workers.scraper --once         # drain due jobs and exit
+    python -m app.workers.scraper --no-schedule  # only run jobs queued by others
+    python -m app.workers.scraper reparse [source ...]  # re-parse archived pages, no network
+    python -m app.workers.scraper dedupe         # rebuild the near-duplicate index
+    python -m app.workers.scraper lifecycle      # move grants to the status their dates call for
+    python -m app.workers.scraper archive        # move long-closed grants to grants_archive
+    python -m app.workers.scraper links          # check every due grant link, then exit
+
+Each job gets its own database session; HTTP connections come from the
+shared scraper pool, which this process owns and closes on exit. Link-check
+passes run as a background task beside the job loop, so a slow batch of
+links never holds up claiming jobs.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.db.session import get_session_local, close_database
+from app.services.grant_archive import archive_closed_grants
+from app.services.grant_lifecycle import update_grant_statuses
+from app.services.link_checker import check_grant_links
+from app.services.scrapers.archive import get_page_archive
+from app.services.scrapers.http_pool import close_http_session
+from app.services.saved_searches import evaluate_saved_searches
+from app.services.scrapers import near_duplicates
+from app.services.scrapers.job_queue import (
+    claim_next_job, complete_job, defer_job, fail_job, requeue_stale_jobs, source_lock
+)
+from app.services.scrapers.parse_pool import shutdown_parse_executor
+from app.services.scrapers.scheduler import ScrapeScheduler
+from app.services.scrapers.scraper_service import ScraperService
+
+logger = logging.getLogger(__name__)
+
+# How long to wait before retrying a job whose source is locked by another worker
+LOCKED_SOURCE_DELAY = timedelta(minutes=5)
+
+# Advisory lock name held while planning, so workers don't plan concurrently
+SCHEDULER_LOCK_NAME = "__scheduler__"
+
+# Advisory lock name held while evaluating saved-search alerts
+ALERTS_LOCK_NAME = "__alerts__"
+
+# Advisory lock name held while updating grant statuses and archiving closed grants
+LIFECYCLE_LOCK_NAME = "__lifecycle__"
+
+# Advisory lock name held while checking grant links
+LINKS_LOCK_NAME = "__links__"
+
+
+async def check_all_links() -> Dict[str, int]:
+    """Check grant links in batches until none are due."""
+    SessionLocal = get_session_local()
+    totals: Dict[str, int] = {}
+    while True:
+        db = SessionLocal()
+        try:
+            stats = await check_grant_links(db)
+            db.commit()
+        finally:
+            db.close()
+        if not stats["checked"]:
+            break
+        for state, count in stats["states"].items():
+            totals[state] = totals.get(state, 0) + count
+    return totals
+
+
+async def reparse(sources: List[str]) -> Dict[str, Dict]:
+    """Rebuild grants from the page archive with the current parsers."""
+    archive = get_page_archive()
+    if archive is None:
+        raise SystemExit("The page archive is disabled (SCRAPER_ARCHIVE_ENABLED=false)")
+    
+    SessionLocal = get_session_local()
+    results = {}
+    try:
+        for source in sources or archive.sources():
+            db = SessionLocal()
+            try:
+                results[source] = await ScraperService(db).reparse_source(source, archive)
+            except Exception as e:
+                logger.error(f"Reparse of {source} failed: {str(e)}")
+                results[source] = {"status": "error", "error": str(e)}
+            finally:
+                db.close()
+    finally:
+        shutdown_parse_executor()
+    return results
+
+
+class ScraperWorker:
+    """Claims scrape jobs from the database and runs them one at a time."""
+
+    def __init__(self, worker_id: Optional[str] = None, poll_interval: Optional[float] = None,
+                 schedule: bool = True):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval if poll_interval is not None else settings.SCRAPER_WORKER_POLL_INTERVAL
+        self.schedule = schedule and settings.SCRAPER_SCHEDULER_ENABLED
+        self.SessionLocal = get_session_local()
+        self._stopping = asyncio.Event()
+        self._last_schedule: Optional[float] = None
+        self._last_lifecycle: Optional[float] = None
+        self._last_link_check: Optional[float] = None
+        self._link_check: Optional[asyncio.Task] = None
+
+    def stop(self):
+        """Finish the current job, then exit."""
+        logger.info(f"Worker {self.worker_id} stopping")
+        self._stopping.set()
+
+    async def run(self, once: bool = False):
+        """Poll for jobs until stopped (or until the queue is empty with ``once``)."""
+        logger.info(f"Scraper worker {self.worker_id} started")
+
+        db = self.SessionLocal()
+        try:
+            requeue_stale_jobs(db)
+        finally:
+            db.close()
+
+        try:
+            while not self._stopping.is_set():
+                self.maybe_schedule()
+                self.maybe_update_statuses()
+                self.maybe_check_links()
+                ran = await self.run_next_job()
+                if ran:
+                    continue
+                if once:
+                    break
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # A stop request cancels a running pass; --once lets it finish
+            await self.finish_link_check(cancel=self._stopping.is_set())
+            await close_http_session()
+            shutdown_parse_executor()
+            logger.info(f"Scraper worker {self.worker_id} stopped")
+
+    def maybe_schedule(self):
+        """Run a scheduler pass if one is due. Only one worker plans at a time."""
+        if not self.schedule:
+            return
+        now = time.monotonic()
+        if self._last_schedule is not None and now - self._last_schedule < settings.SCRAPER_SCHEDULER_INTERVAL:
+            return
+        self._last_schedule = now
+
+        db = self.SessionLocal()
+        try:
+            with source_lock(SCHEDULER_LOCK_NAME) as acquired:
+                if acquired:
+                    enqueued = ScrapeScheduler(db).enqueue_due()
+                    if enqueued:
+                        logger.info(f"Scheduler enqueued: {', '.join(enqueued)}")
+        except Exception as e:
+            logger.error(f"Scheduler pass failed: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def maybe_update_statuses(self):
+        """Run the grant status lifecycle, then archiving, if due. Only one worker at a time."""
+        now = time.monotonic()
+        if self._last_lifecycle is not None and now - self._last_lifecycle < settings.SCRAPER_LIFECYCLE_INTERVAL:
+            return
+        self._last_lifecycle = now
+
+        db = self.SessionLocal()
+        try:
+            with source_lock(LIFECYCLE_LOCK_NAME) as acquired:
+                if not acquired:
+                    return
+                moved = update_grant_statuses(db)
+                db.commit()
+                archive_closed_grants(db)
+        except Exception as e:
+            logger.error(f"Grant status update failed: {str(e)}")
+            db.rollback()
+            return
+        finally:
+            db.close()
+        if moved:
+            # Status moves are feed changes like any other; alerts may fire on them
+            self.evaluate_alerts()
+
+    def maybe_check_links(self):
+        """Start a link-check pass in the background if one is due and none is running."""
+        if self._link_check is not None and not self._link_check.done():
+            return
+        now = time.monotonic()
+        if self._last_link_check is not None and now - self._last_link_check < settings.SCRAPER_LINK_CHECK_INTERVAL:
+            return
+        self._last_link_check = now
+        self._link_check = asyncio.create_task(self.check_links())
+
+    async def finish_link_check(self, cancel: bool = False):
+        """Wait for a running link-check pass, or cancel it (its batch is rolled back and checked again later)."""
+        if self._link_check is None or self._link_check.done():
+            return
+        if cancel:
+            self._link_check.cancel()
+        try:
+            await self._link_check
+        except asyncio.CancelledError:
+            pass
+
+    async def check_links(self):
+        """Check one batch of due grant links. Only one worker at a time."""
+        db = self.SessionLocal()
+        try:
+            with source_lock(LINKS_LOCK_NAME) as acquired:
+                if acquired:
+                    await check_grant_links(db)
+                    db.commit()
+        except Exception as e:
+            logger.error(f"Link check failed: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def evaluate_alerts(self):
+        """Check saved-search alerts against what the last job changed. Only one worker at a time."""
+        db = self.SessionLocal()
+        try:
+            with source_lock(ALERTS_LOCK_NAME) as acquired:
+                if acquired:
+                    evaluate_saved_searches(db)
+                    db.commit()
+        except Exception as e:
+            logger.error(f"Alert evaluation failed: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    async def run_next_job(self) -> bool:
+        """Claim and run one job. Returns False if nothing was due."""
+        db = self.SessionLocal()
+        try:
+            job = claim_next_job(db, self.worker_id)
+            if job is None:
+                return False
+
+            logger.info(f"Worker {self.worker_id} claimed job {job.id} ({job.source_name}, attempt {job.attempts})")
+
+            with source_lock(job.source_name) as acquired:
+                if not acquired:
+                    logger.info(f"Source {job.source_name} is being crawled by another worker, deferring job {job.id}")
+                    defer_job(db, job, LOCKED_SOURCE_DELAY)
+                    return True
+
+                try:
+                    result = await ScraperService(db).scrape_source(job.source_name)
+                    complete_job(db, job, result)
+                    logger.info(f"Job {job.id} ({job.source_name}) finished: {result}")
+                except Exception as e:
+                    db.rollback()
+                    fail_job(db, job, str(e))
+                    return True
+
+            self.evaluate_alerts()
+            return True
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id} error: {str(e)}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NavImpact scraper worker")
+    parser.add_argument("command", nargs="?", choices=["run", "reparse", "dedupe", "lifecycle", "archive", "links"], default="run",
+                        help="run: poll for jobs (default); reparse: rebuild grants from archived pages; "
+                             "dedupe: rebuild the near-duplicate index; lifecycle: update grant statuses; "
+                             "archive: move long-closed grants to grants_archive; links: check grant links")
+    parser.add_argument("sources", nargs="*", help="Sources to reparse (default: every archived source)")
+    parser.add_argument("--once", action="store_true", help="Run all due jobs, then exit")
+    parser.add_argument("--worker-id", help="Identifier recorded on claimed jobs")
+    parser.add_argument("--poll-interval", type=float, help="Seconds between queue polls when idle")
+    parser.add_argument("--no-schedule", action="store_true", help="Only run queued jobs, never plan new ones")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL, format=settings.LOG_FORMAT)
+
+    if args.command == "reparse":
+        try:
+            for source, result in asyncio.run(reparse(args.sources)).items():
+                print(f"{source}: {result}")
+        finally:
+            close_database()
+        return
+
+    if args.command == "dedupe":
+        db = get_session_local()()
+        try:
+            print(near_duplicates.rebuild(db))
+        finally:
+            db.close()
+            close_database()
+        return
+
+    if args.command == "lifecycle":
+        db = get_session_local()()
+        try:
+            print(update_grant_statuses(db))
+            db.commit()
+        finally:
+            db.close()
+            close_database()
+        return
+
+    if args.command == "archive":
+        db = get_session_local()()
+        try:
+            print(archive_closed_grants(db))
+        finally:
+            db.close()
+            close_database()
+        return
+
+    if args.command == "links":
+        try:
+            print(asyncio.run(check_all_links()))
+        finally:
+            close_database()
+        return
+
+    async def _run():
+        worker = ScraperWorker(
+            worker_id=args.worker_id,
+            poll_interval=args.poll_interval,
+            schedule=not args.no_schedule
+        )
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, worker.stop)
+            except NotImplementedError:
+                pass
+        await worker.run(once=args.once)
+
+    try:
+        asyncio.run(_run())
+    finally:
+        close_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the shared scraper extractors.
+
+Compares app/services/scrapers/extraction.py against the per-scraper
+implementations it replaced (kept below as ``legacy_*``), over a corpus of
+distinct grant-like texts so the per-text memoization does not flatter the
+new code. A second "repeat" pass shows the effect of the caches when the
+same container text is asked several questions in a row, as scrapers do.
+
+Usage:
+    python scripts/benchmark_extraction.py [--texts 2000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.scrapers.extraction import (  # noqa: E402
+    KeywordClassifier, _parse_date_str, extract_amounts, extract_dates, extract_email, parse_date, scan_text
+)
+
+# Legacy code logged a warning for every unparseable date; keep output quiet
+logging.disable(logging.WARNING)
+
+INDUSTRY = [
+    ("screen", ["screen", "film", "television", "tv", "movie", "cinema"]),
+    ("games", ["game", "gaming", "interactive", "digital"]),
+    ("arts", ["art", "creative", "culture", "music", "theatre"]),
+    ("media", ["media", "content", "production"])
+]
+ORG_TYPES = [
+    ("individual", ["individual", "artist", "freelancer"]),
+    ("small_business", ["small business", "sme", "startup"]),
+    ("not_for_profit", ["non-profit", "not-for-profit", "charity"]),
+    ("company", ["company", "corporation", "enterprise"])
+]
+PURPOSE = [
+    ("development", ["development", "develop", "create"]),
+    ("production", ["production", "produce", "make"]),
+    ("research", ["research", "study", "investigate"]),
+    ("marketing", ["marketing", "promotion", "distribute"])
+]
+AUDIENCE = [
+    ("emerging", ["emerging", "new", "early career"]),
+    ("established", ["established", "experienced", "professional"]),
+    ("indigenous", ["indigenous", "aboriginal", "first nations"]),
+    ("diverse", ["diverse", "multicultural", "inclusive"])
+]
+
+CATEGORIES = KeywordClassifier({
+    "industry_focus": (INDUSTRY, "creative"),
+    "org_types": (ORG_TYPES, ["any"]),
+    "funding_purpose": (PURPOSE, ["development"]),
+    "audience_tags": (AUDIENCE, ["general"])
+})
+
+LEGACY_DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%d %b %Y", "%d %B %Y", "%B %d, %Y"]
+
+
+# --- Legacy implementations (as previously copied across the scrapers) -----
+
+def legacy_extract_amounts(text):
+    min_amount = None
+    max_amount = None
+    amount_patterns = [
+        r'\$([0-9,]+(?:\.[0-9]{2})?)',
+        r'([0-9,]+(?:\.[0-9]{2})?) dollars?',
+        r'up to \$([0-9,]+)',
+        r'maximum \$([0-9,]+)',
+        r'minimum \$([0-9,]+)'
+    ]
+    for pattern in amount_patterns:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            try:
+                amount = int(match.replace(',', ''))
+                if 'up to' in text.lower() or 'maximum' in text.lower():
+                    max_amount = amount
+                elif 'minimum' in text.lower():
+                    min_amount = amount
+                else:
+                    max_amount = amount
+            except ValueError:
+                continue
+    return min_amount, max_amount
+
+
+def legacy_extract_dates(text):
+    dates = {"open_date": None, "deadline": None}
+    date_patterns = [
+        r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
+        r'(\d{1,2} [A-Za-z]+ \d{4})',
+        r'([A-Za-z]+ \d{1,2}, \d{4})',
+        r'(\d{4}-\d{2}-\d{2})'
+    ]
+    for pattern in date_patterns:
+        for match in re.findall(pattern, text):
+            context = text[max(0, text.find(match) - 50):text.find(match) + 50].lower()
+            if any(word in context for word in ['open', 'start', 'begin']):
+                dates["open_date"] = match
+            elif any(word in context for word in ['close', 'deadline', 'due', 'end']):
+                dates["deadline"] = match
+    return dates
+
+
+def legacy_extract_email(text):
+    matches = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    return matches[0] if matches else None
+
+
+def legacy_first(rules, default, text):
+    text_lower = text.lower()
+    for label, words in rules:
+        if any(word in text_lower for word in words):
+            return label
+    return default
+
+
+def legacy_all(rules, default, text):
+    text_lower = text.lower()
+    labels = [label for label, words in rules if any(word in text_lower for word in words)]
+    return labels if labels else default
+
+
+def legacy_parse_date(date_str):
+    for date_format in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str.strip(), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+# --- Corpus -----------------------------------------------------------------
+
+FILLER = (
+    "The program supports applicants across Australia to deliver projects with lasting community "
+    "benefit. Eligible applicants must hold an ABN and demonstrate capacity to complete the activity "
+    "within the funding period. Assessment considers merit, feasibility and value for money."
+).split()
+
+PHRASES = [
+    "Funding up to ${amount:,} is available",
+    "Grants from ${low:,} to ${high:,}",
+    "minimum ${low:,} per application",
+    "Applications open {open} and close {close}.",
+    "Deadline: {close}",
+    "Contact {email} for more information.",
+    "Support for emerging screen practitioners and documentary production.",
+    "Open to individuals, small businesses and not-for-profit organisations.",
+    "Research and development of new interactive content.",
+    "First Nations and culturally diverse artists are encouraged to apply."
+]
+
+
+def make_corpus(count, seed=7):
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        open_date = datetime(2024, rng.randint(1, 12), rng.randint(1, 28))
+        close_date = datetime(2025, rng.randint(1, 12), rng.randint(1, 28))
+        fmt = rng.choice(["%d/%m/%Y", "%d %B %Y", "%Y-%m-%d", "%B %d, %Y"])
+        values = {
+            "amount": rng.randrange(5_000, 500_000, 500),
+            "low": rng.randrange(1_000, 20_000, 500),
+            "high": rng.randrange(20_000, 200_000, 500),
+            "open": open_date.strftime(fmt),
+            "close": close_date.strftime(fmt),
+            "email": f"grants{i}@example.org.au"
+        }
+        parts = [p.format(**values) for p in rng.sample(PHRASES, 5)]
+        parts.append(" ".join(rng.choice(FILLER) for _ in range(rng.randint(40, 120))))
+        rng.shuffle(parts)
+        texts.append(f"Grant {i}. " + " ".join(parts))
+    return texts
+
+
+def make_dates(count, seed=11):
+    rng = random.Random(seed)
+    formats = ["%d %B %Y", "%B %d, %Y", "%d/%m/%Y", "%d %b %Y", "%Y-%m-%d"]
+    return [
+        datetime(rng.randint(2023, 2026), rng.randint(1, 12), rng.randint(1, 28)).strftime(rng.choice(formats))
+        for _ in range(count)
+    ]
+
+
+# --- Runner -----------------------------------------------------------------
+
+def bench(label, func, items, repeat=1, rounds=3, reset=None):
+    """Best-of-``rounds`` microseconds per call."""
+    best = None
+    for _ in range(rounds):
+        if reset:
+            reset()
+        start = time.perf_counter()
+        for item in items:
+            for _ in range(repeat):
+                func(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return label, best / (len(items) * repeat) * 1e6
+
+
+def legacy_all_fields(text):
+    legacy_extract_amounts(text)
+    legacy_extract_dates(text)
+    legacy_extract_email(text)
+    legacy_first(INDUSTRY, "creative", text)
+    legacy_all(ORG_TYPES, ["any"], text)
+    legacy_all(PURPOSE, ["development"], text)
+    legacy_all(AUDIENCE, ["general"], text)
+
+
+def shared_all_fields(text):
+    extract_amounts(text)
+    extract_dates(text)
+    extract_email(text)
+    CATEGORIES.classify("industry_focus", text)
+    CATEGORIES.classify("org_types", text)
+    CATEGORIES.classify("funding_purpose", text)
+    CATEGORIES.classify("audience_tags", text)
+
+
+def clear_caches():
+    scan_text.cache_clear()
+    extract_email.cache_clear()
+    CATEGORIES.cache_clear()
+    _parse_date_str.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2000, help="Distinct texts in the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Calls per text in the repeat pass")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.texts)
+    dates = make_dates(args.texts)
+    avg_len = sum(map(len, corpus)) // len(corpus)
+    print(f"Corpus: {len(corpus)} texts, average {avg_len} chars\n")
+
+    pairs = [
+        ("amounts", legacy_extract_amounts, extract_amounts, corpus),
+        ("dates", legacy_extract_dates, extract_dates, corpus),
+        ("email", legacy_extract_email, extract_email, corpus),
+        ("industry_focus", lambda t: legacy_first(INDUSTRY, "creative", t),
+         lambda t: CATEGORIES.classify("industry_focus", t), corpus),
+        ("all categories", lambda t: [legacy_first(INDUSTRY, "creative", t), legacy_all(ORG_TYPES, ["any"], t),
+                                      legacy_all(PURPOSE, ["development"], t), legacy_all(AUDIENCE, ["general"], t)],
+         lambda t: [CATEGORIES.classify(name, t) for name in CATEGORIES.tables], corpus),
+        ("parse_date", legacy_parse_date, parse_date, dates),
+        ("all fields", legacy_all_fields, shared_all_fields, corpus),
+    ]
+
+    print(f"{'benchmark':<18}{'legacy us':>12}{'shared us':>12}{'speedup':>10}")
+    for name, legacy, shared, items in pairs:
+        _, legacy_us = bench(name, legacy, items)
+        _, shared_us = bench(name, shared, items, reset=clear_caches)
+        print(f"{name:<18}{legacy_us:>12.2f}{shared_us:>12.2f}{legacy_us / shared_us:>9.1f}x")
+
+    print(f"\nRepeat pass ({args.repeat} calls per text, as scrapers ask several questions of one text):")
+    _, legacy_us = bench("all fields", legacy_all_fields, corpus[:500], args.repeat)
+    _, shared_us = bench("all fields", shared_all_fields, corpus[:500], args.repeat, reset=clear_caches)
+    print(f"{'all fields':<18}{legacy_us:>12.2f}{shared_us:>12.2f}{legacy_us / shared_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmarks for the scrapers.
+
+Record real responses once (needs network), then replay them as often as you
+like without touching the live sites:
+
+    python scripts/benchmark_scrapers.py record [--source philanthropic ...]
+    python scripts/benchmark_scrapers.py run [--rounds 3] [--output results.json]
+    python scripts/benchmark_scrapers.py run --baseline results.json --tolerance 0.2
+
+Each scraper is measured in its own subprocess so peak RSS is per scraper.
+"Peak RSS" is the scraper process itself; "parse RSS" is the largest parse
+pool worker. Scrapers are driven through ``stream()`` without a database and
+replay skips politeness delays, so the numbers are fetch-from-fixture +
+parse + extraction throughput. ``--baseline`` exits non-zero if
+pages/sec or grants/sec drop by more than the tolerance.
+
+Fixtures live in settings.SCRAPER_FIXTURE_DIR (override with --fixtures).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings  # noqa: E402
+from app.services.scrapers.australian_grants_scraper import AustralianGrantsScraper  # noqa: E402
+from app.services.scrapers.business_gov import BusinessGovScraper  # noqa: E402
+from app.services.scrapers.grantconnect import GrantConnectScraper  # noqa: E402
+from app.services.scrapers.http_pool import close_http_session  # noqa: E402
+from app.services.scrapers.media_investment_scraper import MediaInvestmentScraper  # noqa: E402
+from app.services.scrapers.parse_pool import get_parse_executor, shutdown_parse_executor  # noqa: E402
+from app.services.scrapers.philanthropic_scraper import PhilanthropicScraper  # noqa: E402
+from app.services.scrapers.replay import FixtureStore, recording, replaying  # noqa: E402
+
+# Streaming scrapers that fetch through BaseScraper._make_request, so can be replayed
+SCRAPERS = {
+    "australian_grants": AustralianGrantsScraper,
+    "business.gov.au": BusinessGovScraper,
+    "grantconnect": GrantConnectScraper,
+    "media_investment": MediaInvestmentScraper,
+    "philanthropic": PhilanthropicScraper,
+}
+
+# ru_maxrss is kilobytes on Linux, bytes on macOS
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+async def record(store: FixtureStore, source: str):
+    with recording(store, source) as fixtures:
+        grants = [grant async for grant in SCRAPERS[source](None).stream()]
+    print(f"{source}: recorded {fixtures.pages} pages ({fixtures.bytes / 1024:.0f} KiB), {len(grants)} grants")
+
+
+async def measure(store: FixtureStore, source: str, rounds: int, warmup: int) -> dict:
+    """Replay one scraper ``warmup + rounds`` times; keep the fastest round."""
+    best = None
+    for i in range(warmup + rounds):
+        with replaying(store, source) as fixtures:
+            start = time.perf_counter()
+            grants = [grant async for grant in SCRAPERS[source](None).stream()]
+            elapsed = time.perf_counter() - start
+        if i >= warmup and (best is None or elapsed < best["seconds"]):
+            best = {
+                "seconds": elapsed,
+                "pages": fixtures.pages,
+                "bytes": fixtures.bytes,
+                "misses": fixtures.misses,
+                "grants": len(grants),
+            }
+
+    # Wait for the parse workers to exit so their peak shows up in RUSAGE_CHILDREN
+    executor = get_parse_executor()
+    if executor is not None:
+        executor.shutdown(wait=True)
+    shutdown_parse_executor()
+
+    best["source"] = source
+    best["pages_per_sec"] = best["pages"] / best["seconds"] if best["seconds"] else 0.0
+    best["grants_per_sec"] = best["grants"] / best["seconds"] if best["seconds"] else 0.0
+    best["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT / 2 ** 20
+    best["parse_rss_mb"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * RSS_UNIT / 2 ** 20
+    return best
+
+
+def run_isolated(args, source: str) -> dict:
+    """Measure one scraper in a fresh interpreter and return its result."""
+    cmd = [
+        sys.executable, os.path.abspath(__file__), "_measure", source,
+        "--fixtures", args.fixtures, "--rounds", str(args.rounds), "--warmup", str(args.warmup)
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{source} benchmark failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions of more than ``tolerance`` against a previous run."""
+    problems = []
+    for source, result in results.items():
+        before = baseline.get(source)
+        if not before:
+            continue
+        for metric in ("pages_per_sec", "grants_per_sec"):
+            if before[metric] and result[metric] < before[metric] * (1 - tolerance):
+                problems.append(
+                    f"{source}: {metric} {result[metric]:.1f} vs baseline {before[metric]:.1f} "
+                    f"({result[metric] / before[metric] - 1:+.0%})"
+                )
+        if result["grants"] != before["grants"]:
+            print(f"note: {source} now yields {result['grants']} grants (baseline {before['grants']})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["record", "run", "_measure"])
+    parser.add_argument("sources", nargs="*", help=argparse.SUPPRESS)
+    parser.add_argument("--source", action="append", dest="only", choices=sorted(SCRAPERS),
+                        help="Limit to these sources (repeatable)")
+    parser.add_argument("--fixtures", default=settings.SCRAPER_FIXTURE_DIR, help="Fixture store directory")
+    parser.add_argument("--rounds", type=int, default=3, help="Measured replays per scraper")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured replays first (starts the parse pool)")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed fractional slowdown vs baseline")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    store = FixtureStore(args.fixtures)
+
+    if args.command == "_measure":
+        print(json.dumps(asyncio.run(measure(store, args.sources[0], args.rounds, args.warmup))))
+        return
+
+    if args.command == "record":
+        async def _record_all():
+            try:
+                for source in args.only or sorted(SCRAPERS):
+                    await record(store, source)
+            finally:
+                await close_http_session()
+                shutdown_parse_executor()
+        asyncio.run(_record_all())
+        store.save()
+        return
+
+    sources = args.only or [s for s in sorted(SCRAPERS) if s in store.sources()]
+    if not sources:
+        sys.exit(f"No fixtures in {args.fixtures}; run `record` first")
+
+    results = {}
+    header = f"{'scraper':<20}{'pages':>7}{'grants':>8}{'pages/s':>10}{'grants/s':>10}{'peak MB':>9}{'parse MB':>10}{'misses':>8}"
+    print(header)
+    for source in sources:
+        r = run_isolated(args, source)
+        results[source] = r
+        print(f"{source:<20}{r['pages']:>7}{r['grants']:>8}{r['pages_per_sec']:>10.1f}{r['grants_per_sec']:>10.1f}"
+              f"{r['peak_rss_mb']:>9.1f}{r['parse_rss_mb']:>10.1f}{r['misses']:>8}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        if problems:
+            print("\nThroughput regressions:")
+            for problem in problems:
+                print(f"  {problem}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,10 +41,12 @@ test_engine = create_engine(
 @event.listens_for(Engine, "connect")
 def set_foreign_keys(dbapi_connection, connection_record):
     if settings.TESTING:
+        # Look at the connection itself: tests may open their own engines
+        driver = type(dbapi_connection).__module__
         cursor = dbapi_connection.cursor()
-        if 'sqlite' in str(test_engine.url):
+        if 'sqlite' in driver:
             cursor.execute("PRAGMA foreign_keys=ON")
-        elif 'postgresql' in str(test_engine.url):
+        elif 'psycopg' in driver:
             cursor.execute("SET session_replication_role = 'replica';")
         cursor.close()
 
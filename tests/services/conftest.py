@@ -0,0 +1,53 @@
+"""
+Shared fixtures for the service tests.
+
+Service tests run against an in-memory SQLite database holding only the
+tables they need. A module (or test) names them with the ``tables`` marker:
+
+    pytestmark = pytest.mark.tables(Grant, GrantChange)
+
+and takes the ``db`` session. A single model goes through
+``pytest.mark.tables.with_args(Model)``, or pytest takes the marker for a
+decorator. ``threaded=True`` keeps one connection for code that writes from
+a worker thread; ``foreign_keys=False`` is for tables whose parents SQLite
+can't create (``users`` has ARRAY columns).
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "tables(*models, threaded=False, foreign_keys=True): tables the db fixture creates")
+
+
+@pytest.fixture
+def sqlite_sessions():
+    """Factory for session factories bound to a fresh in-memory database with the given models' tables."""
+
+    def build(*models, threaded: bool = False, foreign_keys: bool = True) -> sessionmaker:
+        if threaded:
+            engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        else:
+            engine = create_engine("sqlite://")
+        if not foreign_keys:
+            with engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        Base.metadata.create_all(engine, tables=[model.__table__ for model in models])
+        return sessionmaker(bind=engine)
+
+    return build
+
+
+@pytest.fixture
+def db(request, sqlite_sessions):
+    marker = request.node.get_closest_marker("tables")
+    if marker is None:
+        raise pytest.UsageError(f"{request.node.nodeid} uses db without a tables marker")
+    session = sqlite_sessions(*marker.args, **marker.kwargs)()
+    yield session
+    session.close()
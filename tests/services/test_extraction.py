@@ -0,0 +1,126 @@
+import random
+import pytest
+from datetime import datetime
+from app.services.scrapers.extraction import (
+    KeywordClassifier, extract_amounts, extract_dates, extract_email, parse_date
+)
+
+RULES = {
+    "industry_focus": ([
+        ("screen", ["screen", "film", "tv"]),
+        ("arts", ["art", "creative"]),
+        ("business", ["startup", "small business"])
+    ], "other"),
+    "org_types": ([
+        ("individual", ["individual", "artist"]),
+        ("small_business", ["small business", "sme", "startup"])
+    ], ["any"])
+}
+
+
+def _naive(text):
+    lowered = text.lower()
+    return {
+        (name, label)
+        for name, (rules, _) in RULES.items()
+        for label, keywords in rules
+        if any(keyword in lowered for keyword in keywords)
+    }
+
+
+class TestKeywordClassifier:
+    def test_first_match_and_default(self):
+        classifier = KeywordClassifier(RULES)
+        assert classifier.classify("industry_focus", "A short FILM fund") == "screen"
+        assert classifier.classify("industry_focus", "Nothing relevant") == "other"
+
+    def test_multi_label_and_default_copy(self):
+        classifier = KeywordClassifier(RULES)
+        assert classifier.classify("org_types", "Artists and small businesses") == ["individual", "small_business"]
+        default = classifier.classify("org_types", "Nothing relevant")
+        default.append("mutated")
+        assert classifier.classify("org_types", "Still nothing") == ["any"]
+
+    def test_overlapping_keywords_match_like_substring_checks(self):
+        # "startup" contains "art"; "artist" starts with "art"; "smartv" straddles "art"/"tv"
+        classifier = KeywordClassifier(RULES)
+        for text in ["startup", "artist", "smartv", "small businesses", "creative artists"]:
+            assert classifier.labels(text) == _naive(text), text
+
+        rng = random.Random(3)
+        alphabet = "abcdeilmnorstuv "
+        for _ in range(500):
+            text = "".join(rng.choice(alphabet) for _ in range(40))
+            assert classifier.labels(text) == _naive(text), text
+
+
+class TestAmounts:
+    @pytest.mark.parametrize("text,expected", [
+        ("Funding up to $500,000 for documentary production", (None, 500000)),
+        ("Grants minimum $10,000 available", (10000, None)),
+        ("$1,000,000", (None, 1000000)),
+        ("Grants from $5,000 to $50,000", (5000, 50000)),
+        ("Between $10,000 and $20,000 per project", (10000, 20000)),
+        ("Minimum $1,000, maximum $25,000", (1000, 25000)),
+        ("A budget of $2.5 million", (None, 2500000)),
+        ("5000 dollars", (None, 5000)),
+        ("No monetary amounts here", (None, None)),
+    ])
+    def test_extract_amounts(self, text, expected):
+        assert extract_amounts(text) == expected
+
+    def test_qualifier_is_local_to_each_amount(self):
+        # The old whole-text check turned both amounts into maximums
+        text = "Minimum $1,000 per applicant. Total pool of $80,000, up to $20,000 each"
+        assert extract_amounts(text) == (1000, 80000)
+
+
+class TestDates:
+    def test_open_and_close_from_context(self):
+        text = "Applications open 1 March 2024 and close 30 April 2024."
+        assert extract_dates(text) == {"open_date": "1 March 2024", "deadline": "30 April 2024"}
+
+    @pytest.mark.parametrize("text,deadline", [
+        ("Deadline: 15/06/2024", "15/06/2024"),
+        ("2024-03-20 is the closing date", "2024-03-20"),
+        ("Closes March 5, 2025", "March 5, 2025"),
+        ("Submissions due 7 Aug 2024", "7 Aug 2024"),
+    ])
+    def test_deadline_formats(self, text, deadline):
+        assert extract_dates(text)["deadline"] == deadline
+
+    def test_ignores_non_dates(self):
+        assert extract_dates("10 markets in 2024 close soon") == {"open_date": None, "deadline": None}
+
+
+class TestParseDate:
+    @pytest.mark.parametrize("value,expected", [
+        ("2024-03-20", datetime(2024, 3, 20)),
+        ("20/03/2024", datetime(2024, 3, 20)),
+        ("20-03-2024", datetime(2024, 3, 20)),
+        ("2024/03/20", datetime(2024, 3, 20)),
+        ("20 Mar 2024", datetime(2024, 3, 20)),
+        ("20 March 2024", datetime(2024, 3, 20)),
+        (" March 20, 2024 ", datetime(2024, 3, 20)),
+        ("invalid", None),
+        ("", None),
+    ])
+    def test_formats(self, value, expected):
+        assert parse_date(value) == expected
+
+    def test_shape_shared_by_two_formats(self):
+        # "%d %b %Y" and "%d %B %Y" share a shape; the cached formats for it
+        # must still fall through to the second one
+        assert parse_date("20 Jul 2024") == datetime(2024, 7, 20)
+        assert parse_date("20 July 2024") == datetime(2024, 7, 20)
+        assert parse_date("20 May 2024") == datetime(2024, 5, 20)
+        assert parse_date("21 Sept 2024") is None
+
+    def test_passes_through_datetime(self):
+        value = datetime(2024, 1, 1)
+        assert parse_date(value) is value
+
+
+def test_extract_email():
+    assert extract_email("Contact funding@screenaustralia.gov.au today") == "funding@screenaustralia.gov.au"
+    assert extract_email("No email here") is None
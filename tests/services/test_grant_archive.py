@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import GrantChange
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+from app.services.grant_archive import archive_closed_grants
+from app.services.grant_loader import load_grants
+
+NOW = datetime(2025, 8, 9, 12, 0)
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange, GrantSignature, GrantLshBucket, ArchivedGrant)
+
+
+def _add(db, title, status="closed", days_ago=None, **fields):
+    grant = Grant(
+        title=title, source=fields.pop("source", "manual"), status=status,
+        deadline=NOW - timedelta(days=days_ago) if days_ago is not None else None,
+        org_type_eligible=["sme"], **fields
+    )
+    db.add(grant)
+    db.commit()
+    return grant
+
+
+def test_long_closed_grants_move_to_the_archive_in_batches(db):
+    old = _add(db, "Closed last year", days_ago=200)
+    stale = _add(db, "Closed, no deadline", updated_at=NOW - timedelta(days=120))
+    recent = _add(db, "Closed last week", days_ago=7)
+    still_open = _add(db, "Open, deadline passed", status="open", days_ago=200)
+    copy = _add(db, "Copy of the old one", status="open", source="grantconnect", canonical_id=old.id)
+    db.add(GrantSignature(grant_id=old.id, signature=b"\x00" * 4))
+    db.commit()
+    old_id, stale_id = old.id, stale.id
+    head = db.query(GrantChange).count()
+
+    stats = archive_closed_grants(db, now=NOW, days=90, batch_size=1)
+    assert stats == {"archived": 2, "batches": 2, "unlinked": 1}
+
+    assert sorted(grant.id for grant in db.query(Grant)) == sorted([recent.id, still_open.id, copy.id])
+    assert db.get(Grant, copy.id).canonical_id is None
+    assert db.query(GrantSignature).count() == 0
+
+    archived = db.get(ArchivedGrant, old_id)
+    assert (archived.title, archived.status, archived.org_type_eligible) == ("Closed last year", "closed", ["sme"])
+    assert archived.archived_at == NOW and archived.canonical_id is None
+
+    changes = [(change.op, change.grant_id) for change in db.query(GrantChange).order_by(GrantChange.id).all()[head:]]
+    assert changes == [("update", copy.id), ("delete", old_id), ("delete", stale_id)]
+
+    # Nothing left to do
+    assert archive_closed_grants(db, now=NOW, days=90)["archived"] == 0
+
+
+def test_archived_grants_are_found_by_id(db):
+    old = _add(db, "Closed last year", days_ago=200)
+    current = _add(db, "Open", status="open")
+    old_id = old.id
+    archive_closed_grants(db, now=NOW, days=90)
+
+    assert sorted(load_grants(db, [old_id, current.id])) == [current.id]
+    found = load_grants(db, [old_id, current.id, 999], include_archived=True)
+    assert isinstance(found[old_id], ArchivedGrant) and isinstance(found[current.id], Grant)
+    assert 999 not in found
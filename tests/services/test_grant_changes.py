@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import select
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import GrantChange
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+from app.services.grant_changes import changes_since
+from app.services.scrapers.ingest import upsert_grants
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange, GrantSignature, GrantLshBucket, ArchivedGrant)
+
+
+def _log(db):
+    return [(change.op, change.grant_id) for change in db.query(GrantChange).order_by(GrantChange.id)]
+
+
+def _grant(n, **overrides):
+    data = {
+        "title": f"Arts Grant {n}",
+        "description": "Support for local artists",
+        "source_url": f"https://example.org/arts/{n}",
+        "max_amount": 5000,
+    }
+    data.update(overrides)
+    return data
+
+
+def test_orm_writes_are_logged(db):
+    grant = Grant(title="Screen Fund", source="manual", status="open")
+    db.add(grant)
+    db.commit()
+
+    grant.status = "closed"
+    db.commit()
+    # Flushing an untouched object logs nothing
+    db.flush()
+
+    db.delete(grant)
+    db.commit()
+
+    assert _log(db) == [("insert", grant.id), ("update", grant.id), ("delete", grant.id)]
+
+
+def test_bulk_ingest_logs_inserts_and_real_updates_only(db):
+    upsert_grants(db, "philanthropic", [_grant(1), _grant(2)])
+    db.commit()
+    ids = dict(db.execute(select(Grant.title, Grant.id)).all())
+
+    upsert_grants(db, "philanthropic", [_grant(1), _grant(2, max_amount=9000)])
+    db.commit()
+
+    assert _log(db) == [
+        ("insert", ids["Arts Grant 1"]),
+        ("insert", ids["Arts Grant 2"]),
+        ("update", ids["Arts Grant 2"]),
+    ]
+
+
+def test_feed_pages_by_cursor_and_collapses_repeats(db):
+    grants = [Grant(title=f"Grant {n}", source="manual", status="open") for n in range(3)]
+    db.add_all(grants)
+    db.commit()
+    grants[0].status = "closed"
+    db.commit()
+    db.delete(grants[1])
+    db.commit()
+
+    everything = changes_since(db, since=0)
+    assert everything["has_more"] is False
+    assert [(change["op"], change["grant_id"]) for change in everything["changes"]] == [
+        ("insert", grants[2].id), ("update", grants[0].id), ("delete", grants[1].id)
+    ]
+    assert everything["changes"][1]["grant"].status == "closed"
+    assert everything["changes"][2]["grant"] is None
+
+    first = changes_since(db, since=0, limit=2)
+    assert first["has_more"] is True
+    # The grant deleted later is reported as deleted, not with stale data
+    assert [(change["op"], change["grant"] is None) for change in first["changes"]] == [
+        ("insert", False), ("delete", True)
+    ]
+    second = changes_since(db, since=first["next_cursor"], limit=2)
+    third = changes_since(db, since=second["next_cursor"], limit=2)
+    assert (second["has_more"], third["has_more"]) == (True, False)
+    assert third["next_cursor"] == everything["next_cursor"]
+
+    # Nothing new: the cursor stays put
+    assert changes_since(db, since=third["next_cursor"]) == {
+        "changes": [], "next_cursor": third["next_cursor"], "has_more": False
+    }
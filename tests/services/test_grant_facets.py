@@ -0,0 +1,67 @@
+import pytest
+from app.models.grant import Grant
+from app.models.grant_change import GrantChange
+from app.services.grant_facets import FacetIndex, amount_bucket
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange)
+
+
+def _add(db, title, **fields):
+    fields.setdefault("source", "manual")
+    fields.setdefault("status", "open")
+    grant = Grant(title=title, **fields)
+    db.add(grant)
+    db.commit()
+    return grant
+
+
+def test_amount_buckets():
+    assert amount_bucket(None, None) == "unspecified"
+    assert amount_bucket(None, 9999) == "under_10k"
+    assert amount_bucket(5000, None) == "under_10k"
+    assert amount_bucket(0, 50000) == "50k_100k"
+    assert amount_bucket(0, 2_000_000) == "500k_plus"
+
+
+def test_counts_respect_the_other_filters(db):
+    _add(db, "A", industry_focus="media", org_type_eligible=["sme", "startup"], max_amount=20000)
+    _add(db, "B", industry_focus="media", org_type_eligible=["nonprofit"], status="closed")
+    _add(db, "C", industry_focus="arts", org_type_eligible=["sme"], max_amount=20000)
+
+    index = FacetIndex()
+    index.refresh(db)
+
+    everything = index.counts()
+    assert everything["industry_focus"] == {"media": 2, "arts": 1}
+    assert everything["org_type"] == {"sme": 2, "nonprofit": 1, "startup": 1}
+    assert everything["amount"] == {"10k_50k": 2, "unspecified": 1}
+
+    media = index.counts({"industry_focus": "media", "status": "open"})
+    # The filtered facet still lists its alternatives
+    assert media["industry_focus"] == {"arts": 1, "media": 1}
+    assert media["org_type"] == {"sme": 1, "startup": 1}
+    assert media["status"] == {"closed": 1, "open": 1}
+
+    with pytest.raises(ValueError):
+        index.counts({"colour": "blue"})
+
+
+def test_follows_changes_and_skips_copies(db):
+    gone = _add(db, "Gone", industry_focus="health")
+    a = _add(db, "A", industry_focus="media")
+    b = _add(db, "B", industry_focus="media")
+    index = FacetIndex()
+    index.refresh(db)
+
+    b.canonical_id = a.id
+    db.commit()
+    db.delete(gone)
+    db.commit()
+    c = _add(db, "C", industry_focus="arts")
+    index.refresh(db)
+
+    # The deleted grant's slot is reused
+    assert len(index) == 3 and index.slots[c.id] == 0
+    assert index.counts()["industry_focus"] == {"arts": 1, "media": 1}
+    assert index.counts(include_duplicates=True)["industry_focus"] == {"media": 2, "arts": 1}
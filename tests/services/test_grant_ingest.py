@@ -0,0 +1,155 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import GrantChange
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+from app.services.grant_archive import archive_closed_grants
+from app.services.grant_lifecycle import update_grant_statuses
+from app.services.scrapers.ingest import grant_row, postgres_upsert_statement, upsert_grants
+
+
+# Only the grants tables are needed; the portable path is what runs here
+pytestmark = pytest.mark.tables(Grant, GrantChange, GrantSignature, GrantLshBucket, ArchivedGrant)
+
+
+def _grant(n, **overrides):
+    data = {
+        "title": f"Community Grant {n}",
+        "description": "Support for community projects",
+        "source_url": f"https://example.org/grants/{n}",
+        "max_amount": 10000,
+        "deadline": "30 June 2025",
+        "location": "national",
+        "org_types": ["not_for_profit"],
+    }
+    data.update(overrides)
+    return data
+
+
+def test_counts_added_updated_and_unchanged(db):
+    first = upsert_grants(db, "philanthropic", [_grant(n) for n in range(5)])
+    db.commit()
+    assert (first.added, first.updated, first.unchanged) == (5, 0, 0)
+
+    grants = [_grant(n) for n in range(6)]
+    grants[1]["max_amount"] = 25000
+    grants[2]["description"] = "Now with a different description"
+    second = upsert_grants(db, "philanthropic", grants, batch_size=2)
+    db.commit()
+    assert (second.added, second.updated, second.unchanged) == (1, 2, 3)
+
+    assert db.scalar(select(Grant.max_amount).where(Grant.title == "Community Grant 1")) == 25000
+    assert len(db.scalars(select(Grant)).all()) == 6
+
+
+def test_same_grant_with_cosmetic_differences_is_not_duplicated(db):
+    upsert_grants(db, "philanthropic", [_grant(1)])
+    result = upsert_grants(db, "philanthropic", [
+        _grant(1, title="  community   grant 1 ", source_url="https://example.org/grants/1/")
+    ])
+    db.commit()
+    assert result.added == 0
+    assert len(db.scalars(select(Grant)).all()) == 1
+
+
+def test_same_url_in_another_source_is_a_different_grant(db):
+    upsert_grants(db, "philanthropic", [_grant(1)])
+    result = upsert_grants(db, "media_investment", [_grant(1)])
+    assert result.added == 1
+
+
+def test_duplicates_and_untitled_rows_are_skipped(db):
+    result = upsert_grants(db, "philanthropic", [_grant(1), _grant(1, max_amount=5), {"description": "no title"}])
+    db.commit()
+    assert (result.added, result.skipped) == (1, 2)
+    # The last copy wins
+    assert db.scalar(select(Grant.max_amount)) == 5
+
+
+def test_status_is_only_set_on_insert(db):
+    upsert_grants(db, "philanthropic", [_grant(1)])
+    db.execute(Grant.__table__.update().values(status="closed"))
+    upsert_grants(db, "philanthropic", [_grant(1, description="changed", status="active")])
+    db.commit()
+    assert db.scalar(select(Grant.status)) == "closed"
+
+
+def test_closed_grant_reopens_when_rescraped_with_a_later_deadline(db):
+    upsert_grants(db, "philanthropic", [_grant(1, deadline=datetime(2025, 6, 30))])
+    db.commit()
+    assert db.scalar(select(Grant.status)) == "closed"
+
+    deadline = datetime.utcnow().replace(microsecond=0) + timedelta(days=200)
+    result = upsert_grants(db, "philanthropic", [_grant(1, deadline=deadline, status="active")])
+    db.commit()
+    assert result.updated == 1
+    assert db.execute(select(Grant.status, Grant.deadline)).one() == ("open", deadline)
+    assert update_grant_statuses(db) == {}
+
+
+def test_insert_status_follows_the_dates(db):
+    now = datetime.utcnow()
+    upsert_grants(db, "philanthropic", [
+        _grant(1, status="active", deadline=now + timedelta(days=90)),
+        _grant(2, deadline=now + timedelta(days=3)),
+        _grant(3, open_date=now + timedelta(days=30), deadline=now + timedelta(days=90)),
+        _grant(4, deadline=now - timedelta(days=1)),
+        _grant(5, status="ongoing", deadline=None),
+    ])
+    db.commit()
+    statuses = dict(db.execute(select(Grant.title, Grant.status)).all())
+    assert statuses == {
+        "Community Grant 1": "open",
+        "Community Grant 2": "closing_soon",
+        "Community Grant 3": "draft",
+        "Community Grant 4": "closed",
+        "Community Grant 5": "ongoing",
+    }
+
+
+def test_archived_grants_are_skipped_until_a_new_round_opens(db):
+    upsert_grants(db, "philanthropic", [_grant(1), _grant(2)])
+    db.commit()
+    archive_closed_grants(db, days=0)
+    archived_id = db.scalar(select(ArchivedGrant.id).where(ArchivedGrant.title == "Community Grant 1"))
+
+    # The source still lists the closed round
+    result = upsert_grants(db, "philanthropic", [_grant(1), _grant(2, description="edited")])
+    db.commit()
+    assert (result.added, result.archived, result.restored) == (0, 2, 0)
+    assert db.scalars(select(Grant)).all() == []
+    assert len(db.scalars(select(ArchivedGrant)).all()) == 2
+
+    # A later deadline is a new round: the same grant comes back
+    deadline = datetime.utcnow().replace(microsecond=0) + timedelta(days=90)
+    result = upsert_grants(db, "philanthropic", [_grant(1, deadline=deadline)])
+    db.commit()
+    assert (result.added, result.updated, result.archived, result.restored) == (0, 1, 0, 1)
+    grant = db.scalars(select(Grant)).one()
+    assert (grant.id, grant.status, grant.deadline) == (archived_id, "open", deadline)
+    assert db.scalars(select(ArchivedGrant.title)).all() == ["Community Grant 2"]
+    assert ("insert", archived_id) in db.execute(select(GrantChange.op, GrantChange.grant_id)).all()
+
+
+def test_grant_row_maps_scraper_fields_to_columns():
+    row = grant_row("business.gov.au", _grant(1, min_amount="$1,000", open_date=datetime(2025, 1, 1)))
+    assert row["location_eligibility"] == "national"
+    assert row["org_type_eligible"] == ["not_for_profit"]
+    assert row["min_amount"] == 1000.0
+    assert row["deadline"] == datetime(2025, 6, 30)
+    assert row["open_date"] == datetime(2025, 1, 1)
+    assert "location" not in row and "org_types" not in row
+
+
+def test_postgres_statement_is_one_round_trip_with_xmax():
+    rows = [grant_row("philanthropic", _grant(n)) for n in range(3)]
+    sql = str(postgres_upsert_statement(rows).compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (dedupe_key) DO UPDATE" in sql
+    assert "IS DISTINCT FROM excluded.content_hash" in sql
+    assert "RETURNING grants.id, (xmax = 0)" in sql
+    # Status is only rewritten for a closed grant that reopens
+    assert "status = CASE WHEN (grants.status = %(status_1)s AND excluded.deadline >= %(deadline_1)s) " \
+           "THEN excluded.status ELSE grants.status END" in sql
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.grant import Grant
+from app.models.grant_change import GrantChange
+from app.services.grant_lifecycle import update_grant_statuses
+
+NOW = datetime(2025, 8, 9, 12, 0)
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange)
+
+
+def _add(db, title, status, deadline_days=None, open_days=None):
+    grant = Grant(
+        title=title, source="manual", status=status,
+        deadline=NOW + timedelta(days=deadline_days) if deadline_days is not None else None,
+        open_date=NOW + timedelta(days=open_days) if open_days is not None else None
+    )
+    db.add(grant)
+    db.commit()
+    return grant
+
+
+def _statuses(db):
+    return {grant.title: grant.status for grant in db.query(Grant)}
+
+
+def test_statuses_follow_the_dates(db):
+    _add(db, "Past deadline", "open", deadline_days=-1)
+    _add(db, "Scraped, closing in a week", "active", deadline_days=7)
+    _add(db, "Scraped, no deadline", "active")
+    _add(db, "Opens next month", "active", deadline_days=90, open_days=30)
+    _add(db, "Draft that has opened", "draft", deadline_days=60, open_days=-1)
+    _add(db, "Deadline extended", "closing_soon", deadline_days=60)
+    _add(db, "Hand-made draft", "draft")
+    _add(db, "Closed, deadline moved", "closed", deadline_days=60)
+    _add(db, "Archived", "archived", deadline_days=-10)
+
+    moved = update_grant_statuses(db, now=NOW, closing_soon_days=30)
+    db.commit()
+    assert moved == {"closed": 1, "draft": 1, "closing_soon": 1, "open": 3}
+    assert _statuses(db) == {
+        "Past deadline": "closed",
+        "Scraped, closing in a week": "closing_soon",
+        "Scraped, no deadline": "open",
+        "Opens next month": "draft",
+        "Draft that has opened": "open",
+        "Deadline extended": "open",
+        "Hand-made draft": "draft",
+        "Closed, deadline moved": "closed",
+        "Archived": "archived",
+    }
+
+
+def test_moves_are_logged_to_the_change_feed(db):
+    grant = _add(db, "Closing", "open", deadline_days=40)
+    head = db.query(GrantChange).count()
+
+    assert update_grant_statuses(db, now=NOW, closing_soon_days=30) == {}
+    assert update_grant_statuses(db, now=NOW + timedelta(days=15), closing_soon_days=30) == {"closing_soon": 1}
+    db.commit()
+    assert grant.status == "closing_soon"
+
+    changes = db.query(GrantChange).order_by(GrantChange.id).all()[head:]
+    assert [(change.op, change.grant_id) for change in changes] == [("update", grant.id)]
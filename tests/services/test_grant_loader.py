@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from sqlalchemy import event
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import GrantChange
+from app.services.grant_loader import GrantLoader, load_grants
+
+
+@pytest.fixture
+def session_factory(sqlite_sessions):
+    # Batches run in a worker thread, which needs the one shared in-memory connection
+    factory = sqlite_sessions(Grant, GrantChange, ArchivedGrant, threaded=True)
+    db = factory()
+    db.add_all(Grant(title=f"Grant {n}", source="manual", status="open") for n in range(1, 6))
+    db.commit()
+    db.close()
+
+    factory.selects = []
+
+    @event.listens_for(factory.kw["bind"], "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            factory.selects.append(statement)
+
+    return factory
+
+
+def test_load_grants_is_one_query(session_factory):
+    db = session_factory()
+    found = load_grants(db, [3, 1, 3, 99])
+    assert sorted(found) == [1, 3] and found[3].title == "Grant 3"
+    assert len(session_factory.selects) == 1
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_a_query(session_factory):
+    loader = GrantLoader(session_factory)
+
+    async def request(ids):
+        # Requests arrive a moment apart, inside the batch window
+        await asyncio.sleep(0)
+        return await loader.load_many(ids)
+
+    first, second, single = await asyncio.gather(request([2, 1]), request([1, 42]), loader.load(5))
+    assert [grant.title for grant in first] == ["Grant 2", "Grant 1"]
+    assert second[0].title == "Grant 1" and second[1] is None
+    assert single.title == "Grant 5"
+    # One query for the lot, plus one in the archive for the id not found
+    assert (loader.batches, len(session_factory.selects)) == (1, 2)
+
+    # A later lookup is a new batch
+    assert (await loader.load(4)).title == "Grant 4"
+    assert loader.batches == 2
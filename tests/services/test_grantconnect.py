@@ -0,0 +1,164 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy.orm import Session
+from app.services.scrapers.grantconnect import GrantConnectScraper
+from app.services.scrapers.replay import FixtureStore, replaying
+
+SEARCH_URL = "https://www.grants.gov.au/api/v1/grants/search"
+
+
+def _detail(grant_id):
+    return {"grant": {"openDate": "2025-03-01", "closeDate": "2025-06-30", "estimatedValueTo": "50000",
+                      "categories": ["Media"], "eligibility": {"location": "All"}}}
+
+
+class FakeResponse:
+    def __init__(self, status, data=None):
+        self.status = status
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class FakeApi:
+    """Search pages of ``page_size`` grants plus detail endpoints, with configurable failures."""
+
+    def __init__(self, total, page_size, total_pages=False, failures=None, delay=0.0):
+        self.grants = [{"id": str(n), "title": f"Grant {n}", "description": "Funding"} for n in range(total)]
+        self.page_size = page_size
+        self.total_pages = total_pages
+        self.failures = dict(failures or {})  # url -> list of statuses to return first
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    def get(self, url, params=None):
+        return self._respond(url, params or {})
+
+    def _respond(self, url, params):
+        api = self
+
+        class Response(FakeResponse):
+            async def __aenter__(inner):
+                api.calls.append((url, params.get("page")))
+                api.in_flight += 1
+                api.max_in_flight = max(api.max_in_flight, api.in_flight)
+                await asyncio.sleep(api.delay)
+                api.in_flight -= 1
+                queued = api.failures.get(url)
+                if queued:
+                    inner.status = queued.pop(0)
+                    return inner
+                if url == SEARCH_URL:
+                    page = params["page"]
+                    data = {"grants": api.grants[(page - 1) * api.page_size:page * api.page_size]}
+                    if api.total_pages:
+                        data["totalPages"] = -(-len(api.grants) // api.page_size)
+                    inner._data = data
+                else:
+                    inner._data = _detail(url.rsplit("/", 1)[1])
+                return inner
+
+        return Response(200)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff():
+    async def instant(self, seconds):
+        pass
+    with patch.object(GrantConnectScraper, "_polite_sleep", instant):
+        yield
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("total_pages", [False, True])
+async def test_reads_every_search_page(total_pages):
+    api = FakeApi(total=25, page_size=10, total_pages=total_pages)
+    with patch("app.services.scrapers.grantconnect.settings.SCRAPER_GRANTCONNECT_PAGE_SIZE", 10):
+        grants = await GrantConnectScraper(Mock(spec=Session), http_session=api).scrape()
+    assert len(grants) == 25
+    assert sorted(page for url, page in api.calls if url == SEARCH_URL) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_detail_fetches_are_concurrent_but_bounded():
+    api = FakeApi(total=20, page_size=100, delay=0.01)
+    with patch("app.services.scrapers.grantconnect.settings.SCRAPER_GRANTCONNECT_CONCURRENCY", 5):
+        grants = await GrantConnectScraper(Mock(spec=Session), http_session=api).scrape()
+    assert len(grants) == 20
+    assert api.max_in_flight == 5
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_and_reports_partial_failures():
+    api = FakeApi(total=3, page_size=100, failures={
+        "https://www.grants.gov.au/api/v1/grants/0": [503, 503],  # recovers on the third attempt
+        "https://www.grants.gov.au/api/v1/grants/1": [404],  # final, not retried
+        "https://www.grants.gov.au/api/v1/grants/2": [500, 500, 500],  # gives up
+    })
+    scraper = GrantConnectScraper(Mock(spec=Session), http_session=api)
+    grants = await scraper.scrape()
+
+    assert [grant["source_url"] for grant in grants] == ["https://www.grants.gov.au/grants/0"]
+    assert sorted(scraper.fetch_report["details_failed"]) == ["1", "2"]
+    assert sum(1 for url, _ in api.calls if url.endswith("/grants/1")) == 1
+
+
+@pytest.mark.asyncio
+async def test_replays_through_the_shared_client(tmp_path):
+    store = FixtureStore(tmp_path)
+    store.put("grantconnect", "GET", SEARCH_URL, 200, json.dumps({"grants": [{"id": "7", "title": "Screen Grant", "description": "Funding"}]}),
+              {"params": {"page": 1, "pageSize": 100}})
+    store.put("grantconnect", "GET", "https://www.grants.gov.au/api/v1/grants/7", 200, json.dumps(_detail("7")))
+
+    with patch("app.services.scrapers.base_scraper.get_http_session", side_effect=AssertionError("network used")):
+        with replaying(store, "grantconnect"):
+            grants = await GrantConnectScraper(Mock(spec=Session)).scrape()
+
+    assert [grant["title"] for grant in grants] == ["Screen Grant"]
+    assert grants[0]["max_amount"] == 50000
+
+
+class PoolResponse(FakeResponse):
+    def __init__(self, status, data=None):
+        super().__init__(status, data)
+        self.url = None
+
+    async def text(self):
+        return json.dumps(self._data) if self._data is not None else ""
+
+
+@pytest.mark.asyncio
+async def test_final_statuses_are_not_retried_through_the_shared_pool():
+    detail = "https://www.grants.gov.au/api/v1/grants/"
+    statuses = {detail + "0": [503], detail + "1": [404, 200]}
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        queued = statuses.get(url)
+        if queued:
+            return PoolResponse(queued.pop(0))
+        if url == SEARCH_URL:
+            return PoolResponse(200, {"grants": [{"id": "0", "title": "Retried"}, {"id": "1", "title": "Gone"}]})
+        return PoolResponse(200, _detail(url.rsplit("/", 1)[1]))
+
+    session = Mock()
+    session.request = Mock(side_effect=request)
+    scraper = GrantConnectScraper(Mock(spec=Session))
+    with patch("app.services.scrapers.base_scraper.get_http_session", return_value=session):
+        grants = await scraper.scrape()
+
+    assert [grant["title"] for grant in grants] == ["Retried"]
+    assert scraper.fetch_report["details_failed"] == ["1"]
+    assert (calls.count(detail + "0"), calls.count(detail + "1")) == (2, 1)
@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import Mock
+from sqlalchemy.orm import Session
+from app.models.grant_seed import GrantSeed
+from app.services.scrapers.known_grants import (
+    applied_seed_checksum, known_grants_for, load_known_grants, mark_seed_applied, seed_checksum
+)
+from app.services.scrapers.philanthropic_scraper import PhilanthropicScraper
+
+
+pytestmark = pytest.mark.tables.with_args(GrantSeed)
+
+
+def test_dataset_covers_the_seeded_sources():
+    dataset = load_known_grants()
+    assert {"business.gov.au", "councils", "media_investment", "philanthropic"} <= set(dataset)
+    for seed in dataset.values():
+        assert seed.grants
+        assert all(grant["title"] and grant["source_url"] for grant in seed.grants)
+
+
+def test_checksum_ignores_key_order_but_not_content():
+    grants = [{"title": "A", "max_amount": 100}]
+    assert seed_checksum(grants) == seed_checksum([{"max_amount": 100, "title": "A"}])
+    assert seed_checksum(grants) != seed_checksum([{"title": "A", "max_amount": 101}])
+
+
+@pytest.mark.asyncio
+async def test_known_grants_are_skipped_once_ingested():
+    seed = known_grants_for("philanthropic")
+    scraper = PhilanthropicScraper(Mock(spec=Session))
+
+    first = [grant async for grant in scraper._stream_known_grants()]
+    assert len(first) == len(seed.grants)
+    assert scraper.seed_report["skipped"] is False
+
+    scraper.applied_seed_checksum = seed.checksum
+    assert [grant async for grant in scraper._stream_known_grants()] == []
+    assert scraper.seed_report["skipped"] is True
+
+    # Rebuilding doesn't mutate the shared dataset
+    again = [grant async for grant in PhilanthropicScraper(Mock(spec=Session))._stream_known_grants()]
+    assert again == first
+
+
+def test_applied_checksum_round_trip(db):
+    seed = known_grants_for("media_investment")
+    assert applied_seed_checksum(db, "media_investment") is None
+
+    mark_seed_applied(db, seed)
+    mark_seed_applied(db, seed)
+    db.commit()
+
+    assert applied_seed_checksum(db, "media_investment") == seed.checksum
+    assert db.query(GrantSeed).count() == 1
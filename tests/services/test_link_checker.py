@@ -0,0 +1,260 @@
+import asyncio
+import ipaddress
+import socket
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+import aiohttp
+import pytest
+from aiohttp import web
+from app.models.grant import Grant
+from app.models.grant_change import GrantChange
+from app.models.grant_link import GrantLink
+from app.services.link_checker import (
+    PublicResolver, check_grant_links, check_links, flagged_links, grant_link_statuses, link_check_session
+)
+from app.workers import scraper as scraper_worker
+
+NOW = datetime(2025, 8, 10, 9, 0)
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange, GrantLink)
+
+
+# Test hosts resolve to a public address unless listed here
+PRIVATE_HOSTS = {"intranet.example.org": ["10.0.0.7"], "dual.example.org": ["93.184.215.14", "fe80::1"]}
+
+
+class FakeResolver:
+    """Answers from ``answers`` (host -> list of address lists, one per lookup; the last repeats)."""
+
+    def __init__(self, answers=None):
+        self.answers = answers or {}
+        self.lookups = Counter()
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        answers = self.answers.get(host) or [PRIVATE_HOSTS.get(host, ["93.184.215.14"])]
+        addresses = answers[min(self.lookups[host], len(answers) - 1)]
+        self.lookups[host] += 1
+        return [
+            {"hostname": host, "host": address, "port": port, "family": family, "proto": 0, "flags": 0}
+            for address in addresses
+        ]
+
+    async def close(self):
+        pass
+
+
+class FakeResponse:
+    def __init__(self, status, url, location=None):
+        self.status = status
+        self.url = url
+        self.headers = {"Location": location} if location else {}
+
+
+class FakeSession:
+    """Answers from a table of ``url -> (status, final url) | exception``, per method.
+
+    A different final URL is served as a 301 to it, which then answers with the status.
+    """
+
+    def __init__(self, routes, head_routes=None, delay=0.001):
+        self.routes = routes
+        self.head_routes = head_routes or {}
+        self.delay = delay
+        self.in_flight = Counter()
+        self.max_in_flight = Counter()
+        self.requests = []
+        self.landing = {}
+        # Host names are resolved as the link-check connector does, before anything is sent
+        self.resolver = PublicResolver(FakeResolver())
+
+    def request(self, method, url, allow_redirects=True, timeout=None):
+        assert not allow_redirects
+        session = self
+
+        class _Request:
+            async def __aenter__(self):
+                host = urlsplit(url).hostname
+                try:
+                    ipaddress.ip_address(host)
+                except ValueError:
+                    try:
+                        await session.resolver.resolve(host)
+                    except OSError as e:
+                        raise aiohttp.ClientConnectorDNSError(SimpleNamespace(host=host, port=443, ssl=True), e)
+                session.requests.append((method, url))
+                session.in_flight[host] += 1
+                session.max_in_flight[host] = max(session.max_in_flight[host], session.in_flight[host])
+                try:
+                    await asyncio.sleep(session.delay)
+                finally:
+                    session.in_flight[host] -= 1
+                route = session.head_routes.get(url, session.routes.get(url)) if method == "HEAD" else session.routes.get(url)
+                if isinstance(route, Exception):
+                    raise route
+                if route is None and url in session.landing:
+                    return FakeResponse(session.landing[url], url)
+                status, final_url = route if route else (404, url)
+                if final_url != url:
+                    session.landing[final_url] = status
+                    return FakeResponse(301, url, location=final_url)
+                return FakeResponse(status, url)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+
+def _add(db, title, source_url, application_url=None):
+    grant = Grant(title=title, source="manual", status="open", source_url=source_url, application_url=application_url)
+    db.add(grant)
+    db.commit()
+    return grant
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_per_host():
+    urls = [f"https://slow.example.org/grants/{n}" for n in range(12)] + [f"https://other{n}.example.org/" for n in range(6)]
+    session = FakeSession({url: (200, url) for url in urls})
+
+    results = await check_links(urls, http_session=session, concurrency=8, per_host=2)
+    assert len(results) == len(urls)
+    assert session.max_in_flight["slow.example.org"] == 2
+    assert all(count == 1 for host, count in session.max_in_flight.items() if host != "slow.example.org")
+
+
+@pytest.mark.asyncio
+async def test_states_are_recorded_and_flagged(db):
+    ok = _add(db, "OK", "https://example.org/ok", application_url="http://portal.example.org/apply/")
+    moved = _add(db, "Moved", "https://example.org/old")
+    _add(db, "Gone", "https://example.org/gone")
+    _add(db, "Shared link", "https://example.org/gone")
+    _add(db, "Flaky", "https://flaky.example.org/", application_url="not a url")
+    session = FakeSession(
+        {
+            "https://example.org/ok": (200, "https://example.org/ok"),
+            # http -> https and a trailing slash aren't a move
+            "http://portal.example.org/apply/": (200, "https://portal.example.org/apply"),
+            "https://example.org/old": (200, "https://example.org/new-home"),
+            "https://example.org/gone": (404, "https://example.org/gone"),
+            "https://flaky.example.org/": aiohttp.ClientConnectionError("reset"),
+        },
+        # HEAD refused, GET works
+        head_routes={"https://example.org/ok": (405, "https://example.org/ok")},
+    )
+
+    stats = await check_grant_links(db, now=NOW, http_session=session)
+    db.commit()
+    assert stats == {"checked": 6, "states": {"ok": 2, "redirected": 1, "dead": 2, "error": 1}}
+    assert ("GET", "https://example.org/ok") in session.requests
+
+    links = grant_link_statuses(db, ok)
+    assert (links["source_url"]["state"], links["application_url"]["state"]) == ("ok", "ok")
+    assert grant_link_statuses(db, moved)["source_url"]["final_url"] == "https://example.org/new-home"
+
+    flagged = {item["url"]: item for item in flagged_links(db)}
+    assert set(flagged) == {"https://example.org/gone", "not a url", "https://example.org/old"}
+    assert [grant["title"] for grant in flagged["https://example.org/gone"]["grants"]] == ["Gone", "Shared link"]
+
+    # Nothing is due again until the recheck interval passes; then errors pile up to dead
+    assert (await check_grant_links(db, now=NOW + timedelta(hours=1), http_session=session))["checked"] == 0
+    for day in (1, 2):
+        await check_grant_links(db, now=NOW + timedelta(hours=25 * day), http_session=session)
+        db.commit()
+    flaky = db.query(GrantLink).filter(GrantLink.url == "https://flaky.example.org/").one()
+    assert (flaky.state, flaky.consecutive_failures) == ("dead", 3)
+
+
+@pytest.mark.asyncio
+async def test_non_public_targets_are_invalid_and_never_requested(db):
+    session = FakeSession({
+        "https://example.org/apply": (200, "http://169.254.169.254/latest/meta-data/"),
+        "https://example.org/relative": (200, "https://example.org/moved"),
+    })
+    urls = [
+        "http://127.0.0.1:8000/admin",
+        "http://[::1]/",
+        "https://intranet.example.org/grants",
+        "https://dual.example.org/",
+        "https://example.org/apply",
+        "https://example.org/relative",
+    ]
+    results = {result.url: result for result in await check_links(urls, http_session=session)}
+
+    assert all(results[url].invalid for url in urls[:5])
+    assert results["https://example.org/apply"].error == "non-public address for 169.254.169.254"
+    assert (results["https://example.org/relative"].status, results["https://example.org/relative"].final_url) == (
+        200, "https://example.org/moved"
+    )
+    requested = {url for _, url in session.requests}
+    assert requested == {"https://example.org/apply", "https://example.org/relative", "https://example.org/moved"}
+
+    grant = _add(db, "Internal", "http://127.0.0.1:8000/admin")
+    await check_grant_links(db, now=NOW, http_session=session)
+    assert grant_link_statuses(db, grant)["source_url"]["state"] == "dead"
+
+
+@pytest.mark.asyncio
+async def test_connections_go_to_the_vetted_address():
+    # A real session and a server on loopback: a name that resolves there is refused,
+    # and one that passes vetting and would then rebind there is never looked up again
+    hits = []
+
+    async def handler(request):
+        hits.append(request.path)
+        return web.Response(text="internal")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    resolver = FakeResolver({
+        "internal.example.org": [["127.0.0.1"]],
+        # Public for the check, loopback for any later lookup
+        "rebind.example.org": [["192.88.99.200"], ["127.0.0.1"]],
+    })
+    try:
+        async with link_check_session(4, 2, PublicResolver(resolver)) as session:
+            results = {
+                result.url: result
+                for result in await check_links(
+                    [f"http://internal.example.org:{port}/admin", f"http://rebind.example.org:{port}/admin"],
+                    http_session=session, timeout=2
+                )
+            }
+    finally:
+        await runner.cleanup()
+
+    assert hits == []
+    assert results[f"http://internal.example.org:{port}/admin"].invalid
+    rebind = results[f"http://rebind.example.org:{port}/admin"]
+    assert not rebind.invalid and rebind.status is None
+    assert resolver.lookups["rebind.example.org"] == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_checks_links_beside_the_job_loop(monkeypatch):
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_pass(self):
+        started.set()
+        await release.wait()
+
+    monkeypatch.setattr(scraper_worker.ScraperWorker, "check_links", slow_pass)
+    monkeypatch.setattr(scraper_worker, "get_session_local", lambda: None)
+    worker = scraper_worker.ScraperWorker(worker_id="test", schedule=False)
+    worker.maybe_check_links()
+    await started.wait()
+    task = worker._link_check
+    # The loop carries on while the pass runs, and doesn't start another
+    worker.maybe_check_links()
+    assert worker._link_check is task and not task.done()
+
+    await worker.finish_link_check(cancel=True)
+    assert task.cancelled()
@@ -0,0 +1,73 @@
+import pytest
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import GrantChange
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+from app.services.scrapers import near_duplicates
+from app.services.scrapers.ingest import upsert_grants
+
+EMDG = (
+    "Export Market Development Grants (EMDG) help Australian small and medium businesses "
+    "expand into overseas markets by reimbursing eligible export promotion expenses."
+)
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange, GrantSignature, GrantLshBucket, ArchivedGrant)
+
+
+def _canonical(db):
+    db.expire_all()
+    return {grant.source: grant.canonical_id for grant in db.query(Grant)}
+
+
+def test_signature_similarity_tracks_text_overlap():
+    a = near_duplicates.signature_for("Export Market Development Grants", EMDG)
+    b = near_duplicates.signature_for("Export Market Development Grant (EMDG)", EMDG + " Apply via Austrade.")
+    c = near_duplicates.signature_for("Regional Arts Fund", "Support for artists in regional and remote communities.")
+    assert near_duplicates.similarity(a, b) > 0.7
+    assert near_duplicates.similarity(a, c) < 0.2
+    assert near_duplicates.unpack(near_duplicates.pack(a)) == a
+    assert near_duplicates.signature_for("", None) is None
+
+
+def test_copies_from_other_sources_cluster_under_the_oldest(db):
+    upsert_grants(db, "business.gov.au", [{"title": "Export Market Development Grants", "description": EMDG,
+                                           "source_url": "https://business.gov.au/grants/emdg"}])
+    upsert_grants(db, "grantconnect", [{"title": "Export Market Development Grant (EMDG)", "description": EMDG,
+                                        "source_url": "https://www.grants.gov.au/grants/123"}])
+    upsert_grants(db, "philanthropic", [{"title": "Regional Arts Fund", "description": "Grants for regional artists.",
+                                         "source_url": "https://example.org/raf"}])
+    db.commit()
+
+    canonical = _canonical(db)
+    original = db.query(Grant).filter(Grant.source == "business.gov.au").one()
+    assert canonical == {"business.gov.au": None, "grantconnect": original.id, "philanthropic": None}
+
+
+def test_same_source_listings_are_not_clustered(db):
+    upsert_grants(db, "business.gov.au", [
+        {"title": "Export Market Development Grants", "description": EMDG, "source_url": "https://business.gov.au/a"},
+        {"title": "Export Market Development Grants", "description": EMDG, "source_url": "https://business.gov.au/b"},
+    ])
+    db.commit()
+    assert db.query(Grant).filter(Grant.canonical_id.isnot(None)).count() == 0
+
+
+def test_changed_grant_leaves_its_cluster(db):
+    upsert_grants(db, "business.gov.au", [{"title": "Export Market Development Grants", "description": EMDG}])
+    upsert_grants(db, "grantconnect", [{"title": "Export Market Development Grants", "description": EMDG}])
+    db.commit()
+    assert _canonical(db)["grantconnect"] is not None
+
+    # The original is rewritten into something else; its copy becomes canonical
+    upsert_grants(db, "business.gov.au", [{"title": "Export Market Development Grants",
+                                           "description": "Closed. Replaced by the Digital Solutions program for tourism operators."}])
+    db.commit()
+    assert _canonical(db) == {"business.gov.au": None, "grantconnect": None}
+    # The copy's move is in the change feed too
+    copy = db.query(Grant).filter(Grant.source == "grantconnect").one()
+    last = db.query(GrantChange).order_by(GrantChange.id.desc()).first()
+    assert (last.op, last.grant_id) == ("update", copy.id)
+
+    stats = near_duplicates.rebuild(db)
+    assert (stats["indexed"], stats["clusters"]) == (2, 0)
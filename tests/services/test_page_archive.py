@@ -0,0 +1,107 @@
+import json
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import GrantChange
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+from app.services.scrapers.archive import PageArchive
+from app.services.scrapers.australian_grants_scraper import AustralianGrantsScraper
+from app.services.scrapers.scraper_service import ScraperService
+
+SCREEN_URL = "https://www.screenaustralia.gov.au/funding-and-support/documentary"
+
+SCREEN_HTML = """
+<html><body><main>
+  <div class="funding-program">
+    <h2>Documentary Development</h2>
+    <p>Funding up to $50,000 for documentary development. Applications close 30 June 2025.</p>
+    <a href="/funding/documentary">Details</a>
+  </div>
+</main></body></html>
+"""
+
+
+class FakeResponse:
+    def __init__(self, status, text, url):
+        self.status = status
+        self._text = text
+        self.url = url
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def request(self, method, url, **kwargs):
+        if url in self.pages:
+            return FakeResponse(200, self.pages[url], url)
+        return FakeResponse(404, "", url)
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange, GrantSignature, GrantLshBucket, ArchivedGrant, threaded=True)
+
+
+@pytest.mark.asyncio
+async def test_live_fetches_are_archived_once_per_content(tmp_path):
+    archive = PageArchive(tmp_path)
+    scraper = AustralianGrantsScraper(Mock(spec=Session))
+    session = FakeSession({SCREEN_URL: SCREEN_HTML, SCREEN_URL + "/copy": SCREEN_HTML})
+
+    with patch("app.services.scrapers.base_scraper.get_http_session", return_value=session), \
+         patch("app.services.scrapers.base_scraper.get_page_archive", return_value=archive):
+        await scraper._make_request(SCREEN_URL)
+        await scraper._make_request(SCREEN_URL + "/copy")
+        await scraper._make_request(SCREEN_URL + "/missing")
+
+    lines = (tmp_path / "australian_grants" / "fetches.jsonl").read_text().splitlines()
+    assert [json.loads(line)["status"] for line in lines] == [200, 200, 404]
+    # Identical pages share a blob (plus one for the empty 404 body)
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 2
+
+    reloaded = PageArchive(tmp_path)
+    assert reloaded.sources() == ["australian_grants"]
+    assert reloaded.body(reloaded.get("australian_grants", "GET", SCREEN_URL)) == SCREEN_HTML
+    assert reloaded.summary("australian_grants")["pages"] == 2
+
+
+def test_latest_fetch_wins_and_torn_lines_are_skipped(tmp_path):
+    archive = PageArchive(tmp_path)
+    archive.put("philanthropic", "GET", SCREEN_URL, 200, "old")
+    archive.put("philanthropic", "GET", SCREEN_URL, 200, "new")
+    with (tmp_path / "philanthropic" / "fetches.jsonl").open("a") as f:
+        f.write('{"key": "trunc')
+
+    reloaded = PageArchive(tmp_path)
+    assert reloaded.body(reloaded.get("philanthropic", "GET", SCREEN_URL)) == "new"
+    assert len(reloaded.index("philanthropic")) == 1
+
+
+@pytest.mark.asyncio
+async def test_reparse_rebuilds_grants_without_network(tmp_path, db):
+    archive = PageArchive(tmp_path)
+    archive.put("australian_grants", "GET", SCREEN_URL, 200, SCREEN_HTML)
+
+    with patch("app.services.scrapers.base_scraper.get_http_session", side_effect=AssertionError("network used")):
+        result = await ScraperService(db).reparse_source("australian_grants", archive)
+
+    assert result["pages"] == 1
+    assert result["missing_pages"] > 0
+    assert result["grants_added"] >= 1
+    titles = db.scalars(select(Grant.title)).all()
+    assert any("Documentary" in title for title in titles)
+
+    # Running it again finds nothing new
+    again = await ScraperService(db).reparse_source("australian_grants", archive)
+    assert again["grants_added"] == 0
@@ -0,0 +1,139 @@
+from datetime import date, datetime
+import pytest
+from bs4 import BeautifulSoup
+
+from app.models.grant import Grant
+from app.models.grant_change import GrantChange
+from app.services.query_parser import conditions, parse_query, related_searches, search_suggestions
+from app.services.scrapers.australian_grants_scraper import AustralianGrantsScraper
+from app.services.scrapers.business_gov import BusinessGovScraper
+from app.services.scrapers.council_scraper import CouncilScraper
+from app.services.scrapers.grantconnect import GrantConnectScraper
+from app.services.scrapers.ingest import grant_row
+
+TODAY = date(2025, 8, 9)
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange)
+
+
+def test_vocabulary_amounts_and_dates():
+    parsed = parse_query("Tech grants for startups in Melbourne $20k–$150k closing in March", TODAY)
+    assert (parsed.industry, parsed.location, parsed.org_types) == ("technology", "victoria", ("startup",))
+    assert (parsed.min_amount, parsed.max_amount) == (20_000, 150_000)
+    assert (parsed.deadline_from, parsed.deadline_to) == (date(2026, 3, 1), date(2026, 3, 31))
+    assert parsed.keywords == ()
+
+    # The old literal phrases still work
+    assert parse_query("technology grants in victoria under 50k", TODAY).as_dict() == {
+        "keywords": [], "industry": "technology", "location": "victoria", "amount_range": {"max": 50000}
+    }
+
+
+def test_whole_words_and_longest_phrase_win():
+    parsed = parse_query("training for small business, closing next month", TODAY)
+    # "ai" isn't found inside "training"; "small business" is an org type, not a size
+    assert (parsed.industry, parsed.org_types, parsed.max_amount) == ("education", ("sme",), None)
+    assert (parsed.deadline_from, parsed.deadline_to) == (date(2025, 9, 1), date(2025, 9, 30))
+
+    parsed = parse_query("large drone grants for farmers $50k+", TODAY)
+    assert (parsed.industry, parsed.min_amount, parsed.keywords) == ("agriculture", 50_000, ("drone",))
+    assert parse_query("between 20,000 and 50,000 for 3 employees", TODAY).as_dict() == {
+        "keywords": ["employees"], "amount_range": {"min": 20000, "max": 50000}
+    }
+    assert parse_query("$20-150k closing before june 2026", TODAY).deadline_to == date(2026, 5, 31)
+
+
+def test_parsed_queries_are_cached():
+    assert parse_query("  Arts grants  ", TODAY) is parse_query("arts grants", TODAY)
+
+
+def test_conditions_filter_grants(db):
+    def add(title, **fields):
+        db.add(Grant(title=title, source="manual", status="open", **fields))
+
+    add("Screen Story Fund", industry_focus="media", org_type_eligible=["startup", "sme"],
+        min_amount=10000, max_amount=100000, deadline=datetime(2026, 3, 15))
+    add("Screen Story Fund (closes later)", industry_focus="media", org_type_eligible=["startup"],
+        min_amount=10000, max_amount=100000, deadline=datetime(2026, 4, 15))
+    add("Big Screen Fund", industry_focus="media", org_type_eligible=["enterprise"],
+        min_amount=500000, max_amount=1000000, deadline=datetime(2026, 3, 15))
+    db.commit()
+
+    parsed = parse_query("film funding for startups $20k-$150k closing in March", TODAY)
+    found = db.query(Grant).filter(*conditions(parsed)).all()
+    assert [grant.title for grant in found] == ["Screen Story Fund"]
+
+
+def test_conditions_match_what_scrapers_store(db):
+    # Rows as the scrapers and ingest write them, not the vocabulary's values
+    screen = AustralianGrantsScraper(None)
+    business = BusinessGovScraper(None)
+    grantconnect = GrantConnectScraper(None)
+    scraped = [
+        (screen, "Short Film Fund", "Funding for short film makers, open to small businesses"),
+        (screen, "Open Call", "Anyone can apply for this screen development round"),
+        (business, "Export Grant", "Support for medium enterprises to export overseas"),
+        (business, "Sole Trader Grant", "For individuals and sole traders"),
+    ]
+    for scraper, title, text in scraped:
+        data = scraper.normalize_grant_data({
+            "title": title, "description": text,
+            "industry_focus": scraper._determine_industry_focus(text),
+            "org_types": scraper._extract_org_types(text),
+        })
+        db.add(Grant(**grant_row(scraper.source_id, data)))
+    data = grantconnect.normalize_grant_data({
+        "title": "Community Arts Grant", "description": "Arts projects",
+        "org_types": grantconnect._extract_org_types({"organizationTypes": ["Not for profit"]}),
+    })
+    db.add(Grant(**grant_row("grantconnect", data)))
+    db.commit()
+
+    def search(query):
+        return sorted(grant.title for grant in db.query(Grant).filter(*conditions(parse_query(query, TODAY))))
+
+    # "any" means open to every organisation type
+    assert search("small business grants") == ["Export Grant", "Open Call", "Short Film Fund"]
+    assert search("grants for not-for-profits") == ["Community Arts Grant", "Open Call"]
+    assert search("film grants") == ["Open Call", "Short Film Fund"]
+
+
+@pytest.mark.asyncio
+async def test_location_matches_what_council_scrapers_store(db):
+    # Only the parsers are used; "councils" isn't a configured source, so skip __init__
+    councils = CouncilScraper.__new__(CouncilScraper)
+    councils.source_id = "councils"
+    parsers = {
+        "City of Melbourne Arts Grant": councils._parse_melbourne,
+        "Yarra Community Grant": councils._parse_yarra,
+        "Moreland Neighbourhood Grant": councils._parse_moreland,
+        "City of Sydney Village Grant": councils._parse_sydney,
+        "Inner West Creative Grant": councils._parse_inner_west,
+        "Brisbane Lord Mayor's Grant": councils._parse_brisbane,
+    }
+    for title, parse in parsers.items():
+        page = BeautifulSoup(f'<div class="grant"><h3>{title}</h3><p>Support for local community projects.</p></div>', "html.parser")
+        for data in await parse(page, "https://council.example.org/grants"):
+            db.add(Grant(**grant_row(councils.source_id, councils.normalize_grant_data(data))))
+    db.add(Grant(title="Victorian Statewide Fund", source="manual", status="open", location_eligibility="victoria"))
+    db.commit()
+
+    def search(query):
+        return sorted(grant.title for grant in db.query(Grant).filter(*conditions(parse_query(query, TODAY))))
+
+    assert search("grants in Melbourne") == [
+        "City of Melbourne Arts Grant", "Moreland Neighbourhood Grant", "Victorian Statewide Fund", "Yarra Community Grant"
+    ]
+    assert search("nsw grants") == ["City of Sydney Village Grant", "Inner West Creative Grant"]
+    assert search("grants in Brisbane") == ["Brisbane Lord Mayor's Grant"]
+
+
+def test_suggestions_follow_the_query():
+    parsed = parse_query("technology grants in victoria under 50k", TODAY)
+    assert search_suggestions("technology grants in victoria under 50k", parsed) == [
+        "technology grants in victoria under 50k for nonprofits",
+        "technology grants in victoria under 50k closing soon",
+    ]
+    assert related_searches(parsed)[:2] == ["technology grants for startups", "technology grants for small businesses"]
+    assert "technology innovation funding" not in related_searches(parsed, limit=10)
@@ -0,0 +1,109 @@
+from datetime import datetime
+import pytest
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import GrantChange
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+from app.models.saved_search import GrantAlert, GrantAlertMatch, SavedSearch
+from app.models.user import User  # noqa: F401  (resolves the users.id foreign keys)
+from app.services.grant_archive import archive_closed_grants, restore_archived
+from app.services.saved_searches import (
+    create_alert, create_saved_search, evaluate_saved_searches, predicates, unseen_matches
+)
+
+
+# users has ARRAY columns SQLite can't create; leave it out and don't enforce its foreign keys
+pytestmark = pytest.mark.tables(
+    Grant, GrantChange, SavedSearch, GrantAlert, GrantAlertMatch, ArchivedGrant, GrantSignature, GrantLshBucket,
+    foreign_keys=False
+)
+
+
+def _add(db, title, **fields):
+    fields.setdefault("source", "manual")
+    fields.setdefault("status", "open")
+    grant = Grant(title=title, **fields)
+    db.add(grant)
+    db.commit()
+    return grant
+
+
+def _matched(db, alert):
+    return sorted(match.grant_id for match in db.query(GrantAlertMatch).filter(GrantAlertMatch.alert_id == alert.id))
+
+
+def test_predicates_are_normalised():
+    assert predicates({"industry_focus": "media", "location_eligibility": "national", "status": None}) == (
+        ("industry_focus", '"media"'), ("location", '"national"')
+    )
+    assert predicates({"org_type": ["sme", "nfp"]}) == predicates({"org_type": ["nfp", "sme"]})
+    with pytest.raises(ValueError):
+        predicates({"colour": "blue"})
+
+
+def test_alerts_fire_once_for_grants_changed_after_the_watermark(db):
+    _add(db, "Existing Media Fund", industry_focus="media")
+    media = create_saved_search(db, 1, "Media", {"industry_focus": "media"}, is_alert_enabled=True)
+    big_media = create_saved_search(db, 1, "Big media", {"industry_focus": "media"})
+    big = create_alert(db, big_media, "Over 50k", {"min_amount": 50000})
+    create_saved_search(db, 2, "Arts, no alert", {"industry_focus": "arts"})
+    db.commit()
+    default = db.query(GrantAlert).filter(GrantAlert.search_id == media.id).one()
+
+    small = _add(db, "Local Media Grant", industry_focus="media", max_amount=10000)
+    large = _add(db, "Screen Fund", industry_focus="media", max_amount=250000)
+    _add(db, "Arts Fund", industry_focus="arts")
+
+    stats = evaluate_saved_searches(db)
+    db.commit()
+    # Two searches, three grants; industry_focus=media is evaluated once for both
+    assert (stats["searches"], stats["grants"], stats["predicates"], stats["matches"]) == (2, 3, 2, 3)
+    assert _matched(db, default) == [small.id, large.id]
+    assert _matched(db, big) == [large.id]
+    assert db.get(SavedSearch, media.id).result_count == 2
+
+    # Nothing new: no work. A re-change doesn't fire again; a new match does
+    assert evaluate_saved_searches(db)["grants"] == 0
+    large.notes = "Round 2 announced"
+    small.max_amount = 75000
+    db.commit()
+    stats = evaluate_saved_searches(db)
+    db.commit()
+    assert stats["matches"] == 1
+    assert _matched(db, big) == [small.id, large.id]
+
+
+def test_unseen_matches_for_a_user(db):
+    search = create_saved_search(db, 1, "Open", {"status": "open"}, is_alert_enabled=True)
+    db.commit()
+    grant = _add(db, "New Fund")
+    evaluate_saved_searches(db)
+    db.commit()
+
+    rows = unseen_matches(db, 1, mark_seen=True)
+    assert [(match.op, alert.search_id, found.id) for match, alert, found in rows] == [("insert", search.id, grant.id)]
+    assert unseen_matches(db, 1) == []
+    assert unseen_matches(db, 2) == []
+
+
+def test_matches_survive_archiving_and_restored_grants_do_not_realert(db):
+    # Matches aren't tied to the grant row, which archiving deletes
+    assert not GrantAlertMatch.__table__.c.grant_id.foreign_keys
+
+    search = create_saved_search(db, 1, "Media", {"industry_focus": "media"}, is_alert_enabled=True)
+    db.commit()
+    grant_id = _add(db, "Screen Fund", industry_focus="media", status="closed", deadline=datetime(2024, 6, 30)).id
+    evaluate_saved_searches(db)
+    db.commit()
+    alert = db.query(GrantAlert).filter(GrantAlert.search_id == search.id).one()
+
+    archive_closed_grants(db, days=0)
+    assert db.get(Grant, grant_id) is None
+    assert _matched(db, alert) == [grant_id]
+    # Hidden while archived
+    assert unseen_matches(db, 1) == []
+
+    restore_archived(db, {grant_id: "open"})
+    db.commit()
+    assert evaluate_saved_searches(db)["matches"] == 0
+    assert [found.id for _, _, found in unseen_matches(db, 1)] == [grant_id]
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from contextlib import aclosing
+from unittest.mock import patch
+from sqlalchemy import func, select
+from app.models.grant import Grant
+from app.models.grant_archive import ArchivedGrant
+from app.models.grant_change import GrantChange
+from app.models.grant_signature import GrantLshBucket, GrantSignature
+from app.services.scrapers.pipeline import merge_streams, run_pipeline
+
+
+# Writes run in a worker thread, which needs the one shared in-memory connection
+pytestmark = pytest.mark.tables(Grant, GrantChange, GrantSignature, GrantLshBucket, ArchivedGrant, threaded=True)
+
+
+def _grant(n, **overrides):
+    data = {
+        "title": f"Arts Grant {n}",
+        "description": "Support for artists",
+        "source_url": f"https://example.org/arts/{n}",
+        "max_amount": 5000,
+    }
+    data.update(overrides)
+    return data
+
+
+class FakeScraper:
+    source_id = "philanthropic"
+
+    def __init__(self, grants):
+        self.grants = grants
+
+    def _validate_grant_data(self, grant):
+        return bool(grant.get("title"))
+
+    async def stream(self):
+        for grant in self.grants:
+            await asyncio.sleep(0)
+            yield grant
+
+
+async def _count(n, produced):
+    for i in range(n):
+        produced.append(i)
+        yield i
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_bounds_items_in_flight():
+    produced = []
+    async with aclosing(merge_streams([_count(100, produced)], maxsize=5)) as merged:
+        first = await anext(merged)
+        for _ in range(10):
+            await asyncio.sleep(0)
+    assert first == 0
+    # Producer is held back by the buffer, and cancelled once the consumer stops
+    assert len(produced) <= 7
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_drops_a_failing_stream():
+    async def broken():
+        yield "a"
+        raise RuntimeError("site down")
+
+    merged = [item async for item in merge_streams([broken(), _count(3, [])])]
+    assert sorted(merged, key=str) == [0, 1, 2, "a"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_commits_each_batch_and_counts(db):
+    grants = [_grant(n) for n in range(5)] + [_grant(1), {"title": ""}]
+    with patch.object(db, "commit", wraps=db.commit) as commit:
+        result = await run_pipeline(FakeScraper(grants), db, batch_size=2)
+
+    assert (result.added, result.updated, result.skipped) == (5, 0, 2)
+    assert commit.call_count == 3
+    assert db.scalar(select(func.count()).select_from(Grant)) == 5
+
+    again = await run_pipeline(FakeScraper([_grant(0), _grant(1, max_amount=9000)]), db)
+    assert (again.added, again.updated, again.unchanged) == (0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_keeps_committed_batches_when_a_write_fails(db):
+    grants = [_grant(n) for n in range(6)]
+
+    real = db.commit
+    calls = []
+
+    def flaky_commit():
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError("database went away")
+        real()
+
+    with patch.object(db, "commit", side_effect=flaky_commit):
+        with pytest.raises(RuntimeError):
+            await run_pipeline(FakeScraper(grants), db, batch_size=2)
+
+    assert db.scalar(select(func.count()).select_from(Grant)) == 4
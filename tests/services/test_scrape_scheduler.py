@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime, timedelta
+from app.services.scrapers.scheduler import RunSample, compute_schedule, estimate_change_rate
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+MIN_INTERVAL = timedelta(hours=6)
+MAX_INTERVAL = timedelta(hours=168)
+
+
+def _run(hours_ago: float, status: str = "success", found: int = 10, changed: int = 0) -> RunSample:
+    started = NOW - timedelta(hours=hours_ago)
+    return RunSample(
+        status=status,
+        started_at=started,
+        finished_at=started + timedelta(minutes=5),
+        grants_found=found,
+        grants_changed=changed
+    )
+
+
+def test_never_run_source_is_due_now():
+    schedule = compute_schedule("philanthropic", [], NOW, MIN_INTERVAL, MAX_INTERVAL)
+    assert schedule.next_run == NOW
+    assert schedule.reason == "never run"
+
+
+def test_volatile_source_runs_more_often_than_static_one():
+    volatile = [_run(1, changed=10), _run(10, changed=9)]
+    static = [_run(1, changed=0), _run(50, changed=0)]
+
+    fast = compute_schedule("a", volatile, NOW, MIN_INTERVAL, MAX_INTERVAL)
+    slow = compute_schedule("b", static, NOW, MIN_INTERVAL, MAX_INTERVAL)
+
+    assert fast.interval_hours < slow.interval_hours
+    assert slow.interval_hours == pytest.approx(168)
+    assert fast.interval_hours < 12
+
+
+def test_change_rate_weights_recent_runs():
+    # Newest first: latest run changed nothing, the one before changed everything
+    assert estimate_change_rate([_run(1, changed=0), _run(10, changed=10)]) == pytest.approx(0.5)
+    assert estimate_change_rate([_run(1, status="error")]) == 1.0
+
+
+def test_deadline_season_halves_interval():
+    history = [_run(1, changed=0)]
+    normal = compute_schedule("a", history, NOW, MIN_INTERVAL, MAX_INTERVAL)
+    season = compute_schedule("a", history, NOW, MIN_INTERVAL, MAX_INTERVAL, in_season=True)
+    assert season.interval_hours == pytest.approx(normal.interval_hours / 2)
+
+
+def test_failures_back_off_from_last_attempt():
+    history = [_run(1, status="error"), _run(3, status="error"), _run(100, changed=5)]
+    schedule = compute_schedule("a", history, NOW, MIN_INTERVAL, MAX_INTERVAL)
+    assert schedule.consecutive_failures == 2
+    assert schedule.interval_hours == pytest.approx(12)
+    assert schedule.next_run == history[0].finished_at + timedelta(hours=12)
+
+
+def test_jitter_is_bounded_and_stable():
+    history = [_run(1, changed=5)]
+    base = compute_schedule("a", history, NOW, MIN_INTERVAL, MAX_INTERVAL)
+    first = compute_schedule("a", history, NOW, MIN_INTERVAL, MAX_INTERVAL, jitter=0.1)
+    second = compute_schedule("a", history, NOW, MIN_INTERVAL, MAX_INTERVAL, jitter=0.1)
+
+    assert first.next_run == second.next_run
+    assert abs(first.interval_hours - base.interval_hours) <= base.interval_hours * 0.1 + 0.01
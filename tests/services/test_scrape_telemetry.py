@@ -0,0 +1,98 @@
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.scrape_url_stat import ScrapeUrlStat
+from app.models.scraper_log import ScraperLog
+from app.services.scrapers.grantconnect import GrantConnectScraper
+from app.services.scrapers.telemetry import RunTelemetry, performance_report, request_url, save_run_telemetry
+
+FAST = "https://www.screenaustralia.gov.au/funding-and-support/documentary"
+SLOW = "https://www.screenaustralia.gov.au/funding-and-support/games"
+
+
+pytestmark = pytest.mark.tables(ScraperLog, ScrapeUrlStat)
+
+
+def _run(db, fast_seconds=0.2, slow_seconds=3.0):
+    log = ScraperLog(source_name="australian_grants", status="running")
+    db.add(log)
+    db.flush()
+
+    telemetry = RunTelemetry()
+    telemetry.record_fetch(FAST, 200, fast_seconds, 12000)
+    telemetry.record_parse(FAST, 0.05, 3)
+    telemetry.record_fetch(SLOW, None, slow_seconds, 0, error="TimeoutError: ")
+    telemetry.record_fetch(SLOW, 200, slow_seconds, 40000)
+    telemetry.record_parse(SLOW, 0.4, 1)
+    save_run_telemetry(db, log, telemetry)
+    log.complete(status="success", metadata={"telemetry": telemetry.summary()})
+    db.commit()
+    return log, telemetry
+
+
+def test_run_summary_is_fixed_size(db):
+    _, telemetry = _run(db)
+    summary = telemetry.summary()
+    assert (summary["urls"], summary["requests"], summary["failed"]) == (2, 3, 0)
+    assert (summary["bytes"], summary["grants"]) == (52000, 4)
+    assert summary["fetch_seconds"]["count"] == 2
+
+    row = db.query(ScrapeUrlStat).filter(ScrapeUrlStat.url == SLOW).one()
+    assert (row.requests, row.fetch_ms, row.parse_ms, row.error) == (2, 6000, 400, None)
+
+
+def test_performance_report_ranks_slow_urls_and_tracks_runs(db):
+    _run(db, slow_seconds=1.0)
+    _run(db, slow_seconds=4.0)
+
+    [report] = performance_report(db)
+    assert report["source_name"] == "australian_grants"
+    assert report["runs"] == 2
+    assert report["slowest_urls"][0]["url"] == SLOW
+    assert report["slowest_urls"][0]["max_fetch_seconds"] == 4.0
+    assert [run["urls"] for run in report["trend"]] == [2, 2]
+    # Per-request fetch time went up between the runs
+    assert report["trend"][1]["fetch_p95"] > report["trend"][0]["fetch_p95"]
+
+
+def test_old_runs_are_pruned(db, monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_TELEMETRY_RUNS", 2)
+    logs = [_run(db)[0] for _ in range(3)]
+    kept = {log_id for (log_id,) in db.query(ScrapeUrlStat.scraper_log_id).distinct()}
+    assert kept == {logs[1].id, logs[2].id}
+
+
+class FakeResponse:
+    status = 200
+    url = None
+
+    async def text(self):
+        return "{}"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+def test_request_url_includes_params():
+    assert request_url(FAST) == FAST
+    assert request_url(FAST, {"page": 2, "pageSize": 100}) == FAST + "?page=2&pageSize=100"
+    assert request_url(FAST + "?a=1", [("page", 2)]) == FAST + "?a=1&page=2"
+
+
+@pytest.mark.asyncio
+async def test_paged_requests_are_recorded_separately():
+    search = "https://www.grants.gov.au/api/v1/grants/search"
+    session = Mock()
+    session.request = Mock(side_effect=lambda method, url, **kwargs: FakeResponse())
+    scraper = GrantConnectScraper(Mock(spec=Session))
+    with patch("app.services.scrapers.base_scraper.get_http_session", return_value=session):
+        for page in (1, 2, 2):
+            await scraper._make_request(search, params={"page": page})
+
+    assert {url: entry.requests for url, entry in scraper.telemetry.urls.items()} == {
+        search + "?page=1": 1, search + "?page=2": 2
+    }
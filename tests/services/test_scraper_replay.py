@@ -0,0 +1,137 @@
+import gzip
+import time
+from datetime import datetime
+from pathlib import Path
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy.orm import Session
+from app.services.scrapers.australian_grants_scraper import AustralianGrantsScraper
+from app.services.scrapers.replay import FixtureMissing, FixtureStore, recording, replaying, request_key
+
+SCREEN_URL = "https://www.screenaustralia.gov.au/funding-and-support/documentary"
+
+SCREEN_HTML = """
+<html><body><main>
+  <div class="funding-program">
+    <h2>Documentary Development</h2>
+    <p>Funding up to $50,000 for documentary development. Applications close 30 June 2025.</p>
+    <a href="/funding/documentary">Details</a>
+  </div>
+</main></body></html>
+"""
+
+
+class FakeResponse:
+    def __init__(self, status, text):
+        self.status = status
+        self._text = text
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def request(self, method, url, **kwargs):
+        if url in self.pages:
+            return FakeResponse(200, self.pages[url])
+        return FakeResponse(404, "")
+
+
+def test_blobs_are_compressed_and_deduplicated(tmp_path):
+    store = FixtureStore(tmp_path)
+    first = store.put("philanthropic", "GET", "https://a.example/1", 200, SCREEN_HTML)
+    second = store.put("philanthropic", "GET", "https://a.example/2", 200, SCREEN_HTML)
+
+    assert first.sha256 == second.sha256
+    blobs = list((tmp_path / "blobs").rglob("*.gz"))
+    assert len(blobs) == 1
+    assert gzip.decompress(blobs[0].read_bytes()).decode() == SCREEN_HTML
+    assert store.body(first) == SCREEN_HTML
+
+
+def test_index_round_trips_through_disk(tmp_path):
+    store = FixtureStore(tmp_path)
+    store.put("business.gov.au", "GET", SCREEN_URL, 200, "<html></html>")
+    store.put("business.gov.au", "GET", SCREEN_URL, 200, "page 2", {"params": {"page": 2}})
+    store.save()
+
+    reloaded = FixtureStore(tmp_path)
+    assert reloaded.sources() == ["business.gov.au"]
+    assert reloaded.body(reloaded.get("business.gov.au", "get", SCREEN_URL)) == "<html></html>"
+    assert reloaded.body(reloaded.get("business.gov.au", "GET", SCREEN_URL, {"params": {"page": 2}})) == "page 2"
+
+
+def test_request_key_ignores_headers_but_not_params():
+    assert request_key("GET", SCREEN_URL) == request_key("get", SCREEN_URL, {"headers": {"X": "1"}})
+    assert request_key("GET", SCREEN_URL) != request_key("GET", SCREEN_URL, {"params": {"page": 2}})
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_without_network(tmp_path):
+    store = FixtureStore(tmp_path)
+    scraper = AustralianGrantsScraper(Mock(spec=Session))
+
+    session = FakeSession({SCREEN_URL: SCREEN_HTML})
+    with patch("app.services.scrapers.base_scraper.get_http_session", return_value=session):
+        with recording(store, "australian_grants") as fixtures:
+            assert await scraper._make_request(SCREEN_URL) == SCREEN_HTML
+            assert await scraper._make_request(SCREEN_URL + "/missing") is None
+    assert fixtures.pages == 1
+
+    with patch("app.services.scrapers.base_scraper.get_http_session", side_effect=AssertionError("network used")):
+        with replaying(store, "australian_grants") as fixtures:
+            assert await scraper._make_request(SCREEN_URL) == SCREEN_HTML
+            assert await scraper._make_request(SCREEN_URL + "/missing") is None
+            assert await scraper._make_request(SCREEN_URL + "/never-recorded") is None
+    assert (fixtures.pages, fixtures.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_strict_replay_raises_on_unrecorded_request(tmp_path):
+    scraper = AustralianGrantsScraper(Mock(spec=Session))
+    with replaying(FixtureStore(tmp_path), "australian_grants", strict=True):
+        with pytest.raises(FixtureMissing):
+            await scraper._make_request(SCREEN_URL)
+
+
+@pytest.mark.asyncio
+async def test_full_scrape_replays_without_politeness_delays(tmp_path):
+    store = FixtureStore(tmp_path)
+    store.put("australian_grants", "GET", SCREEN_URL, 200, SCREEN_HTML)
+
+    start = time.monotonic()
+    with replaying(store, "australian_grants") as fixtures:
+        grants = await AustralianGrantsScraper(Mock(spec=Session)).scrape()
+
+    # Live, the staggered sources and retries would take well over a minute
+    assert time.monotonic() - start < 30
+    assert fixtures.pages == 1
+    assert fixtures.misses > 0
+    assert any("Documentary" in grant["title"] for grant in grants)
+
+
+@pytest.mark.asyncio
+async def test_committed_fixtures_replay_strictly():
+    # tests/fixtures/scrapers is the default SCRAPER_FIXTURE_DIR; CI and the benchmarks replay it
+    store = FixtureStore(Path(__file__).resolve().parents[1] / "fixtures" / "scrapers")
+    assert "australian_grants" in store.sources()
+
+    with replaying(store, "australian_grants", strict=True) as fixtures:
+        grants = [grant async for grant in AustralianGrantsScraper(None).stream()]
+
+    assert (fixtures.pages, fixtures.misses) == (14, 0)
+    by_title = {grant["title"]: grant for grant in grants}
+    assert len(by_title) == len(grants) == 25
+    games = by_title["Games Production Fund"]
+    assert (games["min_amount"], games["max_amount"]) == (30000, 150000)
+    assert games["deadline"] == datetime(2025, 9, 1)
+    assert by_title["Regional Arts Fund"]["source_url"].startswith("https://business.gov.au/")
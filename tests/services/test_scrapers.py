@@ -263,7 +263,7 @@ class TestGrantConnectScraper:
     async def test_fetch_grant_details(self, mock_grantconnect_session, db_session):
         """Test fetching grant details from GrantConnect."""
         scraper = GrantConnectScraper(db_session, http_session=mock_grantconnect_session)
-        details = await scraper._fetch_grant_details(mock_grantconnect_session, "123")
+        details = await scraper._fetch_grant_details("123")
         assert details["open_date"] == "2024-03-01"
         assert details["deadline"] == "2024-06-30"
     
@@ -0,0 +1,60 @@
+import pytest
+from app.models.grant import Grant
+from app.models.grant_change import GrantChange
+from app.services.similar_grants import SimilarityIndex, similar_grants
+
+
+pytestmark = pytest.mark.tables(Grant, GrantChange)
+
+
+def _add(db, title, description, source="manual", **fields):
+    grant = Grant(title=title, description=description, source=source, status="open", **fields)
+    db.add(grant)
+    db.commit()
+    return grant
+
+
+def test_ranks_by_shared_weighted_terms(db):
+    film = _add(db, "Documentary Film Production", "Funding for documentary film production and screen storytelling.")
+    screen = _add(db, "Screen Development", "Development funding for documentary and screen storytelling projects.")
+    music = _add(db, "Contemporary Music Touring", "Support for musicians touring regional venues.")
+    _add(db, "Farm Drought Relief", "Assistance for drought affected farm businesses.")
+
+    index = SimilarityIndex()
+    index.refresh(db)
+    ranked = index.similar(film.id)
+    assert [grant_id for grant_id, _ in ranked] == [screen.id]
+    assert 0 < ranked[0][1] < 1
+    assert index.similar(music.id) == []
+
+
+def test_follows_the_change_feed(db):
+    film = _add(db, "Documentary Film Production", "Funding for documentary film production.")
+    index = SimilarityIndex()
+    assert index.refresh(db) == 1
+    assert index.refresh(db) == 0
+
+    other = _add(db, "Short Film Production", "Funding for short film production.")
+    assert index.refresh(db) == 1
+    assert [grant_id for grant_id, _ in index.similar(film.id)] == [other.id]
+
+    other.description = "Support for touring musicians."
+    other.title = "Music Touring"
+    db.commit()
+    db.delete(film)
+    db.commit()
+    index.refresh(db)
+    assert len(index) == 1
+    assert index.similar(other.id) == []
+
+
+def test_results_skip_copies_of_the_same_program(db):
+    film = _add(db, "Documentary Film Production", "Funding for documentary film production.")
+    copy = _add(db, "Documentary Film Production Grant", "Funding for documentary film production.",
+                source="grantconnect", canonical_id=film.id)
+    other = _add(db, "Short Film Production", "Funding for short film production.")
+
+    results = similar_grants(db, film, index=SimilarityIndex())
+    assert [grant.id for grant, _ in results] == [other.id]
+    # A copy is similar to what its canonical grant is similar to, not to the canonical itself
+    assert [grant.id for grant, _ in similar_grants(db, copy, index=SimilarityIndex())] == [other.id]
@@ -0,0 +1,110 @@
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from sqlalchemy.orm import Session
+from app.services.scrapers.australian_grants_scraper import AustralianGrantsScraper
+from app.services.scrapers.discovery import DiscoveredPage, parse_feed, parse_sitemap, parse_w3c_datetime, plan_endpoints
+from app.services.scrapers.frontier import UrlFrontier, UrlState
+
+BASE = "https://www.screenaustralia.gov.au"
+
+SITEMAP_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://www.screenaustralia.gov.au/sitemap-1.xml</loc><lastmod>2025-05-01</lastmod></sitemap>
+</sitemapindex>"""
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://www.screenaustralia.gov.au/funding-and-support/documentary</loc><lastmod>2025-01-10T09:00:00+10:00</lastmod></url>
+  <url><loc>https://www.screenaustralia.gov.au/funding-and-support/games/</loc><lastmod>2025-05-20</lastmod></url>
+  <url><loc>https://www.screenaustralia.gov.au/funding-and-support/first-nations</loc><lastmod>2025-05-28</lastmod></url>
+  <url><loc>https://www.screenaustralia.gov.au/news/latest</loc><lastmod>2025-05-30</lastmod></url>
+</urlset>"""
+
+RSS = """<rss version="2.0"><channel>
+  <item><link>https://www.screenaustralia.gov.au/funding-and-support/new-fund</link><pubDate>Mon, 02 Jun 2025 10:00:00 +1000</pubDate></item>
+</channel></rss>"""
+
+ATOM = """<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry><link href="https://www.screenaustralia.gov.au/funding-and-support/atom-fund"/><updated>2025-06-03T00:00:00Z</updated></entry>
+</feed>"""
+
+
+def test_parse_sitemap_and_index():
+    pages, children = parse_sitemap(SITEMAP)
+    assert len(pages) == 4 and children == []
+    assert pages[0].lastmod == datetime(2025, 1, 9, 23, 0)
+
+    pages, children = parse_sitemap(SITEMAP_INDEX)
+    assert pages == [] and [child.url for child in children] == ["https://www.screenaustralia.gov.au/sitemap-1.xml"]
+
+    assert parse_sitemap("not xml") == ([], [])
+
+
+def test_parse_rss_and_atom_feeds():
+    assert parse_feed(RSS)[0].lastmod == datetime(2025, 6, 2, 0, 0)
+    assert parse_feed(ATOM)[0].url.endswith("/atom-fund")
+    assert parse_w3c_datetime("garbage") is None
+
+
+def test_plan_skips_unchanged_pages_and_adds_new_ones():
+    fixed = [f"{BASE}/funding-and-support/documentary", f"{BASE}/funding-and-support/games", f"{BASE}/funding-and-support/unlisted"]
+    pages, _ = parse_sitemap(SITEMAP)
+    fetched = {
+        f"{BASE}/funding-and-support/documentary": datetime(2025, 3, 1),
+        f"{BASE}/funding-and-support/games": datetime(2025, 3, 1),
+    }
+    urls, stats = plan_endpoints(BASE, fixed, pages, [r"^/funding-and-support/"], fetched.get, max_new=10)
+
+    # documentary unchanged since March; games changed; unlisted has no lastmod; news not included
+    assert urls == [
+        f"{BASE}/funding-and-support/games",
+        f"{BASE}/funding-and-support/unlisted",
+        f"{BASE}/funding-and-support/first-nations",
+    ]
+    assert (stats["unchanged_skipped"], stats["new_pages"]) == (1, 1)
+
+
+def test_plan_caps_new_pages_newest_first():
+    pages = [DiscoveredPage(f"{BASE}/funding-and-support/p{n}", datetime(2025, 1, n + 1)) for n in range(5)]
+    other_host = DiscoveredPage("https://evil.example/funding-and-support/x", datetime(2025, 2, 1))
+    urls, stats = plan_endpoints(BASE, [], pages + [other_host], [r"^/funding-and-support/"], lambda url: None, max_new=2)
+    assert urls == [f"{BASE}/funding-and-support/p4", f"{BASE}/funding-and-support/p3"]
+    assert stats["new_pages_dropped"] == 3
+
+
+@pytest.mark.asyncio
+async def test_scraper_follows_sitemap_index_and_uses_frontier_history():
+    scraper = AustralianGrantsScraper(Mock(spec=Session))
+    scraper.frontier = UrlFrontier("australian_grants", {
+        f"{BASE}/funding-and-support/documentary": UrlState(
+            url=f"{BASE}/funding-and-support/documentary", source_name="australian_grants",
+            last_success_at=datetime(2025, 3, 1)
+        )
+    })
+    responses = {f"{BASE}/sitemap.xml": SITEMAP_INDEX, f"{BASE}/sitemap-1.xml": SITEMAP}
+
+    async def fake_request(url, method="GET", **kwargs):
+        return responses.get(url)
+
+    scraper._make_request = fake_request
+    site = scraper.sources["screen_australia"]
+    fixed = [BASE + endpoint for endpoint in site["endpoints"]]
+    urls = await scraper._discover_endpoints("screen_australia", site, fixed)
+
+    assert f"{BASE}/funding-and-support/documentary" not in urls
+    assert f"{BASE}/funding-and-support/first-nations" in urls
+    assert scraper.discovery_stats["screen_australia"]["new_pages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_sitemap_keeps_fixed_endpoints():
+    scraper = AustralianGrantsScraper(Mock(spec=Session))
+
+    async def fake_request(url, method="GET", **kwargs):
+        return None
+
+    scraper._make_request = fake_request
+    site = scraper.sources["screen_australia"]
+    fixed = [BASE + endpoint for endpoint in site["endpoints"]]
+    assert await scraper._discover_endpoints("screen_australia", site, fixed) == fixed
@@ -0,0 +1,135 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from sqlalchemy.orm import Session
+from app.models.crawl_url import CrawlUrl
+from app.services.scrapers.frontier import UrlFrontier, UrlState, dead_endpoint_report, quarantine_delay
+from app.services.scrapers.media_investment_scraper import MediaInvestmentScraper
+
+URL = "https://www.screenaustralia.gov.au/funding-and-support/old"
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+pytestmark = pytest.mark.tables.with_args(CrawlUrl)
+
+
+class FakeResponse:
+    def __init__(self, status, url, text=""):
+        self.status = status
+        self.url = url
+        self._text = text
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+def test_quarantine_doubles_and_is_capped():
+    assert quarantine_delay(1) is None
+    assert quarantine_delay(2) == timedelta(hours=12)
+    assert quarantine_delay(3) == timedelta(hours=24)
+    assert quarantine_delay(20) == timedelta(hours=720)
+
+
+def test_success_clears_quarantine_and_keeps_history():
+    state = UrlState(url=URL, source_name="media_investment")
+    state.record(NOW, 404)
+    state.record(NOW, 404)
+    assert state.quarantined_until == NOW + timedelta(hours=12)
+
+    state.record(NOW + timedelta(days=1), 200)
+    assert (state.consecutive_failures, state.quarantined_until) == (0, None)
+    assert [check["status"] for check in state.history] == [404, 404, 200]
+    assert state.total_failures == 2
+
+
+def test_retries_within_a_run_count_as_one_failure():
+    frontier = UrlFrontier("media_investment")
+    frontier.record(URL, 503)
+    assert frontier.worth_retrying(URL)
+    frontier.record(URL, 404)
+    frontier.record(URL, 404)
+    assert frontier.states[URL].consecutive_failures == 1
+    assert frontier.states[URL].total_failures == 3
+    assert not frontier.worth_retrying(URL)
+
+
+def test_quarantined_url_is_skipped_until_it_expires():
+    state = UrlState(url=URL, source_name="media_investment", consecutive_failures=2,
+                     quarantined_until=NOW + timedelta(hours=1))
+    assert not UrlFrontier("media_investment", {URL: state}, now=NOW).allow(URL)
+    assert UrlFrontier("media_investment", {URL: state}, now=NOW + timedelta(hours=2)).allow(URL)
+
+
+def test_frontier_round_trips_and_reports_dead_endpoints(db):
+    # One failure per run
+    for _ in range(2):
+        frontier = UrlFrontier.load(db, "media_investment")
+        frontier.record(URL, 404)
+        frontier.record("https://www.abc.net.au/old", 200, "https://www.abc.net.au/new")
+        frontier.save(db)
+        db.commit()
+
+    reloaded = UrlFrontier.load(db, "media_investment")
+    assert reloaded.resolve("https://www.abc.net.au/old") == "https://www.abc.net.au/new"
+    assert reloaded.states[URL].consecutive_failures == 2
+    assert len(reloaded.states[URL].history) == 2
+
+    reloaded.record(URL, 404)
+    reloaded.save(db)
+    db.commit()
+    assert db.query(CrawlUrl).count() == 2
+
+    report = dead_endpoint_report(db)
+    assert [(entry["url"], entry["state"], entry["consecutive_failures"]) for entry in report] == [(URL, "dead", 3)]
+
+
+def test_sources_sharing_a_url_keep_separate_history(db):
+    shared = "https://business.gov.au/grants-and-programs/arts-and-culture"
+    for _ in range(2):
+        for source_name, status in (("australian_grants", 404), ("business.gov.au", 200)):
+            frontier = UrlFrontier.load(db, source_name)
+            frontier.record(shared, status)
+            frontier.save(db)
+            db.commit()
+
+    failing = UrlFrontier.load(db, "australian_grants").states[shared]
+    working = UrlFrontier.load(db, "business.gov.au").states[shared]
+    assert (failing.consecutive_failures, failing.total_requests) == (2, 2)
+    assert failing.quarantined_until is not None
+    assert (working.consecutive_failures, working.total_requests) == (0, 2)
+    assert db.query(CrawlUrl).count() == 2
+    assert [entry["source_name"] for entry in dead_endpoint_report(db)] == ["australian_grants"]
+
+
+@pytest.mark.asyncio
+async def test_quarantined_endpoints_are_not_requested():
+    scraper = MediaInvestmentScraper(Mock(spec=Session))
+    scraper.frontier = UrlFrontier("media_investment", {
+        URL: UrlState(url=URL, source_name="media_investment", consecutive_failures=3,
+                      quarantined_until=datetime.utcnow() + timedelta(days=1))
+    })
+    with patch("app.services.scrapers.base_scraper.get_http_session", side_effect=AssertionError("requested")):
+        assert await scraper._make_request(URL) is None
+    assert scraper.frontier.summary()["skipped_urls"] == [URL]
+
+
+@pytest.mark.asyncio
+async def test_redirects_are_remembered_and_followed_directly():
+    scraper = MediaInvestmentScraper(Mock(spec=Session))
+    scraper.frontier = UrlFrontier("media_investment")
+    moved = "https://www.screenaustralia.gov.au/funding-and-support/new"
+    session = Mock()
+    session.request = Mock(side_effect=lambda method, url, **kw: FakeResponse(200, moved, "<html></html>"))
+
+    with patch("app.services.scrapers.base_scraper.get_http_session", return_value=session):
+        await scraper._make_request(URL)
+        await scraper._make_request(URL)
+
+    assert scraper.frontier.resolve(URL) == moved
+    assert session.request.call_args_list[1].args == ("GET", moved)
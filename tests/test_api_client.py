@@ -0,0 +1,161 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.core import api_client
+from app.core.api_client import (
+    AsyncAPIClient, RetryConfig, endpoint_label, get_api_client, get_async_api_client, get_all_client_metrics,
+    get_latency_report
+)
+
+BASE_URL = "https://business.gov.au"
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    api_client._circuit_breakers.clear()
+    api_client._api_clients.clear()
+    api_client._async_api_clients.clear()
+    api_client._connection_metrics.clear()
+    yield
+    api_client._circuit_breakers.clear()
+    api_client._api_clients.clear()
+    api_client._async_api_clients.clear()
+    api_client._connection_metrics.clear()
+
+
+class FakeResponse:
+    def __init__(self, status, text=""):
+        self.status = status
+        self._text = text
+        self.headers = {"Content-Type": "application/json"}
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        status = self.statuses.pop(0) if self.statuses else 200
+        return FakeResponse(status, '{"ok": true}' if status == 200 else "")
+
+
+def _no_jitter(**overrides):
+    return RetryConfig(initial_delay=0.01, jitter=False, **overrides)
+
+
+@pytest.mark.asyncio
+async def test_async_client_retries_without_blocking_the_loop():
+    session = FakeSession([503, 502, 200])
+    client = AsyncAPIClient(base_url=BASE_URL, retry_config=_no_jitter())
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    background = asyncio.create_task(ticker())
+    with patch("app.core.api_client.get_async_session", return_value=session), \
+         patch("app.core.api_client.time.sleep", side_effect=AssertionError("blocking sleep")):
+        response = await client.get("/grants")
+    background.cancel()
+
+    assert response.success and response.data == {"ok": True}
+    assert response.attempt == 3
+    assert ticks > 1
+    metrics = client.get_metrics()
+    assert (metrics["total_requests"], metrics["failed_requests"]) == (3, 2)
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_status_returns_immediately():
+    session = FakeSession([404])
+    client = AsyncAPIClient(base_url=BASE_URL, retry_config=_no_jitter())
+    with patch("app.core.api_client.get_async_session", return_value=session):
+        response = await client.get("/missing")
+    assert (response.status_code, response.attempt, len(session.calls)) == (404, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_is_shared_per_host():
+    session = FakeSession([500] * 10)
+    first = get_async_api_client("grants_a", BASE_URL, retry_config=_no_jitter(max_retries=1))
+    second = get_async_api_client("grants_b", BASE_URL + "/api", retry_config=_no_jitter(max_retries=1))
+    sync_client = get_api_client("grants_sync", BASE_URL)
+
+    with patch("app.core.api_client.get_async_session", return_value=session):
+        for _ in range(5):
+            await first.get("/grants")
+        response = await second.get("/other")
+
+    assert response.error == "Circuit breaker is open"
+    assert len(session.calls) == 5
+    # Same host, so the synchronous client is cut off too
+    assert sync_client.get("/grants").error == "Circuit breaker is open"
+    assert get_all_client_metrics()["grants_b"]["circuit_breaker_open"] is True
+
+
+@pytest.mark.asyncio
+async def test_client_errors_leave_the_breaker_closed():
+    # Someone's bad token: 401s say nothing about the host
+    session = FakeSession([401] * 10 + [200])
+    client = get_async_api_client("notion_bad_token", BASE_URL, retry_config=_no_jitter(max_retries=1))
+    other = get_async_api_client("notion_good_token", BASE_URL, retry_config=_no_jitter(max_retries=1))
+
+    with patch("app.core.api_client.get_async_session", return_value=session):
+        for _ in range(10):
+            assert (await client.get("/v1/pages")).status_code == 401
+        response = await other.get("/v1/pages")
+
+    assert response.success
+    assert api_client.get_circuit_breaker(BASE_URL).failures == 0
+
+
+@pytest.mark.asyncio
+async def test_disallowed_domain_is_rejected_without_a_request():
+    session = FakeSession([])
+    client = AsyncAPIClient(base_url="https://example.com")
+    with patch("app.core.api_client.get_async_session", return_value=session):
+        response = await client.get("/")
+    assert response.status_code == 403
+    assert session.calls == []
+
+
+def test_endpoint_labels_fold_ids_and_queries():
+    assert endpoint_label("/v1/pages/3f1c9a2b4d5e6f708192a3b4c5d6e7f8") == "/v1/pages/{id}"
+    assert endpoint_label("/grants/42/documents?page=2") == "/grants/{id}/documents"
+    assert endpoint_label("https://business.gov.au/grants-and-programs") == "/grants-and-programs"
+
+
+@pytest.mark.asyncio
+async def test_named_clients_share_latency_metrics():
+    session = FakeSession([200] * 4)
+    with patch("app.core.api_client.get_async_session", return_value=session):
+        for page_id in (1, 2):
+            # A new client per call, as NotionAPIClient does per access token
+            client = AsyncAPIClient(base_url=BASE_URL, service_name="notion", retry_config=_no_jitter())
+            await client.get(f"/v1/pages/{page_id}")
+        await get_async_api_client("grants", BASE_URL).get("/grants")
+
+    metrics = get_all_client_metrics()
+    assert metrics["notion"]["total_requests"] == 2
+    assert list(metrics["notion"]["endpoints"]) == ["/v1/pages/{id}"]
+    assert metrics["notion"]["latency"]["count"] == 2
+    assert metrics["notion"]["latency"]["p95"] is not None
+
+    report = get_latency_report()
+    assert set(report["services"]) == {"notion", "grants"}
+    assert report["overall"]["count"] == 3
@@ -18,5 +18,7 @@ def setup_test_env():
         "MAIL_FROM": "test@example.com",
         "MAIL_PORT": "0",
         "MAIL_SERVER": "mock",
-        "MAIL_FROM_NAME": "SGE Dashboard Test"
+        "MAIL_FROM_NAME": "SGE Dashboard Test",
+        # Tests that fake live fetches shouldn't fill the page archive
+        "SCRAPER_ARCHIVE_ENABLED": "false"
     }) 
\ No newline at end of file
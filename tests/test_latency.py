@@ -0,0 +1,52 @@
+import random
+from app.core.latency import LatencyHistogram, WindowedHistogram, merge_histograms
+
+
+def test_quantiles_are_within_a_bucket():
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(-2, 1) for _ in range(10000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    samples.sort()
+    for q in (0.5, 0.95, 0.99):
+        exact = samples[int(q * len(samples)) - 1]
+        assert abs(histogram.quantile(q) - exact) / exact < 0.1
+    assert histogram.max == samples[-1]
+    assert histogram.summary()["count"] == 10000
+
+
+def test_merge_matches_recording_everything_once():
+    fast, slow, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i in range(100):
+        fast.record(0.01 + i / 10000)
+        slow.record(1 + i / 100)
+        both.record(0.01 + i / 10000)
+        both.record(1 + i / 100)
+
+    merged = merge_histograms([fast, slow])
+    assert merged.counts == both.counts
+    assert merged.summary() == both.summary()
+    # The merge doesn't touch its inputs
+    assert fast.count == 100
+
+
+def test_empty_histogram_summary():
+    assert LatencyHistogram().summary() == {"count": 0, "avg": None, "p50": None, "p95": None, "p99": None, "max": None}
+
+
+def test_window_ages_out_old_samples():
+    window = WindowedHistogram(window=300, slots=5)
+    window.record(5.0, now=0)
+    window.record(0.1, now=200)
+    assert window.snapshot(now=200).count == 2
+    assert window.snapshot(now=200).max == 5.0
+
+    # The slot holding the 5s sample has left the window
+    assert window.snapshot(now=330).count == 1
+    assert window.snapshot(now=330).max == 0.1
+
+    # Recording into a recycled slot drops what was there
+    window.record(0.2, now=600)
+    assert window.snapshot(now=600).count == 1